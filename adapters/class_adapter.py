@@ -4,13 +4,16 @@ Java API endpoints handled:
 - GET /dify/teacher/{teacherId}/classes/me        → list[ClassInfo]
 - GET /dify/teacher/{teacherId}/classes/{classId}  → ClassDetail
 - GET /dify/teacher/{teacherId}/classes/{classId}/assignments → list[AssignmentInfo]
+  (paginated — see ``adapters.pagination``)
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Any
+from dataclasses import replace
+from typing import Any, AsyncIterator
 
+from adapters.pagination import DEFAULT_PAGE_SIZE, Page, iter_pages, parse_page
 from models.data import AssignmentInfo, ClassDetail, ClassInfo, StudentInfo
 from services.java_client import JavaClient
 
@@ -136,16 +139,12 @@ async def get_detail(client: JavaClient, teacher_id: str, class_id: str) -> Clas
     )
 
 
-async def list_assignments(
-    client: JavaClient, teacher_id: str, class_id: str
-) -> list[AssignmentInfo]:
-    """Fetch assignments for a class.
-
-    GET /dify/teacher/{teacherId}/classes/{classId}/assignments
-    """
+async def _fetch_assignment_page(
+    client: JavaClient, teacher_id: str, class_id: str, page: int, limit: int
+) -> Page[AssignmentInfo]:
     resp = await client.get(
         f"/dify/teacher/{teacher_id}/classes/{class_id}/assignments",
-        params={"limit": 100},
+        params={"page": page, "limit": limit},
     )
     raw = _unwrap_data(resp)
 
@@ -156,15 +155,52 @@ async def list_assignments(
         )
 
     # Response is PageResponseDTOClassAssignmentDTO → {data: [...], pagination: {...}}
-    if isinstance(raw, dict) and "data" in raw:
-        items = raw["data"]
-    elif isinstance(raw, list):
-        items = raw
-    else:
+    parsed = parse_page(raw, page, limit)
+    if parsed is None:
         logger.warning("list_assignments: unexpected shape %s", type(raw))
-        return []
+        return Page(items=[], page=page, limit=limit)
+    return replace(parsed, items=[_parse_assignment(a) for a in parsed.items])
+
+
+def iter_assignment_pages(
+    client: JavaClient,
+    teacher_id: str,
+    class_id: str,
+    *,
+    max_items: int | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+) -> AsyncIterator[Page[AssignmentInfo]]:
+    """Iterate a class's assignments page by page (next page prefetched).
+
+    GET /dify/teacher/{teacherId}/classes/{classId}/assignments?page=&limit=
+    """
+    return iter_pages(
+        lambda page, limit: _fetch_assignment_page(client, teacher_id, class_id, page, limit),
+        page_size=page_size,
+        max_items=max_items,
+        prefetch=prefetch,
+    )
+
 
-    return [_parse_assignment(a) for a in items]
+async def list_assignments(
+    client: JavaClient,
+    teacher_id: str,
+    class_id: str,
+    *,
+    limit: int | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> list[AssignmentInfo]:
+    """Fetch assignments for a class — all pages, or the first *limit*.
+
+    GET /dify/teacher/{teacherId}/classes/{classId}/assignments
+    """
+    assignments: list[AssignmentInfo] = []
+    async for page in iter_assignment_pages(
+        client, teacher_id, class_id, max_items=limit, page_size=page_size,
+    ):
+        assignments.extend(page.items)
+    return assignments
 
 
 # ---------------------------------------------------------------------------
@@ -0,0 +1,137 @@
+"""Page-based async iteration over Java list endpoints.
+
+Java list endpoints return either a bare list (unpaginated) or a
+``PageResponseDTO``::
+
+    {"data": [...], "pagination": {"page": 1, "limit": 100, "total": 249}}
+
+``iter_pages`` walks such an endpoint page by page (1-based ``page`` /
+``limit`` query params) instead of fetching one fixed ``limit=100`` page:
+
+- the next page is requested while the caller processes the current one
+  (``prefetch=True``),
+- iteration stops early once ``max_items`` items have been yielded, and a
+  prefetched page that is no longer needed is cancelled,
+- callers that aggregate incrementally (``on_page`` hooks in the adapters)
+  never need the whole list in memory,
+- at most ``max_pages`` pages are requested, so an endpoint that ignores
+  ``page`` and never reports a total cannot keep the loop going forever.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass, replace
+from typing import Any, AsyncIterator, Awaitable, Callable, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 100
+DEFAULT_MAX_PAGES = 500
+
+
+@dataclass(frozen=True)
+class Page(Generic[T]):
+    """One page of a list endpoint."""
+
+    items: list[T]
+    page: int
+    limit: int
+    total: int | None = None
+    has_more: bool = False
+
+
+def parse_page(raw: Any, page: int, limit: int) -> Page[Any] | None:
+    """Interpret an unwrapped Java list response.
+
+    Returns None for shapes that are neither a list nor a page DTO.  A bare
+    list means the endpoint is unpaginated and is treated as complete.
+    """
+    if isinstance(raw, list):
+        return Page(items=raw, page=page, limit=limit, total=len(raw) if page == 1 else None)
+    if not isinstance(raw, dict) or not isinstance(raw.get("data"), list):
+        return None
+
+    items = raw["data"]
+    pagination = raw.get("pagination")
+    if not isinstance(pagination, dict):
+        return Page(items=items, page=page, limit=limit, total=len(items) if page == 1 else None)
+
+    page_limit = _positive_int(pagination.get("limit")) or limit
+    total = _positive_int(pagination.get("total"), allow_zero=True)
+    if total is not None:
+        has_more = page * page_limit < total
+    else:
+        has_more = len(items) >= page_limit
+    return Page(items=items, page=page, limit=page_limit, total=total, has_more=has_more and bool(items))
+
+
+async def iter_pages(
+    fetch: Callable[[int, int], Awaitable[Page[T]]],
+    *,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    max_items: int | None = None,
+    max_pages: int = DEFAULT_MAX_PAGES,
+    prefetch: bool = True,
+) -> AsyncIterator[Page[T]]:
+    """Yield pages from ``fetch(page, limit)`` until exhausted or *max_items*.
+
+    The last page is trimmed so no more than *max_items* items are yielded.
+    Iteration also stops after *max_pages* pages (with a warning) when the
+    endpoint still reports more.
+    """
+    if max_items is not None and max_items <= 0:
+        return
+    page_no = 1
+    pending: asyncio.Future[Page[T]] | None = asyncio.ensure_future(fetch(page_no, page_size))
+    seen = 0
+    try:
+        while pending is not None:
+            page = await pending
+            pending = None
+            if max_items is not None and seen + len(page.items) >= max_items:
+                page = replace(page, items=page.items[:max_items - seen], has_more=False)
+            elif page.has_more and page_no >= max_pages:
+                logger.warning(
+                    "iter_pages: stopping after %d pages (%d items); endpoint still reports more",
+                    page_no, seen + len(page.items),
+                )
+                page = replace(page, has_more=False)
+            seen += len(page.items)
+
+            if page.has_more and prefetch:
+                pending = asyncio.ensure_future(fetch(page_no + 1, page_size))
+            yield page
+            if page.has_more and not prefetch:
+                pending = asyncio.ensure_future(fetch(page_no + 1, page_size))
+            page_no += 1
+    finally:
+        if pending is not None and not pending.done():
+            pending.cancel()
+
+
+async def iter_items(
+    fetch: Callable[[int, int], Awaitable[Page[T]]],
+    **kwargs: Any,
+) -> AsyncIterator[T]:
+    """Item-level view of ``iter_pages`` (same keyword arguments)."""
+    pages = iter_pages(fetch, **kwargs)
+    try:
+        async for page in pages:
+            for item in page.items:
+                yield item
+    finally:
+        await pages.aclose()
+
+
+def _positive_int(value: Any, *, allow_zero: bool = False) -> int | None:
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    if number > 0 or (allow_zero and number == 0):
+        return number
+    return None
@@ -2,14 +2,17 @@
 
 Java API endpoints handled:
 - GET /dify/teacher/{teacherId}/submissions/assignments/{assignmentId} → SubmissionData
+  (paginated when the backend returns a page DTO — see ``adapters.pagination``)
 """
 
 from __future__ import annotations
 
 import logging
-from typing import Any
+from dataclasses import replace
+from typing import Any, AsyncIterator, Callable
 
-from models.data import SubmissionData, SubmissionRecord
+from adapters.pagination import DEFAULT_PAGE_SIZE, Page, iter_pages, parse_page
+from models.data import QuestionItem, SubmissionData, SubmissionRecord
 from services.java_client import JavaClient
 
 logger = logging.getLogger(__name__)
@@ -30,39 +33,145 @@ def _parse_submission(raw: dict[str, Any]) -> SubmissionRecord:
         feedback=raw.get("feedback") or raw.get("teacherComment") or "",
         submission_type=raw.get("submissionType") or "student",
         identity_type=raw.get("identityType") or "registered_account",
+        items=_parse_items(raw.get("items")),
     )
 
 
+def _parse_items(raw_items: Any) -> list[QuestionItem]:
+    """Convert question-level ``items`` (camelCase or snake_case); skip malformed ones."""
+    if not isinstance(raw_items, list):
+        return []
+    items: list[QuestionItem] = []
+    for raw in raw_items:
+        if not isinstance(raw, dict):
+            continue
+        question_id = raw.get("questionId") or raw.get("question_id")
+        if not question_id:
+            continue
+        try:
+            items.append(QuestionItem(
+                question_id=str(question_id),
+                score=raw.get("score") or 0,
+                max_score=raw.get("maxScore") or raw.get("max_score") or 1,
+                correct=bool(raw.get("correct", False)),
+                error_tags=raw.get("errorTags") or raw.get("error_tags") or [],
+                knowledge_point_ids=(
+                    raw.get("knowledgePointIds") or raw.get("knowledge_point_ids") or []
+                ),
+            ))
+        except ValueError:
+            logger.debug("Skipping malformed submission item: %s", raw)
+    return items
+
+
 # ---------------------------------------------------------------------------
 # High-level API calls
 # ---------------------------------------------------------------------------
 
-async def get_submissions(
-    client: JavaClient, teacher_id: str, assignment_id: str
-) -> SubmissionData:
-    """Fetch all submissions for an assignment.
-
-    GET /dify/teacher/{teacherId}/submissions/assignments/{assignmentId}
-    """
+async def _fetch_submission_page(
+    client: JavaClient, teacher_id: str, assignment_id: str, page: int, limit: int
+) -> Page[dict[str, Any]]:
     resp = await client.get(
-        f"/dify/teacher/{teacher_id}/submissions/assignments/{assignment_id}"
+        f"/dify/teacher/{teacher_id}/submissions/assignments/{assignment_id}",
+        params={"page": page, "limit": limit},
     )
-    items = _unwrap_data(resp)
+    raw = _unwrap_data(resp)
 
-    if items is None:
+    if raw is None:
         raise ValueError(
             f"get_submissions: Java backend returned null data for assignment {assignment_id}. "
             "Transient error — will be retried."
         )
-    if not isinstance(items, list):
-        logger.warning("get_submissions: expected list, got %s", type(items))
-        items = []
+    parsed = parse_page(raw, page, limit)
+    if parsed is None:
+        logger.warning("get_submissions: expected list, got %s", type(raw))
+        return Page(items=[], page=page, limit=limit)
+    return parsed
+
+
+def _iter_raw_pages(
+    client: JavaClient,
+    teacher_id: str,
+    assignment_id: str,
+    *,
+    max_items: int | None,
+    page_size: int,
+    prefetch: bool,
+) -> AsyncIterator[Page[dict[str, Any]]]:
+    return iter_pages(
+        lambda page, limit: _fetch_submission_page(client, teacher_id, assignment_id, page, limit),
+        page_size=page_size,
+        max_items=max_items,
+        prefetch=prefetch,
+    )
 
-    records = [_parse_submission(s) for s in items]
-    scores = [r.score for r in records if r.score is not None]
 
-    # Try to extract assignment title from the first record
-    title = items[0].get("assignmentTitle", "") if items else ""
+async def iter_submission_pages(
+    client: JavaClient,
+    teacher_id: str,
+    assignment_id: str,
+    *,
+    max_items: int | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+    prefetch: bool = True,
+) -> AsyncIterator[Page[SubmissionRecord]]:
+    """Iterate an assignment's submissions page by page.
+
+    Only one page (plus the prefetched next one) is held at a time, so
+    aggregations over large cohorts run in bounded memory.
+    """
+    pages = _iter_raw_pages(
+        client, teacher_id, assignment_id,
+        max_items=max_items, page_size=page_size, prefetch=prefetch,
+    )
+    try:
+        async for page in pages:
+            yield replace(page, items=[_parse_submission(s) for s in page.items])
+    finally:
+        await pages.aclose()
+
+
+async def get_submissions(
+    client: JavaClient,
+    teacher_id: str,
+    assignment_id: str,
+    *,
+    limit: int | None = None,
+    on_page: Callable[[list[SubmissionRecord]], Any] | None = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> SubmissionData:
+    """Fetch all submissions for an assignment (or the first *limit*).
+
+    GET /dify/teacher/{teacherId}/submissions/assignments/{assignmentId}
+
+    Args:
+        limit: Stop after this many submissions (early termination).
+        on_page: Incremental aggregation hook, called with each page of
+            parsed records as it arrives (e.g. ``ScoreAccumulator.add_records``).
+            Records are then *not* collected: the returned ``SubmissionData``
+            only carries the assignment metadata, with empty ``submissions``
+            and ``scores``.
+    """
+    records: list[SubmissionRecord] = []
+    title = ""
+    pages = _iter_raw_pages(
+        client, teacher_id, assignment_id,
+        max_items=limit, page_size=page_size, prefetch=True,
+    )
+    try:
+        async for page in pages:
+            if not title and page.items:
+                # Try to extract assignment title from the first record
+                title = page.items[0].get("assignmentTitle", "")
+            parsed = [_parse_submission(s) for s in page.items]
+            if on_page is not None:
+                on_page(parsed)
+            else:
+                records.extend(parsed)
+    finally:
+        await pages.aclose()
+
+    scores = [r.score for r in records if r.score is not None]
 
     return SubmissionData(
         assignment_id=assignment_id,
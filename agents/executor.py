@@ -18,11 +18,13 @@ from typing import TYPE_CHECKING, Any, AsyncGenerator
 from pydantic_ai import Agent
 
 if TYPE_CHECKING:
+    from opentelemetry.trace import Span
+
     from models.patch import PatchPlan
 
 from agents.provider import create_model, execute_mcp_tool
 from agents.resolver import resolve_ref, resolve_refs
-from config.prompts.block_compose import build_block_prompt
+from config.prompts.block_compose import build_block_prompt_layout, build_data_summary
 from config.settings import get_settings
 from errors.exceptions import DataFetchError
 from models.blueprint import (
@@ -42,6 +44,8 @@ from models.quiz_output import (
     build_quiz_meta,
     validate_question_types,
 )
+from services.prompt_layout import record_cache_usage
+from services.tracing import detached_span
 
 logger = logging.getLogger(__name__)
 
@@ -55,6 +59,8 @@ class ExecutorAgent:
     def __init__(self) -> None:
         settings = get_settings()
         self.model = create_model(settings.executor_model)
+        # (data_context, compute_results, summary) of the build being composed.
+        self._data_summary_memo: tuple[dict, dict, str] | None = None
 
     async def execute_blueprint_stream(
         self,
@@ -72,15 +78,27 @@ class ExecutorAgent:
             MESSAGE, COMPLETE, ERROR).
         """
         ctx = context or {}
+        # Spans are detached (not made current): this generator yields
+        # while they are open.
+        with detached_span("executor.blueprint", {"blueprint.id": blueprint.id}) as run_span:
+            async for event in self._execute_phases(blueprint, ctx, run_span):
+                yield event
 
+    async def _execute_phases(
+        self,
+        blueprint: Blueprint,
+        ctx: dict[str, Any],
+        run_span: Span,
+    ) -> AsyncGenerator[dict[str, Any], None]:
         try:
             # ── Phase A: Resolve Data Contract ──
             yield {"type": "PHASE", "phase": "data", "message": "Fetching data..."}
             data_context: dict[str, Any] = {}
-            async for event in self._resolve_data_contract(
-                blueprint, ctx, data_context
-            ):
-                yield event
+            with detached_span("executor.phase.data", parent=run_span):
+                async for event in self._resolve_data_contract(
+                    blueprint, ctx, data_context
+                ):
+                    yield event
 
             # ── Phase B: Execute Compute Graph ──
             yield {
@@ -89,10 +107,11 @@ class ExecutorAgent:
                 "message": "Computing analytics...",
             }
             compute_results: dict[str, Any] = {}
-            async for event in self._execute_compute_graph(
-                blueprint, ctx, data_context, compute_results
-            ):
-                yield event
+            with detached_span("executor.phase.compute", parent=run_span):
+                async for event in self._execute_compute_graph(
+                    blueprint, ctx, data_context, compute_results
+                ):
+                    yield event
 
             # ── Phase C: AI Compose ──
             yield {
@@ -108,17 +127,18 @@ class ExecutorAgent:
                 "compute": compute_results,
             }
 
-            # Build deterministic page structure
-            page = self._build_page(blueprint, all_contexts)
+            with detached_span("executor.phase.compose", parent=run_span):
+                # Build deterministic page structure
+                page = self._build_page(blueprint, all_contexts)
 
-            # Stream AI content with BLOCK_START/SLOT_DELTA/BLOCK_COMPLETE
-            all_ai_texts: list[str] = []
-            async for event in self._stream_ai_content(
-                page, blueprint, data_context, compute_results
-            ):
-                yield event
-                if event.get("type") == "SLOT_DELTA":
-                    all_ai_texts.append(event.get("deltaText", ""))
+                # Stream AI content with BLOCK_START/SLOT_DELTA/BLOCK_COMPLETE
+                all_ai_texts: list[str] = []
+                async for event in self._stream_ai_content(
+                    page, blueprint, data_context, compute_results
+                ):
+                    yield event
+                    if event.get("type") == "SLOT_DELTA":
+                        all_ai_texts.append(event.get("deltaText", ""))
 
             combined_ai_text = "\n\n".join(all_ai_texts) if all_ai_texts else ""
 
@@ -136,6 +156,7 @@ class ExecutorAgent:
 
         except DataFetchError as exc:
             logger.warning("Data fetch error: %s", exc)
+            run_span.set_attribute("executor.outcome", "data_error")
             yield {
                 "type": "COMPLETE",
                 "message": "error",
@@ -151,6 +172,8 @@ class ExecutorAgent:
             }
         except Exception as exc:
             logger.exception("Blueprint execution failed")
+            run_span.record_exception(exc)
+            run_span.set_attribute("executor.outcome", "error")
             yield {
                 "type": "COMPLETE",
                 "message": "error",
@@ -381,8 +404,12 @@ class ExecutorAgent:
         if slot.component_type.value == "question_generator":
             return await self._generate_quiz_content(slot, blueprint)
 
-        prompt, output_format = build_block_prompt(
-            slot, blueprint, data_context, compute_results
+        layout, output_format = build_block_prompt_layout(
+            slot,
+            blueprint,
+            data_context,
+            compute_results,
+            data_summary=self._get_data_summary(data_context, compute_results),
         )
 
         agent = Agent(
@@ -392,7 +419,12 @@ class ExecutorAgent:
             defer_model_check=True,
         )
 
-        result = await agent.run(prompt)
+        result = await agent.run(layout.render())
+        record_cache_usage(
+            result.usage() if hasattr(result, "usage") else None,
+            source="executor_block",
+            fingerprint=layout.fingerprint(),
+        )
         raw_output = str(result.output)
 
         if output_format == "json":
@@ -400,6 +432,23 @@ class ExecutorAgent:
 
         return raw_output
 
+    def _get_data_summary(
+        self,
+        data_context: dict[str, Any],
+        compute_results: dict[str, Any],
+    ) -> str:
+        """Summarize build data once and share it across all AI blocks.
+
+        Memoized on the identity of the build's context dicts, which are
+        complete (and no longer mutated) by the time Phase C runs.
+        """
+        memo = self._data_summary_memo
+        if memo and memo[0] is data_context and memo[1] is compute_results:
+            return memo[2]
+        summary = build_data_summary(data_context, compute_results)
+        self._data_summary_memo = (data_context, compute_results, summary)
+        return summary
+
     async def _generate_quiz_content(
         self,
         slot: ComponentSlot,
@@ -29,7 +29,10 @@ from config.prompts.block_schemas import BLOCK_SCHEMA_PROMPT
 from config.prompts.native_agent import SYSTEM_PROMPT
 from config.settings import get_settings
 from services.metrics import get_metrics_collector
+from services.prompt_budget import PromptBudgetPlan, plan_prompt_budget
+from services.prompt_layout import PromptLayout, record_cache_usage
 from services.tool_tracker import ToolTracker
+from services.tracing import current_span, span
 from tools.registry import (
     ALL_TOOLSETS,
     ALWAYS_TOOLSETS,
@@ -182,14 +185,9 @@ async def select_toolsets(
     try:
         from agents.toolset_planner import plan_toolsets
 
-        # Include recent context so the planner sees the original intent
-        planner_message = message
-        if recent_context:
-            planner_message = f"{message}\n[Previous context: {recent_context}]"
-
         planner_result = await asyncio.wait_for(
             plan_toolsets(
-                planner_message,
+                _planner_message(message, recent_context),
                 has_artifacts=deps.has_artifacts,
                 has_class_id=bool(deps.class_id),
             ),
@@ -197,16 +195,7 @@ async def select_toolsets(
         )
 
         if planner_result.confidence >= settings.toolset_planner_confidence_threshold:
-            sets = list(ALWAYS_TOOLSETS) + list(planner_result.toolsets)
-            # Hard constraints — planner may omit these, enforce in code.
-            # Keyword safety-net: even when planner is confident, keyword
-            # signals override omissions (false positives are cheap).
-            if (deps.has_artifacts or _might_modify(message)) and TOOLSET_ARTIFACT_OPS not in sets:
-                sets.append(TOOLSET_ARTIFACT_OPS)
-            if (deps.class_id or _might_analyze(message)) and TOOLSET_ANALYSIS not in sets:
-                sets.append(TOOLSET_ANALYSIS)
-            if _might_generate(message) and TOOLSET_GENERATION not in sets:
-                sets.append(TOOLSET_GENERATION)
+            sets = _merge_planner_result(planner_result.toolsets, message, deps)
             _log_toolset_selection(
                 deps, message, sets,
                 source="planner",
@@ -215,6 +204,7 @@ async def select_toolsets(
             return sets
 
         # Low confidence — fall back to keywords
+        get_metrics_collector().increment("toolset_planner", "low_confidence")
         keyword_sets = _select_toolsets_keyword(message, deps, recent_context)
         _log_toolset_selection(
             deps, message, keyword_sets,
@@ -224,6 +214,10 @@ async def select_toolsets(
         return keyword_sets
 
     except Exception as exc:
+        get_metrics_collector().increment(
+            "toolset_planner",
+            "timeout" if isinstance(exc, asyncio.TimeoutError) else "error",
+        )
         keyword_sets = _select_toolsets_keyword(message, deps, recent_context)
         _log_toolset_selection(
             deps, message, keyword_sets,
@@ -233,6 +227,125 @@ async def select_toolsets(
         return keyword_sets
 
 
+def _planner_message(message: str, recent_context: str) -> str:
+    # Include recent context so the planner sees the original intent
+    if recent_context:
+        return f"{message}\n[Previous context: {recent_context}]"
+    return message
+
+
+def _merge_planner_result(
+    planner_toolsets: Sequence[str],
+    message: str,
+    deps: AgentDeps,
+) -> list[str]:
+    """Combine a confident planner result with the hard constraints."""
+    sets = list(ALWAYS_TOOLSETS) + list(planner_toolsets)
+    # Hard constraints — planner may omit these, enforce in code.
+    # Keyword safety-net: even when planner is confident, keyword
+    # signals override omissions (false positives are cheap).
+    if (deps.has_artifacts or _might_modify(message)) and TOOLSET_ARTIFACT_OPS not in sets:
+        sets.append(TOOLSET_ARTIFACT_OPS)
+    if (deps.class_id or _might_analyze(message)) and TOOLSET_ANALYSIS not in sets:
+        sets.append(TOOLSET_ANALYSIS)
+    if _might_generate(message) and TOOLSET_GENERATION not in sets:
+        sets.append(TOOLSET_GENERATION)
+    return sets
+
+
+# ── Speculative selection ───────────────────────────────────
+
+
+@dataclass
+class ToolsetSelection:
+    """Mutable per-turn toolset selection.
+
+    In speculative mode the agent starts with the keyword selection and
+    exposes tools through a filter that reads ``toolsets`` on every model
+    request, so a planner result promoted mid-turn takes effect from the
+    next request on.
+    """
+
+    toolsets: list[str]
+    source: str = "keyword"
+
+    def promote(self, toolsets: Sequence[str]) -> list[str]:
+        """Add *toolsets* not yet selected; return the newly added names."""
+        added = [ts for ts in toolsets if ts not in self.toolsets]
+        self.toolsets.extend(added)
+        return added
+
+
+# Strong refs so background planner tasks are not garbage-collected mid-flight.
+_background_tasks: set[asyncio.Task] = set()
+
+
+def start_speculative_selection(
+    message: str,
+    deps: AgentDeps,
+    message_history: Sequence[ModelMessage] | None = None,
+) -> tuple[ToolsetSelection, asyncio.Task | None]:
+    """Select keyword toolsets now and run the LLM planner in the background.
+
+    The planner result is promoted into the returned selection only when it
+    differs materially — i.e. adds a toolset the keywords missed.  Removals
+    are ignored (false positives are cheap).  The background task also warms
+    the planner cache for later turns.
+    """
+    recent_context = _extract_recent_user_text(message_history)
+    selection = ToolsetSelection(
+        toolsets=_select_toolsets_keyword(message, deps, recent_context),
+        source="speculative_keyword",
+    )
+    _log_toolset_selection(deps, message, list(selection.toolsets), source=selection.source)
+
+    settings = get_settings()
+    if not settings.toolset_planner_enabled:
+        return selection, None
+
+    async def _plan_and_promote() -> None:
+        from agents.toolset_planner import plan_toolsets
+
+        metrics = get_metrics_collector()
+        try:
+            planner_result = await asyncio.wait_for(
+                plan_toolsets(
+                    _planner_message(message, recent_context),
+                    has_artifacts=deps.has_artifacts,
+                    has_class_id=bool(deps.class_id),
+                ),
+                timeout=settings.toolset_planner_speculative_timeout_s,
+            )
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            metrics.increment("toolset_planner", "error")
+            logger.debug("Speculative toolset planner failed: %s", exc)
+            return
+
+        if planner_result.confidence < settings.toolset_planner_confidence_threshold:
+            metrics.increment("toolset_planner", "low_confidence")
+            return
+        added = selection.promote(
+            _merge_planner_result(planner_result.toolsets, message, deps)
+        )
+        if added:
+            selection.source = "planner_promoted"
+            metrics.increment("toolset_planner", "override")
+            _log_toolset_selection(
+                deps, message, list(selection.toolsets),
+                source=selection.source,
+                confidence=planner_result.confidence,
+            )
+        else:
+            metrics.increment("toolset_planner", "agree")
+
+    task = asyncio.create_task(_plan_and_promote())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+    return selection, task
+
+
 def _might_generate(message: str) -> bool:
     return any(kw in message for kw in _GENERATE_KEYWORDS)
 
@@ -274,28 +387,66 @@ class NativeAgent:
         toolsets: list[str],
         deps: AgentDeps,
         tracker: ToolTracker | None = None,
+        prompt_layout: PromptLayout | None = None,
+        selection: ToolsetSelection | None = None,
     ) -> Agent[AgentDeps, str]:
         """Create a PydanticAI Agent with selected toolset for this turn.
 
         When *tracker* is provided, each tool function is wrapped with
         ``tracker.wrap()`` so the tracker can emit running/done/error and
         stream-item events that the SSE layer converts to ``data-*`` events.
+
+        Tool descriptions are chosen by the prompt budget: full docstrings
+        by default, compact variants when system prompt + schemas would
+        exceed ``PROMPT_TOKEN_BUDGET``.
+
+        When a speculative *selection* is given, every registered tool is
+        attached behind a filter that exposes only ``selection.toolsets``,
+        re-evaluated on each model request so planner promotions apply
+        mid-turn.
         """
+        # Build system prompt with optional context injection
+        if prompt_layout is None:
+            prompt_layout = self._build_prompt_layout(deps.context)
+        system_prompt = prompt_layout.render()
+
+        settings = get_settings()
+        if selection is not None:
+            # Speculative mode: attach all tools, filter per request.  Any
+            # toolset may be promoted mid-turn, so budget the descriptions
+            # as if all of them were exposed.
+            toolsets = list(ALL_TOOLSETS)
+        raw_tools = get_tools_raw(toolsets)
+        budget_plan = plan_prompt_budget(
+            raw_tools,
+            system_prompt,
+            settings.prompt_token_budget,
+            mode=settings.prompt_tool_description_mode,
+        )
+        _log_prompt_budget(deps, budget_plan)
+
         if tracker is not None:
             from pydantic_ai import Tool
             from pydantic_ai.toolsets import FunctionToolset
 
-            raw_tools = get_tools_raw(toolsets)
             wrapped = [
-                Tool(tracker.wrap(rt.func), name=rt.name, max_retries=2)
+                Tool(
+                    tracker.wrap(rt.func),
+                    name=rt.name,
+                    description=budget_plan.descriptions.get(rt.name),
+                    max_retries=2,
+                )
                 for rt in raw_tools
             ]
             toolset = FunctionToolset(wrapped)
         else:
-            toolset = get_tools(toolsets)
+            toolset = get_tools(toolsets, descriptions=budget_plan.descriptions)
 
-        # Build system prompt with optional context injection
-        system_prompt = self._build_system_prompt(deps.context)
+        if selection is not None:
+            tool_toolsets = {rt.name: rt.toolset for rt in raw_tools}
+            toolset = toolset.filtered(
+                lambda _ctx, tool_def: tool_toolsets.get(tool_def.name) in selection.toolsets
+            )
 
         model = create_model(self._model_name)
 
@@ -305,7 +456,7 @@ class NativeAgent:
         # Other providers (OpenAI, Gemini, etc.) work fine with defaults
         # and would reject the extra_body parameter.
         settings_kwargs: dict[str, Any] = {"max_tokens": 8192}
-        resolved_name = self._model_name or get_settings().default_model
+        resolved_name = self._model_name or settings.default_model
         if resolved_name.startswith("dashscope/") or resolved_name.startswith("qwen"):
             settings_kwargs["temperature"] = 0.3
             settings_kwargs["extra_body"] = {"enable_thinking": False}
@@ -328,42 +479,74 @@ class NativeAgent:
         Returns:
             System prompt string with injected context
         """
-        prompt = SYSTEM_PROMPT
-
-        # Inject resolved entities from blueprint execution
-        if "resolved_entities" in context:
-            resolved_entities = context["resolved_entities"]
-            if resolved_entities:
-                entity_lines = []
-                for key, entity in resolved_entities.items():
-                    entity_lines.append(f"- {key} = {entity['id']} ({entity['displayName']})")
-
-                prompt += "\n\n## 当前上下文实体\n"
-                prompt += "\n".join(entity_lines)
-                prompt += "\n调用工具时请使用上述 ID。"
-
-        # Inject output hints from blueprint
-        if "blueprint_hints" in context:
-            hints = context["blueprint_hints"]
-            if hints and hints.get("expectedArtifacts"):
-                artifacts = hints["expectedArtifacts"]
-
-                # If "report" in artifacts, inject tab structure + block schemas
-                if "report" in artifacts and hints.get("tabs"):
-                    tabs = hints["tabs"]
-                    prompt += "\n\n## 输出结构要求 (Blueprint 报告模式)\n"
-                    prompt += "这是一个 Blueprint 模板执行，你正在生成一份**专业分析报告**。\n"
-                    prompt += "请按以下 tab 结构组织输出，每个 tab 用 `## [TAB:{key}] {label}` 标记开头:\n\n"
-                    for tab in tabs:
-                        desc = tab.get("description", "")
-                        prompt += f"### {tab['label']} (key: {tab['key']})\n{desc}\n\n"
-
-                    # Inject block schemas — LLM uses ```block:type fences
-                    prompt += BLOCK_SCHEMA_PROMPT
-
-                    prompt += "\n根据实际数据灵活调整，如数据不支持某个 tab 可跳过。"
-
-        return prompt
+        return self._build_prompt_layout(context).render()
+
+    def _build_prompt_layout(self, context: dict[str, Any]) -> PromptLayout:
+        """Assemble the system prompt static-first for provider prompt caching.
+
+        Static segments (base prompt, report-mode rules, block schemas) form a
+        byte-identical prefix across turns; per-turn context (resolved
+        entities, blueprint tabs) is appended after them.
+        """
+        layout = PromptLayout()
+        layout.static("base", SYSTEM_PROMPT)
+
+        # Output hints from blueprint — report mode adds static rules +
+        # block schemas; only the tab list itself is per-turn.
+        hints = context.get("blueprint_hints") or {}
+        artifacts = hints.get("expectedArtifacts") or []
+        if "report" in artifacts and hints.get("tabs"):
+            layout.static(
+                "report_rules",
+                "## 输出结构要求 (Blueprint 报告模式)\n"
+                "这是一个 Blueprint 模板执行，你正在生成一份**专业分析报告**。\n"
+                "请按文末「报告 Tab 结构」组织输出，每个 tab 用 `## [TAB:{key}] {label}` 标记开头。\n"
+                "根据实际数据灵活调整，如数据不支持某个 tab 可跳过。",
+            )
+            # Block schemas — LLM uses ```block:type fences
+            layout.static("block_schemas", BLOCK_SCHEMA_PROMPT)
+
+        # Resolved entities from blueprint execution
+        resolved_entities = context.get("resolved_entities")
+        if resolved_entities:
+            entity_lines = [
+                f"- {key} = {entity['id']} ({entity['displayName']})"
+                for key, entity in resolved_entities.items()
+            ]
+            layout.dynamic(
+                "resolved_entities",
+                "## 当前上下文实体\n"
+                + "\n".join(entity_lines)
+                + "\n调用工具时请使用上述 ID。",
+            )
+
+        if "report" in artifacts and hints.get("tabs"):
+            tab_lines = ["## 报告 Tab 结构"]
+            for tab in hints["tabs"]:
+                desc = tab.get("description", "")
+                tab_lines.append(f"### {tab['label']} (key: {tab['key']})\n{desc}")
+            layout.dynamic("report_tabs", "\n\n".join(tab_lines))
+
+        return layout
+
+    async def _select(
+        self,
+        message: str,
+        deps: AgentDeps,
+        message_history: Sequence[ModelMessage] | None,
+    ) -> tuple[list[str], ToolsetSelection | None]:
+        """Pick toolsets for this turn.
+
+        Speculative mode returns the keyword selection immediately (planner
+        running in the background); otherwise awaits ``select_toolsets``.
+        """
+        settings = get_settings()
+        speculative = settings.toolset_planner_enabled and settings.toolset_planner_speculative
+        with span("agent.select_toolsets", {"toolsets.speculative": speculative}):
+            if speculative:
+                selection, _task = start_speculative_selection(message, deps, message_history)
+                return list(selection.toolsets), selection
+            return await select_toolsets(message, deps, message_history), None
 
     async def run_stream(
         self,
@@ -387,24 +570,31 @@ class NativeAgent:
                          *message*.  *message* is still used for toolset
                          selection and logging.
         """
-        selected = await select_toolsets(message, deps, message_history)
         if not deps.turn_id:
             deps.turn_id = f"turn-{uuid.uuid4().hex[:10]}"
-        agent = self._create_agent(selected, deps, tracker=tracker)
+        with span("agent.turn", self._span_attributes(deps, streaming=True)) as turn_span:
+            selected, selection = await self._select(message, deps, message_history)
+            layout = self._build_prompt_layout(deps.context)
+            agent = self._create_agent(
+                selected, deps, tracker=tracker, prompt_layout=layout, selection=selection,
+            )
 
-        _log_turn_start(deps, message, selected)
-        start_time = time.monotonic()
+            _log_turn_start(deps, message, selected)
+            start_time = time.monotonic()
 
-        async with agent.run_stream(
-            user_prompt or message,
-            deps=deps,
-            message_history=list(message_history) if message_history else None,
-            usage_limits=UsageLimits(request_limit=MAX_TOOL_CALLS),
-        ) as stream:
-            yield stream
+            async with agent.run_stream(
+                user_prompt or message,
+                deps=deps,
+                message_history=list(message_history) if message_history else None,
+                usage_limits=UsageLimits(request_limit=MAX_TOOL_CALLS),
+            ) as stream:
+                yield stream
 
-        elapsed_ms = (time.monotonic() - start_time) * 1000
-        _log_turn_end(deps, stream, elapsed_ms, selected)
+            elapsed_ms = (time.monotonic() - start_time) * 1000
+            _log_turn_end(deps, stream, elapsed_ms, selection.toolsets if selection else selected)
+            usage = stream.usage()
+            record_cache_usage(usage, source="native_agent", fingerprint=layout.fingerprint())
+            _set_usage_attributes(turn_span, usage)
 
     async def run(
         self,
@@ -420,24 +610,48 @@ class NativeAgent:
                          When provided, this is sent to the LLM instead of
                          *message*.
         """
-        selected = await select_toolsets(message, deps, message_history)
         if not deps.turn_id:
             deps.turn_id = f"turn-{uuid.uuid4().hex[:10]}"
-        agent = self._create_agent(selected, deps)
-
-        _log_turn_start(deps, message, selected)
-        start_time = time.monotonic()
+        with span("agent.turn", self._span_attributes(deps, streaming=False)) as turn_span:
+            selected, selection = await self._select(message, deps, message_history)
+            layout = self._build_prompt_layout(deps.context)
+            agent = self._create_agent(selected, deps, prompt_layout=layout, selection=selection)
+
+            _log_turn_start(deps, message, selected)
+            start_time = time.monotonic()
+
+            result = await agent.run(
+                user_prompt or message,
+                deps=deps,
+                message_history=list(message_history) if message_history else None,
+                usage_limits=UsageLimits(request_limit=MAX_TOOL_CALLS),
+            )
 
-        result = await agent.run(
-            user_prompt or message,
-            deps=deps,
-            message_history=list(message_history) if message_history else None,
-            usage_limits=UsageLimits(request_limit=MAX_TOOL_CALLS),
-        )
-
-        elapsed_ms = (time.monotonic() - start_time) * 1000
-        _log_turn_end_sync(deps, result, elapsed_ms, selected)
-        return result
+            elapsed_ms = (time.monotonic() - start_time) * 1000
+            _log_turn_end_sync(deps, result, elapsed_ms, selection.toolsets if selection else selected)
+            usage = result.usage() if hasattr(result, "usage") else None
+            record_cache_usage(usage, source="native_agent", fingerprint=layout.fingerprint())
+            _set_usage_attributes(turn_span, usage)
+            return result
+
+    def _span_attributes(self, deps: AgentDeps, *, streaming: bool) -> dict[str, Any]:
+        return {
+            "turn.id": deps.turn_id,
+            "conversation.id": deps.conversation_id,
+            "teacher.id": deps.teacher_id,
+            "agent.model": self._model_name or get_settings().default_model,
+            "agent.streaming": streaming,
+        }
+
+
+def _set_usage_attributes(turn_span: Any, usage: Any) -> None:
+    if usage is None:
+        return
+    turn_span.set_attributes({
+        "llm.requests": getattr(usage, "requests", 0) or 0,
+        "llm.input_tokens": getattr(usage, "input_tokens", 0) or 0,
+        "llm.output_tokens": getattr(usage, "output_tokens", 0) or 0,
+    })
 
 
 # ── Structured Logging (Step 1.5) ───────────────────────────
@@ -453,6 +667,11 @@ def _log_toolset_selection(
     error: str = "",
 ) -> None:
     """Emit structured JSON log for toolset selection decision."""
+    current_span().set_attributes({
+        "toolsets.source": source,
+        "toolsets.selected": toolsets,
+        "toolsets.confidence": confidence,
+    })
     logger.info(json.dumps({
         "event": "toolset_selection",
         "conversation_id": deps.conversation_id,
@@ -466,6 +685,17 @@ def _log_toolset_selection(
     }, ensure_ascii=False))
 
 
+def _log_prompt_budget(deps: AgentDeps, plan: PromptBudgetPlan) -> None:
+    """Emit structured JSON log with per-toolset prompt token estimates."""
+    log = logger.warning if plan.over_budget else logger.info
+    log(json.dumps({
+        "event": "prompt_budget",
+        "conversation_id": deps.conversation_id,
+        "turn_id": deps.turn_id,
+        **plan.report(),
+    }, ensure_ascii=False))
+
+
 def _log_turn_start(deps: AgentDeps, message: str, toolsets: list[str]) -> None:
     """Emit structured JSON log at turn start."""
     logger.info(json.dumps({
@@ -499,6 +729,7 @@ def _log_turn_end(
         "total_latency_ms": round(elapsed_ms, 1),
         "token_usage_input": getattr(usage, "request_tokens", None),
         "token_usage_output": getattr(usage, "response_tokens", None),
+        "token_usage_cached": getattr(usage, "cache_read_tokens", None),
     }, ensure_ascii=False))
 
 
@@ -523,4 +754,5 @@ def _log_turn_end_sync(
         "total_latency_ms": round(elapsed_ms, 1),
         "token_usage_input": getattr(usage, "request_tokens", None) if usage else None,
         "token_usage_output": getattr(usage, "response_tokens", None) if usage else None,
+        "token_usage_cached": getattr(usage, "cache_read_tokens", None) if usage else None,
     }, ensure_ascii=False))
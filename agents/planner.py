@@ -30,15 +30,28 @@ PLANNER_LLM_CONFIG = LLMConfig(
     response_format="json_object",
 )
 
-# Module-level agent — reused across requests.
+
+def _build_planner_agent() -> Agent[None, Blueprint]:
+    return Agent(
+        model=create_model(),
+        output_type=Blueprint,
+        system_prompt=build_planner_prompt(),
+        retries=2,
+        defer_model_check=True,
+    )
+
+
+# Lazy singleton — reused across requests, built on first use so importing
+# this module (via api.workflow) stays cheap at worker boot.
 # The model can be overridden per-run via generate_blueprint(model=...).
-_planner_agent = Agent(
-    model=create_model(),
-    output_type=Blueprint,
-    system_prompt=build_planner_prompt(),
-    retries=2,
-    defer_model_check=True,
-)
+_planner_agent: Agent[None, Blueprint] | None = None
+
+
+def _get_planner_agent() -> Agent[None, Blueprint]:
+    global _planner_agent
+    if _planner_agent is None:
+        _planner_agent = _build_planner_agent()
+    return _planner_agent
 
 
 async def generate_blueprint(
@@ -82,7 +95,7 @@ async def generate_blueprint(
     logger.info("Generating blueprint for prompt: %s", user_prompt[:80])
 
     try:
-        result = await _planner_agent.run(run_prompt, **kwargs)
+        result = await _get_planner_agent().run(run_prompt, **kwargs)
         blueprint = result.output
     except Exception:
         logger.exception("Planner structured output failed, using fallback blueprint")
@@ -104,6 +117,14 @@ async def generate_blueprint(
     return blueprint, model_name
 
 
+_FALLBACK_ID_PREFIX = "bp-fallback-"
+
+
+def is_fallback_blueprint(blueprint: Blueprint) -> bool:
+    """True for the canned blueprint used when structured generation failed."""
+    return blueprint.id.startswith(_FALLBACK_ID_PREFIX)
+
+
 def _build_fallback_blueprint(user_prompt: str, language: str) -> Blueprint:
     """Build a minimal valid Blueprint when structured generation fails."""
     prompt = (user_prompt or "").strip()
@@ -131,7 +152,7 @@ def _build_fallback_blueprint(user_prompt: str, language: str) -> Blueprint:
             else "You are an English teaching assistant. Generate clear, medium-difficulty questions with answer explanations."
         )
         return Blueprint(
-            id=f"bp-fallback-{slug}",
+            id=f"{_FALLBACK_ID_PREFIX}{slug}",
             name=name,
             description=desc,
             icon="quiz",
@@ -177,7 +198,7 @@ def _build_fallback_blueprint(user_prompt: str, language: str) -> Blueprint:
         else "You are an educational analysis assistant. Provide concise and actionable insights based on available information."
     )
     return Blueprint(
-        id=f"bp-fallback-{slug}",
+        id=f"{_FALLBACK_ID_PREFIX}{slug}",
         name=name,
         description="Fallback blueprint",
         source_prompt=user_prompt,
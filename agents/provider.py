@@ -130,6 +130,7 @@ def create_model(model_name: str | None = None):
     - ``anthropic/*`` → native :class:`AnthropicModel` (supports tool-use, streaming)
     - ``dashscope/*``, ``zai/*`` → :class:`OpenAIChatModel` via OpenAI-compatible endpoint
     - ``openai/*`` or bare name → :class:`OpenAIChatModel` with OpenAI API
+    - any name, when ``llm_mock_base_url`` is set → the load-test mock
 
     Args:
         model_name: Model identifier in ``"provider/model"`` format.
@@ -141,6 +142,12 @@ def create_model(model_name: str | None = None):
     settings = get_settings()
     name = model_name or settings.default_model
 
+    # ── Load-test stand-in — every provider goes to the mock ──
+    if settings.llm_mock_base_url:
+        model_id = name.split("/", 1)[1] if "/" in name else name
+        provider = OpenAIProvider(api_key="mock", base_url=settings.llm_mock_base_url)
+        return OpenAIChatModel(model_id, provider=provider)
+
     # Split "provider/model" → lookup
     if "/" in name:
         prefix, model_id = name.split("/", 1)
@@ -3,11 +3,16 @@
 Uses a fast LLM call to decide which optional toolsets (analysis, generation,
 artifact_ops) should be available for the current turn.  Falls back to keyword
 matching on timeout, low confidence, or any error.
+
+Planner results are cached per worker, keyed by the normalized message plus
+conversation state, so repeated phrasings ("再出5道", "生成PPT") skip the LLM.
 """
 
 from __future__ import annotations
 
 import logging
+import re
+import unicodedata
 from typing import Literal
 
 from pydantic import BaseModel, Field
@@ -15,6 +20,9 @@ from pydantic_ai import Agent
 from pydantic_ai.settings import ModelSettings
 
 from agents.provider import create_model, get_model_for_tier
+from config.settings import get_settings
+from services.metrics import get_metrics_collector
+from services.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -88,6 +96,42 @@ def _get_planner_agent() -> Agent[None, ToolsetPlannerResult]:
     return _planner_agent
 
 
+# ── Result cache ───────────────────────────────────────────
+
+_TRAILING_PUNCT = re.compile(r"[\s。！？!?.,，~～…]+$")
+_WHITESPACE = re.compile(r"\s+")
+
+_plan_cache: TTLCache[tuple[str, bool, bool], ToolsetPlannerResult] | None = None
+
+
+def _get_plan_cache() -> TTLCache[tuple[str, bool, bool], ToolsetPlannerResult]:
+    global _plan_cache
+    if _plan_cache is None:
+        settings = get_settings()
+        _plan_cache = TTLCache(
+            max_size=settings.toolset_planner_cache_size,
+            ttl_seconds=settings.toolset_planner_cache_ttl_s,
+        )
+    return _plan_cache
+
+
+def normalize_planner_message(message: str) -> str:
+    """Normalize *message* for cache keys: NFKC, casefold, collapse whitespace."""
+    text = unicodedata.normalize("NFKC", message).casefold()
+    text = _WHITESPACE.sub(" ", text).strip()
+    return _TRAILING_PUNCT.sub("", text)
+
+
+def _cache_key(message: str, has_artifacts: bool, has_class_id: bool) -> tuple[str, bool, bool]:
+    return (normalize_planner_message(message), has_artifacts, has_class_id)
+
+
+def clear_plan_cache() -> None:
+    """Drop all cached planner results (tests / config reload)."""
+    global _plan_cache
+    _plan_cache = None
+
+
 # ── Public API ─────────────────────────────────────────────
 
 
@@ -107,6 +151,15 @@ async def plan_toolsets(
     Returns:
         ``ToolsetPlannerResult`` with selected toolsets and confidence.
     """
+    metrics = get_metrics_collector()
+    cache = _get_plan_cache()
+    key = _cache_key(message, has_artifacts, has_class_id)
+    cached = cache.get(key)
+    if cached is not None:
+        metrics.increment("toolset_planner", "cache_hit")
+        return cached
+    metrics.increment("toolset_planner", "cache_miss")
+
     user_prompt = (
         f"Message: {message}\n"
         f"has_artifacts: {has_artifacts}\n"
@@ -118,4 +171,5 @@ async def plan_toolsets(
         user_prompt,
         model_settings=ModelSettings(temperature=0.0, max_tokens=256),
     )
+    cache.set(key, result.output)
     return result.output
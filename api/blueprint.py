@@ -5,25 +5,21 @@ Handles blueprint distillation requests with concurrency control.
 
 from __future__ import annotations
 
-import asyncio
 import logging
-from typing import Dict
 
 from fastapi import APIRouter, HTTPException
 from pydantic import Field
 
+from config.settings import get_settings
 from models.base import CamelModel
 from models.soft_blueprint import SoftBlueprint
 from services.blueprint_distiller import distill_conversation
+from services.concurrency import LimitExceeded, get_keyed_limiter
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/blueprint", tags=["Blueprint"])
 
-# Concurrency control — max 1 concurrent distillation per teacher
-_distill_semaphores: Dict[str, asyncio.Semaphore] = {}
-
-
 class DistillRequest(CamelModel):
     """Request to distill a conversation into a blueprint."""
 
@@ -37,33 +33,27 @@ async def distill_blueprint(req: DistillRequest) -> SoftBlueprint:
     """
     Distill a conversation into a Soft Blueprint.
 
-    Rate limit: 1 concurrent distillation per teacher.
+    Rate limit: ``distill_max_concurrent_per_teacher`` (default 1) concurrent
+    distillations per teacher, cluster-wide when ``keyed_limit_redis`` is on.
     """
     teacher_id = req.teacher_id
-
-    # Get or create semaphore for this teacher
-    if teacher_id not in _distill_semaphores:
-        _distill_semaphores[teacher_id] = asyncio.Semaphore(1)
-
-    sem = _distill_semaphores[teacher_id]
-
-    # Check-then-acquire is safe in asyncio: no preemption between locked()
-    # and async-with because there is no await in between.
-    if sem.locked():
+    limiter = get_keyed_limiter("distill", get_settings().distill_max_concurrent_per_teacher)
+
+    try:
+        async with limiter.hold(teacher_id):
+            try:
+                blueprint = await distill_conversation(
+                    teacher_id=teacher_id,
+                    conversation_id=req.conversation_id,
+                    language=req.language,
+                )
+                return blueprint
+            except ValueError as e:
+                logger.warning("Validation error in distillation: %s", str(e))
+                raise HTTPException(status_code=400, detail=str(e))
+            except RuntimeError as e:
+                logger.error("Distillation runtime error: %s", str(e))
+                raise HTTPException(status_code=500, detail=str(e))
+    except LimitExceeded:
         logger.warning("Distillation already in progress for teacher %s", teacher_id)
         raise HTTPException(status_code=429, detail="已有蒸馏任务进行中，请稍后再试")
-
-    async with sem:
-        try:
-            blueprint = await distill_conversation(
-                teacher_id=teacher_id,
-                conversation_id=req.conversation_id,
-                language=req.language,
-            )
-            return blueprint
-        except ValueError as e:
-            logger.warning("Validation error in distillation: %s", str(e))
-            raise HTTPException(status_code=400, detail=str(e))
-        except RuntimeError as e:
-            logger.error("Distillation runtime error: %s", str(e))
-            raise HTTPException(status_code=500, detail=str(e))
@@ -16,7 +16,7 @@ import logging
 import uuid
 from typing import AsyncGenerator
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, Header, HTTPException
 from starlette.responses import StreamingResponse
 
 from models.conversation import ConversationRequest
@@ -32,6 +32,12 @@ from services.tool_tracker import ToolTracker, ToolEvent
 from agents.native_agent import AgentDeps, NativeAgent
 from services.stream_adapter import adapt_stream, extract_tool_calls_summary
 from services.artifact_store import get_artifact_store
+from services.generation_cache import GenerationJob
+from services.resumable_stream import (
+    follow_numbered,
+    format_event_id,
+    get_stream_registry,
+)
 from services.tool_summaries import summarize_tool_result
 
 logger = logging.getLogger(__name__)
@@ -151,14 +157,56 @@ def _normalize_teacher_id(raw: str | None) -> str:
     return value
 
 
+def _stream_headers(conversation_id: str, stream_id: str | None) -> dict[str, str]:
+    headers = {
+        "Cache-Control": "no-cache",
+        "Connection": "keep-alive",
+        "X-Conversation-Id": conversation_id,
+        "x-vercel-ai-ui-message-stream": "v1",
+    }
+    if stream_id:
+        headers["X-Stream-Id"] = stream_id
+    return headers
+
+
+async def _numbered_lines(
+    stream_id: str, job: GenerationJob, start: int = 0,
+) -> AsyncGenerator[str, None]:
+    """Follow a detached run, tagging each SSE chunk with ``id: stream:seq``."""
+    async for seq, line in follow_numbered(job, start):
+        yield f"id: {format_event_id(stream_id, seq)}\n{line}"
+
+
 @router.post("/conversation/stream")
-async def conversation_stream(req: ConversationRequest):
-    """SSE streaming endpoint — Data Stream Protocol."""
+async def conversation_stream(
+    req: ConversationRequest,
+    last_event_id: str | None = Header(default=None, alias="Last-Event-ID"),
+):
+    """SSE streaming endpoint — Data Stream Protocol.
+
+    The agent turn runs detached from the response (see
+    ``services/resumable_stream.py``): it completes and saves the session
+    even if the client disconnects, and a retry with ``Last-Event-ID``
+    resumes the same turn instead of starting another.
+    """
     teacher_id = _normalize_teacher_id(req.teacher_id)
     if not teacher_id:
         ctx_tid = (req.context or {}).get("teacherId", "")
         teacher_id = _normalize_teacher_id(ctx_tid)
 
+    registry = get_stream_registry()
+    if registry is not None:
+        resumed = registry.resume(
+            last_event_id, "conversation", owner=(teacher_id, req.conversation_id or ""),
+        )
+        if resumed is not None:
+            stream_id, job, start = resumed
+            return StreamingResponse(
+                _numbered_lines(stream_id, job, start),
+                media_type="text/event-stream",
+                headers=_stream_headers(req.conversation_id or "", stream_id),
+            )
+
     # Session management
     store = get_conversation_store()
     conversation_id = req.conversation_id or generate_conversation_id()
@@ -353,15 +401,19 @@ async def conversation_stream(req: ConversationRequest):
         )
         await store.save(session)
 
+    if registry is None:
+        stream_id = None
+        body = event_generator()
+    else:
+        stream_id, job = registry.launch(
+            "conversation", event_generator, owner=(teacher_id, conversation_id),
+        )
+        body = _numbered_lines(stream_id, job)
+
     return StreamingResponse(
-        event_generator(),
+        body,
         media_type="text/event-stream",
-        headers={
-            "Cache-Control": "no-cache",
-            "Connection": "keep-alive",
-            "X-Conversation-Id": conversation_id,
-            "x-vercel-ai-ui-message-stream": "v1",
-        },
+        headers=_stream_headers(conversation_id, stream_id),
     )
 
 
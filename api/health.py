@@ -1,6 +1,14 @@
-"""Health check endpoint."""
+"""Health check endpoints.
+
+``/api/health`` is liveness (the process answers); ``/api/health/ready`` is
+readiness — 503 until the lifespan is serving and every required warm-up
+component has finished (see ``services/startup.py``).
+"""
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from services.startup import readiness
 
 router = APIRouter()
 
@@ -8,3 +16,11 @@ router = APIRouter()
 @router.get("/api/health")
 async def health():
     return {"status": "healthy"}
+
+
+@router.get("/api/health/ready")
+async def health_ready():
+    ready, report = readiness()
+    if not ready:
+        return JSONResponse(status_code=503, content=report)
+    return report
@@ -2,14 +2,24 @@
 
 Called by Next.js API routes (e.g. /api/ai/iframe-image) to provide
 iframe-embedded interactive HTML with on-demand media generation.
+
+Video generation is asynchronous: ``POST /generate-video`` returns a task
+handle (202) and the result is followed via ``GET /tasks/{task_id}`` or the
+SSE stream ``GET /tasks/{task_id}/events`` (``data-media-task`` updates,
+then ``data-file-ready`` on success).
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
+from typing import Any, AsyncIterator
 
 from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel, Field
+from starlette.responses import StreamingResponse
+
+from services.datastream import DataStreamEncoder
 
 logger = logging.getLogger(__name__)
 
@@ -50,3 +60,99 @@ async def generate_image_endpoint(req: ImageGenerateRequest):
         prompt=result["prompt"],
         size=result["size"],
     )
+
+
+class VideoGenerateRequest(BaseModel):
+    prompt: str = Field(..., min_length=1, max_length=2000)
+    duration: int = Field(default=5)
+    aspect_ratio: str = Field(default="16:9")
+    image_url: str = Field(default="")
+
+
+_SSE_KEEPALIVE_S = 15.0
+
+
+def _get_task_or_404(task_id: str) -> Any:
+    from services.media_tasks import get_media_task_service
+
+    task = get_media_task_service().get(task_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Media task {task_id} not found")
+    return task
+
+
+@router.post("/generate-video", status_code=202)
+async def generate_video_endpoint(req: VideoGenerateRequest):
+    """Submit a Seedance video task and return its handle immediately."""
+    from tools.volcengine_media import start_video_generation
+
+    result = await start_video_generation(
+        prompt=req.prompt,
+        duration=req.duration,
+        aspect_ratio=req.aspect_ratio,
+        image_url=req.image_url,
+    )
+    if result.get("status") == "error":
+        raise HTTPException(status_code=502, detail=result.get("reason", "Video generation failed"))
+    return _get_task_or_404(result["task_id"]).to_dict()
+
+
+@router.get("/tasks/{task_id}")
+async def get_media_task(task_id: str):
+    """Current state of a media task (running / succeeded / failed)."""
+    return _get_task_or_404(task_id).to_dict()
+
+
+@router.get("/tasks/{task_id}/events")
+async def stream_media_task(task_id: str):
+    """SSE stream of a media task until it finishes (Data Stream Protocol)."""
+    from services.media_tasks import get_media_task_service
+
+    _get_task_or_404(task_id)
+    updates = get_media_task_service().subscribe(task_id)
+
+    async def event_generator() -> AsyncIterator[str]:
+        enc = DataStreamEncoder()
+        yield enc.start()
+        try:
+            pending = asyncio.ensure_future(updates.__anext__())
+            while True:
+                done, _ = await asyncio.wait({pending}, timeout=_SSE_KEEPALIVE_S)
+                if not done:
+                    yield ": keepalive\n\n"
+                    continue
+                try:
+                    task = pending.result()
+                except StopAsyncIteration:
+                    break
+                yield enc.data("media-task", task.to_dict(), id=f"media-{task_id}")
+                if task.done:
+                    video_url = task.result.get("video_url")
+                    if task.status == "succeeded" and video_url:
+                        yield enc.data("file-ready", {
+                            "type": task.kind,
+                            "url": video_url,
+                            "filename": f"generated_{task.kind}.mp4",
+                            "preview": {"thumbnailUrl": None},
+                        })
+                    break
+                pending = asyncio.ensure_future(updates.__anext__())
+        finally:
+            if not pending.done():
+                pending.cancel()
+                try:
+                    await pending
+                except (asyncio.CancelledError, StopAsyncIteration):
+                    pass
+            await updates.aclose()
+        yield enc.finish()
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "x-vercel-ai-ui-message-stream": "v1",
+        },
+    )
@@ -6,11 +6,25 @@ import json
 import logging
 from typing import AsyncGenerator
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Header, Request
 from sse_starlette.sse import EventSourceResponse
 
 from agents.executor import ExecutorAgent
+from config.settings import get_settings
 from models.request import PageGenerateRequest, PagePatchRequest
+from services.generation_cache import (
+    GenerationFailed,
+    GenerationJob,
+    data_version,
+    generation_fingerprint,
+    get_generation_cache,
+)
+from services.resumable_stream import (
+    StreamRegistry,
+    follow_numbered,
+    format_event_id,
+    get_stream_registry,
+)
 
 _SSE_HEARTBEAT_INTERVAL = 15  # seconds
 
@@ -22,6 +36,10 @@ router = APIRouter(prefix="/api/page", tags=["page"])
 _executor = ExecutorAgent()
 
 
+def _no_cache(request: Request) -> bool:
+    return "no-cache" in request.headers.get("cache-control", "").lower()
+
+
 def _normalize_teacher_id(raw: str | None) -> str:
     """Normalize teacher_id from request/context to avoid null-like values."""
     if raw is None:
@@ -34,22 +52,97 @@ def _normalize_teacher_id(raw: str | None) -> str:
     return value
 
 
+def _page_completed(events: list) -> bool:
+    """Only successful pages are replayed; errors are retried for real."""
+    return bool(events) and events[-1].get("type") == "COMPLETE" and events[-1].get("message") == "completed"
+
+
+def _page_key(blueprint, context: dict) -> str:
+    teacher_id = context.get("teacherId", "")
+    return generation_fingerprint(
+        "page",
+        {"blueprint": blueprint.model_dump(mode="json"), "context": context},
+        teacher_id=teacher_id,
+        model=get_settings().executor_model,
+        version=data_version(teacher_id, context),
+    )
+
+
 async def _event_generator(
     blueprint,
     context: dict,
+    *,
+    bypass_cache: bool = False,
 ) -> AsyncGenerator[str, None]:
-    """Wrap ExecutorAgent stream into SSE-formatted JSON strings."""
-    async for event in _executor.execute_blueprint_stream(blueprint, context):
+    """Wrap ExecutorAgent stream into SSE-formatted JSON strings.
+
+    Identical submissions share one executor run (see
+    ``services/generation_cache.py``).
+    """
+    cache = get_generation_cache()
+    if cache is None:
+        events = _executor.execute_blueprint_stream(blueprint, context)
+    else:
+        events = cache.stream(
+            "page", _page_key(blueprint, context),
+            lambda: _executor.execute_blueprint_stream(blueprint, context),
+            cacheable=_page_completed,
+            bypass=bypass_cache,
+        )
+    async for event in events:
         yield json.dumps(event, ensure_ascii=False, default=str)
 
 
+def _start_resumable(
+    registry: StreamRegistry,
+    blueprint,
+    context: dict,
+    *,
+    bypass_cache: bool = False,
+) -> tuple[str, GenerationJob]:
+    """Start (or join) a detached page run and register it for resumption."""
+    def produce():
+        return _executor.execute_blueprint_stream(blueprint, context)
+
+    owner = (context.get("teacherId", ""),)
+    cache = get_generation_cache()
+    if cache is None:
+        return registry.launch("page", produce, owner=owner)
+    job = cache.start(
+        "page", _page_key(blueprint, context), produce,
+        cacheable=_page_completed, bypass=bypass_cache,
+    )
+    return registry.register("page", job, owner=owner), job
+
+
+async def _numbered_events(
+    stream_id: str, job: GenerationJob, start: int = 0,
+) -> AsyncGenerator[dict, None]:
+    """Follow a page run as SSE events with ``id: stream:seq``."""
+    async for seq, event in follow_numbered(job, start):
+        yield {
+            "id": format_event_id(stream_id, seq),
+            "data": json.dumps(event, ensure_ascii=False, default=str),
+        }
+    if job.status == "failed":
+        raise GenerationFailed(job.error)
+
+
 @router.post("/generate")
-async def page_generate(req: PageGenerateRequest):
+async def page_generate(
+    req: PageGenerateRequest,
+    request: Request,
+    last_event_id: str | None = Header(default=None, alias="Last-Event-ID"),
+):
     """Execute a Blueprint and stream the page via SSE.
 
     Receives a Blueprint (from PlannerAgent) and executes it through three
     phases: Data → Compute → Compose. Events are streamed as SSE to the
     client, ending with a COMPLETE event containing the full page JSON.
+    A duplicate of a running or recently completed request attaches to /
+    replays that run; send ``Cache-Control: no-cache`` to force a new one.
+    The run is detached from the connection: a retry with ``Last-Event-ID``
+    (returned as ``stream:seq`` event ids) resumes where the client left off.
     """
     context = req.context or {}
     req.teacher_id = _normalize_teacher_id(req.teacher_id)
@@ -58,16 +151,39 @@ async def page_generate(req: PageGenerateRequest):
     if teacher_id:
         context["teacherId"] = teacher_id
 
+    registry = get_stream_registry()
+    if registry is not None:
+        resumed = registry.resume(last_event_id, "page", owner=(teacher_id,))
+        if resumed is not None:
+            stream_id, job, start = resumed
+            return EventSourceResponse(
+                _numbered_events(stream_id, job, start),
+                media_type="text/event-stream",
+                ping=_SSE_HEARTBEAT_INTERVAL,
+                headers={"X-Stream-Id": stream_id},
+            )
+
     logger.info(
         "Generating page for blueprint: %s (id=%s)",
         req.blueprint.name,
         req.blueprint.id,
     )
 
+    if registry is None:
+        return EventSourceResponse(
+            _event_generator(req.blueprint, context, bypass_cache=_no_cache(request)),
+            media_type="text/event-stream",
+            ping=_SSE_HEARTBEAT_INTERVAL,
+        )
+
+    stream_id, job = _start_resumable(
+        registry, req.blueprint, context, bypass_cache=_no_cache(request),
+    )
     return EventSourceResponse(
-        _event_generator(req.blueprint, context),
+        _numbered_events(stream_id, job),
         media_type="text/event-stream",
         ping=_SSE_HEARTBEAT_INTERVAL,
+        headers={"X-Stream-Id": stream_id},
     )
 
 
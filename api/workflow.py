@@ -4,28 +4,75 @@ from __future__ import annotations
 
 import logging
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request
 
-from agents.planner import generate_blueprint
+from agents.planner import generate_blueprint, is_fallback_blueprint
+from config.settings import get_settings
+from models.blueprint import Blueprint
 from models.request import WorkflowGenerateRequest, WorkflowGenerateResponse
+from services.generation_cache import (
+    data_version,
+    generation_fingerprint,
+    get_generation_cache,
+)
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/workflow", tags=["workflow"])
 
 
+async def _plan(req: WorkflowGenerateRequest):
+    blueprint, model_name = await generate_blueprint(
+        user_prompt=req.user_prompt,
+        language=req.language,
+    )
+    yield {
+        "blueprint": blueprint.model_dump(mode="json", by_alias=True),
+        "model": model_name,
+        "fallback": is_fallback_blueprint(blueprint),
+    }
+
+
+def _plan_cacheable(events: list) -> bool:
+    """Replay real plans only — a fallback blueprint should be retried next time."""
+    return bool(events) and not events[-1].get("fallback")
+
+
 @router.post("/generate", response_model=WorkflowGenerateResponse)
-async def workflow_generate(req: WorkflowGenerateRequest):
+async def workflow_generate(req: WorkflowGenerateRequest, request: Request):
     """Generate a Blueprint from a natural-language prompt.
 
     Calls the PlannerAgent to convert the user's request into a structured
     Blueprint with three layers: DataContract, ComputeGraph, UIComposition.
+    Duplicate prompts share one planner run and are replayed for
+    ``generation_cache_ttl_s`` (``Cache-Control: no-cache`` forces a new one).
     """
+    cache = get_generation_cache()
     try:
-        blueprint, model_name = await generate_blueprint(
-            user_prompt=req.user_prompt,
-            language=req.language,
-        )
+        if cache is None:
+            blueprint, model_name = await generate_blueprint(
+                user_prompt=req.user_prompt,
+                language=req.language,
+            )
+        else:
+            context = req.context or {}
+            teacher_id = req.teacher_id or str(context.get("teacherId") or "")
+            key = generation_fingerprint(
+                "workflow",
+                {"prompt": req.user_prompt, "language": req.language, "context": context},
+                teacher_id=teacher_id,
+                model=get_settings().default_model,
+                version=data_version(teacher_id, context),
+            )
+            events = [
+                event async for event in cache.stream(
+                    "workflow", key, lambda: _plan(req),
+                    cacheable=_plan_cacheable,
+                    bypass="no-cache" in request.headers.get("cache-control", "").lower(),
+                )
+            ]
+            blueprint = Blueprint.model_validate(events[-1]["blueprint"])
+            model_name = events[-1]["model"]
     except Exception as e:
         logger.exception("Blueprint generation failed")
         raise HTTPException(
@@ -4,14 +4,19 @@ Each ai_content_slot gets a customized prompt based on its component_type:
 - markdown: narrative analysis prompt
 - suggestion_list: structured JSON suggestions prompt
 - question_generator: structured JSON questions prompt
+
+Prompts are assembled static-first (see ``services/prompt_layout.py``) so
+the per-type instructions form a cacheable prefix.
 """
 
 from __future__ import annotations
 
-import json
 from typing import Any, Literal
 
+from config.settings import get_settings
 from models.blueprint import Blueprint, ComponentSlot
+from services.data_summary import summarize_data
+from services.prompt_layout import PromptLayout
 
 
 OutputFormat = Literal["text", "json"]
@@ -35,8 +40,32 @@ def build_block_prompt(
         Tuple of (prompt_string, output_format).
         output_format is "text" for markdown, "json" for structured types.
     """
+    layout, output_format = build_block_prompt_layout(
+        slot, blueprint, data_context, compute_results
+    )
+    return layout.render(), output_format
+
+
+def build_block_prompt_layout(
+    slot: ComponentSlot,
+    blueprint: Blueprint | None,
+    data_context: dict[str, Any],
+    compute_results: dict[str, Any],
+    data_summary: str | None = None,
+) -> tuple[PromptLayout, OutputFormat]:
+    """Same as :func:`build_block_prompt` but returns the prefix-stable layout.
+
+    Segment order: per-type instructions (static) → data summary (shared by
+    every block of the build) → block parameters.  Blocks of one type thus
+    share a cacheable prefix across builds, and within a build the data
+    summary extends it.
+
+    Pass a precomputed *data_summary* (from :func:`build_data_summary`) to
+    avoid re-summarizing the same build data for every block.
+    """
     component_type = slot.component_type.value
-    data_summary = _build_data_summary(data_context, compute_results)
+    if data_summary is None:
+        data_summary = build_data_summary(data_context, compute_results)
 
     if component_type == "markdown":
         return _build_markdown_prompt(slot, blueprint, data_summary), "text"
@@ -49,51 +78,28 @@ def build_block_prompt(
     return _build_markdown_prompt(slot, blueprint, data_summary), "text"
 
 
-def _build_data_summary(
+def build_data_summary(
     data_context: dict[str, Any],
     compute_results: dict[str, Any],
+    max_tokens: int | None = None,
 ) -> str:
-    """Build a summary of available data for injection into prompts."""
-    sections: list[str] = []
-
-    if data_context:
-        data_lines = []
-        for key, value in data_context.items():
-            data_lines.append(
-                f"### {key}\n```json\n"
-                f"{json.dumps(value, indent=2, ensure_ascii=False, default=str)}\n```"
-            )
-        sections.append("## Fetched Data\n\n" + "\n\n".join(data_lines))
-
-    if compute_results:
-        compute_lines = []
-        for key, value in compute_results.items():
-            compute_lines.append(
-                f"### {key}\n```json\n"
-                f"{json.dumps(value, indent=2, ensure_ascii=False, default=str)}\n```"
-            )
-        sections.append("## Computed Statistics\n\n" + "\n\n".join(compute_lines))
-
-    return "\n\n".join(sections) if sections else "No data available."
-
+    """Build a compact, token-capped summary of available data for prompts.
 
-def _build_markdown_prompt(
-    slot: ComponentSlot,
-    blueprint: Blueprint | None,
-    data_summary: str,
-) -> str:
-    """Build prompt for markdown narrative content."""
-    slot_props = slot.props or {}
-    variant = slot_props.get("variant", "insight")
-
-    return f"""\
-Based on the following data and statistics, write an analytical narrative.
+    See ``services/data_summary.py``; the cap defaults to
+    ``settings.block_prompt_data_max_tokens``.
+    """
+    settings = get_settings()
+    summary = summarize_data(
+        data_context,
+        compute_results,
+        max_tokens=settings.block_prompt_data_max_tokens if max_tokens is None else max_tokens,
+        top_n=settings.block_prompt_data_top_n,
+    )
+    return summary or "No data available."
 
-{data_summary}
 
-## Block: {slot.id}
-- Type: markdown
-- Variant: {variant}
+_MARKDOWN_INSTRUCTIONS = """\
+Based on the data and statistics below, write an analytical narrative for the block described at the end.
 
 ## Instructions
 
@@ -109,26 +115,8 @@ Important rules:
 - Use markdown formatting (headings, bold, lists).
 - Write in a professional but approachable tone suitable for teachers."""
 
-
-def _build_suggestion_prompt(
-    slot: ComponentSlot,
-    blueprint: Blueprint | None,
-    data_summary: str,
-) -> str:
-    """Build prompt for suggestion_list JSON content."""
-    slot_props = slot.props or {}
-    max_items = slot_props.get("maxItems", 5)
-    categories = slot_props.get("categories", ["improvement", "strength", "action"])
-
-    return f"""\
-Based on the following data and statistics, generate actionable teaching suggestions.
-
-{data_summary}
-
-## Block: {slot.id}
-- Type: suggestion_list
-- Max items: {max_items}
-- Categories: {", ".join(categories)}
+_SUGGESTION_INSTRUCTIONS = """\
+Based on the data and statistics below, generate actionable teaching suggestions for the block described at the end.
 
 ## Output Format
 
@@ -136,52 +124,30 @@ Return a JSON array of suggestion objects. Each object must have:
 - "title": short title (under 50 characters)
 - "description": detailed description (1-2 sentences)
 - "priority": one of "high", "medium", "low"
-- "category": one of {categories}
+- "category": one of the block's Categories
 
 Example:
 ```json
 [
-  {{"title": "Focus on vocabulary gaps", "description": "Students scored lowest on vocabulary questions. Consider adding more vocabulary exercises.", "priority": "high", "category": "improvement"}},
-  {{"title": "Maintain reading comprehension", "description": "Reading scores are strong. Continue current approach.", "priority": "low", "category": "strength"}}
+  {"title": "Focus on vocabulary gaps", "description": "Students scored lowest on vocabulary questions. Consider adding more vocabulary exercises.", "priority": "high", "category": "improvement"},
+  {"title": "Maintain reading comprehension", "description": "Reading scores are strong. Continue current approach.", "priority": "low", "category": "strength"}
 ]
 ```
 
 Important rules:
-- Generate {max_items} or fewer suggestions.
+- Generate no more suggestions than the block's Max items.
 - Base suggestions on ACTUAL data, not hypothetical scenarios.
 - Each suggestion must be specific and actionable.
 - Return ONLY the JSON array, no additional text."""
 
-
-def _build_question_prompt(
-    slot: ComponentSlot,
-    blueprint: Blueprint | None,
-    data_summary: str,
-) -> str:
-    """Build prompt for question_generator JSON content."""
-    slot_props = slot.props or {}
-    question_count = slot_props.get("count", 5)
-    question_types = slot_props.get("types", ["multiple_choice", "short_answer"])
-    difficulty = slot_props.get("difficulty", "medium")
-    subject = slot_props.get("subject", "general")
-
-    return f"""\
-Based on the following data, generate practice questions for students.
-
-{data_summary}
-
-## Block: {slot.id}
-- Type: question_generator
-- Count: {question_count} questions
-- Types: {", ".join(question_types)}
-- Difficulty: {difficulty}
-- Subject: {subject}
+_QUESTION_INSTRUCTIONS = """\
+Based on the data below, generate practice questions for students as specified by the block described at the end.
 
 ## Output Format
 
 Return a JSON array of question objects. Each object must have:
 - "id": unique identifier (e.g., "q1", "q2")
-- "type": one of {question_types}
+- "type": one of the block's Types
 - "question": the question text
 - "options": (for multiple_choice only) array of 4 options
 - "answer": the correct answer
@@ -190,13 +156,87 @@ Return a JSON array of question objects. Each object must have:
 Example:
 ```json
 [
-  {{"id": "q1", "type": "multiple_choice", "question": "What is the main idea of the passage?", "options": ["A. ...", "B. ...", "C. ...", "D. ..."], "answer": "B", "explanation": "The passage focuses on..."}},
-  {{"id": "q2", "type": "short_answer", "question": "Explain why...", "answer": "Because...", "explanation": "This tests understanding of..."}}
+  {"id": "q1", "type": "multiple_choice", "question": "What is the main idea of the passage?", "options": ["A. ...", "B. ...", "C. ...", "D. ..."], "answer": "B", "explanation": "The passage focuses on..."},
+  {"id": "q2", "type": "short_answer", "question": "Explain why...", "answer": "Because...", "explanation": "This tests understanding of..."}
 ]
 ```
 
 Important rules:
-- Generate exactly {question_count} questions.
+- Generate exactly the block's Count of questions.
 - Questions should target areas where students need improvement (based on the data).
 - Each question must have a clear, unambiguous answer.
 - Return ONLY the JSON array, no additional text."""
+
+
+def _build_markdown_prompt(
+    slot: ComponentSlot,
+    blueprint: Blueprint | None,
+    data_summary: str,
+) -> PromptLayout:
+    """Build prompt for markdown narrative content."""
+    slot_props = slot.props or {}
+    variant = slot_props.get("variant", "insight")
+
+    return (
+        PromptLayout()
+        .static("instructions", _MARKDOWN_INSTRUCTIONS)
+        .dynamic("data", data_summary)
+        .dynamic(
+            "block",
+            f"## Block: {slot.id}\n"
+            f"- Type: markdown\n"
+            f"- Variant: {variant}",
+        )
+    )
+
+
+def _build_suggestion_prompt(
+    slot: ComponentSlot,
+    blueprint: Blueprint | None,
+    data_summary: str,
+) -> PromptLayout:
+    """Build prompt for suggestion_list JSON content."""
+    slot_props = slot.props or {}
+    max_items = slot_props.get("maxItems", 5)
+    categories = slot_props.get("categories", ["improvement", "strength", "action"])
+
+    return (
+        PromptLayout()
+        .static("instructions", _SUGGESTION_INSTRUCTIONS)
+        .dynamic("data", data_summary)
+        .dynamic(
+            "block",
+            f"## Block: {slot.id}\n"
+            f"- Type: suggestion_list\n"
+            f"- Max items: {max_items}\n"
+            f"- Categories: {', '.join(categories)}",
+        )
+    )
+
+
+def _build_question_prompt(
+    slot: ComponentSlot,
+    blueprint: Blueprint | None,
+    data_summary: str,
+) -> PromptLayout:
+    """Build prompt for question_generator JSON content."""
+    slot_props = slot.props or {}
+    question_count = slot_props.get("count", 5)
+    question_types = slot_props.get("types", ["multiple_choice", "short_answer"])
+    difficulty = slot_props.get("difficulty", "medium")
+    subject = slot_props.get("subject", "general")
+
+    return (
+        PromptLayout()
+        .static("instructions", _QUESTION_INSTRUCTIONS)
+        .dynamic("data", data_summary)
+        .dynamic(
+            "block",
+            f"## Block: {slot.id}\n"
+            f"- Type: question_generator\n"
+            f"- Count: {question_count} questions\n"
+            f"- Types: {', '.join(question_types)}\n"
+            f"- Difficulty: {difficulty}\n"
+            f"- Subject: {subject}",
+        )
+    )
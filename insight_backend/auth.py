@@ -1,59 +1,121 @@
 """JWT verification: forward to Java backend + cache verified teacher_id.
 
 User requests to AI carry the user's JWT. We verify it by calling
-Java's /api/auth/me endpoint and cache the result for 5 minutes.
+Java's /api/auth/me endpoint and cache the result (default 5 minutes).
+
+Verification tiers, checked in order:
+
+1. per-worker LRU + TTL cache (``TTLCache``, bounded by ``auth_cache_size``),
+2. optional Redis tier shared by all workers (``auth_cache_redis`` +
+   ``redis_url``),
+3. Java ``/auth/me`` over a pooled ``httpx.AsyncClient``.
+
+Concurrent misses for the same token are coalesced (single-flight): a burst
+of parallel requests from one browser costs exactly one upstream call, and
+every waiter receives the same result or the same error.
 """
 
 from __future__ import annotations
 
+import asyncio
 import hashlib
 import logging
-import time
+from typing import Any
 
 import httpx
 from fastapi import HTTPException, Request
 
 from config.settings import get_settings
+from services.metrics import get_metrics_collector
+from services.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
-# In-memory cache: sha256(token)[:16] → (teacher_id, expire_at)
-_verified_cache: dict[str, tuple[str, float]] = {}
+_REDIS_KEY_PREFIX = "auth:tid:"
+
+# sha256(token) → teacher_id
+_verified_cache: TTLCache[str, str] | None = None
+# sha256(token) → verification in progress
+_inflight: dict[str, asyncio.Task[str]] = {}
+_http_client: httpx.AsyncClient | None = None
+_redis: Any = None
+
+
+def _get_verified_cache() -> TTLCache[str, str]:
+    global _verified_cache
+    if _verified_cache is None:
+        settings = get_settings()
+        _verified_cache = TTLCache(
+            max_size=settings.auth_cache_size,
+            ttl_seconds=settings.auth_cache_ttl_s,
+        )
+    return _verified_cache
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    """Shared keep-alive client for Java /auth/me calls."""
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        _http_client = httpx.AsyncClient(
+            verify=False,
+            timeout=10,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+    return _http_client
+
+
+def _get_redis() -> Any:
+    """Redis client for the shared tier, or None when disabled."""
+    global _redis
+    settings = get_settings()
+    if not (settings.auth_cache_redis and settings.redis_url):
+        return None
+    if _redis is None:
+        import redis.asyncio as aioredis
 
-# Cache TTL in seconds
-_CACHE_TTL = 300  # 5 minutes
+        _redis = aioredis.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            socket_connect_timeout=2,
+            socket_timeout=2,
+        )
+    return _redis
 
 
-async def get_verified_teacher_id(request: Request) -> str:
-    """Extract and verify teacher_id from the user's JWT via Java backend.
+def _token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+async def _redis_get(key: str) -> str | None:
+    client = _get_redis()
+    if client is None:
+        return None
+    try:
+        return await client.get(_REDIS_KEY_PREFIX + key)
+    except Exception as exc:
+        logger.warning("Auth cache Redis read failed: %s", exc)
+        return None
 
-    1. Read Authorization header
-    2. Check local cache (5-min TTL keyed by token hash)
-    3. On cache miss → call Java GET /api/auth/me
-    4. Return the verified teacher_id (never trust request body)
-    """
-    token = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
-    if not token:
-        raise HTTPException(status_code=401, detail="Missing Authorization header")
 
-    # Cache lookup
-    cache_key = hashlib.sha256(token.encode()).hexdigest()[:16]
-    cached = _verified_cache.get(cache_key)
-    if cached is not None:
-        tid, expire_at = cached
-        if time.time() < expire_at:
-            return tid
-        # Expired — remove stale entry
-        _verified_cache.pop(cache_key, None)
-
-    # Cache miss → verify with Java
+async def _redis_set(key: str, teacher_id: str) -> None:
+    client = _get_redis()
+    if client is None:
+        return
+    try:
+        ttl = max(int(get_settings().auth_cache_ttl_s), 1)
+        await client.set(_REDIS_KEY_PREFIX + key, teacher_id, ex=ttl)
+    except Exception as exc:
+        logger.warning("Auth cache Redis write failed: %s", exc)
+
+
+async def _fetch_teacher_id(token: str) -> str:
+    """Call Java GET /api/auth/me and return the teacher id."""
     settings = get_settings()
     try:
-        async with httpx.AsyncClient(verify=False, timeout=10) as client:
-            resp = await client.get(
-                f"{settings.spring_boot_base_url}{settings.spring_boot_api_prefix}/auth/me",
-                headers={"Authorization": f"Bearer {token}"},
-            )
+        resp = await _get_http_client().get(
+            f"{settings.spring_boot_base_url}{settings.spring_boot_api_prefix}/auth/me",
+            headers={"Authorization": f"Bearer {token}"},
+        )
     except httpx.TransportError as exc:
         logger.error("Failed to verify JWT with Java backend: %s", exc)
         raise HTTPException(status_code=502, detail="Auth service unavailable")
@@ -67,12 +129,79 @@ async def get_verified_teacher_id(request: Request) -> str:
     if not teacher_id:
         raise HTTPException(status_code=401, detail="Could not extract teacher ID from JWT")
 
-    # Write cache
-    _verified_cache[cache_key] = (teacher_id, time.time() + _CACHE_TTL)
     logger.info("Verified teacher_id=%s via Java /auth/me", teacher_id)
     return teacher_id
 
 
+async def _verify_uncached(token: str, key: str) -> str:
+    metrics = get_metrics_collector()
+    teacher_id = await _redis_get(key)
+    if teacher_id:
+        metrics.increment("auth_verify", "redis_hit")
+    else:
+        metrics.increment("auth_verify", "upstream")
+        teacher_id = await _fetch_teacher_id(token)
+        await _redis_set(key, teacher_id)
+    _get_verified_cache().set(key, teacher_id)
+    return teacher_id
+
+
+def _forget_inflight(key: str, task: asyncio.Task[str]) -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    # Mark the error as retrieved even if every waiter was cancelled.
+    if not task.cancelled():
+        task.exception()
+
+
+async def verify_token(token: str) -> str:
+    """Return the teacher_id for *token*, verifying it at most once per TTL.
+
+    Raises:
+        HTTPException: 401 for invalid tokens, 502 when Java is unreachable.
+    """
+    key = _token_key(token)
+    teacher_id = _get_verified_cache().get(key)
+    if teacher_id is not None:
+        get_metrics_collector().increment("auth_verify", "cache_hit")
+        return teacher_id
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.create_task(_verify_uncached(token, key))
+        _inflight[key] = task
+        task.add_done_callback(lambda t: _forget_inflight(key, t))
+    else:
+        get_metrics_collector().increment("auth_verify", "coalesced")
+    # Shield so one cancelled request does not abort the shared verification.
+    return await asyncio.shield(task)
+
+
+async def get_verified_teacher_id(request: Request) -> str:
+    """Extract and verify teacher_id from the user's JWT via Java backend.
+
+    1. Read Authorization header
+    2. Check local cache, then the shared Redis tier (if enabled)
+    3. On cache miss → call Java GET /api/auth/me (coalesced per token)
+    4. Return the verified teacher_id (never trust request body)
+    """
+    token = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+    if not token:
+        raise HTTPException(status_code=401, detail="Missing Authorization header")
+    return await verify_token(token)
+
+
+async def close_auth_clients() -> None:
+    """Close the pooled HTTP client and Redis connection (app shutdown)."""
+    global _http_client, _redis
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+    if _redis is not None:
+        await _redis.aclose()
+        _redis = None
+
+
 def verify_internal_secret(request: Request) -> None:
     """Verify X-Internal-Secret header for internal (Java → AI) calls."""
     settings = get_settings()
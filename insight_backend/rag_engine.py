@@ -8,6 +8,7 @@ Phase 1: text documents only (digital PDF, DOCX, PPTX) — no OCR/VLM.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import tempfile
@@ -19,6 +20,7 @@ import httpx
 import numpy as np
 
 from config.settings import get_settings
+from services.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -37,11 +39,28 @@ class InsightRAGEngine:
         self._file_registry: dict[str, list[dict[str, str]]] = {}  # workspace_id → [{file_id, file_name}]
         self._initialized = False
         self._pg_pool = None  # asyncpg connection pool
+        self._init_lock = asyncio.Lock()
+
+    @property
+    def pg_available(self) -> bool:
+        """True once the PostgreSQL pool has been created."""
+        return self._pg_pool is not None
 
     async def initialize(self) -> None:
-        """Create connection pool and verify database connectivity (called once at startup)."""
+        """Create connection pool and verify database connectivity.
+
+        Runs as a background warm-up after startup; concurrent callers wait
+        for the first one instead of creating a second pool.
+        """
         if self._initialized:
             return
+        async with self._init_lock:
+            if self._initialized:
+                return
+            await self._create_pool()
+            self._initialized = True
+
+    async def _create_pool(self) -> None:
         try:
             import asyncpg
             self._pg_pool = await asyncpg.create_pool(
@@ -62,7 +81,6 @@ class InsightRAGEngine:
                 "document parsing will fail until DB is accessible",
                 exc,
             )
-        self._initialized = True
 
     def _ensure_pg_env_vars(self) -> None:
         """Set PostgreSQL env vars from pg_uri — LightRAG reads os.environ directly."""
@@ -318,6 +336,22 @@ class InsightRAGEngine:
         Returns:
             List of {"content", "source_file", "score", "metadata"} dicts.
         """
+        with span("rag.search", {
+            "rag.teacher_id": teacher_id,
+            "rag.mode": mode,
+            "rag.include_public": include_public,
+        }) as search_span:
+            results = await self._search(teacher_id, query, mode, include_public)
+            search_span.set_attribute("rag.results", len(results))
+            return results
+
+    async def _search(
+        self,
+        teacher_id: str,
+        query: str,
+        mode: str,
+        include_public: bool,
+    ) -> list[dict[str, Any]]:
         results: list[dict[str, Any]] = []
 
         # Map our mode names to RAGAnything mode names
@@ -557,26 +591,38 @@ def _extract_text(file_path: str) -> str:
         raise RuntimeError(f"Unsupported file type for text extraction: {ext}")
 
 
-async def download_file(url: str, dest_dir: str | None = None) -> str:
+async def download_file(
+    url: str,
+    dest_dir: str | None = None,
+    *,
+    expected_sha256: str | None = None,
+) -> str:
     """Download a file from OSS URL to a local temp path.
 
+    Streams to disk over the shared download client (bounded memory), with
+    the ``rag_download_*`` size limit and retry settings applied.  See
+    :func:`services.file_download.download_to_file`.
+
     Returns:
         Local file path of the downloaded file.
     """
+    from services.file_download import download_to_file
+
+    settings = get_settings()
     dest_dir = dest_dir or tempfile.mkdtemp(prefix="rag_download_")
-    async with httpx.AsyncClient(verify=False, timeout=120) as client:
-        resp = await client.get(url)
-        resp.raise_for_status()
-        content = resp.content
 
     # Extract filename from URL or Content-Disposition
     file_name = url.split("/")[-1].split("?")[0] or "document"
     file_path = os.path.join(dest_dir, file_name)
 
-    with open(file_path, "wb") as f:
-        f.write(content)
-
-    logger.info("Downloaded file to %s (%d bytes)", file_path, len(content))
+    result = await download_to_file(
+        url,
+        file_path,
+        max_bytes=settings.rag_download_max_bytes,
+        expected_sha256=expected_sha256,
+        max_retries=settings.rag_download_max_retries,
+    )
+    logger.info("Downloaded file to %s (%d bytes, sha256=%s)", file_path, result.size, result.sha256[:12])
     return file_path
 
 
@@ -1,5 +1,9 @@
 """FastAPI entry point for Insight AI Agent service."""
 
+import time
+
+_BOOT_T0 = time.monotonic()
+
 import asyncio
 import logging
 from contextlib import asynccontextmanager
@@ -12,42 +16,89 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from config.settings import get_settings
-from services.concurrency import ConcurrencyLimitMiddleware
+from services.concurrency import ConcurrencyLimitMiddleware, close_keyed_limiters
 from services.conversation_store import get_conversation_store, periodic_cleanup
+from services.file_download import close_download_client
 from services.java_client import get_java_client
+from services.llm_service import close_llm_http_session
+from services.generation_cache import close_generation_cache
+from services.resumable_stream import close_stream_registry
+from services.media_cache import close_media_cache
+from services.media_tasks import close_media_task_service
 from services.middleware import RequestIdMiddleware
+from services.startup import (
+    begin_boot,
+    check_startup_budget,
+    mark_phase,
+    start_warmup,
+    stop_warmups,
+)
+from services.tracing import setup_tracing, shutdown_tracing
+from insight_backend.auth import close_auth_clients
 from insight_backend.rag_engine import init_rag_engine
 
+begin_boot(_BOOT_T0)
+mark_phase("imports")
+
 # ── Global LiteLLM settings ──────────────────────────────────
 litellm.request_timeout = 60  # 60s timeout for all LLM API calls
 
 settings = get_settings()
 
 
+async def _warm_tool_registry() -> None:
+    """Import the native tool chain and build the planner agent off-loop."""
+    from agents.planner import _get_planner_agent
+    from tools.registry import load_builtin_tools
+
+    await asyncio.to_thread(load_builtin_tools)
+    await asyncio.to_thread(_get_planner_agent)
+
+
+async def _warm_rag_engine(rag_engine) -> None:
+    await rag_engine.initialize()
+    if not rag_engine.pg_available:
+        raise RuntimeError("PostgreSQL not available")
+
+
+async def _warm_conversation_store(store) -> None:
+    if not await store.ping():
+        raise RuntimeError("Redis ping failed — sessions may not persist")
+    logger.info("Redis connection verified")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Manage application lifecycle — start/stop shared resources."""
+    """Manage application lifecycle — start/stop shared resources.
+
+    Only what serving needs happens before ``yield``; the tool registry,
+    the RAG PostgreSQL pool and the Redis check warm up in the background
+    (see ``services/startup.py`` and ``GET /api/health/ready``).
+    """
+    setup_tracing()
     client = get_java_client()
     await client.start()
 
-    # Initialize RAG engine (non-blocking — parsing fails gracefully if DB is down)
+    # RAG engine connects in the background — parsing fails gracefully
+    # until the DB is reachable.
     rag_engine = init_rag_engine()
-    await rag_engine.initialize()
 
     # Initialize conversation store and start periodic cleanup
     store = get_conversation_store()
     cleanup_task = asyncio.create_task(periodic_cleanup(interval_seconds=300))
 
-    # Verify Redis connectivity if using Redis store
+    start_warmup("tool_registry", _warm_tool_registry)
+    start_warmup("rag_engine", lambda: _warm_rag_engine(rag_engine), required=False)
+
     from services.conversation_store import RedisConversationStore
     if isinstance(store, RedisConversationStore):
-        if await store.ping():
-            logger.info("Redis connection verified")
-        else:
-            logger.warning("Redis connection failed — sessions may not persist")
+        start_warmup("conversation_store", lambda: _warm_conversation_store(store), required=False)
+
+    check_startup_budget(settings.startup_budget_s)
 
     yield
 
+    await stop_warmups()
     cleanup_task.cancel()
     try:
         await cleanup_task
@@ -60,6 +111,15 @@ async def lifespan(app: FastAPI):
 
     await rag_engine.close()
     await client.close()
+    await close_auth_clients()
+    await close_download_client()
+    await close_media_task_service()
+    await close_media_cache()
+    await close_generation_cache()
+    await close_stream_registry()
+    await close_keyed_limiters()
+    await close_llm_http_session()
+    shutdown_tracing()
 
 
 app = FastAPI(
@@ -81,9 +141,6 @@ app.add_middleware(
 app.add_middleware(RequestIdMiddleware)
 app.add_middleware(ConcurrencyLimitMiddleware)
 
-# ── Populate native tool registry (must happen before router import) ──
-import tools.native_tools  # noqa: E402, F401  — registers tools via @register_tool
-
 # ── Register routers ────────────────────────────────────────
 from api.health import router as health_router  # noqa: E402
 from api.models_routes import router as models_router  # noqa: E402
@@ -107,6 +164,8 @@ app.include_router(knowledge_router)
 app.include_router(blueprint_router)
 app.include_router(media_router)
 
+mark_phase("app")
+
 
 if __name__ == "__main__":
     if settings.debug:
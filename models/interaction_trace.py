@@ -38,12 +38,15 @@ class InteractionTrace(CamelModel):
     # Trigger
     initial_message: str = ""
     all_messages: list[str] = []
+    omitted_messages: int = 0  # follow-ups dropped when the trace was compacted
 
     # Skill calls
     skill_calls: list[SkillCall] = []
+    omitted_skill_calls: int = 0
 
     # Output
     output_type: str = ""  # "quiz" | "report" | "lesson_plan"
+    output_types: list[str] = []  # every artifact type produced, in order
     output_data: dict = {}
 
     # Teacher modifications
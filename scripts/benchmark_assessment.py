@@ -0,0 +1,88 @@
+"""Benchmark the columnar assessment engine against the previous loop code.
+
+Times class weakness, per-student error patterns and class mastery at
+40, 400 and 4000 students (3 assignments × 10 questions each).  The
+"legacy" column runs the pre-vectorization reference implementations kept
+in ``tests/test_assessment_engine.py``.
+
+Usage:
+    cd insight-ai-agent
+    python scripts/benchmark_assessment.py
+    python scripts/benchmark_assessment.py --sizes 40 400 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests.test_assessment_engine import (  # noqa: E402
+    make_cohort,
+    reference_mastery,
+    reference_patterns,
+    reference_weakness,
+)
+from tools.assessment_engine import AssessmentFrame  # noqa: E402
+
+# Per-student lookups sampled per run (legacy code rescans every time).
+_PATTERN_SAMPLE = 20
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def run(sizes: list[int], repeat: int) -> None:
+    print(f"{'students':>8} {'analysis':<18} {'legacy ms':>10} {'engine ms':>10} {'speedup':>8}")
+    for n in sizes:
+        subs = make_cohort(n)
+        student_ids = sorted({s["student_id"] for s in subs})[:_PATTERN_SAMPLE]
+
+        def engine_weakness():
+            AssessmentFrame.from_submissions(subs).class_weakness()
+
+        def engine_patterns():
+            frame = AssessmentFrame.from_submissions(subs)
+            for sid in student_ids:
+                frame.student_error_patterns(sid)
+
+        def engine_mastery():
+            AssessmentFrame.from_submissions(subs).class_mastery()
+
+        cases = [
+            ("class_weakness", lambda: reference_weakness(subs), engine_weakness),
+            (
+                f"patterns x{len(student_ids)}",
+                lambda: [reference_patterns(subs, sid) for sid in student_ids],
+                engine_patterns,
+            ),
+            ("class_mastery", lambda: reference_mastery(subs), engine_mastery),
+        ]
+        for name, legacy, engine in cases:
+            legacy_ms = _best_of(legacy, repeat)
+            engine_ms = _best_of(engine, repeat)
+            print(
+                f"{n:>8} {name:<18} {legacy_ms:>10.2f} {engine_ms:>10.2f} "
+                f"{legacy_ms / engine_ms:>7.1f}x"
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[40, 400, 4000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -20,7 +20,8 @@ class InMemoryArtifactStore:
 
     ``MAX_ARTIFACTS`` caps the total number of artifact versions stored.
     When the cap is reached, the oldest entry (by insertion order) is evicted.
-    ``MAX_CONVERSATIONS`` caps the conversation→latest-artifact mapping.
+    ``MAX_CONVERSATIONS`` caps the per-conversation mappings (latest artifact
+    and the artifact types produced, in order).
     """
 
     MAX_ARTIFACTS = 2000
@@ -30,6 +31,7 @@ class InMemoryArtifactStore:
         self._lock = threading.RLock()
         self._by_id: dict[str, ArtifactVersion] = {}
         self._latest_by_conversation: dict[str, str] = {}
+        self._types_by_conversation: dict[str, list[str]] = {}
 
     def save_artifact(
         self,
@@ -59,6 +61,9 @@ class InMemoryArtifactStore:
             self._by_id[aid] = ArtifactVersion(artifact=artifact)
             if conversation_id:
                 self._latest_by_conversation[conversation_id] = aid
+                types = self._types_by_conversation.setdefault(conversation_id, [])
+                if artifact_type not in types:
+                    types.append(artifact_type)
 
             # Evict oldest entries when capacity is exceeded.
             if len(self._by_id) > self.MAX_ARTIFACTS:
@@ -67,6 +72,9 @@ class InMemoryArtifactStore:
             if len(self._latest_by_conversation) > self.MAX_CONVERSATIONS:
                 oldest_conv = next(iter(self._latest_by_conversation))
                 del self._latest_by_conversation[oldest_conv]
+            if len(self._types_by_conversation) > self.MAX_CONVERSATIONS:
+                oldest_conv = next(iter(self._types_by_conversation))
+                del self._types_by_conversation[oldest_conv]
 
             return artifact
 
@@ -83,6 +91,11 @@ class InMemoryArtifactStore:
             item = self._by_id.get(aid)
             return item.artifact if item else None
 
+    def get_types_for_conversation(self, conversation_id: str) -> list[str]:
+        """Artifact types produced in a conversation, in first-produced order."""
+        with self._lock:
+            return list(self._types_by_conversation.get(conversation_id, []))
+
 
 _artifact_store = InMemoryArtifactStore()
 
@@ -1,26 +1,45 @@
 """Blueprint distillation service.
 
-Converts conversation history into a reusable Soft Blueprint via LLM extraction.
+Converts a conversation into a reusable Soft Blueprint via LLM extraction.
+
+The LLM does not see the raw history: the session is first compacted into
+an :class:`~models.interaction_trace.InteractionTrace` — the initial
+request, the teacher's follow-ups (clipped, consecutive repeats dropped),
+the tool calls parsed from each turn's ``tool_calls_summary`` (repeats
+collapsed), the final reply and every artifact type produced — and the
+oldest follow-ups / tool calls are dropped until the rendered trace fits
+``distill_trace_token_budget``.  Prompt size therefore stays flat however
+long the conversation ran.
 """
 
 from __future__ import annotations
 
 import logging
 import re
-from typing import Any
 
 from pydantic_ai import Agent
 from pydantic_ai.settings import ModelSettings
 
 from agents.provider import create_model
+from config.settings import get_settings
+from models.interaction_trace import InteractionTrace, SkillCall
 from models.soft_blueprint import SoftBlueprint
-from services.conversation_store import get_conversation_store
+from services.artifact_store import get_artifact_store
+from services.conversation_store import ConversationSession, get_conversation_store
+from services.prompt_budget import estimate_tokens
 
 logger = logging.getLogger(__name__)
 
 # Distillation settings — low temperature for consistency
 DISTILL_MODEL_SETTINGS = ModelSettings(temperature=0.2, max_tokens=8192)
 
+# Interaction trace compaction limits
+_MAX_MESSAGE_CHARS = 300
+_MAX_REPLY_CHARS = 500
+_MAX_PARAM_CHARS = 80
+_MAX_FOLLOWUPS = 8
+_MAX_SKILL_CALLS = 12
+
 # Lazy-initialized agent (avoids import-time model creation)
 _distill_agent: Agent | None = None
 
@@ -37,36 +56,122 @@ def _get_distill_agent() -> Agent:
     return _distill_agent
 
 
-def _build_distill_prompt(conversation_history: list[dict[str, Any]]) -> str:
-    """
-    Build distillation prompt from conversation history.
-
-    Args:
-        conversation_history: List of messages with role, content, tool_calls_summary
-
-    Returns:
-        Formatted prompt for distillation
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text[:limit] + "..." if len(text) > limit else text
+
+
+def _parse_tool_summary(summary: str) -> list[SkillCall]:
+    """Parse ``"tool(k=v, k2=v2) → ok; other() → error"`` into skill calls."""
+    calls: list[SkillCall] = []
+    for item in summary.split("; "):
+        desc, _, status = item.partition(" → ")
+        name, _, args = desc.partition("(")
+        if not name.strip():
+            continue
+        params: dict[str, str] = {}
+        for pair in args.removesuffix(")").split(", "):
+            key, sep, value = pair.partition("=")
+            if sep:
+                params[key.strip()] = _clip(value, _MAX_PARAM_CHARS)
+        status = status.strip() or "ok"
+        calls.append(SkillCall(
+            skill_name=name.strip(),
+            input_params=params,
+            output_summary=status,
+            was_successful=status == "ok",
+        ))
+    return calls
+
+
+def _format_skill_call(call: SkillCall) -> str:
+    args = ", ".join(f"{k}={v}" for k, v in call.input_params.items())
+    name = f"{call.skill_name}({args})" if args else call.skill_name
+    return f"{name} → {call.output_summary}"
+
+
+def _format_trace(trace: InteractionTrace) -> str:
+    """Render a compacted trace as the conversation section of the prompt."""
+    lines = [f"Teacher: {trace.initial_message}"]
+    if trace.omitted_messages:
+        lines.append(f"（省略 {trace.omitted_messages} 条较早的教师消息）")
+    lines.extend(f"Teacher: {message}" for message in trace.all_messages)
+    if trace.skill_calls:
+        tools = "; ".join(_format_skill_call(call) for call in trace.skill_calls)
+        if trace.omitted_skill_calls:
+            tools = f"… {trace.omitted_skill_calls} earlier calls; {tools}"
+        lines.append(f"AI: [Tools used: {tools}]")
+    final_reply = trace.output_data.get("final_reply", "")
+    if final_reply:
+        lines.append(f"AI: {final_reply}")
+    if trace.output_types:
+        lines.append(f"Output: {' → '.join(trace.output_types)}")
+    return "\n".join(lines)
+
+
+def build_interaction_trace(
+    session: ConversationSession,
+    teacher_id: str,
+    *,
+    artifact_types: list[str] | None = None,
+    token_budget: int = 1500,
+) -> InteractionTrace:
+    """Compact *session* into a trace whose rendering fits *token_budget*.
+
+    *artifact_types* are the artifact types the conversation produced, in
+    order; the last one is also recorded as ``output_type``.
     """
-    # Format conversation
-    conv_lines = []
-    for msg in conversation_history:
-        role = msg.get("role", "")
-        content = msg.get("content", "")
-        tool_summary = msg.get("tool_calls_summary", "")
-
-        if role == "user":
-            conv_lines.append(f"Teacher: {content}")
-        elif role == "assistant":
-            if tool_summary:
-                conv_lines.append(f"AI: [Tools used: {tool_summary}]")
-            if content:
-                # Truncate long assistant messages
-                truncated = content[:500] + "..." if len(content) > 500 else content
-                conv_lines.append(f"AI: {truncated}")
-
-    conversation_text = "\n".join(conv_lines)
-
-    prompt = f"""你是一个 Blueprint 蒸馏器。阅读以下教师与 AI 的对话历史，提取一个可复用的 Soft Blueprint。
+    artifact_types = list(artifact_types or [])
+    user_messages: list[str] = []
+    skill_calls: list[SkillCall] = []
+    final_reply = ""
+    for turn in session.turns:
+        if turn.role == "user":
+            message = _clip(turn.content, _MAX_MESSAGE_CHARS)
+            if message and (not user_messages or user_messages[-1] != message):
+                user_messages.append(message)
+        elif turn.role == "assistant":
+            for call in _parse_tool_summary(turn.tool_calls_summary or ""):
+                last = skill_calls[-1] if skill_calls else None
+                if last and (last.skill_name, last.input_params) == (call.skill_name, call.input_params):
+                    skill_calls[-1] = call  # retry of the same call: keep the outcome
+                else:
+                    skill_calls.append(call)
+            if turn.content:
+                final_reply = _clip(turn.content, _MAX_REPLY_CHARS)
+
+    followups = user_messages[1:]
+    trace = InteractionTrace(
+        conversation_id=session.conversation_id,
+        teacher_id=teacher_id,
+        initial_message=user_messages[0] if user_messages else "",
+        all_messages=followups[-_MAX_FOLLOWUPS:],
+        omitted_messages=max(0, len(followups) - _MAX_FOLLOWUPS),
+        skill_calls=skill_calls[-_MAX_SKILL_CALLS:],
+        omitted_skill_calls=max(0, len(skill_calls) - _MAX_SKILL_CALLS),
+        output_type=artifact_types[-1] if artifact_types else "",
+        output_types=artifact_types,
+        output_data={"final_reply": final_reply},
+    )
+
+    # Drop the oldest detail until the rendered trace fits the budget.
+    while estimate_tokens(_format_trace(trace)) > token_budget:
+        if trace.all_messages and len(trace.all_messages) >= len(trace.skill_calls):
+            trace.all_messages.pop(0)
+            trace.omitted_messages += 1
+        elif trace.skill_calls:
+            trace.skill_calls.pop(0)
+            trace.omitted_skill_calls += 1
+        else:
+            break
+    return trace
+
+
+def _build_distill_prompt(trace: InteractionTrace) -> str:
+    """Build the distillation prompt from a compacted interaction trace."""
+    conversation_text = _format_trace(trace)
+
+    prompt = f"""你是一个 Blueprint 蒸馏器。阅读以下教师与 AI 交互的压缩轨迹，提取一个可复用的 Soft Blueprint。
 
 ## 规则
 
@@ -94,7 +199,7 @@ def _build_distill_prompt(conversation_history: list[dict[str, Any]]) -> str:
    - expected_artifacts 按执行顺序列出所有 artifact 类型
    - 不要把 artifact 的原始内容 (题目JSON/HTML代码) 写入 prompt, 只描述"生成什么"
 
-## 对话历史
+## 交互轨迹
 
 {conversation_text}
 
@@ -197,24 +302,22 @@ async def distill_conversation(
     if not session:
         raise ValueError(f"Conversation not found or expired: {conversation_id}")
 
-    # Build conversation history from turns
-    conversation_history = []
-    for turn in session.turns:
-        msg_dict = {
-            "role": turn.role,
-            "content": turn.content,
-        }
-        if turn.tool_calls_summary:
-            msg_dict["tool_calls_summary"] = turn.tool_calls_summary
-        conversation_history.append(msg_dict)
-
-    if not conversation_history:
+    if not session.turns:
         raise ValueError("Conversation history is empty")
 
-    # Build prompt
-    distill_prompt = _build_distill_prompt(conversation_history)
-
-    logger.info("Distilling conversation %s for teacher %s", conversation_id, teacher_id)
+    trace = build_interaction_trace(
+        session,
+        teacher_id,
+        artifact_types=get_artifact_store().get_types_for_conversation(conversation_id),
+        token_budget=get_settings().distill_trace_token_budget,
+    )
+    distill_prompt = _build_distill_prompt(trace)
+
+    logger.info(
+        "Distilling conversation %s for teacher %s (%d turns → %d follow-ups, %d tool calls)",
+        conversation_id, teacher_id, len(session.turns),
+        len(trace.all_messages), len(trace.skill_calls),
+    )
 
     # Run agent with retries (handled by PydanticAI)
     try:
@@ -0,0 +1,158 @@
+"""In-process BM25 inverted index with a CJK-aware tokenizer.
+
+``SimpleRAGStore`` used to answer every query with a linear substring scan
+over the whole collection.  ``BM25Index`` keeps a term → postings map
+instead, so a query only touches the documents that share a term with it
+and scoring cost follows the query, not the corpus size.
+
+Tokenization:
+
+- Latin / digit runs become lower-cased word tokens (``"Essay-2"`` →
+  ``essay``, ``2``),
+- runs of CJK characters become overlapping character bigrams
+  (``"閱讀理解"`` → ``閱讀``, ``讀理``, ``理解``); a lone CJK character is
+  kept as a unigram.
+
+Documents can be added, replaced and removed incrementally.  ``to_dict`` /
+``from_dict`` serialize the per-document term frequencies so a persisted
+index is rebuilt without re-tokenizing the corpus.
+"""
+
+from __future__ import annotations
+
+import heapq
+import math
+import re
+from collections import Counter
+from typing import Any, Callable, Iterable
+
+INDEX_FORMAT_VERSION = 1
+
+# CJK Unified Ideographs (+ Ext. A, compatibility), kana and hangul.
+_CJK_RANGES = (
+    "぀-ヿ"
+    "㐀-䶿"
+    "一-鿿"
+    "가-힯"
+    "豈-﫿"
+)
+_TOKEN_RE = re.compile(rf"[{_CJK_RANGES}]+|[^\W_{_CJK_RANGES}]+")
+_CJK_RE = re.compile(rf"[{_CJK_RANGES}]")
+
+
+def tokenize(text: str) -> list[str]:
+    """Split *text* into Latin word tokens and CJK character bigrams."""
+    tokens: list[str] = []
+    for run in _TOKEN_RE.findall(text.lower()):
+        if _CJK_RE.match(run):
+            if len(run) == 1:
+                tokens.append(run)
+            else:
+                tokens.extend(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.append(run)
+    return tokens
+
+
+class BM25Index:
+    """Okapi BM25 over an incrementally maintained inverted index."""
+
+    def __init__(self, *, k1: float = 1.5, b: float = 0.75) -> None:
+        self.k1 = k1
+        self.b = b
+        self._postings: dict[str, dict[str, int]] = {}
+        self._doc_terms: dict[str, dict[str, int]] = {}
+        self._doc_len: dict[str, int] = {}
+        self._total_len = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_len)
+
+    def __contains__(self, doc_id: object) -> bool:
+        return doc_id in self._doc_len
+
+    def add(self, doc_id: str, text: str) -> None:
+        """Index *text* under *doc_id*, replacing any previous version."""
+        self._add_terms(doc_id, Counter(tokenize(text)))
+
+    def remove(self, doc_id: str) -> bool:
+        """Drop *doc_id* from the index.  Returns False if it was absent."""
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return False
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        self._total_len -= self._doc_len.pop(doc_id)
+        return True
+
+    def clear(self) -> None:
+        self._postings.clear()
+        self._doc_terms.clear()
+        self._doc_len.clear()
+        self._total_len = 0
+
+    def search(
+        self,
+        query: str,
+        limit: int | None = None,
+        accept: Callable[[str], bool] | None = None,
+    ) -> list[tuple[str, float]]:
+        """Return ``(doc_id, score)`` pairs, best first.
+
+        Only documents sharing at least one term with *query* are scored.
+        *accept* filters candidates (e.g. on metadata) before ranking.
+        """
+        n_docs = len(self._doc_len)
+        if not n_docs:
+            return []
+        avg_len = self._total_len / n_docs or 1.0
+        k1, b = self.k1, self.b
+        scores: dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            df = len(postings)
+            idf = math.log(1.0 + (n_docs - df + 0.5) / (df + 0.5))
+            for doc_id, tf in postings.items():
+                norm = k1 * (1.0 - b + b * self._doc_len[doc_id] / avg_len)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1.0) / (tf + norm)
+
+        items: Iterable[tuple[str, float]] = scores.items()
+        if accept is not None:
+            items = [(doc_id, s) for doc_id, s in items if accept(doc_id)]
+        key = lambda item: item[1]  # noqa: E731
+        if limit is None:
+            return sorted(items, key=key, reverse=True)
+        return heapq.nlargest(limit, items, key=key)
+
+    # ── Persistence ─────────────────────────────────────────
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": INDEX_FORMAT_VERSION,
+            "k1": self.k1,
+            "b": self.b,
+            "docs": self._doc_terms,
+        }
+
+    @classmethod
+    def from_dict(cls, payload: dict[str, Any]) -> BM25Index:
+        if payload.get("version") != INDEX_FORMAT_VERSION:
+            raise ValueError(f"Unsupported BM25 index version: {payload.get('version')!r}")
+        index = cls(k1=payload["k1"], b=payload["b"])
+        for doc_id, terms in payload["docs"].items():
+            index._add_terms(doc_id, terms)
+        return index
+
+    def _add_terms(self, doc_id: str, terms: dict[str, int]) -> None:
+        self.remove(doc_id)
+        self._doc_terms[doc_id] = dict(terms)
+        length = sum(terms.values())
+        self._doc_len[doc_id] = length
+        self._total_len += length
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = tf
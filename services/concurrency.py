@@ -13,7 +13,9 @@ from __future__ import annotations
 import asyncio
 import json
 import logging
-from typing import Any, Callable, Coroutine
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Coroutine
 
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
@@ -38,6 +40,21 @@ def _get_semaphore() -> asyncio.Semaphore:
     return _llm_semaphore
 
 
+@asynccontextmanager
+async def llm_slot() -> AsyncIterator[None]:
+    """Hold one LLM concurrency slot for the duration of the block.
+
+    For calls that outlive a single await — e.g. consuming a streamed
+    completion — where :func:`rate_limited_llm_call` does not fit::
+
+        async with llm_slot():
+            async for chunk in await litellm.acompletion(..., stream=True):
+                ...
+    """
+    async with _get_semaphore():
+        yield
+
+
 async def rate_limited_llm_call(
     func: Callable[..., Coroutine[Any, Any, Any]],
     *args: Any,
@@ -49,8 +66,7 @@ async def rate_limited_llm_call(
 
         result = await rate_limited_llm_call(litellm.acompletion, model=..., messages=...)
     """
-    sem = _get_semaphore()
-    async with sem:
+    async with llm_slot():
         return await func(*args, **kwargs)
 
 
@@ -79,6 +95,42 @@ def _get_heavy_semaphore() -> asyncio.Semaphore:
     return _heavy_semaphore
 
 
+# ── Detached runs ─────────────────────────────────────────────
+# Resumable streams and the generation cache run their producers as tasks
+# that outlive the request, so once the client disconnects the work would
+# no longer be counted by the middleware below.  Every detached run holds a
+# slot for its whole life (waiting for one if needed), and the middleware
+# also answers 503 while all of them are taken.  A run started from inside
+# another detached run (e.g. a quiz generated during a conversation turn)
+# shares its parent's slot instead of waiting on a second one.
+
+_MAX_DETACHED_RUNS = _MAX_CONCURRENT_HEAVY  # per worker
+_detached_semaphore: asyncio.Semaphore | None = None
+_in_detached_run: ContextVar[bool] = ContextVar("in_detached_run", default=False)
+
+
+def _get_detached_semaphore() -> asyncio.Semaphore:
+    global _detached_semaphore
+    if _detached_semaphore is None:
+        _detached_semaphore = asyncio.Semaphore(_MAX_DETACHED_RUNS)
+        logger.info("Detached run semaphore initialized (max=%d)", _MAX_DETACHED_RUNS)
+    return _detached_semaphore
+
+
+@asynccontextmanager
+async def detached_run_slot() -> AsyncIterator[None]:
+    """Hold one detached-run slot for the duration of the block."""
+    if _in_detached_run.get():
+        yield
+        return
+    async with _get_detached_semaphore():
+        token = _in_detached_run.set(True)
+        try:
+            yield
+        finally:
+            _in_detached_run.reset(token)
+
+
 class ConcurrencyLimitMiddleware:
     """Pure ASGI middleware — reject heavy requests when the worker is at capacity.
 
@@ -105,7 +157,7 @@ class ConcurrencyLimitMiddleware:
         sem = _get_heavy_semaphore()
 
         # Try to acquire without blocking — if full, return 503
-        if not sem._value:  # noqa: SLF001
+        if not sem._value or not _get_detached_semaphore()._value:  # noqa: SLF001
             logger.warning("Concurrency limit reached for %s — returning 503", path)
             body = json.dumps(
                 {"detail": "Server busy — too many concurrent requests. Please retry."}
@@ -126,3 +178,157 @@ class ConcurrencyLimitMiddleware:
 
         async with sem:
             await self.app(scope, receive, send)
+
+
+# ── Keyed limiters ───────────────────────────────────────────
+# Per-key concurrency caps (e.g. one blueprint distillation per teacher).
+# Only keys with a held slot are tracked — an entry is dropped the moment
+# its last slot is released — so memory follows the number of *running*
+# operations, not the number of teachers seen since start-up.  With
+# ``keyed_limit_redis`` the cap also holds across workers: each slot is a
+# Redis counter lease that expires after ``keyed_limit_lease_s`` so a
+# crashed worker cannot pin a key forever.
+
+
+class LimitExceeded(RuntimeError):
+    """The key already holds its maximum number of slots."""
+
+    def __init__(self, name: str, key: str, limit: int) -> None:
+        super().__init__(f"{name}: limit of {limit} reached for {key!r}")
+        self.name = name
+        self.key = key
+        self.limit = limit
+
+
+class KeyedLimiter:
+    """Non-blocking per-key slot counter, optionally enforced cluster-wide."""
+
+    def __init__(
+        self,
+        name: str,
+        limit: int = 1,
+        *,
+        redis: Any = None,
+        lease_s: float = 300.0,
+    ) -> None:
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        self.name = name
+        self.limit = limit
+        self._redis = redis
+        self._lease_s = lease_s
+        self._active: dict[str, int] = {}
+
+    def active(self, key: str) -> int:
+        """Slots currently held for *key* on this worker."""
+        return self._active.get(key, 0)
+
+    def __len__(self) -> int:
+        """Number of keys with at least one held slot."""
+        return len(self._active)
+
+    @asynccontextmanager
+    async def hold(self, key: str) -> AsyncIterator[None]:
+        """Hold one slot for *key*; raises :class:`LimitExceeded` if none is free."""
+        # No await between the check and the increment: safe on one event loop.
+        if self._active.get(key, 0) >= self.limit:
+            raise LimitExceeded(self.name, key, self.limit)
+        self._active[key] = self._active.get(key, 0) + 1
+        leased = False
+        try:
+            leased = await self._lease(key)
+            yield
+        finally:
+            if leased:
+                await self._release_lease(key)
+            remaining = self._active[key] - 1
+            if remaining:
+                self._active[key] = remaining
+            else:
+                del self._active[key]
+
+    def _redis_key(self, key: str) -> str:
+        return f"insight:limit:{self.name}:{key}"
+
+    async def _lease(self, key: str) -> bool:
+        """Take a cluster-wide slot; False when Redis is off or unreachable."""
+        if self._redis is None:
+            return False
+        rkey = self._redis_key(key)
+        try:
+            count = await self._redis.incr(rkey)
+            if count > self.limit:
+                await self._redis.decr(rkey)
+            else:
+                await self._redis.expire(rkey, max(int(self._lease_s), 1))
+        except Exception as exc:
+            # Fail open to the per-worker limit rather than rejecting everyone.
+            logger.warning("Keyed limiter %s Redis lease failed: %s", self.name, exc)
+            return False
+        if count > self.limit:
+            raise LimitExceeded(self.name, key, self.limit)
+        return True
+
+    async def _release_lease(self, key: str) -> None:
+        rkey = self._redis_key(key)
+        try:
+            if await self._redis.decr(rkey) <= 0:
+                await self._redis.delete(rkey)
+        except Exception as exc:
+            logger.warning("Keyed limiter %s Redis release failed: %s", self.name, exc)
+
+
+_keyed_limiters: dict[str, KeyedLimiter] = {}
+_limit_redis: Any = None
+
+
+def _get_limit_redis() -> Any:
+    global _limit_redis
+    from config.settings import get_settings
+
+    settings = get_settings()
+    if not (settings.keyed_limit_redis and settings.redis_url):
+        return None
+    if _limit_redis is None:
+        import redis.asyncio as aioredis
+
+        _limit_redis = aioredis.from_url(
+            settings.redis_url,
+            decode_responses=True,
+            socket_connect_timeout=2,
+            socket_timeout=2,
+        )
+    return _limit_redis
+
+
+def get_keyed_limiter(name: str, limit: int) -> KeyedLimiter:
+    """Process-wide limiter called *name* (created on first use).
+
+    A different *limit* (e.g. a changed setting) is applied to the existing
+    limiter in place, so slots held by running operations still count.
+    """
+    limiter = _keyed_limiters.get(name)
+    if limiter is None:
+        from config.settings import get_settings
+
+        limiter = KeyedLimiter(
+            name,
+            limit,
+            redis=_get_limit_redis(),
+            lease_s=get_settings().keyed_limit_lease_s,
+        )
+        _keyed_limiters[name] = limiter
+    elif limiter.limit != limit:
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        limiter.limit = limit
+    return limiter
+
+
+async def close_keyed_limiters() -> None:
+    """Close the shared Redis connection (app shutdown)."""
+    global _limit_redis
+    _keyed_limiters.clear()
+    if _limit_redis is not None:
+        await _limit_redis.aclose()
+        _limit_redis = None
@@ -0,0 +1,240 @@
+"""Compact, token-bounded data summaries for LLM prompts.
+
+Block composition prompts used to embed the full ``json.dumps(indent=2)``
+of every fetched data contract and compute result, so prompt size grew
+linearly with class size and was repeated for every AI block.
+
+``summarize_data`` renders a compact view instead:
+
+- record lists (submissions, students, grades) are reduced to a schema-aware
+  column selection — identifier columns plus numeric score-like columns;
+  long text and nested structures are dropped,
+- large record lists and numeric arrays become statistical rollups via
+  ``tools.stats_tools.calculate_stats`` plus the top/bottom-N rows by the
+  primary score column,
+- the rendered text is held under a hard token cap, shrinking N and
+  finally truncating when needed.
+
+Small inputs pass through almost unchanged, so exact numbers from compute
+nodes (means, KPIs) are always preserved.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from services.prompt_budget import estimate_tokens
+from tools.stats_tools import calculate_stats
+
+DEFAULT_TOP_N = 5
+DEFAULT_MAX_TOKENS = 1500
+
+_ROLLUP_METRICS = ["mean", "median", "stddev", "min", "max"]
+_MAX_DEPTH = 4
+_MAX_STR_CHARS = 200
+_MAX_NUMERIC_COLUMNS = 4
+_MAX_CATEGORY_VALUES = 8
+
+# Column-name hints, checked as substrings of the lower-cased key.
+_LABEL_HINTS = ("name", "title", "label")
+_SCORE_HINTS = ("score", "percentage", "rate", "mastery", "grade", "accuracy", "points")
+_TRUNCATION_NOTE = "\n…(data truncated to fit prompt budget)"
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _is_record_list(value: Any) -> bool:
+    return bool(value) and isinstance(value, list) and all(isinstance(v, dict) for v in value)
+
+
+def _compact_json(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+def _rollup(values: list[float | int]) -> dict[str, Any]:
+    stats = calculate_stats(values, _ROLLUP_METRICS)
+    stats.pop("summary", None)
+    return stats
+
+
+# ── Record lists ────────────────────────────────────────────
+
+
+def _select_columns(records: list[dict]) -> tuple[list[str], list[str], list[str]]:
+    """Return ``(label_columns, numeric_columns, category_columns)``."""
+    keys: dict[str, None] = {}
+    for row in records:
+        keys.update(dict.fromkeys(row))
+
+    labels: list[str] = []
+    numeric: list[str] = []
+    categories: list[str] = []
+    for key in keys:
+        values = [row.get(key) for row in records if row.get(key) is not None]
+        if not values:
+            continue
+        lowered = key.lower()
+        if all(_is_number(v) for v in values):
+            if not lowered.endswith("id"):
+                numeric.append(key)
+        elif all(isinstance(v, str) for v in values):
+            longest = max(len(v) for v in values)
+            if any(h in lowered for h in _LABEL_HINTS) and longest <= _MAX_STR_CHARS:
+                labels.append(key)
+            elif lowered.endswith("id") and longest <= 64:
+                labels.append(key)
+            elif len(set(values)) <= _MAX_CATEGORY_VALUES and longest <= 40:
+                categories.append(key)
+        elif all(isinstance(v, bool) for v in values):
+            categories.append(key)
+
+    # Prefer human-readable labels over ids; keep at most two.
+    labels.sort(key=lambda k: 0 if any(h in k.lower() for h in _LABEL_HINTS) else 1)
+    numeric.sort(key=lambda k: 0 if any(h in k.lower() for h in _SCORE_HINTS) else 1)
+    return labels[:2], numeric[:_MAX_NUMERIC_COLUMNS], categories
+
+
+def _project(row: dict, columns: list[str]) -> dict:
+    return {c: row[c] for c in columns if c in row}
+
+
+def _summarize_records(records: list[dict], top_n: int) -> Any:
+    labels, numeric, categories = _select_columns(records)
+    columns = labels + numeric + categories
+    if not columns:
+        return {"count": len(records)}
+    if len(records) <= max(top_n * 2, 1):
+        return [_project(row, columns) for row in records]
+
+    summary: dict[str, Any] = {"count": len(records)}
+    stats = {}
+    for col in numeric:
+        values = [row[col] for row in records if _is_number(row.get(col))]
+        if values:
+            stats[col] = _rollup(values)
+    if stats:
+        summary["stats"] = stats
+    counts: dict[str, dict[str, int]] = {}
+    for col in categories:
+        col_counts: dict[str, int] = {}
+        for row in records:
+            if col in row:
+                value = str(row[col])
+                col_counts[value] = col_counts.get(value, 0) + 1
+        counts[col] = col_counts
+    if counts:
+        summary["categories"] = counts
+
+    if numeric and top_n > 0:
+        primary = numeric[0]
+        ranked = sorted(
+            (row for row in records if _is_number(row.get(primary))),
+            key=lambda row: row[primary],
+            reverse=True,
+        )
+        row_columns = labels + numeric
+        summary[f"top_{top_n}_by_{primary}"] = [_project(r, row_columns) for r in ranked[:top_n]]
+        summary[f"bottom_{top_n}_by_{primary}"] = [
+            _project(r, row_columns) for r in ranked[-top_n:][::-1]
+        ]
+    return summary
+
+
+# ── Generic values ──────────────────────────────────────────
+
+
+def _summarize_value(value: Any, top_n: int, depth: int = 0) -> Any:
+    if isinstance(value, str):
+        if len(value) > _MAX_STR_CHARS:
+            return value[:_MAX_STR_CHARS] + "…"
+        return value
+    if isinstance(value, dict):
+        if depth >= _MAX_DEPTH:
+            return f"<{len(value)} fields>"
+        return {k: _summarize_value(v, top_n, depth + 1) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        items = list(value)
+        if not items:
+            return items
+        if all(_is_number(v) for v in items):
+            if len(items) <= max(top_n * 2, 1):
+                return items
+            return _rollup(items)
+        if _is_record_list(items):
+            if depth >= _MAX_DEPTH:
+                return f"<{len(items)} records>"
+            return _summarize_records(items, top_n)
+        if depth >= _MAX_DEPTH:
+            return f"<{len(items)} items>"
+        limit = max(top_n * 2, 1)
+        head = [_summarize_value(v, top_n, depth + 1) for v in items[:limit]]
+        if len(items) > limit:
+            head.append(f"…(+{len(items) - limit} more)")
+        return head
+    return value
+
+
+def _render_sections(
+    data_context: dict[str, Any],
+    compute_results: dict[str, Any],
+    top_n: int,
+) -> str:
+    sections: list[str] = []
+    if data_context:
+        lines = [
+            f"### {key}\n{_compact_json(_summarize_value(value, top_n))}"
+            for key, value in data_context.items()
+        ]
+        sections.append("## Fetched Data\n\n" + "\n\n".join(lines))
+    if compute_results:
+        # Compute results are authoritative numbers — keep them whole where
+        # possible; only oversized arrays get rolled up.
+        lines = [
+            f"### {key}\n{_compact_json(_summarize_value(value, max(top_n, DEFAULT_TOP_N)))}"
+            for key, value in compute_results.items()
+        ]
+        sections.append("## Computed Statistics\n\n" + "\n\n".join(lines))
+    return "\n\n".join(sections)
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    budget = max_tokens - estimate_tokens(_TRUNCATION_NOTE)
+    lo, hi = 0, len(text)
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if estimate_tokens(text[:mid]) <= budget:
+            lo = mid
+        else:
+            hi = mid - 1
+    return text[:lo] + _TRUNCATION_NOTE
+
+
+def summarize_data(
+    data_context: dict[str, Any],
+    compute_results: dict[str, Any],
+    *,
+    max_tokens: int = DEFAULT_MAX_TOKENS,
+    top_n: int = DEFAULT_TOP_N,
+) -> str:
+    """Render fetched data and compute results as a bounded prompt section.
+
+    Args:
+        data_context: Data fetched in executor Phase A.
+        compute_results: Results from Phase B compute nodes.
+        max_tokens: Hard cap on the estimated tokens of the result.
+            ``0`` disables the cap.
+        top_n: Rows kept from each end of large record lists.
+
+    Returns:
+        Markdown text with ``## Fetched Data`` / ``## Computed Statistics``
+        sections, or an empty string when there is no data.
+    """
+    text = ""
+    for n in dict.fromkeys((top_n, min(top_n, 3), min(top_n, 1), 0)):
+        text = _render_sections(data_context, compute_results, n)
+        if max_tokens <= 0 or estimate_tokens(text) <= max_tokens:
+            return text
+    return _truncate_to_tokens(text, max_tokens)
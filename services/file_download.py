@@ -0,0 +1,236 @@
+"""Streaming file downloads over a shared, pooled HTTP client.
+
+Attachment and document downloads used to open a fresh ``httpx.AsyncClient``
+per file and buffer the whole body in memory.  ``download_to_file`` /
+``download_to_tempfile`` stream the body to disk in chunks instead:
+
+- a size limit is enforced as bytes arrive,
+- SHA-256 (and ``Content-MD5`` when sent) is computed on the way through
+  and verified, along with the declared length,
+- transport errors resume from the last received byte via ``Range``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import base64
+import hashlib
+import logging
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_RETRIES = 3
+RETRY_BASE_DELAY = 0.5  # seconds, doubles each attempt
+
+_client: httpx.AsyncClient | None = None
+
+
+class DownloadIntegrityError(Exception):
+    """Raised when a download is truncated or fails checksum verification."""
+
+    def __init__(self, url: str, reason: str):
+        self.url = url
+        self.reason = reason
+        super().__init__(f"Download integrity check failed: {reason}")
+
+
+class DownloadTooLargeError(Exception):
+    """Raised when a download exceeds its ``max_bytes`` limit."""
+
+    def __init__(self, url: str, max_bytes: int):
+        self.url = url
+        self.max_bytes = max_bytes
+        super().__init__(f"Download exceeds {max_bytes} bytes")
+
+
+@dataclass(frozen=True)
+class DownloadedFile:
+    """A completed download on local disk."""
+
+    path: str
+    size: int
+    sha256: str
+
+
+def get_download_client() -> httpx.AsyncClient:
+    """Shared keep-alive client for file downloads (signed OSS URLs)."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            verify=False,
+            timeout=httpx.Timeout(120, connect=10),
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+        )
+    return _client
+
+
+async def close_download_client() -> None:
+    """Close the shared client (app shutdown)."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+async def download_to_tempfile(
+    url: str,
+    *,
+    suffix: str = "",
+    prefix: str = "dl_",
+    max_bytes: int = 0,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+) -> DownloadedFile:
+    """Stream *url* into a new temp file.
+
+    Args:
+        url: URL to download.
+        suffix: Temp file suffix (keep the extension for type detection).
+        prefix: Temp file prefix.
+        max_bytes: See :func:`download_to_file`.
+        max_retries: See :func:`download_to_file`.
+
+    Returns:
+        The downloaded file.  The caller owns (and must delete) ``path``.
+    """
+    fd, file_path = tempfile.mkstemp(suffix=suffix, prefix=prefix)
+    os.close(fd)
+    return await download_to_file(url, file_path, max_bytes=max_bytes, max_retries=max_retries)
+
+
+async def download_to_file(
+    url: str,
+    file_path: str,
+    *,
+    max_bytes: int = 0,
+    expected_sha256: str | None = None,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+) -> DownloadedFile:
+    """Stream *url* into *file_path*, resuming after transport errors.
+
+    The body is written to disk chunk by chunk as it arrives, so memory use
+    does not depend on file size.  On a dropped connection the download resumes
+    with ``Range: bytes=N-``; servers that ignore ranges restart from zero.
+
+    Integrity checks: received size vs. ``Content-Length`` /
+    ``Content-Range``, ``Content-MD5`` when the server sends one, and
+    *expected_sha256* when given.
+
+    Args:
+        url: URL to download.
+        file_path: Destination path (overwritten).
+        max_bytes: Abort with :class:`DownloadTooLargeError` beyond this
+            size (``0`` = unlimited).  Checked against the declared length
+            up front and against the bytes actually received.
+        expected_sha256: Hex digest the content must match.
+        max_retries: Resume attempts after transport errors.
+
+    Raises:
+        httpx.HTTPStatusError: Non-2xx response.
+        httpx.TransportError: Network failure after all retries.
+        DownloadTooLargeError: Size limit exceeded.
+        DownloadIntegrityError: Truncated body or checksum mismatch.
+    """
+    state = _DownloadState()
+    attempt = 0
+    try:
+        with open(file_path, "wb") as out:
+            while True:
+                try:
+                    await _stream_once(url, out, state, max_bytes)
+                    break
+                except httpx.TransportError as exc:
+                    attempt += 1
+                    if attempt > max_retries:
+                        raise
+                    delay = RETRY_BASE_DELAY * (2 ** (attempt - 1))
+                    logger.warning(
+                        "Download interrupted at %d bytes (%s); resuming in %.1fs [%d/%d]",
+                        state.size, exc, delay, attempt, max_retries,
+                    )
+                    await asyncio.sleep(delay)
+        state.verify(url, expected_sha256)
+    except BaseException:
+        _unlink_quietly(file_path)
+        raise
+
+    logger.debug("Downloaded %s → %s (%d bytes)", url.split("?", 1)[0], file_path, state.size)
+    return DownloadedFile(path=file_path, size=state.size, sha256=state.sha256.hexdigest())
+
+
+class _DownloadState:
+    """Bytes received so far plus running digests (survives resumes)."""
+
+    def __init__(self) -> None:
+        self.reset()
+        self.total: int | None = None
+
+    def reset(self) -> None:
+        self.size = 0
+        self.sha256 = hashlib.sha256()
+        self.md5: Any = None
+        self.expected_md5: str | None = None
+
+    def verify(self, url: str, expected_sha256: str | None) -> None:
+        if self.total is not None and self.size != self.total:
+            raise DownloadIntegrityError(url, f"received {self.size} of {self.total} bytes")
+        if self.md5 is not None:
+            actual = base64.b64encode(self.md5.digest()).decode()
+            if actual != self.expected_md5:
+                raise DownloadIntegrityError(url, "Content-MD5 mismatch")
+        if expected_sha256 and self.sha256.hexdigest() != expected_sha256.lower():
+            raise DownloadIntegrityError(url, "SHA-256 mismatch")
+
+
+async def _stream_once(url: str, out: Any, state: _DownloadState, max_bytes: int) -> None:
+    headers = {"Range": f"bytes={state.size}-"} if state.size else None
+    async with get_download_client().stream("GET", url, headers=headers) as resp:
+        resp.raise_for_status()
+        if state.size and resp.status_code != 206:
+            # Range ignored — start over
+            out.seek(0)
+            out.truncate()
+            state.reset()
+        if state.size == 0:
+            state.total = _declared_length(resp)
+            content_md5 = resp.headers.get("Content-MD5")
+            if content_md5:
+                state.expected_md5 = content_md5
+                state.md5 = hashlib.md5()
+        if max_bytes and state.total is not None and state.total > max_bytes:
+            raise DownloadTooLargeError(url, max_bytes)
+
+        # No re-chunking: every byte received is on disk before a reset.
+        async for chunk in resp.aiter_bytes():
+            state.size += len(chunk)
+            if max_bytes and state.size > max_bytes:
+                raise DownloadTooLargeError(url, max_bytes)
+            state.sha256.update(chunk)
+            if state.md5 is not None:
+                state.md5.update(chunk)
+            out.write(chunk)
+
+
+def _declared_length(resp: httpx.Response) -> int | None:
+    """Full object size from ``Content-Range`` (206) or ``Content-Length``."""
+    content_range = resp.headers.get("Content-Range", "")
+    if "/" in content_range:
+        total = content_range.rsplit("/", 1)[1]
+        return int(total) if total.isdigit() else None
+    if "Content-Encoding" in resp.headers:
+        return None  # Content-Length counts compressed bytes
+    length = resp.headers.get("Content-Length", "")
+    return int(length) if length.isdigit() else None
+
+
+def _unlink_quietly(path: str) -> None:
+    try:
+        os.unlink(path)
+    except OSError:
+        pass
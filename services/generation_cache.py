@@ -0,0 +1,343 @@
+"""Idempotent generation: fingerprinted jobs, in-flight dedup and replay.
+
+Teachers re-submit ``/api/page/generate``, ``/api/workflow/generate`` and
+quiz requests after a network hiccup or a double click; each duplicate
+used to run the whole multi-minute LLM pipeline again.  Generation now
+goes through :class:`GenerationCache`:
+
+- **Fingerprint** — ``gen:{kind}:{sha256}`` over the canonical JSON of the
+  normalized inputs (``normalize_inputs``: NFC + collapsed whitespace for
+  strings, volatile keys such as ids and timestamps dropped), plus the
+  teacher, the resolved model and the teacher's *data version* (see
+  :func:`data_version`).
+- **In-flight dedup** — the first request starts a detached job that
+  records every event it produces; duplicates attach to the same job and
+  follow its event log from the start, so they see the same progress
+  stream and cost zero extra tokens.  The job keeps running if the client
+  that started it disconnects (the retry is usually on its way), holding
+  a ``detached_run_slot`` (``services/concurrency.py``) while it produces.
+- **Replay** — completed event logs accepted by ``cacheable`` are kept for
+  ``generation_cache_ttl_s`` in a per-worker LRU and, optionally, a shared
+  tier (``generation_cache_backend = "disk" | "redis"``, same backends as
+  the media cache) and replayed instantly.
+
+Requests sent with ``Cache-Control: no-cache`` bypass replay and in-flight
+dedup (explicit "regenerate").  Outcomes are counted per kind under the
+``generation_cache_{kind}`` counter (``hit`` / ``miss`` / ``coalesced`` /
+``bypass``).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable
+
+from config.settings import get_settings
+from services.concurrency import detached_run_slot
+from services.media_cache import (
+    DiskMediaCache,
+    MediaCacheBackend,
+    RedisMediaCache,
+    media_cache_key,
+    normalize_text,
+)
+from services.metrics import get_metrics_collector
+from services.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# Keys that differ between otherwise identical submissions.
+_VOLATILE_KEYS = frozenset({
+    "id", "created_at", "createdAt", "request_id", "requestId", "turn_id", "turnId",
+    "timestamp", "nonce",
+})
+
+EventProducer = Callable[[], AsyncIterator[Any]]
+
+
+# ── Fingerprints ────────────────────────────────────────────
+
+
+def normalize_inputs(value: Any) -> Any:
+    """Canonical form of request inputs for fingerprinting."""
+    if isinstance(value, str):
+        return normalize_text(value)
+    if isinstance(value, dict):
+        return {
+            str(k): normalize_inputs(v)
+            for k, v in value.items()
+            if k not in _VOLATILE_KEYS and v is not None
+        }
+    if isinstance(value, (list, tuple)):
+        return [normalize_inputs(v) for v in value]
+    return value
+
+
+def data_version(teacher_id: str, context: dict[str, Any] | None = None) -> str:
+    """Version of the teacher's data a result was computed from.
+
+    An explicit ``dataVersion`` from the client wins; otherwise results are
+    only reused within the same ``generation_cache_data_window_s`` bucket,
+    which bounds how stale a replayed page can be.
+    """
+    explicit = (context or {}).get("dataVersion")
+    if explicit:
+        return f"v:{explicit}"
+    window = get_settings().generation_cache_data_window_s
+    if window <= 0:
+        return "static"
+    return f"w:{int(time.time() // window)}"
+
+
+def generation_fingerprint(
+    kind: str,
+    inputs: dict[str, Any],
+    *,
+    teacher_id: str = "",
+    model: str = "",
+    version: str = "",
+) -> str:
+    return media_cache_key(f"gen:{kind}", {
+        "inputs": normalize_inputs(inputs),
+        "teacher": teacher_id,
+        "model": model,
+        "data": version,
+    })
+
+
+# ── Jobs ────────────────────────────────────────────────────
+
+
+@dataclass
+class GenerationJob:
+    """One generation run and the events it has produced so far."""
+
+    key: str
+    kind: str
+    events: list[Any] = field(default_factory=list)
+    status: str = "running"  # "running" | "done" | "failed"
+    error: str = ""
+    replayed: bool = False
+    task: asyncio.Task[None] | None = field(default=None, repr=False)
+    _changed: asyncio.Condition = field(default_factory=asyncio.Condition, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status != "running"
+
+    async def append(self, event: Any) -> None:
+        self.events.append(event)
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def finish(self, status: str, error: str = "") -> None:
+        self.status = status
+        self.error = error
+        async with self._changed:
+            self._changed.notify_all()
+
+    async def follow(self, start: int = 0) -> AsyncIterator[Any]:
+        """Yield events from *start*, waiting for new ones until the job ends."""
+        index = start
+        while True:
+            while index < len(self.events):
+                yield self.events[index]
+                index += 1
+            if self.done:
+                return
+            async with self._changed:
+                await self._changed.wait_for(lambda: self.done or len(self.events) > index)
+
+
+class GenerationCache:
+    """Per-key single-flight generation jobs plus a replay store."""
+
+    def __init__(
+        self,
+        *,
+        max_size: int = 256,
+        ttl_s: float = 600.0,
+        backend: MediaCacheBackend | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._ttl_s = ttl_s
+        self._completed: TTLCache[str, list[Any]] = TTLCache(
+            max_size=max_size, ttl_seconds=ttl_s, clock=clock,
+        )
+        self._backend = backend
+        self._inflight: dict[str, GenerationJob] = {}
+        self._tasks: set[asyncio.Task[None]] = set()  # strong refs for detached runs
+
+    def start(
+        self,
+        kind: str,
+        key: str,
+        produce: EventProducer,
+        *,
+        cacheable: Callable[[list[Any]], bool],
+        bypass: bool = False,
+    ) -> GenerationJob:
+        """Return the job for *key*, starting *produce* only if none can be reused."""
+        metrics = get_metrics_collector()
+        counter = f"generation_cache_{kind}"
+
+        if bypass:
+            metrics.increment(counter, "bypass")
+            return self._launch(kind, key, produce, cacheable, check_backend=False, register=False)
+
+        events = self._completed.get(key)
+        if events is not None:
+            metrics.increment(counter, "hit")
+            return GenerationJob(key, kind, events=list(events), status="done", replayed=True)
+
+        job = self._inflight.get(key)
+        if job is not None and not job.done:
+            metrics.increment(counter, "coalesced")
+            return job
+
+        return self._launch(kind, key, produce, cacheable, check_backend=True, register=True)
+
+    async def stream(
+        self,
+        kind: str,
+        key: str,
+        produce: EventProducer,
+        *,
+        cacheable: Callable[[list[Any]], bool],
+        bypass: bool = False,
+    ) -> AsyncIterator[Any]:
+        """Events of the (possibly shared or replayed) job for *key*."""
+        job = self.start(kind, key, produce, cacheable=cacheable, bypass=bypass)
+        async for event in job.follow():
+            yield event
+        if job.status == "failed":
+            raise GenerationFailed(job.error)
+
+    def _launch(
+        self,
+        kind: str,
+        key: str,
+        produce: EventProducer,
+        cacheable: Callable[[list[Any]], bool],
+        *,
+        check_backend: bool,
+        register: bool,
+    ) -> GenerationJob:
+        job = GenerationJob(key, kind)
+        job.task = asyncio.create_task(self._run(job, produce, cacheable, check_backend))
+        self._tasks.add(job.task)
+        job.task.add_done_callback(self._tasks.discard)
+        if register:
+            self._inflight[key] = job
+            job.task.add_done_callback(lambda _: self._forget_inflight(job))
+        return job
+
+    async def _run(
+        self,
+        job: GenerationJob,
+        produce: EventProducer,
+        cacheable: Callable[[list[Any]], bool],
+        check_backend: bool,
+    ) -> None:
+        counter = f"generation_cache_{job.kind}"
+        try:
+            stored = await self._backend_get(job.key) if check_backend else None
+            if stored is not None:
+                get_metrics_collector().increment(counter, "hit")
+                job.replayed = True
+                job.events.extend(stored)
+                self._completed.set(job.key, stored)
+                await job.finish("done")
+                return
+
+            if check_backend:
+                get_metrics_collector().increment(counter, "miss")
+            async with detached_run_slot():
+                async for event in produce():
+                    await job.append(event)
+        except asyncio.CancelledError:
+            await job.finish("failed", "cancelled")
+            raise
+        except Exception as exc:
+            logger.exception("Generation job %s failed", job.key)
+            await job.finish("failed", str(exc) or type(exc).__name__)
+            return
+
+        store = cacheable(job.events)
+        if store:
+            self._completed.set(job.key, list(job.events))
+        await job.finish("done")
+        if store:
+            await self._backend_set(job.key, job.events)
+
+    def _forget_inflight(self, job: GenerationJob) -> None:
+        if self._inflight.get(job.key) is job:
+            del self._inflight[job.key]
+
+    async def _backend_get(self, key: str) -> list[Any] | None:
+        if self._backend is None:
+            return None
+        try:
+            entry = await self._backend.get(key)
+        except Exception as exc:
+            logger.warning("Generation cache read failed: %s", exc)
+            return None
+        return entry.get("events") if entry else None
+
+    async def _backend_set(self, key: str, events: list[Any]) -> None:
+        if self._backend is None:
+            return
+        try:
+            await self._backend.set(key, {"events": events}, self._ttl_s)
+        except Exception as exc:
+            logger.warning("Generation cache write failed: %s", exc)
+
+    def clear(self) -> None:
+        """Drop the per-worker replay tier (running jobs are kept)."""
+        self._completed.clear()
+
+    async def close(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        self._tasks.clear()
+        self._inflight.clear()
+        if self._backend is not None:
+            await self._backend.close()
+
+
+class GenerationFailed(RuntimeError):
+    """The shared generation job raised; every follower sees the same error."""
+
+
+_generation_cache: GenerationCache | None = None
+
+
+def get_generation_cache() -> GenerationCache | None:
+    """Worker-wide generation cache, or None when ``generation_cache_enabled`` is off."""
+    global _generation_cache
+    settings = get_settings()
+    if not settings.generation_cache_enabled:
+        return None
+    if _generation_cache is None:
+        backend: MediaCacheBackend | None = None
+        if settings.generation_cache_backend == "disk":
+            backend = DiskMediaCache(settings.generation_cache_dir)
+        elif settings.generation_cache_backend == "redis" and settings.redis_url:
+            backend = RedisMediaCache(settings.redis_url, prefix="generation:")
+        _generation_cache = GenerationCache(
+            max_size=settings.generation_cache_size,
+            ttl_s=settings.generation_cache_ttl_s,
+            backend=backend,
+        )
+    return _generation_cache
+
+
+async def close_generation_cache() -> None:
+    """Cancel running jobs and close the shared-tier connection (app shutdown)."""
+    global _generation_cache
+    if _generation_cache is not None:
+        await _generation_cache.close()
+        _generation_cache = None
@@ -0,0 +1,166 @@
+"""Search/replace patching for interactive HTML artifacts.
+
+Small edits to a stored interactive page ("make the button blue") used to
+regenerate the whole document with the code model — tens of seconds and
+up to 16K output tokens.  Instead the code model is asked for targeted
+edits in a SEARCH/REPLACE block format::
+
+    <<<<<<< SEARCH
+    .btn { background: #999; }
+    =======
+    .btn { background: #2563eb; }
+    >>>>>>> REPLACE
+
+The edits are parsed, applied to the stored HTML locally and the result is
+validated.  Any failure raises ``HtmlPatchError`` so the caller can fall
+back to full regeneration.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from html.parser import HTMLParser
+
+_SEARCH_MARKER = re.compile(r"^<{5,9} ?SEARCH\s*$")
+_DIVIDER_MARKER = re.compile(r"^={5,9}\s*$")
+_REPLACE_MARKER = re.compile(r"^>{5,9} ?REPLACE\s*$")
+
+# Tags whose open/close counts must stay balanced after patching.
+_STRUCTURAL_TAGS = ("html", "head", "body", "script", "style")
+
+
+class HtmlPatchError(ValueError):
+    """Raised when model edits cannot be parsed, applied or validated."""
+
+
+@dataclass(frozen=True)
+class HtmlEdit:
+    """Replace the single occurrence of ``search`` with ``replace``."""
+
+    search: str
+    replace: str
+
+
+def parse_html_edits(text: str) -> list[HtmlEdit]:
+    """Parse SEARCH/REPLACE blocks from a model response.
+
+    Text outside the blocks (explanations, code fences) is ignored.
+    Raises ``HtmlPatchError`` on an unterminated block or when no block
+    is present.
+    """
+    edits: list[HtmlEdit] = []
+    search: list[str] = []
+    replace: list[str] = []
+    state = "outside"
+
+    for line in text.splitlines():
+        if state == "outside":
+            if _SEARCH_MARKER.match(line):
+                search, replace = [], []
+                state = "search"
+        elif state == "search":
+            if _DIVIDER_MARKER.match(line):
+                state = "replace"
+            else:
+                search.append(line)
+        elif _REPLACE_MARKER.match(line):
+            if not "".join(search).strip():
+                raise HtmlPatchError(f"edit {len(edits)} has an empty SEARCH section")
+            edits.append(HtmlEdit("\n".join(search), "\n".join(replace)))
+            state = "outside"
+        else:
+            replace.append(line)
+
+    if state != "outside":
+        raise HtmlPatchError("unterminated SEARCH/REPLACE block")
+    if not edits:
+        raise HtmlPatchError("no SEARCH/REPLACE blocks found")
+    return edits
+
+
+def _locate(html: str, search: str) -> tuple[int, int] | None:
+    """Return the ``(start, end)`` span of the unique match of *search*.
+
+    Tries an exact match first, then a match that ignores per-line
+    indentation and trailing whitespace (models often re-indent).
+    """
+    count = html.count(search)
+    if count == 1:
+        start = html.index(search)
+        return start, start + len(search)
+    if count > 1:
+        raise HtmlPatchError(f"SEARCH text is ambiguous ({count} matches)")
+
+    lines = [line.strip() for line in search.strip("\n").splitlines()]
+    if not lines:
+        return None
+    pattern = r"[ \t]*" + r"[ \t]*\r?\n[ \t]*".join(re.escape(line) for line in lines) + r"[ \t]*"
+    matches = list(re.finditer(pattern, html))
+    if len(matches) > 1:
+        raise HtmlPatchError(f"SEARCH text is ambiguous ({len(matches)} matches)")
+    if not matches:
+        return None
+    return matches[0].span()
+
+
+def apply_html_edits(html: str, edits: list[HtmlEdit]) -> str:
+    """Apply *edits* in order; each SEARCH must match exactly one location."""
+    for idx, edit in enumerate(edits):
+        span = _locate(html, edit.search)
+        if span is None:
+            raise HtmlPatchError(f"edit {idx}: SEARCH text not found in document")
+        start, end = span
+        html = html[:start] + edit.replace + html[end:]
+    return html
+
+
+class _TagCounter(HTMLParser):
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=True)
+        self.counts: dict[str, list[int]] = {tag: [0, 0] for tag in _STRUCTURAL_TAGS}
+
+    def handle_starttag(self, tag: str, attrs) -> None:
+        if tag in self.counts:
+            self.counts[tag][0] += 1
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self.counts:
+            self.counts[tag][1] += 1
+
+
+def _tag_counts(html: str) -> dict[str, list[int]]:
+    parser = _TagCounter()
+    parser.feed(html)
+    parser.close()
+    return parser.counts
+
+
+def validate_patched_html(original: str, patched: str) -> None:
+    """Reject patches that break the document structure.
+
+    The patched document must be non-empty and keep every structural tag
+    (html/head/body/script/style) balanced wherever the original was.
+    """
+    if not patched.strip():
+        raise HtmlPatchError("patched document is empty")
+    before = _tag_counts(original)
+    after = _tag_counts(patched)
+    for tag in _STRUCTURAL_TAGS:
+        was_balanced = before[tag][0] == before[tag][1]
+        opened, closed = after[tag]
+        if was_balanced and opened != closed:
+            raise HtmlPatchError(f"unbalanced <{tag}> tags after patch ({opened} open, {closed} close)")
+        if before[tag][0] and not opened and tag in ("html", "body"):
+            raise HtmlPatchError(f"patch removed the <{tag}> element")
+
+
+def patch_html(original: str, model_output: str) -> tuple[str, int]:
+    """Parse, apply and validate *model_output* against *original*.
+
+    Returns ``(patched_html, edit_count)``; raises ``HtmlPatchError``.
+    """
+    edits = parse_html_edits(model_output)
+    patched = apply_html_edits(original, edits)
+    validate_patched_html(original, patched)
+    return patched, len(edits)
@@ -8,18 +8,30 @@ Wraps ``httpx.AsyncClient`` with:
 - circuit breaker: auto-degrade to mock after N consecutive failures
 - request timing logs
 - connection-pool lifecycle tied to FastAPI lifespan
+- optional HTTP/2 transport (``spring_boot_http2``, needs ``h2``)
+- GET response cache with ETag / Last-Modified revalidation; POST / PUT
+  evict cached GETs under the written resource's collection
+- in-flight dedup: concurrent identical GETs share one upstream request
+- ``fan_out`` helper for per-entity loops with bounded concurrency
 """
 
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
+import re
 import time
-from typing import Any
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Iterable, TypeVar
 
 import httpx
+from opentelemetry import trace
 
 from config.settings import get_settings
+from services.metrics import get_metrics_collector
+from services.tracing import current_span, span
+from services.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +46,86 @@ RETRY_BASE_DELAY = 0.5  # seconds, doubles each attempt
 CIRCUIT_OPEN_THRESHOLD = 5  # consecutive failures before circuit opens
 CIRCUIT_RESET_TIMEOUT = 60  # seconds before attempting to close circuit
 
+_MAX_AGE_RE = re.compile(r"max-age\s*=\s*(\d+)")
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+async def fan_out(
+    items: Iterable[T],
+    fn: Callable[[T], Awaitable[R]],
+    *,
+    limit: int = 8,
+    return_exceptions: bool = False,
+) -> list[R | BaseException]:
+    """Run ``fn(item)`` for every item with at most *limit* in flight.
+
+    Results keep the order of *items*.  With ``return_exceptions`` a failed
+    item yields its exception instead of cancelling the rest.
+    """
+    semaphore = asyncio.Semaphore(max(limit, 1))
+
+    async def _run(item: T) -> R:
+        async with semaphore:
+            return await fn(item)
+
+    return await asyncio.gather(
+        *(_run(item) for item in items), return_exceptions=return_exceptions,
+    )
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+@dataclass
+class _CachedResponse:
+    """Body and validators of a successful GET."""
+
+    content: bytes
+    etag: str | None
+    last_modified: str | None
+    fresh_until: float
+
+    def value(self) -> Any:
+        return json.loads(self.content) if self.content else {}
+
+    def conditional_headers(self) -> dict[str, str]:
+        headers: dict[str, str] = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def _cache_key(path: str, params: dict[str, Any] | None) -> tuple:
+    if not params:
+        return (path,)
+    return (path, tuple(sorted((str(k), str(v)) for k, v in params.items())))
+
+
+def _resource_prefix(path: str) -> str:
+    """Collection a write to *path* may change.
+
+    ``/studio/teacher/me/files/f1/parse-status`` → ``/studio/teacher/me/files``
+    (the item, its sub-resources and the listing).  Single-segment paths
+    only cover themselves.
+    """
+    segments = [s for s in path.split("?", 1)[0].split("/") if s]
+    keep = max(1, len(segments) - 2)
+    return "/" + "/".join(segments[:keep])
+
+
+def _under(path: str, prefix: str) -> bool:
+    path = "/" + path.split("?", 1)[0].strip("/")
+    return path == prefix or path.startswith(prefix + "/")
+
 
 class JavaClientError(Exception):
     """Raised when the Java backend returns a non-2xx response."""
@@ -58,13 +150,24 @@ class CircuitOpenError(Exception):
 class JavaClient:
     """Async HTTP client for the SpringBoot backend with retry and circuit breaker."""
 
-    def __init__(self) -> None:
+    def __init__(self, *, transport: httpx.AsyncBaseTransport | None = None) -> None:
         settings = get_settings()
         self._base_url = f"{settings.spring_boot_base_url.rstrip('/')}{settings.spring_boot_api_prefix}"
         self._timeout = settings.spring_boot_timeout
         self._access_token = settings.spring_boot_access_token
         self._refresh_token = settings.spring_boot_refresh_token
         self._http: httpx.AsyncClient | None = None
+        self._transport = transport
+        self._http2 = settings.spring_boot_http2
+
+        # GET response cache + in-flight dedup
+        self._cache_fresh_s = settings.spring_boot_cache_fresh_s
+        self._response_cache: TTLCache[tuple, _CachedResponse] | None = (
+            TTLCache(max_size=settings.spring_boot_cache_size, ttl_seconds=0)
+            if settings.spring_boot_cache_size > 0 else None
+        )
+        self._inflight: dict[tuple, asyncio.Task[Any]] = {}
+        self._fanout_limit = settings.spring_boot_fanout_concurrency
 
         # Internal secret for AI Agent → Java internal calls (parse-status, download)
         self._internal_secret = settings.internal_api_secret
@@ -92,8 +195,13 @@ class JavaClient:
         """
         if self._http is not None:
             return
+        http2 = self._http2 and _http2_available()
+        if self._http2 and not http2:
+            logger.warning("spring_boot_http2 enabled but 'h2' is not installed; using HTTP/1.1")
         self._http = httpx.AsyncClient(
             base_url=self._base_url,
+            transport=self._transport,
+            http2=http2,
             timeout=httpx.Timeout(self._timeout),
             headers=self._auth_headers(),
             verify=False,  # internal API – skip TLS verification
@@ -103,7 +211,7 @@ class JavaClient:
                 keepalive_expiry=30,
             ),
         )
-        logger.info("JavaClient started — base_url=%s", self._base_url)
+        logger.info("JavaClient started — base_url=%s http2=%s", self._base_url, http2)
 
         # Auto-login with DIFY credentials if configured
         if self._dify_account and self._dify_password:
@@ -127,18 +235,82 @@ class JavaClient:
     async def get(self, path: str, params: dict[str, Any] | None = None) -> Any:
         """Send a GET request with retry and circuit-breaker logic.
 
+        Fresh cached responses are returned without a request; stale ones
+        are revalidated with ``If-None-Match`` / ``If-Modified-Since``.
+        Concurrent calls for the same path + params share one request.
+
         Raises :class:`JavaClientError` on non-retryable errors (4xx).
         Raises :class:`CircuitOpenError` when circuit is open.
         """
-        return await self._request_with_retry("GET", path, params=params)
+        metrics = get_metrics_collector()
+        key = _cache_key(path, params)
+        cached = self._response_cache.get(key) if self._response_cache is not None else None
+        if cached is not None and time.monotonic() < cached.fresh_until:
+            metrics.increment("java_client_get", "fresh_hit")
+            return cached.value()
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(
+                self._request_with_retry("GET", path, params=params, cached=cached, cache_key=key)
+            )
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._forget_inflight(key, t))
+        else:
+            metrics.increment("java_client_get", "coalesced")
+        return await asyncio.shield(task)
+
+    async def fan_out(
+        self,
+        items: Iterable[T],
+        fn: Callable[[T], Awaitable[R]],
+        *,
+        limit: int | None = None,
+        return_exceptions: bool = False,
+    ) -> list[R | BaseException]:
+        """Per-entity calls with bounded concurrency (``spring_boot_fanout_concurrency``)."""
+        return await fan_out(
+            items, fn,
+            limit=limit or self._fanout_limit,
+            return_exceptions=return_exceptions,
+        )
+
+    def clear_cache(self) -> None:
+        """Drop all cached GET responses."""
+        if self._response_cache is not None:
+            self._response_cache.clear()
+
+    def invalidate(self, path: str) -> None:
+        """Evict cached GETs a write to *path* may have made stale.
+
+        GETs still in flight are detached so later calls do not join a
+        pre-write request, and their response is dropped once it lands.
+        """
+        prefix = _resource_prefix(path)
+        if self._response_cache is not None:
+            for key in self._response_cache.keys():
+                if _under(key[0], prefix):
+                    self._response_cache.pop(key)
+        for key, task in list(self._inflight.items()):
+            if _under(key[0], prefix):
+                del self._inflight[key]
+                if self._response_cache is not None:
+                    cache = self._response_cache
+                    task.add_done_callback(lambda _t, key=key: cache.pop(key))
 
     async def post(self, path: str, json_body: dict[str, Any] | None = None) -> Any:
         """Send a POST request with retry and circuit-breaker logic."""
-        return await self._request_with_retry("POST", path, json_body=json_body)
+        try:
+            return await self._request_with_retry("POST", path, json_body=json_body)
+        finally:
+            self.invalidate(path)
 
     async def put(self, path: str, json_body: dict[str, Any] | None = None) -> Any:
         """Send a PUT request with retry and circuit-breaker logic."""
-        return await self._request_with_retry("PUT", path, json_body=json_body)
+        try:
+            return await self._request_with_retry("PUT", path, json_body=json_body)
+        finally:
+            self.invalidate(path)
 
     # -- token management ----------------------------------------------------
 
@@ -254,9 +426,14 @@ class JavaClient:
         path: str,
         params: dict[str, Any] | None = None,
         json_body: dict[str, Any] | None = None,
+        cached: _CachedResponse | None = None,
+        cache_key: tuple | None = None,
     ) -> Any:
         """Execute an HTTP request with exponential-backoff retry.
 
+        For GETs, *cached* supplies validators for a conditional request and
+        *cache_key* stores the new response in the response cache.
+
         Retries on:
         - Network errors (``httpx.TransportError``)
         - Server errors (5xx)
@@ -268,20 +445,40 @@ class JavaClient:
         if self.circuit_open:
             raise CircuitOpenError()
 
+        with span(
+            "java.request",
+            {"http.request.method": method, "url.path": path},
+            kind=trace.SpanKind.CLIENT,
+        ):
+            return await self._attempt_requests(method, path, params, json_body, cached, cache_key)
+
+    async def _attempt_requests(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None,
+        json_body: dict[str, Any] | None,
+        cached: _CachedResponse | None,
+        cache_key: tuple | None,
+    ) -> Any:
         client = self._ensure_started()
+        request_span = current_span()
         last_exc: Exception | None = None
 
         for attempt in range(1, MAX_RETRIES + 1):
+            request_span.set_attribute("http.request.resend_count", attempt - 1)
             t0 = time.monotonic()
             try:
                 if method == "GET":
-                    response = await client.get(path, params=params)
+                    headers = cached.conditional_headers() if cached is not None else None
+                    response = await client.get(path, params=params, headers=headers)
                 elif method == "PUT":
                     response = await client.put(path, json=json_body)
                 else:
                     response = await client.post(path, json=json_body)
 
                 elapsed_ms = (time.monotonic() - t0) * 1000
+                request_span.set_attribute("http.response.status_code", response.status_code)
                 logger.info(
                     "%s %s → %d (%.0fms)",
                     method, path, response.status_code, elapsed_ms,
@@ -324,8 +521,18 @@ class JavaClient:
                         continue
                     raise last_exc
 
+                # Not modified: serve the cached body
+                if response.status_code == 304 and cached is not None:
+                    self._record_success()
+                    get_metrics_collector().increment("java_client_get", "revalidated")
+                    cached.fresh_until = time.monotonic() + self._freshness(response)
+                    return cached.value()
+
                 # Success
                 self._record_success()
+                if cache_key is not None:
+                    get_metrics_collector().increment("java_client_get", "miss")
+                    self._store_response(cache_key, response)
                 if not response.text:
                     return {}
                 return response.json()
@@ -346,6 +553,51 @@ class JavaClient:
         # Exhausted all retries
         raise last_exc  # type: ignore[misc]
 
+    # -- response cache ------------------------------------------------------
+
+    def _freshness(self, response: httpx.Response) -> float:
+        """Seconds a response may be served without revalidation."""
+        cache_control = response.headers.get("Cache-Control")
+        if isinstance(cache_control, str):
+            cache_control = cache_control.lower()
+            if "no-cache" in cache_control or "no-store" in cache_control:
+                return 0.0
+            match = _MAX_AGE_RE.search(cache_control)
+            if match:
+                return float(match.group(1))
+        return self._cache_fresh_s
+
+    def _store_response(self, key: tuple, response: httpx.Response) -> None:
+        if self._response_cache is None or response.status_code != 200:
+            return
+        content = response.content
+        if not isinstance(content, bytes):
+            return
+        cache_control = response.headers.get("Cache-Control")
+        if isinstance(cache_control, str) and "no-store" in cache_control.lower():
+            self._response_cache.pop(key)
+            return
+        etag = response.headers.get("ETag")
+        etag = etag if isinstance(etag, str) else None
+        last_modified = response.headers.get("Last-Modified")
+        last_modified = last_modified if isinstance(last_modified, str) else None
+        freshness = self._freshness(response)
+        if not (etag or last_modified or freshness > 0):
+            return
+        self._response_cache.set(key, _CachedResponse(
+            content=content,
+            etag=etag,
+            last_modified=last_modified,
+            fresh_until=time.monotonic() + freshness,
+        ))
+
+    def _forget_inflight(self, key: tuple, task: asyncio.Task[Any]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the error as retrieved even if every waiter was cancelled.
+        if not task.cancelled():
+            task.exception()
+
     # -- internals -----------------------------------------------------------
 
     def _auth_headers(self) -> dict[str, str]:
@@ -2,15 +2,23 @@
 
 Phase 7 P1-2: Provides access to structured knowledge point definitions
 for curriculum alignment and weakness-targeted question generation.
+
+Each registry file is compiled once into a ``KnowledgeGraph`` (id index,
+prerequisite adjacency, reverse "unlocks" edges and precomputed transitive
+prerequisite closures).  Graphs are cached per (subject, level) and shared
+across requests — the ``KnowledgePoint`` objects they return must be
+treated as read-only.
 """
 
 from __future__ import annotations
 
 import json
 import logging
+from dataclasses import dataclass
 from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
 
 from models.data import KnowledgePoint
 
@@ -184,15 +192,145 @@ def load_knowledge_registry(subject: str, level: str = "DSE") -> dict[str, Any]:
         return {}
 
 
-def get_knowledge_point(knowledge_point_id: str) -> KnowledgePoint | None:
-    """Get a single knowledge point by ID.
+@dataclass(frozen=True)
+class KnowledgeGraph:
+    """Compiled, read-only view of one knowledge registry.
+
+    Attributes:
+        nodes: Knowledge point id → ``KnowledgePoint``.
+        units: Unit id → knowledge point ids in registry order.
+        unit_names: Unit name → unit id.
+        prerequisites: Id → direct prerequisite ids (as declared).
+        unlocks: Id → ids that list it as a direct prerequisite.
+        closures: Id → prerequisite chain ids, prerequisites before
+            dependents, ending with the id itself.  Prerequisite ids that
+            are not in this registry appear as-is (not expanded).
+        cycles: Prerequisite edges skipped because they close a cycle,
+            as ``(from_id, prerequisite_id)`` pairs.
+    """
 
-    Args:
-        knowledge_point_id: Knowledge point ID (e.g., "DSE-ENG-U5-RC-01").
+    nodes: Mapping[str, KnowledgePoint]
+    units: Mapping[str, tuple[str, ...]]
+    unit_names: Mapping[str, str]
+    prerequisites: Mapping[str, tuple[str, ...]]
+    unlocks: Mapping[str, tuple[str, ...]]
+    closures: Mapping[str, tuple[str, ...]]
+    cycles: tuple[tuple[str, str], ...] = ()
 
-    Returns:
-        KnowledgePoint object if found, None otherwise.
+    def __contains__(self, knowledge_point_id: object) -> bool:
+        return knowledge_point_id in self.nodes
+
+    def get(self, knowledge_point_id: str) -> KnowledgePoint | None:
+        return self.nodes.get(knowledge_point_id)
+
+    def unit_ids(self, unit: str) -> tuple[str, ...]:
+        """Knowledge point ids of a unit given by id or name."""
+        unit_id = unit if unit in self.units else self.unit_names.get(unit, "")
+        return self.units.get(unit_id, ())
+
+
+def _compile_closures(
+    node_ids: list[str],
+    prerequisites: Mapping[str, tuple[str, ...]],
+) -> tuple[dict[str, tuple[str, ...]], list[tuple[str, str]]]:
+    """Depth-first post-order prerequisite chains for every node.
+
+    Iterative (no recursion limit) with white/grey/black colouring; an edge
+    into a grey node closes a cycle and is skipped.
     """
+    closures: dict[str, tuple[str, ...]] = {}
+    cycles: list[tuple[str, str]] = []
+    on_stack: set[str] = set()
+
+    for root in node_ids:
+        if root in closures:
+            continue
+        stack: list[tuple[str, int]] = [(root, 0)]
+        on_stack.add(root)
+        while stack:
+            node, idx = stack[-1]
+            prereqs = prerequisites.get(node, ())
+            if idx < len(prereqs):
+                stack[-1] = (node, idx + 1)
+                child = prereqs[idx]
+                if child in on_stack:
+                    cycles.append((node, child))
+                elif child not in closures and child in prerequisites:
+                    on_stack.add(child)
+                    stack.append((child, 0))
+                continue
+            # All prerequisites done — merge their chains in declared order.
+            seen: set[str] = set()
+            chain: list[str] = []
+            for child in prereqs:
+                if (node, child) in cycles:
+                    continue
+                for cid in closures.get(child, (child,)):
+                    if cid not in seen and cid != node:
+                        seen.add(cid)
+                        chain.append(cid)
+            chain.append(node)
+            closures[node] = tuple(chain)
+            on_stack.discard(node)
+            stack.pop()
+
+    return closures, cycles
+
+
+def compile_knowledge_graph(registry: dict[str, Any], level: str = "DSE") -> KnowledgeGraph:
+    """Build a ``KnowledgeGraph`` from a raw registry dict."""
+    nodes: dict[str, KnowledgePoint] = {}
+    units: dict[str, tuple[str, ...]] = {}
+    unit_names: dict[str, str] = {}
+
+    for unit in registry.get("units", []):
+        unit_id = unit.get("id", "")
+        ids: list[str] = []
+        for kp in unit.get("knowledgePoints", []):
+            nodes[kp["id"]] = KnowledgePoint(
+                id=kp["id"],
+                name=kp["name"],
+                subject=registry.get("subject", ""),
+                unit=unit_id,
+                level=registry.get("level", level),
+                description=kp.get("description", ""),
+                skill_tags=kp.get("skillTags", []),
+                prerequisites=kp.get("prerequisites", []),
+                difficulty=kp.get("difficulty", "medium"),
+            )
+            ids.append(kp["id"])
+        units[unit_id] = tuple(ids)
+        if unit.get("name"):
+            unit_names[unit["name"]] = unit_id
+
+    prerequisites = {kp_id: tuple(kp.prerequisites) for kp_id, kp in nodes.items()}
+    unlocks: dict[str, list[str]] = {}
+    for kp_id, prereqs in prerequisites.items():
+        for prereq in prereqs:
+            unlocks.setdefault(prereq, []).append(kp_id)
+
+    closures, cycles = _compile_closures(list(nodes), prerequisites)
+    for edge in cycles:
+        logger.warning("Knowledge prerequisite cycle skipped: %s -> %s", *edge)
+
+    return KnowledgeGraph(
+        nodes=MappingProxyType(nodes),
+        units=MappingProxyType(units),
+        unit_names=MappingProxyType(unit_names),
+        prerequisites=MappingProxyType(prerequisites),
+        unlocks=MappingProxyType({k: tuple(v) for k, v in unlocks.items()}),
+        closures=MappingProxyType(closures),
+        cycles=tuple(cycles),
+    )
+
+
+@lru_cache(maxsize=32)
+def get_knowledge_graph(subject: str, level: str = "DSE") -> KnowledgeGraph:
+    """Compiled knowledge graph for a subject (cached, shared read-only)."""
+    return compile_knowledge_graph(load_knowledge_registry(subject, level), level)
+
+
+def _graph_for_id(knowledge_point_id: str) -> KnowledgeGraph | None:
     # Parse ID to extract subject and level
     # Format: LEVEL-SUBJECT_CODE-UNIT-TYPE-NUMBER (e.g., DSE-ENG-U5-RC-01)
     parts = knowledge_point_id.split("-")
@@ -203,24 +341,22 @@ def get_knowledge_point(knowledge_point_id: str) -> KnowledgePoint | None:
 
     # Map subject code to full subject name
     subject = SUBJECT_CODE_MAP.get(subject_code.upper(), subject_code)
-    registry = load_knowledge_registry(subject, level)
+    return get_knowledge_graph(subject, level)
 
-    for unit in registry.get("units", []):
-        for kp in unit.get("knowledgePoints", []):
-            if kp["id"] == knowledge_point_id:
-                return KnowledgePoint(
-                    id=kp["id"],
-                    name=kp["name"],
-                    subject=registry.get("subject", ""),
-                    unit=unit.get("id", ""),
-                    level=registry.get("level", level),
-                    description=kp.get("description", ""),
-                    skill_tags=kp.get("skillTags", []),
-                    prerequisites=kp.get("prerequisites", []),
-                    difficulty=kp.get("difficulty", "medium"),
-                )
-
-    return None
+
+def get_knowledge_point(knowledge_point_id: str) -> KnowledgePoint | None:
+    """Get a single knowledge point by ID.
+
+    Args:
+        knowledge_point_id: Knowledge point ID (e.g., "DSE-ENG-U5-RC-01").
+
+    Returns:
+        KnowledgePoint object if found, None otherwise.
+    """
+    graph = _graph_for_id(knowledge_point_id)
+    if graph is None:
+        return None
+    return graph.get(knowledge_point_id)
 
 
 def list_knowledge_points(
@@ -242,36 +378,19 @@ def list_knowledge_points(
     Returns:
         List of matching KnowledgePoint objects.
     """
-    registry = load_knowledge_registry(subject, level)
+    graph = get_knowledge_graph(subject, level)
+    ids = graph.unit_ids(unit) if unit else graph.nodes.keys()
     results = []
 
-    for u in registry.get("units", []):
-        # Unit filter
-        if unit and u["id"] != unit and u["name"] != unit:
+    for kp_id in ids:
+        kp = graph.nodes[kp_id]
+        # Skill tag filter
+        if skill_tags and not any(tag in kp.skill_tags for tag in skill_tags):
             continue
-
-        for kp in u.get("knowledgePoints", []):
-            # Skill tag filter
-            if skill_tags:
-                kp_tags = kp.get("skillTags", [])
-                if not any(tag in kp_tags for tag in skill_tags):
-                    continue
-
-            # Difficulty filter
-            if difficulty and kp.get("difficulty", "medium") != difficulty:
-                continue
-
-            results.append(KnowledgePoint(
-                id=kp["id"],
-                name=kp["name"],
-                subject=registry.get("subject", ""),
-                unit=u.get("id", ""),
-                level=registry.get("level", level),
-                description=kp.get("description", ""),
-                skill_tags=kp.get("skillTags", []),
-                prerequisites=kp.get("prerequisites", []),
-                difficulty=kp.get("difficulty", "medium"),
-            ))
+        # Difficulty filter
+        if difficulty and kp.difficulty != difficulty:
+            continue
+        results.append(kp)
 
     return results
 
@@ -306,28 +425,60 @@ def get_prerequisite_chain(knowledge_point_id: str) -> list[KnowledgePoint]:
         knowledge_point_id: Starting knowledge point ID.
 
     Returns:
-        List of prerequisite knowledge points in order.
+        List of prerequisite knowledge points in order (prerequisites
+        before dependents, ending with the knowledge point itself).
     """
-    visited = set()
-    chain = []
+    visited: set[str] = set()
+    chain: list[KnowledgePoint] = []
 
-    def collect_prerequisites(kp_id: str) -> None:
-        if kp_id in visited:
+    def collect(kp_id: str) -> None:
+        graph = _graph_for_id(kp_id)
+        if graph is None or kp_id not in graph:
             return
-        visited.add(kp_id)
+        for cid in graph.closures[kp_id]:
+            if cid in visited:
+                continue
+            if cid in graph:
+                visited.add(cid)
+                chain.append(graph.nodes[cid])
+            else:
+                # Prerequisite declared in another registry
+                collect(cid)
+
+    collect(knowledge_point_id)
+    return chain
 
-        kp = get_knowledge_point(kp_id)
-        if not kp:
-            return
 
-        # Process prerequisites first (depth-first)
-        for prereq_id in kp.prerequisites:
-            collect_prerequisites(prereq_id)
+def get_unlocked_knowledge_points(
+    knowledge_point_id: str,
+    transitive: bool = False,
+) -> list[KnowledgePoint]:
+    """Get knowledge points that list this one as a prerequisite.
 
-        chain.append(kp)
+    Args:
+        knowledge_point_id: Prerequisite knowledge point ID.
+        transitive: Also include everything those points unlock.
 
-    collect_prerequisites(knowledge_point_id)
-    return chain
+    Returns:
+        Unlocked knowledge points, nearest first.
+    """
+    graph = _graph_for_id(knowledge_point_id)
+    if graph is None or knowledge_point_id not in graph:
+        return []
+
+    seen = {knowledge_point_id}
+    frontier = [knowledge_point_id]
+    results: list[KnowledgePoint] = []
+    while frontier:
+        next_frontier = []
+        for kp_id in frontier:
+            for child in graph.unlocks.get(kp_id, ()):
+                if child not in seen:
+                    seen.add(child)
+                    results.append(graph.nodes[child])
+                    next_frontier.append(child)
+        frontier = next_frontier if transitive else []
+    return results
 
 
 def get_knowledge_points_for_weakness(
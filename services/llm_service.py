@@ -5,18 +5,72 @@ Supports any provider LiteLLM supports via model name prefix:
     - openai/gpt-4o
     - dashscope/qwen-max
     - zai/glm-4.7
+
+All calls are async (``litellm.acompletion``) so an LLM round-trip never
+blocks the event loop.  Every call:
+
+- holds one slot of the worker-wide LLM semaphore (``llm_slot`` /
+  ``rate_limited_llm_call``) — for streams, until the stream is consumed,
+- goes through one shared, pooled ``httpx.AsyncClient`` installed as
+  ``litellm.aclient_session`` (used by the OpenAI-compatible providers),
+- is recorded in ``MetricsCollector`` (latency, status, token usage and
+  provider prompt-cache hits).
 """
 
 from __future__ import annotations
 
+import logging
+import time
+from typing import Any, AsyncIterator
+
+import httpx
 import litellm
 
 from config.llm_config import LLMConfig
 from config.settings import get_settings
+from services.concurrency import llm_slot, rate_limited_llm_call
+from services.metrics import get_metrics_collector
+
+logger = logging.getLogger(__name__)
+
+_METRICS_SOURCE = "llm_service"
+
+_http_session: httpx.AsyncClient | None = None
+
+
+def get_llm_http_session() -> httpx.AsyncClient:
+    """Shared keep-alive pool for LiteLLM calls (installed once per worker).
+
+    A session configured elsewhere (``litellm.aclient_session``) is reused
+    as-is.
+    """
+    global _http_session
+    if litellm.aclient_session is not None and not litellm.aclient_session.is_closed:
+        return litellm.aclient_session
+    settings = get_settings()
+    _http_session = httpx.AsyncClient(
+        timeout=httpx.Timeout(600, connect=10),
+        limits=httpx.Limits(
+            max_connections=settings.llm_http_max_connections,
+            max_keepalive_connections=settings.llm_http_max_keepalive,
+        ),
+    )
+    litellm.aclient_session = _http_session
+    return _http_session
+
+
+async def close_llm_http_session() -> None:
+    """Close the pool created by :func:`get_llm_http_session` (app shutdown)."""
+    global _http_session
+    if _http_session is not None:
+        if litellm.aclient_session is _http_session:
+            litellm.aclient_session = None
+        await _http_session.aclose()
+        _http_session = None
 
 
 class LLMService:
-    """Thin wrapper around litellm.completion() for multi-provider LLM access.
+    """Thin async wrapper around ``litellm.acompletion()`` for multi-provider access.
 
     Accepts an optional :class:`LLMConfig` that is merged on top of the
     global defaults from Settings.  Individual calls can still override
@@ -42,7 +96,36 @@ class LLMService:
     def model(self) -> str | None:
         return self._config.model
 
-    def chat(
+    def _build_kwargs(
+        self,
+        messages: list,
+        tools: list | None,
+        system: str,
+        overrides: dict[str, Any],
+    ) -> dict[str, Any]:
+        all_messages = []
+        if system:
+            all_messages.append({"role": "system", "content": system})
+        all_messages.extend(messages)
+
+        kwargs: dict[str, Any] = {
+            "model": self._config.model,
+            "messages": all_messages,
+            **self._config.to_litellm_kwargs(),
+        }
+        if tools:
+            kwargs["tools"] = tools
+
+        # Per-call overrides win
+        kwargs.update(overrides)
+
+        mock_base_url = get_settings().llm_mock_base_url
+        if mock_base_url:
+            model_id = kwargs["model"].split("/", 1)[-1]
+            kwargs.update(model=f"openai/{model_id}", api_base=mock_base_url, api_key="mock")
+        return kwargs
+
+    async def chat(
         self,
         messages: list,
         tools: list | None = None,
@@ -61,24 +144,87 @@ class LLMService:
             Parsed response dict with keys:
                 content, tool_calls, finish_reason, usage.
         """
-        all_messages = []
-        if system:
-            all_messages.append({"role": "system", "content": system})
-        all_messages.extend(messages)
+        kwargs = self._build_kwargs(messages, tools, system, overrides)
+        get_llm_http_session()
 
-        kwargs: dict = {
-            "model": self._config.model,
-            "messages": all_messages,
-            **self._config.to_litellm_kwargs(),
-        }
-        if tools:
-            kwargs["tools"] = tools
+        start = time.perf_counter()
+        try:
+            response = await rate_limited_llm_call(litellm.acompletion, **kwargs)
+        except Exception:
+            self._record(kwargs["model"], "error", start)
+            raise
 
-        # Per-call overrides win
-        kwargs.update(overrides)
+        result = self._parse_response(response)
+        self._record(kwargs["model"], "ok", start, response.usage)
+        return result
 
-        response = litellm.completion(**kwargs)
-        return self._parse_response(response)
+    async def stream(
+        self,
+        messages: list,
+        tools: list | None = None,
+        system: str = "",
+        **overrides,
+    ) -> AsyncIterator[dict]:
+        """Stream a conversation turn.
+
+        Yields ``{"type": "delta", "content": str}`` for each text chunk and
+        finally ``{"type": "done", ...}`` carrying the same keys as
+        :meth:`chat` (full content, assembled tool calls, usage).
+        """
+        kwargs = self._build_kwargs(messages, tools, system, overrides)
+        kwargs["stream"] = True
+        get_llm_http_session()
+
+        parts: list[str] = []
+        tool_calls: dict[int, dict[str, Any]] = {}
+        finish_reason = None
+        usage = None
+        start = time.perf_counter()
+        try:
+            async with llm_slot():
+                response = await litellm.acompletion(**kwargs)
+                async for chunk in response:
+                    usage = getattr(chunk, "usage", None) or usage
+                    if not chunk.choices:
+                        continue
+                    choice = chunk.choices[0]
+                    delta = choice.delta
+                    if delta.content:
+                        parts.append(delta.content)
+                        yield {"type": "delta", "content": delta.content}
+                    for tc in getattr(delta, "tool_calls", None) or []:
+                        _merge_tool_call_delta(tool_calls, tc)
+                    if choice.finish_reason:
+                        finish_reason = choice.finish_reason
+        except Exception:
+            self._record(kwargs["model"], "error", start)
+            raise
+
+        self._record(kwargs["model"], "ok", start, usage)
+        yield {
+            "type": "done",
+            "content": "".join(parts),
+            "tool_calls": [tool_calls[i] for i in sorted(tool_calls)] or None,
+            "finish_reason": finish_reason,
+            "usage": _usage_dict(usage),
+        }
+
+    def _record(self, model: str, status: str, start: float, usage: Any = None) -> None:
+        metrics = get_metrics_collector()
+        tokens = _usage_dict(usage)
+        metrics.record_llm_call(
+            model=str(model),
+            status=status,
+            latency_ms=(time.perf_counter() - start) * 1000,
+            input_tokens=tokens["input_tokens"],
+            output_tokens=tokens["output_tokens"],
+        )
+        if tokens["input_tokens"]:
+            metrics.record_prompt_cache(
+                source=_METRICS_SOURCE,
+                input_tokens=tokens["input_tokens"],
+                cached_tokens=_cached_tokens(usage),
+            )
 
     def _parse_response(self, response) -> dict:
         """Parse LiteLLM ModelResponse into a simple dict."""
@@ -102,8 +248,31 @@ class LLMService:
             "content": message.content,
             "tool_calls": tool_calls,
             "finish_reason": choice.finish_reason,
-            "usage": {
-                "input_tokens": response.usage.prompt_tokens if response.usage else 0,
-                "output_tokens": response.usage.completion_tokens if response.usage else 0,
-            },
+            "usage": _usage_dict(response.usage),
         }
+
+
+def _usage_dict(usage: Any) -> dict[str, int]:
+    return {
+        "input_tokens": (getattr(usage, "prompt_tokens", 0) or 0) if usage else 0,
+        "output_tokens": (getattr(usage, "completion_tokens", 0) or 0) if usage else 0,
+    }
+
+
+def _cached_tokens(usage: Any) -> int:
+    details = getattr(usage, "prompt_tokens_details", None)
+    return int(getattr(details, "cached_tokens", 0) or 0) if details else 0
+
+
+def _merge_tool_call_delta(acc: dict[int, dict[str, Any]], tc: Any) -> None:
+    """Accumulate a streamed tool-call fragment (arguments arrive in pieces)."""
+    index = getattr(tc, "index", None) or 0
+    entry = acc.setdefault(index, {"id": None, "function": {"name": "", "arguments": ""}})
+    if getattr(tc, "id", None):
+        entry["id"] = tc.id
+    fn = getattr(tc, "function", None)
+    if fn is not None:
+        if getattr(fn, "name", None):
+            entry["function"]["name"] += fn.name
+        if getattr(fn, "arguments", None):
+            entry["function"]["arguments"] += fn.arguments
@@ -0,0 +1,279 @@
+"""Content-addressed cache for generated media (TTS audio, Seedream images).
+
+Teachers regenerate the same narration or illustration over and over;
+every call used to cost a Java ``/text-to-speech`` synthesis or an Ark
+image generation.  Results are now keyed by a hash of the *normalized*
+inputs (Unicode NFC, collapsed whitespace, canonical casing of voice /
+language / size) and reused until their TTL expires:
+
+- TTS audio lives on our own OSS, so it is kept for ``media_cache_tts_ttl_s``
+  (default 7 days),
+- Ark image URLs expire after 24 hours, so images use the shorter
+  ``media_cache_image_ttl_s``.
+
+Tiers, checked in order:
+
+1. per-worker LRU + TTL (``TTLCache``, ``media_cache_size`` entries),
+2. optional shared tier — ``media_cache_backend = "disk"`` (JSON files under
+   ``media_cache_dir``) or ``"redis"`` (needs ``redis_url``).
+
+Only successful results with a URL are stored.  Concurrent identical
+requests are coalesced into one upstream call.  Hits and misses are
+counted per kind under the ``media_cache_{kind}`` metrics counter, so
+``get_counter_rates("media_cache_tts")["hit"]`` is the hit rate.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+import unicodedata
+from typing import Any, Awaitable, Callable, Protocol
+
+from config.settings import get_settings
+from services.metrics import get_metrics_collector
+from services.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+_REDIS_KEY_PREFIX = "media:"
+_WHITESPACE_RE = re.compile(r"[ \t　]+")
+
+
+# ── Keys ────────────────────────────────────────────────────
+
+
+def normalize_text(text: str) -> str:
+    """NFC-normalize, trim and collapse runs of blanks (newlines kept)."""
+    text = unicodedata.normalize("NFC", text)
+    lines = [_WHITESPACE_RE.sub(" ", line).strip() for line in text.splitlines()]
+    return "\n".join(line for line in lines if line)
+
+
+def media_cache_key(kind: str, inputs: dict[str, Any]) -> str:
+    """``{kind}:{sha256}`` over the canonical JSON of *inputs*."""
+    canonical = json.dumps(inputs, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return f"{kind}:{hashlib.sha256(canonical.encode()).hexdigest()}"
+
+
+# ── Shared tier backends ────────────────────────────────────
+
+
+class MediaCacheBackend(Protocol):
+    async def get(self, key: str) -> dict[str, Any] | None: ...
+
+    async def set(self, key: str, value: dict[str, Any], ttl_s: float) -> None: ...
+
+    async def close(self) -> None: ...
+
+
+class DiskMediaCache:
+    """One JSON file per key; expired files are ignored and removed on read."""
+
+    def __init__(self, directory: str, *, clock: Callable[[], float] = time.time) -> None:
+        self._dir = directory
+        self._clock = clock
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self._dir, key.replace(":", "_") + ".json")
+
+    def _read(self, key: str) -> dict[str, Any] | None:
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get("expires_at", 0) <= self._clock():
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            return None
+        return entry.get("value")
+
+    def _write(self, key: str, value: dict[str, Any], ttl_s: float) -> None:
+        os.makedirs(self._dir, exist_ok=True)
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"expires_at": self._clock() + ttl_s, "value": value}, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, value: dict[str, Any], ttl_s: float) -> None:
+        await asyncio.to_thread(self._write, key, value, ttl_s)
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisMediaCache:
+    """Values as JSON strings with a native Redis expiry."""
+
+    def __init__(self, redis_url: str, *, prefix: str = _REDIS_KEY_PREFIX) -> None:
+        import redis.asyncio as aioredis
+
+        self._prefix = prefix
+        self._client = aioredis.from_url(
+            redis_url,
+            decode_responses=True,
+            socket_connect_timeout=2,
+            socket_timeout=2,
+        )
+
+    async def get(self, key: str) -> dict[str, Any] | None:
+        raw = await self._client.get(self._prefix + key)
+        return json.loads(raw) if raw else None
+
+    async def set(self, key: str, value: dict[str, Any], ttl_s: float) -> None:
+        await self._client.set(
+            self._prefix + key,
+            json.dumps(value, ensure_ascii=False),
+            ex=max(int(ttl_s), 1),
+        )
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+# ── Cache ───────────────────────────────────────────────────
+
+
+class MediaResultCache:
+    """Two-tier result cache with per-key single-flight."""
+
+    def __init__(
+        self,
+        *,
+        max_size: int = 1024,
+        backend: MediaCacheBackend | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._local: TTLCache[str, dict[str, Any]] = TTLCache(
+            max_size=max_size, ttl_seconds=3600.0, clock=clock,
+        )
+        self._backend = backend
+        self._inflight: dict[str, asyncio.Task[dict[str, Any]]] = {}
+
+    async def get_or_create(
+        self,
+        kind: str,
+        inputs: dict[str, Any],
+        produce: Callable[[], Awaitable[dict[str, Any]]],
+        *,
+        ttl_s: float,
+        cacheable: Callable[[dict[str, Any]], bool],
+    ) -> dict[str, Any]:
+        """Return the cached result for *inputs* or call *produce* once.
+
+        Cached results are returned as copies with ``"cached": True``.
+        Results rejected by *cacheable* (errors, empty URLs) are passed
+        through without being stored.
+        """
+        key = media_cache_key(kind, inputs)
+        metrics = get_metrics_collector()
+        counter = f"media_cache_{kind}"
+
+        value = self._local.get(key)
+        if value is not None:
+            metrics.increment(counter, "hit")
+            return {**value, "cached": True}
+
+        task = self._inflight.get(key)
+        if task is not None:
+            metrics.increment(counter, "coalesced")
+            return dict(await asyncio.shield(task))
+
+        task = asyncio.create_task(self._load(key, counter, produce, ttl_s, cacheable))
+        self._inflight[key] = task
+        task.add_done_callback(lambda t: self._forget_inflight(key, t))
+        return dict(await asyncio.shield(task))
+
+    async def _load(
+        self,
+        key: str,
+        counter: str,
+        produce: Callable[[], Awaitable[dict[str, Any]]],
+        ttl_s: float,
+        cacheable: Callable[[dict[str, Any]], bool],
+    ) -> dict[str, Any]:
+        metrics = get_metrics_collector()
+        value = await self._backend_get(key)
+        if value is not None:
+            metrics.increment(counter, "hit")
+            self._local.set(key, value, ttl_seconds=ttl_s)
+            return {**value, "cached": True}
+
+        metrics.increment(counter, "miss")
+        result = await produce()
+        if cacheable(result):
+            self._local.set(key, result, ttl_seconds=ttl_s)
+            await self._backend_set(key, result, ttl_s)
+        return result
+
+    def _forget_inflight(self, key: str, task: asyncio.Task[dict[str, Any]]) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the error as retrieved even if every waiter was cancelled.
+        if not task.cancelled():
+            task.exception()
+
+    async def _backend_get(self, key: str) -> dict[str, Any] | None:
+        if self._backend is None:
+            return None
+        try:
+            return await self._backend.get(key)
+        except Exception as exc:
+            logger.warning("Media cache read failed: %s", exc)
+            return None
+
+    async def _backend_set(self, key: str, value: dict[str, Any], ttl_s: float) -> None:
+        if self._backend is None:
+            return
+        try:
+            await self._backend.set(key, value, ttl_s)
+        except Exception as exc:
+            logger.warning("Media cache write failed: %s", exc)
+
+    def clear(self) -> None:
+        """Drop the per-worker tier (the shared tier expires on its own)."""
+        self._local.clear()
+
+    async def close(self) -> None:
+        if self._backend is not None:
+            await self._backend.close()
+
+
+_media_cache: MediaResultCache | None = None
+
+
+def get_media_cache() -> MediaResultCache | None:
+    """Worker-wide media cache, or None when ``media_cache_enabled`` is off."""
+    global _media_cache
+    settings = get_settings()
+    if not settings.media_cache_enabled:
+        return None
+    if _media_cache is None:
+        backend: MediaCacheBackend | None = None
+        if settings.media_cache_backend == "disk":
+            backend = DiskMediaCache(settings.media_cache_dir)
+        elif settings.media_cache_backend == "redis" and settings.redis_url:
+            backend = RedisMediaCache(settings.redis_url)
+        _media_cache = MediaResultCache(max_size=settings.media_cache_size, backend=backend)
+    return _media_cache
+
+
+async def close_media_cache() -> None:
+    """Close the shared-tier connection (app shutdown)."""
+    global _media_cache
+    if _media_cache is not None:
+        await _media_cache.close()
+        _media_cache = None
@@ -0,0 +1,305 @@
+"""Background tracking for long-running media generation tasks (Seedance video).
+
+Video generation takes 1-5 minutes.  ``generate_video`` used to poll Ark
+inside the tool call, pinning an agent turn (and a heavy-path slot) for the
+whole wait.  Now the tool submits the job, registers it here and returns a
+task handle straight away; ``MediaTaskService`` polls every pending task
+from a single background loop:
+
+- polls start at ``ark_video_poll_interval`` and back off (×1.5) up to
+  ``ark_video_poll_max_interval`` — most videos need minutes, not seconds,
+- all due tasks are polled in one batch with bounded concurrency,
+- tasks exceeding ``ark_video_max_wait`` are failed with a timeout,
+- status changes wake subscribers (``subscribe`` / ``wait``), which back
+  the ``/api/media/tasks/{id}`` status and SSE endpoints,
+- finished tasks stay queryable for ``media_task_retention_s``.
+
+Tasks live in the worker that submitted them (like the artifact store);
+the loop exits when nothing is pending and restarts on the next submit.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable
+
+from config.settings import get_settings
+from services.java_client import fan_out
+from services.metrics import get_metrics_collector
+from services.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+TERMINAL_STATUSES = frozenset({"succeeded", "failed"})
+_BACKOFF = 1.5
+_POLL_CONCURRENCY = 8
+
+# task_id → {"status": "running" | "succeeded" | "failed" | ..., "video_url"?, "reason"?}
+StatusFetcher = Callable[[str], Awaitable[dict[str, Any]]]
+
+
+@dataclass
+class MediaTask:
+    """One submitted generation job and its latest known state."""
+
+    task_id: str
+    kind: str
+    params: dict[str, Any] = field(default_factory=dict)
+    conversation_id: str = ""
+    status: str = "running"
+    result: dict[str, Any] = field(default_factory=dict)
+    error: str = ""
+    created_at: float = 0.0
+    updated_at: float = 0.0
+    next_poll_at: float = 0.0
+    poll_interval: float = 0.0
+    polls: int = 0
+    version: int = 0
+    on_complete: list[Callable[[MediaTask], None]] = field(default_factory=list, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def to_dict(self) -> dict[str, Any]:
+        """Public (camelCase) view for API responses and SSE events."""
+        payload: dict[str, Any] = {
+            "taskId": self.task_id,
+            "type": self.kind,
+            "status": self.status,
+            "elapsed": round(max(self.updated_at - self.created_at, 0.0), 1),
+        }
+        if self.result:
+            payload["result"] = self.result
+        if self.error:
+            payload["error"] = self.error
+        return payload
+
+
+class MediaTaskService:
+    """Registry of media tasks plus one shared polling loop."""
+
+    def __init__(
+        self,
+        fetch_status: StatusFetcher,
+        *,
+        poll_interval: float = 5.0,
+        max_poll_interval: float = 15.0,
+        max_wait: float = 300.0,
+        retention_s: float = 3600.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._fetch_status = fetch_status
+        self._poll_interval = poll_interval
+        self._max_poll_interval = max(max_poll_interval, poll_interval)
+        self._max_wait = max_wait
+        self._clock = clock
+        self._pending: dict[str, MediaTask] = {}
+        self._finished: TTLCache[str, MediaTask] = TTLCache(
+            max_size=1024, ttl_seconds=retention_s, clock=clock,
+        )
+        self._changed: asyncio.Condition | None = None
+        self._wakeup: asyncio.Event | None = None
+        self._loop_task: asyncio.Task[None] | None = None
+
+    # ── Registry ────────────────────────────────────────────
+
+    def register(
+        self,
+        task_id: str,
+        kind: str,
+        *,
+        params: dict[str, Any] | None = None,
+        conversation_id: str = "",
+        on_complete: Callable[[MediaTask], None] | None = None,
+    ) -> MediaTask:
+        """Track a task already submitted upstream and make sure it is polled."""
+        now = self._clock()
+        task = MediaTask(
+            task_id=task_id,
+            kind=kind,
+            params=params or {},
+            conversation_id=conversation_id,
+            created_at=now,
+            updated_at=now,
+            next_poll_at=now + self._poll_interval,
+            poll_interval=self._poll_interval,
+        )
+        if on_complete is not None:
+            task.on_complete.append(on_complete)
+        self._pending[task_id] = task
+        get_metrics_collector().increment("media_task", "submitted")
+        self._ensure_loop()
+        self._get_wakeup().set()
+        return task
+
+    def get(self, task_id: str) -> MediaTask | None:
+        return self._pending.get(task_id) or self._finished.get(task_id)
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    async def wait(self, task_id: str, timeout: float | None = None) -> MediaTask:
+        """Block until *task_id* finishes.
+
+        Raises:
+            KeyError: Unknown task.
+            asyncio.TimeoutError: *timeout* elapsed first.
+        """
+        async def _until_done() -> MediaTask:
+            async for task in self.subscribe(task_id):
+                if task.done:
+                    return task
+            raise KeyError(task_id)
+
+        return await asyncio.wait_for(_until_done(), timeout)
+
+    async def subscribe(self, task_id: str) -> AsyncIterator[MediaTask]:
+        """Yield the task now and after every change, ending once it is done.
+
+        Raises:
+            KeyError: Unknown task.
+        """
+        task = self.get(task_id)
+        if task is None:
+            raise KeyError(task_id)
+        changed = self._get_condition()
+        seen = task.version
+        yield task
+        while not task.done:
+            async with changed:
+                await changed.wait_for(lambda: task.version != seen)
+            seen = task.version
+            yield task
+
+    # ── Polling loop ────────────────────────────────────────
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._changed is None:
+            self._changed = asyncio.Condition()
+        return self._changed
+
+    def _get_wakeup(self) -> asyncio.Event:
+        if self._wakeup is None:
+            self._wakeup = asyncio.Event()
+        return self._wakeup
+
+    def _ensure_loop(self) -> None:
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        wakeup = self._get_wakeup()
+        while self._pending:
+            now = self._clock()
+            due = [t for t in self._pending.values() if t.next_poll_at <= now]
+            if due:
+                await fan_out(due, self._poll_one, limit=_POLL_CONCURRENCY, return_exceptions=True)
+                continue
+            delay = min(t.next_poll_at for t in self._pending.values()) - now
+            wakeup.clear()
+            try:
+                await asyncio.wait_for(wakeup.wait(), timeout=max(delay, 0.0))
+            except asyncio.TimeoutError:
+                pass
+
+    async def _poll_one(self, task: MediaTask) -> None:
+        task.polls += 1
+        # Reschedule first so a failing poll can never spin the loop.
+        task.poll_interval = min(task.poll_interval * _BACKOFF, self._max_poll_interval)
+        task.next_poll_at = self._clock() + task.poll_interval
+        try:
+            state = await self._fetch_status(task.task_id)
+        except Exception as exc:
+            # Transient (network / 5xx) — keep polling until max_wait.
+            logger.warning("Media task %s status check failed: %s", task.task_id, exc)
+            state = {"status": task.status}
+
+        status = str(state.get("status") or "running")
+        if status == "succeeded":
+            result = {k: v for k, v in state.items() if k not in ("status", "reason")}
+            await self._finish(task, "succeeded", result=result)
+        elif status == "failed":
+            await self._finish(task, "failed", error=str(state.get("reason") or "unknown error"))
+        elif self._clock() - task.created_at >= self._max_wait:
+            await self._finish(
+                task, "failed",
+                error=f"Video generation timed out after {self._max_wait:g}s",
+            )
+        elif status != task.status:
+            await self._update(task, status=status)
+
+    async def _finish(
+        self,
+        task: MediaTask,
+        status: str,
+        *,
+        result: dict[str, Any] | None = None,
+        error: str = "",
+    ) -> None:
+        self._pending.pop(task.task_id, None)
+        self._finished.set(task.task_id, task)
+        task.status = status
+        task.result = result or {}
+        task.error = error
+        for callback in task.on_complete:
+            try:
+                callback(task)
+            except Exception:
+                logger.exception("Media task %s completion callback failed", task.task_id)
+        get_metrics_collector().increment("media_task", status)
+        logger.info(
+            "Media task %s %s after %d polls (%.0fs)%s",
+            task.task_id, status, task.polls, self._clock() - task.created_at,
+            f": {error}" if error else "",
+        )
+        await self._update(task, status=status)
+
+    async def _update(self, task: MediaTask, *, status: str) -> None:
+        task.status = status
+        task.updated_at = self._clock()
+        task.version += 1
+        changed = self._get_condition()
+        async with changed:
+            changed.notify_all()
+
+    async def close(self) -> None:
+        """Stop the polling loop (app shutdown).  Pending tasks are dropped."""
+        if self._loop_task is not None and not self._loop_task.done():
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+        self._loop_task = None
+
+
+_service: MediaTaskService | None = None
+
+
+def get_media_task_service() -> MediaTaskService:
+    """Worker-wide service polling Seedance video tasks."""
+    global _service
+    if _service is None:
+        from tools.volcengine_media import get_video_task
+
+        settings = get_settings()
+        _service = MediaTaskService(
+            get_video_task,
+            poll_interval=settings.ark_video_poll_interval,
+            max_poll_interval=settings.ark_video_poll_max_interval,
+            max_wait=settings.ark_video_max_wait,
+            retention_s=settings.media_task_retention_s,
+        )
+    return _service
+
+
+async def close_media_task_service() -> None:
+    global _service
+    if _service is not None:
+        await _service.close()
+        _service = None
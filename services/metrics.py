@@ -42,12 +42,16 @@ class MetricsCollector:
 
     MAX_LATENCIES_PER_TOOL = 2000
     MAX_TURN_STATS = 5000
+    MAX_PREFIXES_PER_SOURCE = 200
 
     def __init__(self) -> None:
         self._lock = threading.RLock()
         self._tool_latencies: dict[str, list[float]] = defaultdict(list)
         self._tool_status: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
         self._turn_stats: dict[str, dict] = {}
+        self._prompt_cache: dict[str, dict] = {}
+        self._counters: dict[str, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self._llm_calls: dict[str, dict] = {}
 
     def record_tool_call(
         self,
@@ -86,6 +90,83 @@ class MetricsCollector:
                 oldest_key = next(iter(self._turn_stats))
                 del self._turn_stats[oldest_key]
 
+    def record_prompt_cache(
+        self,
+        *,
+        source: str,
+        input_tokens: int,
+        cached_tokens: int,
+        prefix_fingerprint: str = "",
+    ) -> None:
+        """Record provider prompt-cache usage for one LLM run.
+
+        *source* identifies the prompt family (``native_agent``,
+        ``executor_block``, ...); *prefix_fingerprint* the static prefix
+        hash from ``PromptLayout``.
+        """
+        with self._lock:
+            entry = self._prompt_cache.setdefault(
+                source,
+                {
+                    "requests": 0,
+                    "cache_hits": 0,
+                    "input_tokens": 0,
+                    "cached_tokens": 0,
+                    "prefixes": {},
+                },
+            )
+            entry["requests"] += 1
+            entry["input_tokens"] += int(input_tokens)
+            entry["cached_tokens"] += int(cached_tokens)
+            if cached_tokens > 0:
+                entry["cache_hits"] += 1
+            if prefix_fingerprint:
+                prefixes = entry["prefixes"]
+                prefixes[prefix_fingerprint] = prefixes.get(prefix_fingerprint, 0) + 1
+                if len(prefixes) > self.MAX_PREFIXES_PER_SOURCE:
+                    del prefixes[next(iter(prefixes))]
+
+    def record_llm_call(
+        self,
+        *,
+        model: str,
+        status: str,
+        latency_ms: float,
+        input_tokens: int = 0,
+        output_tokens: int = 0,
+    ) -> None:
+        """Record one direct LLM completion (``LLMService``)."""
+        with self._lock:
+            entry = self._llm_calls.setdefault(
+                model,
+                {"latencies": [], "status": defaultdict(int), "input_tokens": 0, "output_tokens": 0},
+            )
+            latencies = entry["latencies"]
+            latencies.append(float(latency_ms))
+            if len(latencies) > self.MAX_LATENCIES_PER_TOOL:
+                del latencies[: len(latencies) - self.MAX_LATENCIES_PER_TOOL]
+            entry["status"][status] += 1
+            entry["input_tokens"] += int(input_tokens)
+            entry["output_tokens"] += int(output_tokens)
+
+    def increment(self, counter: str, label: str, n: int = 1) -> None:
+        """Bump a labelled event counter (e.g. ``toolset_planner`` / ``cache_hit``)."""
+        with self._lock:
+            self._counters[counter][label] += n
+
+    def get_counter(self, counter: str) -> dict[str, int]:
+        with self._lock:
+            return dict(self._counters.get(counter, {}))
+
+    def get_counter_rates(self, counter: str) -> dict[str, float]:
+        """Return each label's share of the counter total (0.0-1.0)."""
+        with self._lock:
+            labels = self._counters.get(counter, {})
+            total = sum(labels.values())
+            if not total:
+                return {}
+            return {label: round(count / total, 4) for label, count in labels.items()}
+
     def get_turn_summary(self, turn_id: str) -> dict:
         with self._lock:
             return dict(self._turn_stats.get(turn_id, {}))
@@ -105,9 +186,39 @@ class MetricsCollector:
                     "status_breakdown": dict(status_map),
                 }
 
+            prompt_cache = {}
+            for source, entry in self._prompt_cache.items():
+                input_tokens = entry["input_tokens"]
+                prompt_cache[source] = {
+                    "requests": entry["requests"],
+                    "cache_hits": entry["cache_hits"],
+                    "input_tokens": input_tokens,
+                    "cached_tokens": entry["cached_tokens"],
+                    "cached_ratio": (
+                        round(entry["cached_tokens"] / input_tokens, 4)
+                        if input_tokens else 0.0
+                    ),
+                    "distinct_prefixes": len(entry["prefixes"]),
+                }
+
+            llm_calls = {}
+            for model, entry in self._llm_calls.items():
+                latencies = entry["latencies"]
+                llm_calls[model] = {
+                    "count": sum(entry["status"].values()),
+                    "latency_p50_ms": round(_percentile(latencies, 0.5), 2),
+                    "latency_p95_ms": round(_percentile(latencies, 0.95), 2),
+                    "input_tokens": entry["input_tokens"],
+                    "output_tokens": entry["output_tokens"],
+                    "status_breakdown": dict(entry["status"]),
+                }
+
             return {
                 "tools": tool_metrics,
                 "turns": list(self._turn_stats.values()),
+                "prompt_cache": prompt_cache,
+                "llm_calls": llm_calls,
+                "counters": {name: dict(labels) for name, labels in self._counters.items()},
             }
 
     def reset(self) -> None:
@@ -115,6 +226,9 @@ class MetricsCollector:
             self._tool_latencies.clear()
             self._tool_status.clear()
             self._turn_stats.clear()
+            self._prompt_cache.clear()
+            self._counters.clear()
+            self._llm_calls.clear()
 
 
 _metrics_collector = MetricsCollector()
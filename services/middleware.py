@@ -2,11 +2,15 @@
 
 from __future__ import annotations
 
+import time
 import uuid
 from typing import Callable
 
+from opentelemetry import propagate, trace
 from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from services.tracing import request_id_var, span
+
 
 class RequestIdMiddleware:
     """Inject a unique request ID into every HTTP request/response.
@@ -16,6 +20,12 @@ class RequestIdMiddleware:
 
     If the client sends ``X-Request-ID``, it is reused; otherwise a short
     UUID is generated. The ID is returned in the response headers.
+
+    Each request also runs inside a root tracing span (``HTTP {method}
+    {path}``, continuing an incoming ``traceparent``) that every span of
+    the request inherits — see ``services/tracing.py``.  The span records
+    the first body byte and the time spent flushing body chunks, which is
+    where a slow SSE consumer shows up.
     """
 
     def __init__(self, app: ASGIApp) -> None:
@@ -34,11 +44,48 @@ class RequestIdMiddleware:
         scope.setdefault("state", {})
         scope["state"]["request_id"] = request_id
 
-        async def send_with_request_id(message: Message) -> None:
-            if message["type"] == "http.response.start":
-                headers = list(message.get("headers", []))
-                headers.append((b"x-request-id", request_id.encode()))
-                message["headers"] = headers
+        token = request_id_var.set(request_id)
+        parent = propagate.extract({
+            key.decode("latin-1"): value.decode("latin-1")
+            for key, value in headers.items()
+            if key in (b"traceparent", b"tracestate")
+        })
+        method = scope.get("method", "")
+        path = scope.get("path", "")
+        try:
+            with span(
+                f"HTTP {method} {path}",
+                {"http.request.method": method, "url.path": path},
+                kind=trace.SpanKind.SERVER,
+                context=parent,
+            ) as root:
+                await self.app(scope, receive, _traced_send(send, request_id, root))
+        finally:
+            request_id_var.reset(token)
+
+
+def _traced_send(send: Send, request_id: str, root: trace.Span) -> Callable:
+    chunks = 0
+    send_s = 0.0
+
+    async def send_with_request_id(message: Message) -> None:
+        nonlocal chunks, send_s
+        if message["type"] == "http.response.start":
+            headers = list(message.get("headers", []))
+            headers.append((b"x-request-id", request_id.encode()))
+            message["headers"] = headers
+            root.set_attribute("http.response.status_code", message["status"])
+        elif message["type"] == "http.response.body" and root.is_recording():
+            if chunks == 0:
+                root.add_event("http.first_byte")
+            chunks += 1
+            started = time.perf_counter()
             await send(message)
+            send_s += time.perf_counter() - started
+            if not message.get("more_body", False):
+                root.set_attribute("http.response.body_chunks", chunks)
+                root.set_attribute("http.response.send_ms", round(send_s * 1000, 1))
+            return
+        await send(message)
 
-        await self.app(scope, receive, send_with_request_id)
+    return send_with_request_id
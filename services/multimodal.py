@@ -10,15 +10,20 @@ agent call path is zero-cost compatible with the existing text-only flow.
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
-import tempfile
 from pathlib import Path
 from typing import Sequence
 
 from pydantic_ai.messages import ImageUrl, UserContent
 
+from config.settings import get_settings
 from models.conversation import Attachment
+from services.file_download import DownloadTooLargeError, download_to_tempfile
+from services.java_client import fan_out
+from services.metrics import get_metrics_collector
+from services.ttl_cache import TTLCache
 
 logger = logging.getLogger(__name__)
 
@@ -76,6 +81,11 @@ async def build_user_content(
     - With document attachments → downloads, extracts text, and prepends
       as context to the text prompt.
 
+    Signed URLs for all attachments are resolved in one concurrent batch,
+    documents are downloaded and extracted concurrently, and extracted text
+    is cached by file id + content hash, so a turn costs roughly the time
+    of its slowest file and a re-sent file costs nothing.
+
     Args:
         text_prompt: The assembled text prompt (language hint + history + message).
         attachments: Attachments from the conversation request.
@@ -89,25 +99,35 @@ async def build_user_content(
     if not image_atts and not doc_atts:
         return text_prompt
 
-    # ── Extract text from document attachments ──
+    # ── Resolve signed URLs (skipping documents whose text is cached) ──
+    uncached_docs = [a for a in doc_atts if _cached_document_text(a) is None]
+    urls = await _resolve_urls(image_atts + uncached_docs)
+
+    # ── Extract text from document attachments (concurrently) ──
     doc_context = ""
     if doc_atts:
+        results = await fan_out(
+            doc_atts,
+            lambda att: _extract_document_text(att, urls.get(att.file_id, att.url)),
+            limit=get_settings().attachment_download_concurrency,
+            return_exceptions=True,
+        )
         doc_texts: list[str] = []
-        for att in doc_atts:
-            try:
-                extracted = await _extract_document_text(att)
-                if extracted.strip():
-                    doc_texts.append(f"[Attached file: {att.filename}]\n{extracted}")
-                    logger.info(
-                        "Extracted %d chars from document %s (%s)",
-                        len(extracted), att.filename, att.mime_type,
-                    )
-            except Exception as exc:
+        for att, result in zip(doc_atts, results):
+            if isinstance(result, BaseException):
                 logger.warning(
                     "Failed to extract text from %s (%s): %s",
-                    att.filename, att.mime_type, exc,
+                    att.filename, att.mime_type, result,
+                )
+                reason = "file too large" if isinstance(result, DownloadTooLargeError) \
+                    else "could not extract content"
+                doc_texts.append(f"[Attached file: {att.filename} — {reason}]")
+            elif result.strip():
+                doc_texts.append(f"[Attached file: {att.filename}]\n{result}")
+                logger.info(
+                    "Extracted %d chars from document %s (%s)",
+                    len(result), att.filename, att.mime_type,
                 )
-                doc_texts.append(f"[Attached file: {att.filename} — could not extract content]")
 
         if doc_texts:
             doc_context = "\n\n".join(doc_texts) + "\n\n"
@@ -126,8 +146,7 @@ async def build_user_content(
     parts: list[UserContent] = []
 
     for att in image_atts:
-        fresh_url = await _refresh_url(att.file_id, att.url)
-        parts.append(ImageUrl(url=fresh_url))
+        parts.append(ImageUrl(url=urls.get(att.file_id, att.url)))
         logger.debug("Multimodal: added image %s (%s)", att.file_id, att.mime_type)
 
     parts.append(enriched_prompt)
@@ -139,42 +158,102 @@ async def build_user_content(
     return parts
 
 
+# ── Caches ────────────────────────────────────────────────────────
+
+# file_id → fresh signed URL
+_url_cache: TTLCache[str, str] | None = None
+# file_id → sha256 of its content (uploads are immutable)
+_content_hash_cache: TTLCache[str, str] | None = None
+# sha256 → extracted text
+_text_cache: TTLCache[str, str] | None = None
+
+
+def _get_url_cache() -> TTLCache[str, str]:
+    global _url_cache
+    if _url_cache is None:
+        settings = get_settings()
+        _url_cache = TTLCache(
+            max_size=settings.attachment_cache_size,
+            ttl_seconds=settings.attachment_url_ttl_s,
+        )
+    return _url_cache
+
+
+def _get_content_hash_cache() -> TTLCache[str, str]:
+    global _content_hash_cache
+    if _content_hash_cache is None:
+        settings = get_settings()
+        _content_hash_cache = TTLCache(
+            max_size=settings.attachment_cache_size,
+            ttl_seconds=settings.attachment_cache_ttl_s,
+        )
+    return _content_hash_cache
+
+
+def _get_text_cache() -> TTLCache[str, str]:
+    global _text_cache
+    if _text_cache is None:
+        settings = get_settings()
+        _text_cache = TTLCache(
+            max_size=settings.attachment_cache_size,
+            ttl_seconds=settings.attachment_cache_ttl_s,
+        )
+    return _text_cache
+
+
+def clear_attachment_caches() -> None:
+    """Drop cached URLs and extracted text (tests / settings reload)."""
+    global _url_cache, _content_hash_cache, _text_cache
+    _url_cache = _content_hash_cache = _text_cache = None
+
+
+def _cached_document_text(att: Attachment) -> str | None:
+    if not att.file_id:
+        return None
+    content_hash = _get_content_hash_cache().get(att.file_id)
+    if content_hash is None:
+        return None
+    return _get_text_cache().get(content_hash)
+
+
 # ── Document text extraction ──────────────────────────────────────
 
 
-async def _extract_document_text(att: Attachment) -> str:
+async def _extract_document_text(att: Attachment, url: str) -> str:
     """Download a document attachment and extract its text content."""
-    fresh_url = await _refresh_url(att.file_id, att.url)
-    file_path = await _download_file(fresh_url, att.filename)
+    metrics = get_metrics_collector()
+    cached = _cached_document_text(att)
+    if cached is not None:
+        metrics.increment("attachment_cache", "hit")
+        return cached
+
+    downloaded = await download_to_tempfile(
+        url,
+        suffix=Path(att.filename).suffix if att.filename else "",
+        prefix="chat_att_",
+        max_bytes=get_settings().attachment_max_bytes,
+    )
     try:
-        return _extract_text(file_path)
+        text_cache = _get_text_cache()
+        text = text_cache.get(downloaded.sha256)
+        if text is None:
+            metrics.increment("attachment_cache", "miss")
+            text = await asyncio.to_thread(_extract_text, downloaded.path)
+            text_cache.set(downloaded.sha256, text)
+        else:
+            # Same content under another file id
+            metrics.increment("attachment_cache", "content_hit")
+        if att.file_id:
+            _get_content_hash_cache().set(att.file_id, downloaded.sha256)
+        return text
     finally:
         # Clean up temp file
         try:
-            os.unlink(file_path)
+            os.unlink(downloaded.path)
         except OSError:
             pass
 
 
-async def _download_file(url: str, filename: str = "") -> str:
-    """Download a file from a signed URL to a temp path."""
-    import httpx
-
-    async with httpx.AsyncClient(verify=False, timeout=120) as client:
-        resp = await client.get(url)
-        resp.raise_for_status()
-
-    suffix = Path(filename).suffix if filename else ""
-    fd, file_path = tempfile.mkstemp(suffix=suffix, prefix="chat_att_")
-    os.close(fd)
-
-    with open(file_path, "wb") as f:
-        f.write(resp.content)
-
-    logger.debug("Downloaded attachment to %s (%d bytes)", file_path, len(resp.content))
-    return file_path
-
-
 def _extract_text(file_path: str) -> str:
     """Extract plain text from a document file.
 
@@ -240,15 +319,44 @@ def _extract_text(file_path: str) -> str:
 # ── URL helpers ──────────────────────────────────────────────────
 
 
-async def _refresh_url(file_id: str, fallback_url: str) -> str:
-    """Get a fresh signed URL from Java backend, falling back to the provided URL."""
+async def _resolve_urls(attachments: Sequence[Attachment]) -> dict[str, str]:
+    """Fresh signed URLs for *attachments*, keyed by file id.
+
+    Unique file ids are refreshed concurrently in one batch; recently
+    refreshed URLs come from cache.  Failures fall back to the URL sent
+    with the attachment.
+    """
+    url_cache = _get_url_cache()
+    urls: dict[str, str] = {}
+    pending: dict[str, str] = {}  # file_id → fallback URL
+    for att in attachments:
+        if att.file_id in urls or att.file_id in pending:
+            continue
+        cached = url_cache.get(att.file_id) if att.file_id else None
+        if cached is not None:
+            urls[att.file_id] = cached
+        else:
+            pending[att.file_id] = att.url
+
+    if pending:
+        file_ids = list(pending)
+        fresh = await fan_out(file_ids, _refresh_url_or_none, limit=len(file_ids))
+        for file_id, url in zip(file_ids, fresh):
+            if url:
+                urls[file_id] = url
+                url_cache.set(file_id, url)
+            else:
+                urls[file_id] = pending[file_id]
+    return urls
+
+
+async def _refresh_url_or_none(file_id: str) -> str | None:
+    if not file_id:
+        return None
     from services.java_file_client import get_file_url
 
     try:
-        url = await get_file_url(file_id)
-        if url:
-            return url
+        return await get_file_url(file_id)
     except Exception as exc:
         logger.warning("Failed to refresh URL for %s: %s; using fallback", file_id, exc)
-
-    return fallback_url
+        return None
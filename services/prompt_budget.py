@@ -0,0 +1,198 @@
+"""Prompt token budgeting for NativeAgent turns.
+
+Every turn ships the system prompt plus one JSON schema per selected tool.
+Some tool docstrings (``generate_interactive_html``) are several thousand
+tokens on their own, so the assembled prompt can dwarf the user message.
+
+This module:
+- estimates the token cost of each tool schema (name + description +
+  parameter schema) once per tool and caches it,
+- keeps two description variants per tool (extended = full docstring,
+  compact = short summary registered via ``@register_tool``),
+- assembles the tool set plus system prompt under a configured budget by
+  compacting the tools with the largest savings first,
+- reports the token cost per toolset for structured logging.
+
+Token counts are estimates — CJK characters count as one token each, other
+text as roughly four characters per token — which is accurate enough for
+budgeting without pulling a tokenizer onto the request path.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Sequence
+
+if TYPE_CHECKING:
+    from tools.registry import RegisteredTool
+
+logger = logging.getLogger(__name__)
+
+# Fixed per-tool overhead (function wrapper, type markers) in provider formats.
+_TOOL_OVERHEAD_TOKENS = 8
+
+
+def _is_cjk(ch: str) -> bool:
+    code = ord(ch)
+    return (
+        0x4E00 <= code <= 0x9FFF  # CJK Unified Ideographs
+        or 0x3400 <= code <= 0x4DBF  # Extension A
+        or 0x3000 <= code <= 0x303F  # CJK punctuation
+        or 0xFF00 <= code <= 0xFFEF  # Full-width forms
+        or 0x3040 <= code <= 0x30FF  # Kana
+        or 0xAC00 <= code <= 0xD7AF  # Hangul
+    )
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of *text* (mixed Chinese/English aware)."""
+    if not text:
+        return 0
+    cjk = sum(1 for ch in text if _is_cjk(ch))
+    other = len(text) - cjk
+    return cjk + (other + 3) // 4
+
+
+# ── Per-tool cost ───────────────────────────────────────────
+
+
+@dataclass(frozen=True)
+class ToolCost:
+    """Estimated prompt tokens for one tool schema."""
+
+    name: str
+    toolset: str
+    schema_tokens: int  # name + parameter JSON schema (description excluded)
+    compact_tokens: int
+    extended_tokens: int
+
+    @property
+    def savings(self) -> int:
+        """Tokens saved by sending the compact description."""
+        return self.extended_tokens - self.compact_tokens
+
+
+_cost_cache: dict[tuple[str, int], ToolCost] = {}
+
+
+def _parameters_schema(rt: RegisteredTool) -> dict:
+    from pydantic_ai import Tool
+
+    return Tool(rt.func, name=rt.name).tool_def.parameters_json_schema
+
+
+def get_tool_cost(rt: RegisteredTool) -> ToolCost:
+    """Return the (cached) token cost of *rt*'s schema in both variants."""
+    key = (rt.name, id(rt.func))
+    cost = _cost_cache.get(key)
+    if cost is not None:
+        return cost
+
+    try:
+        schema = json.dumps(_parameters_schema(rt), ensure_ascii=False)
+    except Exception:
+        logger.debug("Could not build schema for tool %s", rt.name, exc_info=True)
+        schema = ""
+    schema_tokens = estimate_tokens(rt.name) + estimate_tokens(schema) + _TOOL_OVERHEAD_TOKENS
+    extended = rt.extended_description or rt.description
+    compact = rt.compact_description or extended
+    cost = ToolCost(
+        name=rt.name,
+        toolset=rt.toolset,
+        schema_tokens=schema_tokens,
+        compact_tokens=schema_tokens + estimate_tokens(compact),
+        extended_tokens=schema_tokens + estimate_tokens(extended),
+    )
+    _cost_cache[key] = cost
+    return cost
+
+
+# ── Budget assembly ─────────────────────────────────────────
+
+
+@dataclass
+class PromptBudgetPlan:
+    """Result of fitting a system prompt + tool set into a token budget."""
+
+    budget: int
+    system_tokens: int
+    # Tool name → description chosen for this turn.
+    descriptions: dict[str, str] = field(default_factory=dict)
+    # Toolset → estimated schema tokens (after compaction).
+    toolset_tokens: dict[str, int] = field(default_factory=dict)
+    compacted: list[str] = field(default_factory=list)
+
+    @property
+    def tool_tokens(self) -> int:
+        return sum(self.toolset_tokens.values())
+
+    @property
+    def total_tokens(self) -> int:
+        return self.system_tokens + self.tool_tokens
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget > 0 and self.total_tokens > self.budget
+
+    def report(self) -> dict:
+        """Structured summary for logs / metrics."""
+        return {
+            "budget": self.budget,
+            "total_tokens": self.total_tokens,
+            "system_tokens": self.system_tokens,
+            "tool_tokens": self.tool_tokens,
+            "toolset_tokens": dict(self.toolset_tokens),
+            "compacted_tools": list(self.compacted),
+            "over_budget": self.over_budget,
+        }
+
+
+def plan_prompt_budget(
+    tools: Sequence[RegisteredTool],
+    system_prompt: str,
+    budget: int,
+    *,
+    mode: str = "auto",
+) -> PromptBudgetPlan:
+    """Choose a description variant per tool so the prompt fits *budget*.
+
+    Args:
+        tools: Tools selected for this turn.
+        system_prompt: Fully assembled system prompt.
+        budget: Max estimated tokens for system prompt + tool schemas.
+            ``0`` disables the budget.
+        mode: ``"auto"`` (extended, compacting the biggest savings first
+            until under budget), ``"compact"`` or ``"extended"`` (force a
+            variant for every tool).
+
+    Tools are never dropped — a missing tool breaks functionality, an
+    over-budget prompt only costs latency — so the plan may still be
+    ``over_budget`` after full compaction.
+    """
+    costs = {rt.name: get_tool_cost(rt) for rt in tools}
+    use_compact: set[str] = set()
+
+    if mode == "compact":
+        use_compact = set(costs)
+    elif mode == "auto" and budget > 0:
+        total = estimate_tokens(system_prompt) + sum(c.extended_tokens for c in costs.values())
+        for cost in sorted(costs.values(), key=lambda c: c.savings, reverse=True):
+            if total <= budget or cost.savings <= 0:
+                break
+            use_compact.add(cost.name)
+            total -= cost.savings
+
+    plan = PromptBudgetPlan(budget=budget, system_tokens=estimate_tokens(system_prompt))
+    for rt in tools:
+        cost = costs[rt.name]
+        if rt.name in use_compact:
+            plan.descriptions[rt.name] = rt.compact_description or rt.description
+            plan.compacted.append(rt.name)
+            tokens = cost.compact_tokens
+        else:
+            plan.descriptions[rt.name] = rt.extended_description or rt.description
+            tokens = cost.extended_tokens
+        plan.toolset_tokens[rt.toolset] = plan.toolset_tokens.get(rt.toolset, 0) + tokens
+    return plan
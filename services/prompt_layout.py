@@ -0,0 +1,121 @@
+"""Prefix-stable prompt assembly for provider-side prompt caching.
+
+DashScope and OpenAI-compatible providers cache the longest *byte-identical
+prefix* of a request.  Interleaving per-turn content (teacher context, data
+summaries) with static instructions means no two requests share a prefix,
+so every system prompt is billed at full price.
+
+``PromptLayout`` collects named segments flagged static or dynamic and
+renders them static-first (each group in insertion order).  The static
+prefix is fingerprinted so logs and metrics can tell which prompt family a
+request belongs to, and ``record_cache_usage`` feeds provider-reported
+cached-token counts into ``MetricsCollector``.
+
+Usage::
+
+    layout = PromptLayout()
+    layout.static("base", SYSTEM_PROMPT)
+    layout.dynamic("entities", entity_block)
+    prompt = layout.render()
+    ...
+    record_cache_usage(result.usage(), source="native_agent",
+                       fingerprint=layout.fingerprint())
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Any
+
+from services.metrics import get_metrics_collector
+
+_DEFAULT_SEPARATOR = "\n\n"
+
+
+@dataclass(frozen=True)
+class PromptSegment:
+    """A named piece of a prompt."""
+
+    name: str
+    text: str
+    static: bool
+
+
+class PromptLayout:
+    """Ordered prompt builder — static segments always precede dynamic ones."""
+
+    def __init__(self, separator: str = _DEFAULT_SEPARATOR) -> None:
+        self._separator = separator
+        self._segments: list[PromptSegment] = []
+
+    def static(self, name: str, text: str) -> PromptLayout:
+        """Append a segment that is identical across requests of this kind."""
+        return self._add(name, text, static=True)
+
+    def dynamic(self, name: str, text: str) -> PromptLayout:
+        """Append a per-request segment (placed after all static segments)."""
+        return self._add(name, text, static=False)
+
+    def _add(self, name: str, text: str, *, static: bool) -> PromptLayout:
+        text = text.strip("\n")
+        if text:
+            self._segments.append(PromptSegment(name=name, text=text, static=static))
+        return self
+
+    @property
+    def segments(self) -> list[PromptSegment]:
+        """Segments in render order."""
+        return [s for s in self._segments if s.static] + [
+            s for s in self._segments if not s.static
+        ]
+
+    def static_prefix(self) -> str:
+        """The cacheable prefix — all static segments joined."""
+        return self._separator.join(s.text for s in self._segments if s.static)
+
+    def fingerprint(self) -> str:
+        """Short stable hash of the static prefix (empty when there is none)."""
+        prefix = self.static_prefix()
+        if not prefix:
+            return ""
+        return hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:16]
+
+    def render(self) -> str:
+        """Full prompt text: static prefix followed by dynamic segments."""
+        return self._separator.join(s.text for s in self.segments)
+
+    def __str__(self) -> str:
+        return self.render()
+
+
+def cached_tokens_from_usage(usage: Any) -> tuple[int, int]:
+    """Return ``(input_tokens, cached_tokens)`` from a PydanticAI usage object.
+
+    Providers report cache hits as ``prompt_tokens_details.cached_tokens``;
+    PydanticAI normalises that into ``cache_read_tokens``.  Older usage
+    objects expose ``request_tokens`` instead of ``input_tokens``.
+    """
+    if usage is None:
+        return 0, 0
+    input_tokens = getattr(usage, "input_tokens", None)
+    if input_tokens is None:
+        input_tokens = getattr(usage, "request_tokens", None)
+    cached = getattr(usage, "cache_read_tokens", None)
+    return int(input_tokens or 0), int(cached or 0)
+
+
+def record_cache_usage(usage: Any, *, source: str, fingerprint: str = "") -> None:
+    """Record provider prompt-cache usage for one LLM run.  Never raises."""
+    try:
+        input_tokens, cached_tokens = cached_tokens_from_usage(usage)
+    except (TypeError, ValueError):
+        return
+    if not input_tokens and not cached_tokens:
+        return
+    get_metrics_collector().record_prompt_cache(
+        source=source,
+        prefix_fingerprint=fingerprint,
+        input_tokens=input_tokens,
+        cached_tokens=cached_tokens,
+    )
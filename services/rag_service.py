@@ -5,12 +5,15 @@ Phase 7 P1-1: Provides retrieval-augmented generation capabilities for:
 - School-specific teaching materials
 - Question bank with knowledge point indexing
 
-Note: This is a lightweight implementation. For production, consider using
-chromadb or similar vector stores for better retrieval quality.
+Retrieval uses an in-process BM25 inverted index (``services.bm25_index``)
+with CJK bigram tokenization, so lookups over the bundled rubric and
+curriculum corpus stay sub-millisecond.  For semantic retrieval over
+teacher documents see ``insight_backend.rag_engine``.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
 import logging
 from pathlib import Path
@@ -18,7 +21,9 @@ from functools import lru_cache
 from typing import Any
 from dataclasses import dataclass, field
 
+from config.settings import get_settings
 from models.base import CamelModel
+from services.bm25_index import BM25Index
 
 logger = logging.getLogger(__name__)
 
@@ -30,6 +35,7 @@ COLLECTIONS = {
 }
 
 DATA_DIR = Path(__file__).parent.parent / "data"
+INDEX_FILENAME = "rag_index.json"
 
 
 class CorpusVersion(CamelModel):
@@ -52,15 +58,24 @@ class Document:
 
 
 class SimpleRAGStore:
-    """Simple in-memory RAG store for development.
+    """In-memory RAG store backed by a BM25 inverted index per collection.
 
-    In production, replace with chromadb or similar vector store.
+    Documents are keyed by id within a collection; adding an existing id
+    replaces it.  ``save``/``load`` persist documents together with the
+    index term frequencies so a restart skips re-tokenizing the corpus.
     """
 
     def __init__(self):
-        self._documents: dict[str, list[Document]] = {
-            name: [] for name in COLLECTIONS
+        self._documents: dict[str, dict[str, Document]] = {
+            name: {} for name in COLLECTIONS
         }
+        self._indexes: dict[str, BM25Index] = {
+            name: BM25Index() for name in COLLECTIONS
+        }
+
+    def _check_collection(self, collection: str) -> None:
+        if collection not in self._documents:
+            raise ValueError(f"Unknown collection: {collection}")
 
     def add_document(
         self,
@@ -70,9 +85,8 @@ class SimpleRAGStore:
         metadata: dict[str, Any] | None = None,
         version: str = "v1",
     ) -> None:
-        """Add a document to the specified collection."""
-        if collection not in self._documents:
-            raise ValueError(f"Unknown collection: {collection}")
+        """Add (or replace) a document in the specified collection."""
+        self._check_collection(collection)
 
         doc = Document(
             id=doc_id,
@@ -81,7 +95,16 @@ class SimpleRAGStore:
             collection=collection,
             version=version,
         )
-        self._documents[collection].append(doc)
+        self._documents[collection][doc_id] = doc
+        self._indexes[collection].add(doc_id, content)
+
+    def remove_document(self, collection: str, doc_id: str) -> bool:
+        """Remove a document.  Returns False if it was not present."""
+        self._check_collection(collection)
+        if self._documents[collection].pop(doc_id, None) is None:
+            return False
+        self._indexes[collection].remove(doc_id)
+        return True
 
     def query(
         self,
@@ -90,7 +113,7 @@ class SimpleRAGStore:
         n_results: int = 5,
         where: dict[str, Any] | None = None,
     ) -> list[dict[str, Any]]:
-        """Query documents by simple keyword matching.
+        """Query documents by BM25 relevance.
 
         Args:
             collection: Collection to search in.
@@ -101,50 +124,30 @@ class SimpleRAGStore:
         Returns:
             List of matching documents with relevance scores.
         """
-        if collection not in self._documents:
-            raise ValueError(f"Unknown collection: {collection}")
+        self._check_collection(collection)
 
         docs = self._documents[collection]
+        accept = None
+        if where:
+            def accept(doc_id: str) -> bool:
+                metadata = docs[doc_id].metadata
+                return all(metadata.get(k) == v for k, v in where.items())
 
-        # Simple keyword matching (replace with vector similarity in production)
-        keywords = query_text.lower().split()
-        scored_docs = []
-
-        for doc in docs:
-            # Apply metadata filters
-            if where:
-                skip = False
-                for key, value in where.items():
-                    if doc.metadata.get(key) != value:
-                        skip = True
-                        break
-                if skip:
-                    continue
-
-            # Calculate simple relevance score
-            content_lower = doc.content.lower()
-            score = sum(1 for kw in keywords if kw in content_lower)
-
-            if score > 0:
-                scored_docs.append((doc, score))
-
-        # Sort by score descending
-        scored_docs.sort(key=lambda x: x[1], reverse=True)
-
+        hits = self._indexes[collection].search(query_text, n_results, accept)
         return [
             {
-                "id": doc.id,
-                "content": doc.content,
-                "metadata": doc.metadata,
+                "id": doc_id,
+                "content": docs[doc_id].content,
+                "metadata": docs[doc_id].metadata,
+                "score": round(score, 4),
                 "distance": 1.0 / (score + 1),  # Convert to distance-like metric
             }
-            for doc, score in scored_docs[:n_results]
+            for doc_id, score in hits
         ]
 
     def get_collection_stats(self, collection: str) -> dict[str, Any]:
         """Get statistics for a collection."""
-        if collection not in self._documents:
-            raise ValueError(f"Unknown collection: {collection}")
+        self._check_collection(collection)
 
         docs = self._documents[collection]
         return {
@@ -153,6 +156,58 @@ class SimpleRAGStore:
             "doc_count": len(docs),
         }
 
+    # ── Persistence ─────────────────────────────────────────
+
+    def save(self, path: Path, fingerprint: str = "") -> None:
+        """Write documents and index to *path* (atomically)."""
+        payload = {
+            "fingerprint": fingerprint,
+            "collections": {
+                name: {
+                    "documents": [
+                        {
+                            "id": d.id,
+                            "content": d.content,
+                            "metadata": d.metadata,
+                            "version": d.version,
+                        }
+                        for d in docs.values()
+                    ],
+                    "index": self._indexes[name].to_dict(),
+                }
+                for name, docs in self._documents.items()
+            },
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path, fingerprint: str = "") -> SimpleRAGStore | None:
+        """Load a store written by ``save``.
+
+        Returns None when the file is missing, unreadable, or was built from
+        different source data (*fingerprint* mismatch).
+        """
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            if payload.get("fingerprint") != fingerprint:
+                return None
+            store = cls()
+            for name, section in payload["collections"].items():
+                store._check_collection(name)
+                store._documents[name] = {
+                    d["id"]: Document(collection=name, **d) for d in section["documents"]
+                }
+                store._indexes[name] = BM25Index.from_dict(section["index"])
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Ignoring unreadable RAG index %s: %s", path, e)
+            return None
+        return store
+
 
 class CurriculumRAG:
     """DSE 课纲 RAG 服务
@@ -169,10 +224,39 @@ class CurriculumRAG:
                         If None, uses in-memory storage only.
         """
         self.persist_dir = Path(persist_dir) if persist_dir else None
-        self._store = SimpleRAGStore()
-
-        # Load initial data if available
-        self._load_initial_data()
+        self._fingerprint = self._source_fingerprint()
+
+        store = None
+        if self.persist_dir is not None:
+            store = SimpleRAGStore.load(self.persist_dir / INDEX_FILENAME, self._fingerprint)
+        if store is not None:
+            self._store = store
+            logger.debug("Loaded RAG index from %s", self.persist_dir)
+        else:
+            self._store = SimpleRAGStore()
+            # Load initial data if available
+            self._load_initial_data()
+            self.save()
+
+    @staticmethod
+    def _source_fingerprint() -> str:
+        """Hash of the bundled source files; a persisted index is reused
+        only while this matches."""
+        h = hashlib.sha1()
+        for sub in ("rubrics", "knowledge_points"):
+            for file_path in sorted((DATA_DIR / sub).glob("*.json")):
+                st = file_path.stat()
+                h.update(f"{sub}/{file_path.name}:{st.st_size}:{st.st_mtime_ns};".encode())
+        return h.hexdigest()
+
+    def save(self) -> None:
+        """Persist the store to ``persist_dir`` (no-op when in-memory only)."""
+        if self.persist_dir is None:
+            return
+        try:
+            self._store.save(self.persist_dir / INDEX_FILENAME, self._fingerprint)
+        except OSError as e:
+            logger.warning("Failed to persist RAG index to %s: %s", self.persist_dir, e)
 
     def _load_initial_data(self) -> None:
         """Load initial corpus data from data/ directory."""
@@ -260,6 +344,10 @@ Difficulty: {kp.get('difficulty', 'medium')}
         """Add a document to the specified collection."""
         self._store.add_document(collection, doc_id, content, metadata, version)
 
+    def remove_document(self, collection: str, doc_id: str) -> bool:
+        """Remove a document from the specified collection."""
+        return self._store.remove_document(collection, doc_id)
+
     def query(
         self,
         collection: str,
@@ -354,5 +442,5 @@ def get_rag_service() -> CurriculumRAG:
     """Get the RAG service singleton."""
     global _rag_service
     if _rag_service is None:
-        _rag_service = CurriculumRAG()
+        _rag_service = CurriculumRAG(get_settings().rag_index_dir or None)
     return _rag_service
@@ -0,0 +1,188 @@
+"""Resumable SSE streams: detached runs, sequence numbers and Last-Event-ID.
+
+A dropped mobile connection used to cancel ``/api/conversation/stream``
+mid-turn (the session was only saved after the last event) and lose the
+page built by ``/api/page/generate``; the retry then started the whole run
+again.  Streaming endpoints now go through :class:`StreamRegistry`:
+
+- **Detached run** — the producer runs as its own task and appends every
+  event to a :class:`~services.generation_cache.GenerationJob` log, so it
+  finishes (and persists the session / caches the page) even when the
+  client is gone.  The HTTP response only *follows* the log.
+- **Sequence numbers** — event ``n`` (1-based) of stream ``s`` is sent with
+  the SSE ``id: s:n``; the stream id is also returned as ``X-Stream-Id``.
+- **Resume** — a retry carrying ``Last-Event-ID: s:n`` attaches to stream
+  ``s`` and replays from event ``n + 1`` (then keeps following if the run
+  is still going) instead of starting a new run.  Each stream records its
+  *owner* (teacher id, and conversation id for conversation turns); a
+  retry from anyone else is treated as an unknown id.
+- **Capacity** — a detached run holds a
+  :func:`~services.concurrency.detached_run_slot` for its whole life, so
+  runs whose client went away still count against the heavy-endpoint cap.
+
+Finished logs are kept for ``stream_resume_ttl_s`` in a per-worker LRU of
+``stream_resume_max_streams`` entries, so resumption needs the retry to
+reach the same worker (sticky sessions).  An unknown or expired id falls
+back to a fresh run.  Resumes are counted under the ``sse_resume`` counter
+(``{kind}`` on success, ``miss`` otherwise).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable
+
+from config.settings import get_settings
+from services.concurrency import detached_run_slot
+from services.generation_cache import EventProducer, GenerationJob
+from services.metrics import get_metrics_collector
+from services.ttl_cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+def new_stream_id() -> str:
+    return f"s-{uuid.uuid4().hex[:16]}"
+
+
+def format_event_id(stream_id: str, seq: int) -> str:
+    return f"{stream_id}:{seq}"
+
+
+def parse_event_id(raw: str | None) -> tuple[str, int] | None:
+    """Split a ``Last-Event-ID`` of the form ``stream_id:seq``; None if malformed."""
+    if not raw:
+        return None
+    stream_id, sep, seq = raw.strip().rpartition(":")
+    if not sep or not stream_id or not seq.isdigit():
+        return None
+    return stream_id, int(seq)
+
+
+Owner = tuple[str, ...]
+
+
+@dataclass
+class _Stream:
+    job: GenerationJob
+    owner: Owner
+
+
+class StreamRegistry:
+    """Per-worker buffered event logs addressable by stream id."""
+
+    def __init__(
+        self,
+        *,
+        max_streams: int = 512,
+        ttl_s: float = 300.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._streams: TTLCache[str, _Stream] = TTLCache(
+            max_size=max_streams, ttl_seconds=ttl_s, clock=clock,
+        )
+        self._tasks: set[asyncio.Task[None]] = set()
+
+    def launch(
+        self, kind: str, produce: EventProducer, *, owner: Owner = (),
+    ) -> tuple[str, GenerationJob]:
+        """Start *produce* detached from the caller; returns its stream id and log."""
+        stream_id = new_stream_id()
+        job = GenerationJob(stream_id, kind)
+        job.task = asyncio.create_task(self._run(job, produce))
+        self._tasks.add(job.task)
+        job.task.add_done_callback(self._tasks.discard)
+        entry = _Stream(job, owner)
+        self._streams.set(stream_id, entry)
+        job.task.add_done_callback(lambda _: self._streams.set(stream_id, entry))
+        return stream_id, job
+
+    def register(self, kind: str, job: GenerationJob, *, owner: Owner = ()) -> str:
+        """Make an already running (or replayed) *job* resumable."""
+        stream_id = new_stream_id()
+        entry = _Stream(job, owner)
+        self._streams.set(stream_id, entry)
+        if job.task is not None and not job.task.done():
+            # Restart the TTL when the run ends rather than when it began.
+            job.task.add_done_callback(lambda _: self._streams.set(stream_id, entry))
+        return stream_id
+
+    def resume(
+        self, last_event_id: str | None, kind: str, *, owner: Owner = (),
+    ) -> tuple[str, GenerationJob, int] | None:
+        """``(stream_id, job, next_index)`` for a ``Last-Event-ID``, or None.
+
+        Only the *owner* the stream was launched for may resume it.
+        """
+        parsed = parse_event_id(last_event_id)
+        if parsed is None:
+            return None
+        stream_id, seq = parsed
+        entry = self._streams.get(stream_id)
+        if entry is None or entry.job.kind != kind or seq > len(entry.job.events):
+            get_metrics_collector().increment("sse_resume", "miss")
+            logger.info("Cannot resume %s stream %s; starting a new run", kind, last_event_id)
+            return None
+        if entry.owner != owner:
+            get_metrics_collector().increment("sse_resume", "miss")
+            logger.warning("Refusing to resume %s stream %s for another caller", kind, stream_id)
+            return None
+        get_metrics_collector().increment("sse_resume", kind)
+        return stream_id, entry.job, seq
+
+    async def _run(self, job: GenerationJob, produce: EventProducer) -> None:
+        try:
+            async with detached_run_slot():
+                async for event in produce():
+                    await job.append(event)
+        except asyncio.CancelledError:
+            await job.finish("failed", "cancelled")
+            raise
+        except Exception as exc:
+            logger.exception("Detached %s stream %s failed", job.kind, job.key)
+            await job.finish("failed", str(exc) or type(exc).__name__)
+        else:
+            await job.finish("done")
+
+    async def close(self) -> None:
+        for task in list(self._tasks):
+            task.cancel()
+        self._tasks.clear()
+        self._streams.clear()
+
+
+async def follow_numbered(job: GenerationJob, start: int = 0) -> AsyncIterator[tuple[int, Any]]:
+    """``(seq, event)`` pairs of *job* from index *start* (seq is 1-based)."""
+    seq = start
+    async for event in job.follow(start):
+        seq += 1
+        yield seq, event
+
+
+_stream_registry: StreamRegistry | None = None
+
+
+def get_stream_registry() -> StreamRegistry | None:
+    """Worker-wide registry, or None when ``stream_resume_enabled`` is off."""
+    global _stream_registry
+    settings = get_settings()
+    if not settings.stream_resume_enabled:
+        return None
+    if _stream_registry is None:
+        _stream_registry = StreamRegistry(
+            max_streams=settings.stream_resume_max_streams,
+            ttl_s=settings.stream_resume_ttl_s,
+        )
+    return _stream_registry
+
+
+async def close_stream_registry() -> None:
+    """Cancel detached runs (app shutdown)."""
+    global _stream_registry
+    if _stream_registry is not None:
+        await _stream_registry.close()
+        _stream_registry = None
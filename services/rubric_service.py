@@ -2,50 +2,186 @@
 
 Phase 7: Provides access to assessment rubrics stored in data/rubrics/.
 Supports loading by ID and listing/filtering rubrics.
+
+Rubric files are parsed once per worker into a ``RubricCatalog`` indexed
+by subject, task type and level, so lookups during grading turns do no
+filesystem I/O.  Set ``rubric_reload_interval`` to pick up edited files
+without a restart.
 """
 
 from __future__ import annotations
 
 import json
 import logging
-from functools import lru_cache
+import threading
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any
+from types import MappingProxyType
+from typing import Any, Mapping
 
+from config.settings import get_settings
 from models.rubric import Rubric
 
 logger = logging.getLogger(__name__)
 
 RUBRIC_DIR = Path(__file__).parent.parent / "data" / "rubrics"
 
+_FILTER_FIELDS = ("subject", "taskType", "level")
+
+
+@dataclass(frozen=True)
+class RubricCatalog:
+    """All rubrics in a directory, parsed once and indexed for lookup.
+
+    ``summaries`` keeps the list view in filename order; ``index`` maps each
+    filter field to ``{lower-cased value: positions in summaries}``.
+    """
+
+    summaries: tuple[dict[str, Any], ...]
+    rubrics: Mapping[str, Rubric]
+    index: Mapping[str, Mapping[str, frozenset[int]]]
+    signature: tuple[tuple[str, int, int], ...]
+
+    def find(self, subject: str = "", task_type: str = "", level: str = "") -> list[dict[str, Any]]:
+        """Summaries matching all non-empty filters (case-insensitive)."""
+        hits: frozenset[int] | None = None
+        for field_name, value in zip(_FILTER_FIELDS, (subject, task_type, level)):
+            if not value:
+                continue
+            positions = self.index[field_name].get(value.lower(), frozenset())
+            hits = positions if hits is None else hits & positions
+            if not hits:
+                return []
+        if hits is None:
+            return [dict(s) for s in self.summaries]
+        return [dict(self.summaries[i]) for i in sorted(hits)]
+
+    def get(self, rubric_id: str) -> Rubric | None:
+        key = rubric_id.lower()
+        return self.rubrics.get(key) or self.rubrics.get(key.replace("_", "-"))
+
+
+def _dir_signature(directory: Path) -> tuple[tuple[str, int, int], ...]:
+    """``(filename, mtime_ns, size)`` for every rubric file."""
+    signature = []
+    for file_path in sorted(directory.glob("*.json")):
+        try:
+            st = file_path.stat()
+        except OSError:
+            continue
+        signature.append((file_path.name, st.st_mtime_ns, st.st_size))
+    return tuple(signature)
+
+
+def build_rubric_catalog(directory: Path) -> RubricCatalog:
+    """Parse every ``*.json`` rubric in *directory* into a catalog."""
+    if not directory.exists():
+        logger.warning("Rubric directory does not exist: %s", directory)
+    signature = _dir_signature(directory) if directory.exists() else ()
+
+    summaries: list[dict[str, Any]] = []
+    rubrics: dict[str, Rubric] = {}
+    index: dict[str, dict[str, set[int]]] = {f: {} for f in _FILTER_FIELDS}
+    for filename, _, _ in signature:
+        file_path = directory / filename
+        try:
+            with open(file_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            summary = {
+                "id": data["id"],
+                "name": data["name"],
+                "subject": data.get("subject", ""),
+                "taskType": data.get("taskType", ""),
+                "level": data.get("level", ""),
+                "totalMarks": data.get("totalMarks", 0),
+                "version": data.get("version", ""),
+            }
+        except (OSError, json.JSONDecodeError, KeyError) as e:
+            logger.warning("Failed to read rubric file %s: %s", file_path, e)
+            continue
+
+        position = len(summaries)
+        summaries.append(summary)
+        for field_name in _FILTER_FIELDS:
+            value = str(summary[field_name]).lower()
+            index[field_name].setdefault(value, set()).add(position)
+
+        try:
+            rubric = Rubric(**data)
+        except Exception as e:
+            logger.error("Failed to load rubric %s: %s", file_path.stem, e)
+            continue
+        rubrics[file_path.stem.lower()] = rubric
+        rubrics.setdefault(rubric.id.lower(), rubric)
+
+    return RubricCatalog(
+        summaries=tuple(summaries),
+        rubrics=MappingProxyType(rubrics),
+        index=MappingProxyType({
+            f: MappingProxyType({v: frozenset(p) for v, p in values.items()})
+            for f, values in index.items()
+        }),
+        signature=signature,
+    )
+
+
+_catalog: RubricCatalog | None = None
+_catalog_dir: Path | None = None
+_catalog_checked_at = 0.0
+_catalog_lock = threading.Lock()
+
+
+def get_rubric_catalog() -> RubricCatalog:
+    """Return the process-wide rubric catalog.
+
+    Loaded once per worker.  When ``rubric_reload_interval`` is positive,
+    file mtimes are re-checked at most that often and the catalog is
+    rebuilt (and swapped atomically) if any rubric file changed.
+    """
+    global _catalog, _catalog_dir, _catalog_checked_at
+
+    catalog = _catalog
+    if catalog is not None and _catalog_dir == RUBRIC_DIR:
+        interval = get_settings().rubric_reload_interval
+        now = time.monotonic()
+        if interval <= 0 or now - _catalog_checked_at < interval:
+            return catalog
+        _catalog_checked_at = now
+        if _dir_signature(RUBRIC_DIR) == catalog.signature:
+            return catalog
+        logger.info("Rubric files changed; reloading catalog")
+
+    with _catalog_lock:
+        if _catalog is catalog or _catalog_dir != RUBRIC_DIR:
+            _catalog = build_rubric_catalog(RUBRIC_DIR)
+            _catalog_dir = RUBRIC_DIR
+            _catalog_checked_at = time.monotonic()
+        return _catalog
+
+
+def reload_rubric_catalog() -> RubricCatalog:
+    """Drop the cached catalog and rebuild it from disk."""
+    global _catalog
+    with _catalog_lock:
+        _catalog = None
+    return get_rubric_catalog()
+
 
-@lru_cache(maxsize=32)
 def load_rubric(rubric_id: str) -> Rubric | None:
-    """Load a rubric by ID from the data/rubrics directory.
+    """Load a rubric by ID from the data/rubrics catalog.
 
     Args:
-        rubric_id: The rubric ID (matches filename without .json extension).
+        rubric_id: The rubric ID (matches filename without .json extension,
+            case-insensitive; underscores are treated as dashes).
 
     Returns:
         Rubric object if found, None otherwise.
     """
-    # Try exact match first
-    file_path = RUBRIC_DIR / f"{rubric_id.lower()}.json"
-    if not file_path.exists():
-        # Try with dashes instead of underscores
-        file_path = RUBRIC_DIR / f"{rubric_id.lower().replace('_', '-')}.json"
-
-    if not file_path.exists():
+    rubric = get_rubric_catalog().get(rubric_id)
+    if rubric is None:
         logger.warning("Rubric not found: %s", rubric_id)
-        return None
-
-    try:
-        with open(file_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return Rubric(**data)
-    except (json.JSONDecodeError, Exception) as e:
-        logger.error("Failed to load rubric %s: %s", rubric_id, e)
-        return None
+    return rubric
 
 
 def list_rubrics(
@@ -63,38 +199,7 @@ def list_rubrics(
     Returns:
         List of rubric summaries with id, name, subject, taskType, level.
     """
-    if not RUBRIC_DIR.exists():
-        logger.warning("Rubric directory does not exist: %s", RUBRIC_DIR)
-        return []
-
-    rubrics = []
-    for file_path in RUBRIC_DIR.glob("*.json"):
-        try:
-            with open(file_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            # Apply filters
-            if subject and data.get("subject", "").lower() != subject.lower():
-                continue
-            if task_type and data.get("taskType", "").lower() != task_type.lower():
-                continue
-            if level and data.get("level", "").lower() != level.lower():
-                continue
-
-            rubrics.append({
-                "id": data["id"],
-                "name": data["name"],
-                "subject": data.get("subject", ""),
-                "taskType": data.get("taskType", ""),
-                "level": data.get("level", ""),
-                "totalMarks": data.get("totalMarks", 0),
-                "version": data.get("version", ""),
-            })
-        except (json.JSONDecodeError, KeyError) as e:
-            logger.warning("Failed to read rubric file %s: %s", file_path, e)
-            continue
-
-    return rubrics
+    return get_rubric_catalog().find(subject, task_type, level)
 
 
 def get_rubric_for_task(
@@ -112,17 +217,18 @@ def get_rubric_for_task(
     Returns:
         Best matching Rubric, or None if not found.
     """
-    candidates = list_rubrics(subject=subject, task_type=task_type, level=level)
+    catalog = get_rubric_catalog()
+    candidates = catalog.find(subject=subject, task_type=task_type, level=level)
 
     if not candidates:
         # Try without level filter
-        candidates = list_rubrics(subject=subject, task_type=task_type)
+        candidates = catalog.find(subject=subject, task_type=task_type)
 
     if not candidates:
         return None
 
     # Return the first match
-    return load_rubric(candidates[0]["id"])
+    return catalog.get(candidates[0]["id"])
 
 
 def get_rubric_context(rubric: Rubric) -> dict[str, Any]:
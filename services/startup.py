@@ -0,0 +1,147 @@
+"""Startup timing, background warm-up and readiness tracking.
+
+Worker boot used to do everything before serving: import the native tool
+chain, build the planner agent, and await the RAG engine's PostgreSQL pool
+(which waits out the connect timeout when the DB is down).  After a
+gunicorn ``max_requests`` recycle that window surfaced as 503s.
+
+Now boot does only what serving needs, and everything else runs as
+*warm-up* tasks once the event loop is up:
+
+- ``mark_phase`` records named boot phases; ``check_startup_budget`` logs a
+  warning when boot exceeds ``startup_budget_s``,
+- ``start_warmup`` runs a component's initializer in the background and
+  tracks it as ``pending`` → ``ready`` / ``failed``,
+- ``readiness`` backs ``GET /api/health/ready``: the worker is ready once
+  the lifespan has started serving and every *required* warm-up has
+  finished; optional components (RAG) only report their state.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+from services.metrics import get_metrics_collector
+
+logger = logging.getLogger(__name__)
+
+_boot_started = time.monotonic()
+
+
+@dataclass
+class WarmupComponent:
+    name: str
+    required: bool
+    status: str = "pending"  # pending | ready | failed
+    error: str = ""
+    duration_ms: float = 0.0
+    task: asyncio.Task[None] | None = field(default=None, repr=False)
+
+    def to_dict(self) -> dict[str, Any]:
+        payload: dict[str, Any] = {
+            "status": self.status,
+            "required": self.required,
+            "durationMs": round(self.duration_ms, 1),
+        }
+        if self.error:
+            payload["error"] = self.error
+        return payload
+
+
+_phases: dict[str, float] = {}
+_components: dict[str, WarmupComponent] = {}
+
+
+def begin_boot(started: float | None = None) -> None:
+    """Set the boot start (``time.monotonic()`` taken at the top of main)."""
+    global _boot_started
+    _boot_started = time.monotonic() if started is None else started
+    _phases.clear()
+
+
+def mark_phase(name: str) -> float:
+    """Record that boot phase *name* finished; returns ms since boot start."""
+    elapsed_ms = (time.monotonic() - _boot_started) * 1000
+    _phases[name] = round(elapsed_ms, 1)
+    return elapsed_ms
+
+
+def check_startup_budget(budget_s: float) -> bool:
+    """Log the boot timeline; warn (and count) when it exceeds *budget_s*."""
+    elapsed_ms = mark_phase("serving")
+    timeline = ", ".join(f"{name}={ms:.0f}ms" for name, ms in _phases.items())
+    if budget_s > 0 and elapsed_ms > budget_s * 1000:
+        logger.warning("Startup took %.0fms (budget %.0fms): %s", elapsed_ms, budget_s * 1000, timeline)
+        get_metrics_collector().increment("startup", "over_budget")
+        return False
+    logger.info("Startup took %.0fms: %s", elapsed_ms, timeline)
+    return True
+
+
+def start_warmup(
+    name: str,
+    init: Callable[[], Awaitable[Any]],
+    *,
+    required: bool = True,
+) -> WarmupComponent:
+    """Run *init* in the background and track it under *name*."""
+    component = WarmupComponent(name=name, required=required)
+    _components[name] = component
+
+    async def _run() -> None:
+        started = time.monotonic()
+        try:
+            await init()
+        except Exception as exc:
+            component.status = "failed"
+            component.error = str(exc)[:200]
+            logger.warning("Warm-up %s failed: %s", name, exc)
+        else:
+            component.status = "ready"
+            logger.info("Warm-up %s ready", name)
+        finally:
+            component.duration_ms = (time.monotonic() - started) * 1000
+            get_metrics_collector().increment("startup_warmup", f"{name}_{component.status}")
+
+    component.task = asyncio.create_task(_run())
+    return component
+
+
+async def wait_for_warmup(name: str, timeout: float | None = None) -> bool:
+    """Wait for *name*'s warm-up; returns True when it finished ready."""
+    component = _components.get(name)
+    if component is None or component.task is None:
+        return False
+    await asyncio.wait({component.task}, timeout=timeout)
+    return component.status == "ready"
+
+
+def readiness() -> tuple[bool, dict[str, Any]]:
+    """Return ``(ready, report)`` for the readiness endpoint."""
+    ready = "serving" in _phases and all(
+        c.status == "ready" for c in _components.values() if c.required
+    )
+    return ready, {
+        "status": "ready" if ready else "starting",
+        "components": {name: c.to_dict() for name, c in _components.items()},
+        "startupMs": dict(_phases),
+    }
+
+
+async def stop_warmups() -> None:
+    """Cancel unfinished warm-ups (app shutdown)."""
+    tasks = [c.task for c in _components.values() if c.task is not None and not c.task.done()]
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def reset_startup_state() -> None:
+    """Forget phases and components (tests)."""
+    _phases.clear()
+    _components.clear()
@@ -27,6 +27,7 @@ from pydantic_ai.result import StreamedRunResult
 
 from models.errors import classify_stream_error
 from services.datastream import DataStreamEncoder
+from services.tracing import current_span
 
 logger = logging.getLogger(__name__)
 
@@ -246,6 +247,8 @@ async def adapt_stream(
 
                     if current_len > prev_len:
                         delta = part.content[prev_len:]
+                        if not prev_text_len:
+                            current_span().add_event("llm.first_token")
                         yield enc.text_delta(text_id, delta)
                         prev_text_len[idx] = current_len
 
@@ -447,6 +450,17 @@ def _emit_semantic_events(
             },
         }))
 
+    # ── Background media task started (video) ──
+    # Progress and the final file-ready event arrive on eventsUrl.
+    elif output.get("media_task_id"):
+        lines.append(enc.data("media-task", {
+            "taskId": output["media_task_id"],
+            "type": artifact_type or "video",
+            "status": output.get("task_status", "running"),
+            "statusUrl": output.get("status_url", ""),
+            "eventsUrl": output.get("events_url", ""),
+        }, id=f"media-{output['media_task_id']}"))
+
     # ── Interactive content (complete HTML) ──
     # "html" from generate_interactive_html; "content" from patch_artifact
     elif artifact_type == "interactive" and (output.get("html") or output.get("content")):
@@ -0,0 +1,211 @@
+"""Per-request tracing spans (OpenTelemetry).
+
+``MetricsCollector`` only has aggregates; to find the slow tail of a chat
+turn we need the breakdown of *that* turn.  When ``tracing_enabled`` is on,
+every HTTP request gets a root span (``RequestIdMiddleware``) and the hot
+path adds children:
+
+- ``agent.select_toolsets`` / ``agent.turn`` (NativeAgent), plus PydanticAI's
+  own ``agent run`` / ``chat <model>`` / ``running tool`` spans via
+  ``Agent.instrument_all`` (message content is *not* recorded),
+- ``tool <name>`` around every registered tool (``_wrap_with_metrics``),
+- ``java.request`` per JavaClient call, ``rag.search`` per RAG query,
+- ``executor.blueprint`` with one child per phase (data / compute / compose).
+
+All spans carry ``request.id`` (the ``X-Request-ID`` of the request that
+started them), so one ``jq 'select(.attributes["request.id"]=="…")'``
+over the trace file shows a whole turn.  The stream itself is annotated
+with ``llm.first_token`` and ``http.first_byte`` events and the total time
+spent flushing body chunks.
+
+Exporters (``tracing_exporter``): ``file`` (one JSON span per line at
+``tracing_file_path``), ``console`` (stdout) or ``otlp`` (OTLP/HTTP to
+``tracing_otlp_endpoint``).  With tracing disabled the helpers hand out
+non-recording spans, so call sites need no guards.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Sequence
+
+from opentelemetry import trace
+from opentelemetry.context import Context
+from opentelemetry.sdk.resources import Resource
+from opentelemetry.sdk.trace import ReadableSpan, SpanProcessor, TracerProvider
+from opentelemetry.sdk.trace.export import (
+    BatchSpanProcessor,
+    ConsoleSpanExporter,
+    SpanExporter,
+    SpanExportResult,
+)
+from opentelemetry.sdk.trace.sampling import ParentBased, TraceIdRatioBased
+from opentelemetry.trace import Span, Status, StatusCode
+
+from config.settings import get_settings
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "insight-ai-agents"
+
+# Set by RequestIdMiddleware for the duration of a request.
+request_id_var: ContextVar[str] = ContextVar("request_id", default="")
+
+_provider: TracerProvider | None = None
+
+
+# ── Export ──────────────────────────────────────────────────
+
+
+class RequestIdSpanProcessor(SpanProcessor):
+    """Stamp ``request.id`` on every span started inside a request."""
+
+    def on_start(self, span: Span, parent_context: Context | None = None) -> None:
+        request_id = request_id_var.get()
+        if request_id:
+            span.set_attribute("request.id", request_id)
+
+
+class JsonLinesSpanExporter(SpanExporter):
+    """Append finished spans to *path*, one compact JSON object per line."""
+
+    def __init__(self, path: str) -> None:
+        self._path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(span.to_json(indent=None) + "\n" for span in spans)
+        try:
+            with self._lock, open(self._path, "a", encoding="utf-8") as f:
+                f.write(lines)
+        except OSError as exc:
+            logger.warning("Trace export to %s failed: %s", self._path, exc)
+            return SpanExportResult.FAILURE
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
+
+
+def _build_exporter(kind: str) -> SpanExporter:
+    settings = get_settings()
+    if kind == "console":
+        return ConsoleSpanExporter()
+    if kind == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        return OTLPSpanExporter(endpoint=settings.tracing_otlp_endpoint or None)
+    return JsonLinesSpanExporter(settings.tracing_file_path)
+
+
+# ── Lifecycle ───────────────────────────────────────────────
+
+
+def setup_tracing(exporter: SpanExporter | None = None) -> TracerProvider | None:
+    """Install the worker's tracer provider (no-op when ``tracing_enabled`` is off).
+
+    *exporter* overrides the one chosen by ``tracing_exporter`` (tests).
+    """
+    global _provider
+    settings = get_settings()
+    if not settings.tracing_enabled and exporter is None:
+        return None
+    if _provider is not None:
+        return _provider
+
+    provider = TracerProvider(
+        resource=Resource.create({"service.name": SERVICE_NAME}),
+        sampler=ParentBased(TraceIdRatioBased(settings.tracing_sample_ratio)),
+    )
+    provider.add_span_processor(RequestIdSpanProcessor())
+    provider.add_span_processor(
+        BatchSpanProcessor(exporter or _build_exporter(settings.tracing_exporter))
+    )
+    _provider = provider
+
+    from pydantic_ai import Agent
+    from pydantic_ai.models.instrumented import InstrumentationSettings
+
+    Agent.instrument_all(InstrumentationSettings(
+        tracer_provider=provider,
+        include_content=False,
+        include_binary_content=False,
+    ))
+    logger.info("Tracing enabled — exporter=%s", "custom" if exporter else settings.tracing_exporter)
+    return provider
+
+
+def shutdown_tracing() -> None:
+    """Flush pending spans and uninstall the provider (app shutdown)."""
+    global _provider
+    if _provider is None:
+        return
+    from pydantic_ai import Agent
+
+    Agent.instrument_all(False)
+    _provider.shutdown()
+    _provider = None
+
+
+def get_tracer() -> trace.Tracer:
+    if _provider is not None:
+        return _provider.get_tracer(SERVICE_NAME)
+    return trace.get_tracer(SERVICE_NAME)
+
+
+# ── Spans ───────────────────────────────────────────────────
+
+
+@contextmanager
+def span(
+    name: str,
+    attributes: dict[str, Any] | None = None,
+    *,
+    kind: trace.SpanKind = trace.SpanKind.INTERNAL,
+    context: Context | None = None,
+) -> Iterator[Span]:
+    """Start *name* as the current span; exceptions are recorded on it."""
+    with get_tracer().start_as_current_span(
+        name, context=context, kind=kind, attributes=attributes,
+    ) as current:
+        yield current
+
+
+@contextmanager
+def detached_span(
+    name: str,
+    attributes: dict[str, Any] | None = None,
+    *,
+    parent: Span | None = None,
+) -> Iterator[Span]:
+    """Start *name* without making it current.
+
+    For async generators: a span attached to the context across a ``yield``
+    may be detached from a different context when the consumer goes away.
+    Children must name it explicitly via ``parent=``.
+    """
+    context = trace.set_span_in_context(parent) if parent is not None else None
+    current = get_tracer().start_span(name, context=context, attributes=attributes)
+    try:
+        yield current
+    except (GeneratorExit, asyncio.CancelledError):
+        current.set_attribute("cancelled", True)
+        raise
+    except BaseException as exc:
+        current.record_exception(exc)
+        current.set_status(Status(StatusCode.ERROR, str(exc)))
+        raise
+    finally:
+        current.end()
+
+
+def current_span() -> Span:
+    return trace.get_current_span()
@@ -0,0 +1,99 @@
+"""Bounded in-process LRU cache with per-entry TTL.
+
+Shared building block for the small per-worker caches on the request path
+(toolset planner results, verification results, upstream responses).
+Not thread-safe by design — callers run on the asyncio event loop.
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import Callable, Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_MISSING = object()
+
+
+class TTLCache(Generic[K, V]):
+    """LRU cache bounded by *max_size* whose entries expire after *ttl_seconds*.
+
+    ``ttl_seconds <= 0`` disables expiry (pure LRU).  Expired entries are
+    dropped lazily on access and when the cache is full.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl_seconds: float = 300.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_size <= 0:
+            raise ValueError("max_size must be positive")
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._data: OrderedDict[K, tuple[float, V]] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _expired(self, expires_at: float) -> bool:
+        # Entries that never expire carry ``inf``; per-entry TTLs passed to
+        # ``set()`` apply even when the default TTL is disabled.
+        return self._clock() >= expires_at
+
+    def get(self, key: K, default: V | None = None) -> V | None:
+        """Return the cached value (refreshing its LRU position) or *default*."""
+        entry = self._data.get(key, _MISSING)
+        if entry is _MISSING:
+            self.misses += 1
+            return default
+        expires_at, value = entry  # type: ignore[misc]
+        if self._expired(expires_at):
+            del self._data[key]
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def set(self, key: K, value: V, ttl_seconds: float | None = None) -> None:
+        """Insert or replace *key*; evicts expired then least-recently-used entries."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        expires_at = self._clock() + ttl if ttl > 0 else float("inf")
+        self._data[key] = (expires_at, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.max_size:
+            self._evict()
+
+    def pop(self, key: K, default: V | None = None) -> V | None:
+        entry = self._data.pop(key, _MISSING)
+        if entry is _MISSING:
+            return default
+        return entry[1]  # type: ignore[index]
+
+    def _evict(self) -> None:
+        now = self._clock()
+        for key in [k for k, (exp, _) in self._data.items() if exp <= now]:
+            del self._data[key]
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def keys(self) -> list[K]:
+        """Snapshot of the keys currently held (expired ones included)."""
+        return list(self._data)
+
+    def clear(self) -> None:
+        self._data.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key: object) -> bool:
+        entry = self._data.get(key, _MISSING)  # type: ignore[arg-type]
+        return entry is not _MISSING and not self._expired(entry[0])  # type: ignore[index]
+
+    def __len__(self) -> int:
+        return len(self._data)
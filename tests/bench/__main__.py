@@ -0,0 +1,93 @@
+"""Run the micro-benchmarks and report regressions against the baseline.
+
+Usage:
+    cd insight-ai-agent
+    python -m tests.bench                        # compare, exit 1 on regression
+    python -m tests.bench -k assessment          # only matching cases
+    python -m tests.bench --save-baseline        # record new baselines
+    python -m tests.bench --threshold 0.15 --report bench-report.md --json bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from dataclasses import asdict
+
+from tests.bench.harness import (
+    BASELINE_PATH,
+    DEFAULT_THRESHOLD,
+    compare,
+    load_baseline,
+    registered_cases,
+    render_report,
+    run_case,
+    save_baseline,
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Hot-path micro-benchmarks")
+    parser.add_argument("-k", dest="pattern", default="", help="Substring filter on case names")
+    parser.add_argument("--rounds", type=int, default=7)
+    parser.add_argument("--min-time", type=float, default=0.35, help="Seconds per case")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown over the scaled baseline (0.25 = +25%%)")
+    parser.add_argument("--confirm", type=int, default=1,
+                        help="Re-measure suspected regressions this many times, keeping the best")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="Write results as the new baseline instead of failing")
+    parser.add_argument("--report", help="Write the Markdown report here")
+    parser.add_argument("--json", dest="json_path", help="Write raw results + comparisons here")
+    args = parser.parse_args()
+
+    cases = registered_cases(args.pattern)
+    if not cases:
+        print(f"No benchmark matches {args.pattern!r}", file=sys.stderr)
+        return 2
+
+    measure_kwargs = {"rounds": args.rounds, "min_time": args.min_time}
+    results = []
+    for case in cases:
+        result = run_case(case, **measure_kwargs)
+        results.append(result)
+        print(f"  {case.name:<45} {result.min_us:>10.1f} µs  (n={result.iterations})", file=sys.stderr)
+
+    baseline = load_baseline(args.baseline)
+    if args.save_baseline:
+        save_baseline(results, args.baseline, merge=baseline)
+        print(f"Baseline written to {args.baseline}", file=sys.stderr)
+        return 0
+
+    thresholds = {c.name: c.threshold for c in cases if c.threshold is not None}
+    comparisons = compare(results, baseline, threshold=args.threshold, thresholds=thresholds)
+    by_name = {case.name: case for case in cases}
+    for _ in range(args.confirm):
+        suspects = {c.name for c in comparisons if c.status == "regressed"}
+        if not suspects:
+            break
+        # A slow neighbour on a shared runner only ever adds time: keep the faster run.
+        results = [
+            min(r, run_case(by_name[r.name], **measure_kwargs), key=lambda x: x.min_us / x.calibration_us)
+            if r.name in suspects else r
+            for r in results
+        ]
+        comparisons = compare(results, baseline, threshold=args.threshold, thresholds=thresholds)
+    report = render_report(results, comparisons)
+    print(report)
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            f.write(report)
+    if args.json_path:
+        with open(args.json_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "results": [asdict(r) for r in results],
+                "comparisons": [asdict(c) for c in comparisons],
+            }, f, indent=2)
+    return 1 if any(c.status == "regressed" for c in comparisons) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,263 @@
+"""Benchmark cases for the per-request hot paths.
+
+Fixtures are sized like a real Form-level class: 40 students, a 20-turn
+conversation, a 10-question quiz stream, a ~3k-character tabbed report.
+Names are ``<group>.<what>``; keep them stable — they key the baselines.
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from unittest.mock import patch
+
+from pydantic_ai.messages import (
+    ModelRequest,
+    ModelResponse,
+    TextPart,
+    ToolCallPart,
+    ToolReturnPart,
+)
+
+from config.prompts.block_compose import build_data_summary
+from services.conversation_store import ConversationSession
+from services.datastream import DataStreamEncoder
+from services.entity_resolver import resolve_entities
+from services.mock_data import CLASS_DETAILS
+from services.stream_adapter import adapt_stream
+from skills.quiz_skill import _try_extract_question
+from tests.bench.harness import bench
+from tests.test_assessment_engine import make_cohort
+from tools.assessment_engine import AssessmentFrame
+from tools.assessment_tools import calculate_class_mastery
+from tools.stats_tools import calculate_stats
+
+_STUDENTS = 40
+
+
+def _scores(n: int = _STUDENTS, seed: int = 7) -> list[float]:
+    rng = random.Random(seed)
+    return [round(min(100, max(0, rng.gauss(68, 15))), 1) for _ in range(n)]
+
+
+def _quiz_question(i: int) -> dict:
+    return {
+        "questionType": "SINGLE_CHOICE",
+        "question": f"第{i}题：若 $x^2 - 5x + 6 = 0$，求 \\(x\\) 的值。Which option is correct?",
+        "options": [f"{c}. x = {i + k}" for k, c in enumerate("ABCD")],
+        "correctAnswer": "A",
+        "explanation": "因式分解得 (x-2)(x-3)=0，" * 3,
+        "difficulty": "medium",
+        "knowledgePoint": "DSE-MATH-QE-01",
+    }
+
+
+def _report_markdown() -> str:
+    kpi = json.dumps({"items": [{"label": "平均分", "value": "68.2"}, {"label": "及格率", "value": "82%"}]})
+    tab = (
+        "## [TAB:KEY] LABEL\n\n"
+        "本班整体表现稳定，阅读理解得分较高，写作部分仍有提升空间。\n\n"
+        f"```block:kpi_grid\n{kpi}\n```\n\n"
+        + "- 建议针对段落结构进行专项练习，并安排每周小测。\n" * 8
+    )
+    return "\n".join(
+        tab.replace("KEY", k).replace("LABEL", k.title()) for k in ("overview", "students", "advice")
+    )
+
+
+# ── SSE encoding ────────────────────────────────────────────
+
+
+@bench("sse.text_delta", group="sse")
+def _():
+    enc = DataStreamEncoder()
+    yield lambda: enc.text_delta("t-0", "本班整体表现稳定，阅读理解得分较高")
+
+
+@bench("sse.tool_output_quiz", group="sse")
+def _():
+    payload = {
+        "type": "tool-output-available",
+        "toolCallId": "call_0123456789",
+        "output": {"status": "ok", "artifact_type": "quiz", "questions": [_quiz_question(i) for i in range(10)]},
+    }
+    yield lambda: DataStreamEncoder._sse(payload)
+
+
+# ── Stream adaptation ───────────────────────────────────────
+
+
+class _SnapshotStream:
+    """Replays cumulative ``ModelResponse`` snapshots like ``StreamedRunResult``."""
+
+    def __init__(self, snapshots: list[ModelResponse], new_messages: list) -> None:
+        self._snapshots = snapshots
+        self._new_messages = new_messages
+
+    async def stream_responses(self):
+        last = len(self._snapshots) - 1
+        for i, response in enumerate(self._snapshots):
+            yield response, i == last
+
+    def new_messages(self):
+        return self._new_messages
+
+
+@bench("stream.adapt_report_200_snapshots", group="stream", threshold=0.4)
+def _():
+    text = _report_markdown()
+    step = max(1, len(text) // 200)
+    call = ToolCallPart(tool_name="get_class_detail", args={"class_id": "class-hk-f1a"}, tool_call_id="call_1")
+    snapshots = [ModelResponse(parts=[call])] + [
+        ModelResponse(parts=[call, TextPart(content=text[:end])])
+        for end in range(step, len(text) + step, step)
+    ]
+    new_messages = [
+        ModelResponse(parts=[call]),
+        ModelRequest(parts=[ToolReturnPart(
+            tool_name="get_class_detail", content=CLASS_DETAILS["class-hk-f1a"], tool_call_id="call_1",
+        )]),
+        snapshots[-1],
+    ]
+    context = {"blueprint_hints": {"expectedArtifacts": ["report"]}}
+
+    async def body():
+        stream = _SnapshotStream(snapshots, new_messages)
+        async for _ in adapt_stream(stream, DataStreamEncoder(), message_id="m-1", context=context):
+            pass
+
+    yield body
+
+
+# ── Quiz streaming parse ────────────────────────────────────
+
+
+@bench("quiz.extract_10_questions", group="quiz")
+def _():
+    stream = "[\n" + ",\n".join(json.dumps(_quiz_question(i), ensure_ascii=False) for i in range(10)) + "\n]"
+
+    def body():
+        buffer = stream
+        while True:
+            question, buffer = _try_extract_question(buffer)
+            if question is None:
+                break
+
+    yield body
+
+
+# ── Entity resolution ───────────────────────────────────────
+
+
+@bench("entities.resolve_class_student_assignment", group="entities", threshold=0.4)
+def _():
+    detail = dict(CLASS_DETAILS["class-hk-f1a"])
+    detail["students"] = [
+        {"student_id": f"s-{i:03d}", "name": f"Student {i:03d}", "number": i} for i in range(_STUDENTS)
+    ] + detail["students"]
+    classes = {"classes": [
+        {k: v for k, v in d.items() if k not in ("students", "assignments")}
+        for d in CLASS_DETAILS.values()
+    ]}
+
+    async def teacher_classes(teacher_id: str = ""):
+        return classes
+
+    async def class_detail(teacher_id: str = "", class_id: str = ""):
+        return detail
+
+    with patch("services.entity_resolver._raw_get_teacher_classes", teacher_classes), \
+            patch("services.entity_resolver._raw_get_class_detail", class_detail):
+        async def body():
+            await resolve_entities("t-001", "分析 Form 1A 的 Wong Ka Ho 在 Unit 5 Test 的成绩")
+
+        yield body
+
+
+# ── Prompt data summary ─────────────────────────────────────
+
+
+@bench("summary.build_data_summary_class", group="summary")
+def _():
+    scores = _scores()
+    data_context = {
+        "class": CLASS_DETAILS["class-hk-f1a"],
+        "submissions": {
+            "assignment_id": "a-001",
+            "title": "Unit 5 Test",
+            "max_score": 100,
+            "submissions": [
+                {
+                    "student_id": f"s-{i:03d}",
+                    "name": f"Student {i:03d}",
+                    "score": score,
+                    "submitted": i % 7 != 0,
+                    "feedback": "Good effort on the reading section. " * 6,
+                }
+                for i, score in enumerate(scores)
+            ],
+            "scores": scores,
+        },
+    }
+    compute_results = {"stats": calculate_stats(scores, max_score=100)}
+    yield lambda: build_data_summary(data_context, compute_results)
+
+
+# ── Conversation history ────────────────────────────────────
+
+
+@bench("history.to_pydantic_messages_20", group="history")
+def _():
+    session = ConversationSession(conversation_id="c-bench")
+    for i in range(30):
+        session.add_user_turn(f"请分析 Form 1A 第{i}次测验的成绩分布，并给出教学建议。")
+        session.add_assistant_turn(
+            "本班平均分 68 分，及格率 82%。建议针对写作进行专项练习。" * 4,
+            action="chat",
+            tool_calls_summary="get_assignment_submissions(a-001), calculate_stats(...)" if i % 2 else None,
+        )
+    session.add_user_turn("继续")
+    yield lambda: session.to_pydantic_messages(max_turns=20)
+
+
+# ── Statistics ──────────────────────────────────────────────
+
+
+@bench("stats.calculate_class", group="stats")
+def _():
+    scores = _scores()
+    yield lambda: calculate_stats(scores, max_score=100)
+
+
+@bench("stats.calculate_cohort_2000", group="stats")
+def _():
+    scores = _scores(2000)
+    yield lambda: calculate_stats(scores)
+
+
+# ── Assessment aggregations ─────────────────────────────────
+
+
+@bench("assessment.frame_from_submissions", group="assessment")
+def _():
+    submissions = make_cohort(_STUDENTS)
+    yield lambda: AssessmentFrame.from_submissions(submissions)
+
+
+@bench("assessment.class_weakness", group="assessment")
+def _():
+    frame = AssessmentFrame.from_submissions(make_cohort(_STUDENTS))
+    yield frame.class_weakness
+
+
+@bench("assessment.student_error_patterns", group="assessment")
+def _():
+    frame = AssessmentFrame.from_submissions(make_cohort(_STUDENTS))
+    yield lambda: frame.student_error_patterns("s-0007")
+
+
+@bench("assessment.class_mastery_tool", group="assessment")
+def _():
+    submissions = make_cohort(_STUDENTS)
+    yield lambda: calculate_class_mastery(submissions)
+
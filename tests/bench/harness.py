@@ -0,0 +1,277 @@
+"""Minimal micro-benchmark harness with stored baselines.
+
+Cases are registered with :func:`bench`.  A case is a generator function:
+everything before its ``yield`` is fixture setup (not timed), the yielded
+zero-argument callable is the timed body (sync or ``async def``), and
+anything after the ``yield`` is teardown::
+
+    @bench("stats.calculate_400", group="stats")
+    def _():
+        scores = make_scores(400)
+        yield lambda: calculate_stats(scores, max_score=100)
+
+:func:`measure` auto-sizes a batch so one round takes ``min_time / rounds``
+and reports per-call statistics.  Async bodies are awaited in a loop inside
+one coroutine, so event-loop start-up is not part of the number.
+
+Each case is timed right after a fixed pure-Python calibration loop, and
+baselines (``baselines.json``) store both numbers.  :func:`compare` works
+on the *fastest* round (noise on a shared runner only ever adds time) and
+scales the stored value by ``current_calibration / baseline_calibration``
+of that case before applying the regression threshold — so a baseline
+recorded on a laptop still means something on a CI runner, and CPU
+frequency drift during a run does not show up as a regression.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import inspect
+import json
+import os
+import platform
+import statistics
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Any, Callable, Iterator
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines.json")
+DEFAULT_THRESHOLD = 0.25  # +25% over the scaled baseline fails
+
+
+@dataclass(frozen=True)
+class BenchCase:
+    name: str
+    group: str
+    factory: Callable[[], Iterator[Callable[[], Any]]]
+    threshold: float | None = None  # per-case override of the run threshold
+
+
+@dataclass
+class BenchResult:
+    name: str
+    group: str
+    median_us: float
+    min_us: float
+    mean_us: float
+    stddev_us: float
+    rounds: int
+    iterations: int  # calls per round
+    calibration_us: float  # calibration loop timed just before this case
+
+
+@dataclass
+class Comparison:
+    name: str
+    status: str  # "ok" | "regressed" | "improved" | "new"
+    current_us: float
+    baseline_us: float | None = None  # already scaled by calibration
+    ratio: float | None = None
+    threshold: float = DEFAULT_THRESHOLD
+
+
+@dataclass
+class Baseline:
+    cases: dict[str, dict[str, float]] = field(default_factory=dict)
+    python: str = ""
+    machine: str = ""
+
+
+_REGISTRY: dict[str, BenchCase] = {}
+
+
+def bench(name: str, *, group: str, threshold: float | None = None):
+    """Register a generator-function case under *name*."""
+
+    def decorator(factory):
+        if name in _REGISTRY:
+            raise ValueError(f"Duplicate benchmark name: {name}")
+        _REGISTRY[name] = BenchCase(name, group, factory, threshold)
+        return factory
+
+    return decorator
+
+
+def registered_cases(pattern: str = "") -> list[BenchCase]:
+    import tests.bench.cases  # noqa: F401 — populates the registry
+
+    return [case for name, case in sorted(_REGISTRY.items()) if pattern in name]
+
+
+# ── Timing ──────────────────────────────────────────────────
+
+
+def _timer_for(body: Callable[[], Any]) -> Callable[[int], float]:
+    """Return ``run(n) -> seconds`` that calls *body* *n* times."""
+    if inspect.iscoroutinefunction(body):
+        async def batch(n: int) -> float:
+            t0 = time.perf_counter()
+            for _ in range(n):
+                await body()
+            return time.perf_counter() - t0
+
+        loop = asyncio.new_event_loop()
+
+        def run(n: int) -> float:
+            return loop.run_until_complete(batch(n))
+
+        run.close = loop.close  # type: ignore[attr-defined]
+        return run
+
+    def run(n: int) -> float:
+        t0 = time.perf_counter()
+        for _ in range(n):
+            body()
+        return time.perf_counter() - t0
+
+    return run
+
+
+def measure(
+    body: Callable[[], Any],
+    *,
+    rounds: int = 7,
+    min_time: float = 0.35,
+    max_iterations: int = 100_000,
+) -> tuple[list[float], int]:
+    """Time *body*; returns ``(per-call seconds per round, calls per round)``."""
+    run = _timer_for(body)
+    try:
+        run(1)  # warm-up: imports, caches, first-call compilation
+        target = min_time / max(rounds, 1)
+        n = 1
+        while n < max_iterations:
+            elapsed = run(n)
+            if elapsed >= target:
+                break
+            n = min(max_iterations, max(n * 2, int(n * target / max(elapsed, 1e-9))))
+        samples = [run(n) / n for _ in range(rounds)]
+    finally:
+        close = getattr(run, "close", None)
+        if close is not None:
+            close()
+    return samples, n
+
+
+def run_case(case: BenchCase, **measure_kwargs: Any) -> BenchResult:
+    with contextlib.contextmanager(case.factory)() as body:
+        calibration_us = calibrate(**measure_kwargs)
+        samples, n = measure(body, **measure_kwargs)
+    us = [s * 1e6 for s in samples]
+    return BenchResult(
+        name=case.name,
+        group=case.group,
+        median_us=statistics.median(us),
+        min_us=min(us),
+        mean_us=statistics.fmean(us),
+        stddev_us=statistics.stdev(us) if len(us) > 1 else 0.0,
+        rounds=len(us),
+        iterations=n,
+        calibration_us=calibration_us,
+    )
+
+
+def _calibration_body() -> None:
+    # Mix of dict/str/arithmetic work comparable to the hot paths.
+    acc: dict[str, int] = {}
+    for i in range(2000):
+        key = f"k{i % 97}"
+        acc[key] = acc.get(key, 0) + i * 3 // 7
+    ",".join(sorted(acc))
+
+
+def calibrate(**measure_kwargs: Any) -> float:
+    """Fastest-round microseconds of the fixed calibration loop on this machine."""
+    samples, _ = measure(_calibration_body, **measure_kwargs)
+    return min(samples) * 1e6
+
+
+# ── Baselines ───────────────────────────────────────────────
+
+
+def load_baseline(path: str = BASELINE_PATH) -> Baseline | None:
+    try:
+        with open(path, encoding="utf-8") as f:
+            raw = json.load(f)
+    except FileNotFoundError:
+        return None
+    return Baseline(**raw)
+
+
+def save_baseline(
+    results: list[BenchResult],
+    path: str = BASELINE_PATH,
+    *,
+    merge: Baseline | None = None,
+) -> Baseline:
+    """Write *results* as the new baseline (keeping other cases from *merge*)."""
+    cases = dict(merge.cases) if merge is not None else {}
+    for r in results:
+        cases[r.name] = {
+            "min_us": round(r.min_us, 3),
+            "median_us": round(r.median_us, 3),
+            "calibration_us": round(r.calibration_us, 3),
+        }
+    baseline = Baseline(
+        cases=dict(sorted(cases.items())),
+        python=platform.python_version(),
+        machine=f"{platform.system()} {platform.machine()}",
+    )
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(asdict(baseline), f, indent=2)
+        f.write("\n")
+    return baseline
+
+
+def compare(
+    results: list[BenchResult],
+    baseline: Baseline | None,
+    *,
+    threshold: float = DEFAULT_THRESHOLD,
+    thresholds: dict[str, float] | None = None,
+) -> list[Comparison]:
+    """Classify each result's ``min_us`` against the calibration-scaled baseline."""
+    out: list[Comparison] = []
+    for r in results:
+        limit = (thresholds or {}).get(r.name, threshold)
+        stored = baseline.cases.get(r.name) if baseline else None
+        if not stored:
+            out.append(Comparison(r.name, "new", r.min_us, threshold=limit))
+            continue
+        expected = stored["min_us"] * r.calibration_us / stored["calibration_us"]
+        ratio = r.min_us / expected if expected else float("inf")
+        if ratio > 1 + limit:
+            status = "regressed"
+        elif ratio < 1 - limit:
+            status = "improved"
+        else:
+            status = "ok"
+        out.append(Comparison(r.name, status, r.min_us, expected, ratio, limit))
+    return out
+
+
+def render_report(results: list[BenchResult], comparisons: list[Comparison]) -> str:
+    """Markdown report: one row per case, regressions first."""
+    by_name = {r.name: r for r in results}
+    order = {"regressed": 0, "improved": 1, "new": 2, "ok": 3}
+    lines = [
+        f"# Micro-benchmarks — {platform.python_version()} on {platform.machine()}",
+        "",
+        f"Calibration loop: {statistics.median(r.calibration_us for r in results):.1f} µs (median)",
+        "",
+        "| case | min µs | median µs | ± stddev | scaled baseline µs | ratio | limit | status |",
+        "|---|---:|---:|---:|---:|---:|---:|---|",
+    ]
+    for c in sorted(comparisons, key=lambda c: (order[c.status], c.name)):
+        r = by_name[c.name]
+        baseline = f"{c.baseline_us:.1f}" if c.baseline_us is not None else "—"
+        ratio = f"{c.ratio:.2f}x" if c.ratio is not None else "—"
+        status = c.status.upper() if c.status == "regressed" else c.status
+        lines.append(
+            f"| {c.name} | {r.min_us:.1f} | {r.median_us:.1f} | {r.stddev_us:.1f} | {baseline} | {ratio} "
+            f"| +{c.threshold:.0%} | {status} |"
+        )
+    regressed = [c.name for c in comparisons if c.status == "regressed"]
+    lines += ["", f"**{len(regressed)} regression(s)**" + (": " + ", ".join(regressed) if regressed else "")]
+    return "\n".join(lines) + "\n"
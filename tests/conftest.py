@@ -6,6 +6,8 @@ Provides:
 - ``native_deps_with_class``: AgentDeps with class_id set
 - ``artifact_store``: Fresh InMemoryArtifactStore per test
 - ``metrics_collector``: Fresh MetricsCollector per test
+- ``fresh_generation_cache`` (autouse): no generation replays or resumable
+  streams carried across tests
 """
 
 from __future__ import annotations
@@ -16,10 +18,18 @@ import pytest
 import tools.native_tools  # noqa: F401
 
 from agents.native_agent import AgentDeps
+from services import generation_cache, resumable_stream
 from services.artifact_store import InMemoryArtifactStore
 from services.metrics import MetricsCollector
 
 
+@pytest.fixture(autouse=True)
+def fresh_generation_cache(monkeypatch):
+    """Generation results and stream logs must not leak across tests."""
+    monkeypatch.setattr(generation_cache, "_generation_cache", None)
+    monkeypatch.setattr(resumable_stream, "_stream_registry", None)
+
+
 @pytest.fixture
 def native_deps() -> AgentDeps:
     """Basic AgentDeps for testing — teacher with no class context."""
@@ -16,6 +16,11 @@ Usage:
     # Run specific user class only:
     locust -f tests/load/locustfile.py ChatUser --host http://localhost:5000
 
+    # Reproducible runs without DashScope / Java: start the deterministic
+    # stand-ins plus a service wired to them, then point Locust at it:
+    python -m tests.load.mock_backends --with-service 5000
+    locust -f tests/load/locustfile.py --host http://localhost:5000
+
 Metrics recorded per endpoint:
     - Response time (p50, p95, p99)
     - TTFE (Time to First Event) for SSE endpoints
@@ -0,0 +1,116 @@
+"""Run the LLM and Java stand-ins (optionally plus the service) for load tests.
+
+Usage:
+    # Mocks only — start the service yourself with the printed env vars:
+    python -m tests.load.mock_backends --llm-port 9100 --java-port 9200
+
+    # Mocks + service on :5000, wired to them:
+    python -m tests.load.mock_backends --with-service 5000 \\
+        --llm-config tests/load/mock_llm.json --java-latency-ms 30
+
+    # Then, from another shell:
+    locust -f tests/load/locustfile.py --host http://localhost:5000
+    python tests/load/run_baseline.py --host http://localhost:5000
+
+Both stand-ins are deterministic for a given seed/config, so numbers from
+two runs differ only by the code under test (and scheduling noise).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+import uvicorn
+
+from tests.load.mock_java import MockJavaConfig, MockJavaServer
+from tests.load.mock_llm import MockLLMConfig, MockLLMServer
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def serve_in_thread(app, port: int = 0, host: str = "127.0.0.1") -> tuple[uvicorn.Server, int]:
+    """Serve *app* from a daemon thread; returns the server and the bound port.
+
+    ``port=0`` picks a free port (tests).  Stop with ``server.should_exit = True``.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    server = uvicorn.Server(uvicorn.Config(app, log_level="warning", lifespan="off"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    deadline = time.monotonic() + 10
+    while not server.started and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return server, sock.getsockname()[1]
+
+
+def service_env(llm_port: int, java_port: int) -> dict[str, str]:
+    """Environment that points the service at the stand-ins."""
+    return {
+        "LLM_MOCK_BASE_URL": f"http://127.0.0.1:{llm_port}/v1",
+        "SPRING_BOOT_BASE_URL": f"http://127.0.0.1:{java_port}",
+        "SPRING_BOOT_API_PREFIX": "/api",
+        "SPRING_BOOT_ACCESS_TOKEN": "mock-dify",
+        "USE_MOCK_DATA": "false",
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Mock LLM + Java backends for load tests")
+    parser.add_argument("--llm-port", type=int, default=9100)
+    parser.add_argument("--java-port", type=int, default=9200)
+    parser.add_argument("--llm-config", help="JSON config for the mock LLM (see mock_llm.py)")
+    parser.add_argument("--seed", type=int, default=0, help="Java fixture seed")
+    parser.add_argument("--java-latency-ms", type=float, default=20.0)
+    parser.add_argument("--java-jitter-ms", type=float, default=0.0)
+    parser.add_argument("--students-per-class", type=int, default=0)
+    parser.add_argument("--with-service", type=int, metavar="PORT",
+                        help="Also start `uvicorn main:app` on PORT wired to the mocks")
+    args = parser.parse_args()
+
+    llm_config = MockLLMConfig.from_file(args.llm_config) if args.llm_config else MockLLMConfig()
+    java_config = MockJavaConfig(
+        seed=args.seed,
+        latency_ms=args.java_latency_ms,
+        jitter_ms=args.java_jitter_ms,
+        students_per_class=args.students_per_class,
+    )
+    _, llm_port = serve_in_thread(MockLLMServer(llm_config).app(), args.llm_port)
+    _, java_port = serve_in_thread(MockJavaServer(java_config).app(), args.java_port)
+    env = service_env(llm_port, java_port)
+    print(f"Mock LLM  → http://127.0.0.1:{llm_port}/v1")
+    print(f"Mock Java → http://127.0.0.1:{java_port}/api")
+    for key, value in env.items():
+        print(f"  export {key}={value}")
+
+    service = None
+    if args.with_service:
+        service = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app",
+             "--host", "127.0.0.1", "--port", str(args.with_service)],
+            cwd=ROOT,
+            env={**os.environ, **env},
+        )
+        print(f"Service   → http://127.0.0.1:{args.with_service}")
+
+    try:
+        while service is None or service.poll() is None:
+            time.sleep(0.5)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if service is not None and service.poll() is None:
+            service.terminate()
+            service.wait(timeout=10)
+    return service.returncode if service is not None else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,239 @@
+"""Spring Boot stand-in serving ``/dify/teacher/...`` fixtures for load tests.
+
+Point the service at it with ``SPRING_BOOT_BASE_URL=http://127.0.0.1:9200``
+(``spring_boot_api_prefix`` stays ``/api``).  Every teacher id gets the
+same classes — the ``services/mock_data`` fixtures, optionally padded to
+``students_per_class`` synthetic students — so Locust's
+``test-teacher-00x`` ids all resolve.
+
+Responses use the real Java envelope (``{code, message, data}``) and page
+DTOs (``{data: [...], pagination: {page, limit, total}}``), so adapters,
+pagination and the response cache run exactly as in production.  Scores
+are derived from ``seed`` + ids, and every request waits ``latency_ms``
+(± ``jitter_ms``) to model the backend round-trip.
+
+Endpoints:
+- ``POST /api/auth/login`` / ``GET /api/auth/me`` (token ``mock-<teacherId>``)
+- ``GET /api/dify/teacher/{t}/classes/me``
+- ``GET /api/dify/teacher/{t}/classes/{classId}``
+- ``GET /api/dify/teacher/{t}/classes/{classId}/assignments``
+- ``GET /api/dify/teacher/{t}/submissions/assignments/{assignmentId}``
+- ``GET /api/dify/teacher/{t}/submissions/students/{studentId}``
+- ``GET /api/dify/student/{s}/courses/{courseId}/mygrades``
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import random
+from dataclasses import dataclass
+from typing import Any
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from services import mock_data
+
+
+@dataclass
+class MockJavaConfig:
+    seed: int = 0
+    latency_ms: float = 20.0
+    jitter_ms: float = 0.0
+    students_per_class: int = 0  # 0 = fixture rosters as-is
+
+
+class MockJavaServer:
+    """Starlette app over deterministic classroom fixtures."""
+
+    def __init__(self, config: MockJavaConfig | None = None) -> None:
+        self.config = config or MockJavaConfig()
+        self.requests = 0
+        self._rng = random.Random(self.config.seed)
+        self._students = {
+            class_id: self._roster(class_id, detail["students"])
+            for class_id, detail in mock_data.CLASS_DETAILS.items()
+        }
+
+    def app(self) -> Starlette:
+        prefix = "/api/dify"
+        return Starlette(routes=[
+            Route("/api/auth/login", self.login, methods=["POST"]),
+            Route("/api/auth/me", self.me),
+            Route(prefix + "/teacher/{teacher_id}/classes/me", self.classes),
+            Route(prefix + "/teacher/{teacher_id}/classes/{class_id}", self.class_detail),
+            Route(prefix + "/teacher/{teacher_id}/classes/{class_id}/assignments", self.assignments),
+            Route(
+                prefix + "/teacher/{teacher_id}/submissions/assignments/{assignment_id}",
+                self.submissions,
+            ),
+            Route(
+                prefix + "/teacher/{teacher_id}/submissions/students/{student_id}",
+                self.student_submissions,
+            ),
+            Route(prefix + "/student/{student_id}/courses/{course_id}/mygrades", self.course_grades),
+        ])
+
+    # -- fixtures ------------------------------------------------------------
+
+    def _roster(self, class_id: str, fixture: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        students = [
+            {"studentId": s["student_id"], "name": s["name"], "studentNo": str(s["number"])}
+            for s in fixture
+        ]
+        for n in range(len(students) + 1, self.config.students_per_class + 1):
+            students.append({
+                "studentId": f"{class_id}-s{n:03d}",
+                "name": f"Student {n:03d}",
+                "studentNo": str(n),
+            })
+        return students
+
+    def _score(self, assignment_id: str, student_id: str, max_score: int) -> int:
+        digest = hashlib.sha256(f"{self.config.seed}:{assignment_id}:{student_id}".encode()).digest()
+        return round(max_score * (0.4 + 0.6 * digest[0] / 255))
+
+    def _assignments(self, class_id: str) -> list[dict[str, Any]]:
+        detail = mock_data.CLASS_DETAILS.get(class_id, {})
+        return [
+            {
+                "assignmentId": a["assignment_id"],
+                "title": a["title"],
+                "assignmentType": a["type"],
+                "totalPoints": a["max_score"],
+                "status": "published",
+                "submissionCount": len(self._students.get(class_id, [])),
+                "totalStudents": len(self._students.get(class_id, [])),
+            }
+            for a in detail.get("assignments", [])
+        ]
+
+    def _find_assignment(self, assignment_id: str) -> tuple[str, dict[str, Any]] | None:
+        for class_id, detail in mock_data.CLASS_DETAILS.items():
+            for a in detail.get("assignments", []):
+                if a["assignment_id"] == assignment_id:
+                    return class_id, a
+        return None
+
+    # -- handlers ------------------------------------------------------------
+
+    async def _respond(self, data: Any, status: int = 200) -> JSONResponse:
+        self.requests += 1
+        delay = self.config.latency_ms
+        if self.config.jitter_ms:
+            delay += self._rng.uniform(-self.config.jitter_ms, self.config.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        return JSONResponse(
+            {"code": status, "message": "success" if status == 200 else "error", "data": data},
+            status_code=status,
+        )
+
+    async def login(self, request: Request) -> JSONResponse:
+        body = await request.json()
+        return await self._respond({
+            "accessToken": f"mock-{body.get('account', 'dify')}",
+            "refreshToken": "mock-refresh",
+            "expiresIn": 86400,
+        })
+
+    async def me(self, request: Request) -> JSONResponse:
+        token = request.headers.get("authorization", "").removeprefix("Bearer ").strip()
+        if not token.startswith("mock-"):
+            return await self._respond(None, status=401)
+        return await self._respond({"id": token.removeprefix("mock-")})
+
+    async def classes(self, request: Request) -> JSONResponse:
+        classes = [
+            {
+                "uid": c["class_id"],
+                "name": c["name"],
+                "grade": c["grade"],
+                "subject": c["subject"],
+                "studentCount": len(self._students.get(c["class_id"], [])),
+                "assignmentCount": len(self._assignments(c["class_id"])),
+            }
+            for c in mock_data.CLASSES["t-001"]
+        ]
+        return await self._respond(classes)
+
+    async def class_detail(self, request: Request) -> JSONResponse:
+        class_id = request.path_params["class_id"]
+        detail = mock_data.CLASS_DETAILS.get(class_id)
+        if detail is None:
+            return await self._respond(None, status=404)
+        return await self._respond({
+            "uid": class_id,
+            "name": detail["name"],
+            "grade": detail["grade"],
+            "subject": detail["subject"],
+            "studentCount": len(self._students[class_id]),
+            "students": self._students[class_id],
+        })
+
+    async def assignments(self, request: Request) -> JSONResponse:
+        items = self._assignments(request.path_params["class_id"])
+        return await self._respond(_page(items, request))
+
+    async def submissions(self, request: Request) -> JSONResponse:
+        assignment_id = request.path_params["assignment_id"]
+        found = self._find_assignment(assignment_id)
+        if found is None:
+            return await self._respond(None, status=404)
+        class_id, assignment = found
+        items = [
+            {
+                "studentId": s["studentId"],
+                "studentName": s["name"],
+                "assignmentTitle": assignment["title"],
+                "score": self._score(assignment_id, s["studentId"], assignment["max_score"]),
+                "status": "graded",
+                "submissionType": "student",
+                "identityType": "registered_account",
+            }
+            for s in self._students[class_id]
+        ]
+        return await self._respond(_page(items, request))
+
+    async def student_submissions(self, request: Request) -> JSONResponse:
+        student_id = request.path_params["student_id"]
+        items = []
+        for class_id, students in self._students.items():
+            if not any(s["studentId"] == student_id for s in students):
+                continue
+            for a in mock_data.CLASS_DETAILS[class_id].get("assignments", []):
+                items.append({
+                    "studentName": next(s["name"] for s in students if s["studentId"] == student_id),
+                    "assignmentUid": a["assignment_id"],
+                    "assignmentTitle": a["title"],
+                    "score": self._score(a["assignment_id"], student_id, a["max_score"]),
+                    "totalPoints": a["max_score"],
+                })
+        return await self._respond(items)
+
+    async def course_grades(self, request: Request) -> JSONResponse:
+        student_id = request.path_params["student_id"]
+        history = [
+            {
+                "assignmentId": a["assignment_id"],
+                "assignmentName": a["title"],
+                "score": self._score(a["assignment_id"], student_id, a["max_score"]),
+                "totalScore": a["max_score"],
+            }
+            for detail in mock_data.CLASS_DETAILS.values()
+            for a in detail.get("assignments", [])
+        ]
+        return await self._respond({"gradeHistory": history})
+
+
+def _page(items: list[dict[str, Any]], request: Request) -> dict[str, Any]:
+    page = max(int(request.query_params.get("page", 1)), 1)
+    limit = max(int(request.query_params.get("limit", 100)), 1)
+    start = (page - 1) * limit
+    return {
+        "data": items[start:start + limit],
+        "pagination": {"page": page, "limit": limit, "total": len(items)},
+    }
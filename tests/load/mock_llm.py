@@ -0,0 +1,336 @@
+"""Deterministic OpenAI-compatible LLM stand-in for load tests.
+
+Serves ``POST /v1/chat/completions`` (streaming and non-streaming) and
+``GET /v1/models`` so the service can run end-to-end without DashScope.
+Point the service at it with ``LLM_MOCK_BASE_URL=http://127.0.0.1:9100/v1``;
+every model name (``dashscope/qwen3-max``, ``openai/…``) is then routed here
+by ``agents.provider.create_model`` and ``LLMService``.
+
+Behaviour is reproducible: the reply for a request depends only on
+``seed`` and the request messages, so two runs of the same Locust scenario
+produce the same tokens, tool calls and timings (up to scheduling noise).
+
+- **Timing** — ``first_token`` latency (fixed / uniform / lognormal) before
+  the first chunk, then ``tokens_per_s`` for the rest of the reply.
+- **Tool calls** — ``tool_scripts`` rules: when the last user message
+  matches ``pattern`` and the request offers ``tool``, the model calls it
+  with ``arguments`` (or a schema-valid example when omitted).  After a
+  tool result the model answers with text.
+- **Structured output** — when the request offers PydanticAI's
+  ``final_result`` tool (``output_type=...`` agents such as the planner)
+  and no rule matched, the model calls it with an example built from the
+  tool's JSON schema.
+
+Config file (``--llm-config``)::
+
+    {
+      "seed": 7,
+      "tokens_per_s": 40,
+      "reply_tokens": 80,
+      "first_token": {"distribution": "lognormal", "ms": 400, "sigma": 0.5},
+      "tool_scripts": [
+        {"pattern": "出|quiz", "tool": "generate_quiz_questions",
+         "arguments": {"topic": "fractions", "count": 5}}
+      ]
+    }
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+FINAL_RESULT_TOOL = "final_result"
+
+_WORDS = (
+    "the class shows steady progress in reading while writing scores vary "
+    "across students so we suggest targeted practice on paragraph structure "
+    "and vocabulary review with short weekly quizzes and peer feedback"
+).split()
+
+
+# ── Config ──────────────────────────────────────────────────
+
+
+@dataclass
+class LatencyProfile:
+    """Time to first token: ``fixed`` ms, ``uniform`` ms±jitter, or ``lognormal``."""
+
+    distribution: str = "fixed"
+    ms: float = 200.0
+    jitter_ms: float = 0.0
+    sigma: float = 0.5
+
+    def sample(self, rng: random.Random) -> float:
+        if self.distribution == "uniform":
+            return max(0.0, rng.uniform(self.ms - self.jitter_ms, self.ms + self.jitter_ms))
+        if self.distribution == "lognormal":
+            # Median = ms; long right tail like real providers.
+            return rng.lognormvariate(math.log(max(self.ms, 1e-3)), self.sigma)
+        return self.ms
+
+
+@dataclass
+class ToolCallRule:
+    pattern: str
+    tool: str
+    arguments: dict[str, Any] | None = None
+
+
+@dataclass
+class MockLLMConfig:
+    seed: int = 0
+    tokens_per_s: float = 50.0  # 0 = no pacing
+    reply_tokens: int = 60
+    first_token: LatencyProfile = field(default_factory=LatencyProfile)
+    tool_scripts: list[ToolCallRule] = field(default_factory=list)
+
+    @classmethod
+    def from_dict(cls, raw: dict[str, Any]) -> MockLLMConfig:
+        return cls(
+            seed=int(raw.get("seed", 0)),
+            tokens_per_s=float(raw.get("tokens_per_s", 50.0)),
+            reply_tokens=int(raw.get("reply_tokens", 60)),
+            first_token=LatencyProfile(**raw.get("first_token", {})),
+            tool_scripts=[ToolCallRule(**rule) for rule in raw.get("tool_scripts", [])],
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> MockLLMConfig:
+        with open(path, encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
+
+
+# ── Schema examples ─────────────────────────────────────────
+
+
+def example_from_schema(schema: dict[str, Any], defs: dict[str, Any] | None = None) -> Any:
+    """Smallest value that satisfies *schema* (required fields, min sizes)."""
+    defs = defs if defs is not None else schema.get("$defs", {})
+    if "$ref" in schema:
+        return example_from_schema(defs[schema["$ref"].rsplit("/", 1)[-1]], defs)
+    if "const" in schema:
+        return schema["const"]
+    if "enum" in schema:
+        return schema["enum"][0]
+    if "default" in schema:
+        return schema["default"]
+    for key in ("anyOf", "oneOf"):
+        if key in schema:
+            options = [s for s in schema[key] if s.get("type") != "null"] or schema[key]
+            return example_from_schema(options[0], defs)
+    if "allOf" in schema:
+        return example_from_schema(schema["allOf"][0], defs)
+
+    kind = schema.get("type", "object" if "properties" in schema else "string")
+    if isinstance(kind, list):
+        kind = next((k for k in kind if k != "null"), "null")
+    if kind == "object":
+        props = schema.get("properties", {})
+        return {
+            name: example_from_schema(props[name], defs)
+            for name in schema.get("required", [])
+            if name in props
+        }
+    if kind == "array":
+        count = max(int(schema.get("minItems", 1)), 1)
+        return [example_from_schema(schema.get("items", {}), defs) for _ in range(count)]
+    if kind in ("integer", "number"):
+        value = schema.get("minimum", schema.get("exclusiveMinimum", 0))
+        if "exclusiveMinimum" in schema and "minimum" not in schema:
+            value += 1
+        return int(value) if kind == "integer" else float(value)
+    if kind == "boolean":
+        return False
+    if kind == "null":
+        return None
+    return "mock" + "x" * max(int(schema.get("minLength", 0)) - 4, 0)
+
+
+# ── Server ──────────────────────────────────────────────────
+
+
+@dataclass
+class _Plan:
+    text: str = ""
+    tool_name: str = ""
+    tool_args: dict[str, Any] = field(default_factory=dict)
+    first_token_s: float = 0.0
+
+    @property
+    def finish_reason(self) -> str:
+        return "tool_calls" if self.tool_name else "stop"
+
+
+class MockLLMServer:
+    """Starlette app + counters (``requests``, ``max_inflight``)."""
+
+    def __init__(self, config: MockLLMConfig | None = None) -> None:
+        self.config = config or MockLLMConfig()
+        self.requests = 0
+        self.inflight = 0
+        self.max_inflight = 0
+
+    def app(self) -> Starlette:
+        return Starlette(routes=[
+            Route("/v1/chat/completions", self.completions, methods=["POST"]),
+            Route("/v1/models", self.models, methods=["GET"]),
+        ])
+
+    async def models(self, request: Request) -> JSONResponse:
+        return JSONResponse({"object": "list", "data": [{"id": "mock", "object": "model"}]})
+
+    async def completions(self, request: Request):
+        body = await request.json()
+        plan = self.plan(body)
+        self.requests += 1
+        if body.get("stream"):
+            return StreamingResponse(self._stream(body, plan), media_type="text/event-stream")
+        self._enter()
+        try:
+            await asyncio.sleep(plan.first_token_s + self._token_delay() * _count_tokens(plan.text))
+        finally:
+            self._exit()
+        return JSONResponse(self._completion(body, plan))
+
+    # -- planning ------------------------------------------------------------
+
+    def plan(self, body: dict[str, Any]) -> _Plan:
+        """Decide the reply for *body* (pure function of seed + messages)."""
+        messages = body.get("messages") or []
+        digest = hashlib.sha256(
+            json.dumps([self.config.seed, messages], sort_keys=True, default=str).encode()
+        ).digest()
+        rng = random.Random(digest)
+        plan = _Plan(first_token_s=self.config.first_token.sample(rng) / 1000)
+
+        tools = {
+            t["function"]["name"]: t["function"]
+            for t in body.get("tools") or []
+            if t.get("type") == "function"
+        }
+        last = messages[-1] if messages else {}
+        if tools and last.get("role") != "tool":
+            user_text = _message_text(last)
+            for rule in self.config.tool_scripts:
+                if rule.tool in tools and re.search(rule.pattern, user_text):
+                    plan.tool_name = rule.tool
+                    plan.tool_args = (
+                        rule.arguments if rule.arguments is not None
+                        else example_from_schema(tools[rule.tool].get("parameters") or {})
+                    )
+                    return plan
+        if FINAL_RESULT_TOOL in tools:
+            plan.tool_name = FINAL_RESULT_TOOL
+            plan.tool_args = example_from_schema(tools[FINAL_RESULT_TOOL].get("parameters") or {})
+            return plan
+
+        plan.text = " ".join(rng.choice(_WORDS) for _ in range(self.config.reply_tokens))
+        return plan
+
+    # -- responses -----------------------------------------------------------
+
+    def _completion(self, body: dict[str, Any], plan: _Plan) -> dict[str, Any]:
+        message: dict[str, Any] = {"role": "assistant", "content": plan.text or None}
+        if plan.tool_name:
+            message["tool_calls"] = [self._tool_call(plan)]
+        return {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "mock"),
+            "choices": [{"index": 0, "message": message, "finish_reason": plan.finish_reason}],
+            "usage": self._usage(body, plan),
+        }
+
+    async def _stream(self, body: dict[str, Any], plan: _Plan) -> AsyncIterator[str]:
+        self._enter()
+        try:
+            await asyncio.sleep(plan.first_token_s)
+            chunk_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+            delay = self._token_delay()
+            if plan.tool_name:
+                call = self._tool_call(plan)
+                yield _sse(chunk_id, body, {"role": "assistant", "tool_calls": [{"index": 0, **call}]})
+            else:
+                for i, word in enumerate(plan.text.split(" ")):
+                    delta = {"role": "assistant", "content": word} if i == 0 else {"content": " " + word}
+                    yield _sse(chunk_id, body, delta)
+                    if delay:
+                        await asyncio.sleep(delay)
+            yield _sse(chunk_id, body, {}, finish_reason=plan.finish_reason)
+            if (body.get("stream_options") or {}).get("include_usage"):
+                yield "data: " + json.dumps({
+                    "id": chunk_id,
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": body.get("model", "mock"),
+                    "choices": [],
+                    "usage": self._usage(body, plan),
+                }) + "\n\n"
+            yield "data: [DONE]\n\n"
+        finally:
+            self._exit()
+
+    @staticmethod
+    def _tool_call(plan: _Plan) -> dict[str, Any]:
+        digest = hashlib.sha256(json.dumps(plan.tool_args, sort_keys=True).encode()).hexdigest()
+        return {
+            "id": f"call_{digest[:16]}",
+            "type": "function",
+            "function": {"name": plan.tool_name, "arguments": json.dumps(plan.tool_args, ensure_ascii=False)},
+        }
+
+    @staticmethod
+    def _usage(body: dict[str, Any], plan: _Plan) -> dict[str, int]:
+        prompt = sum(_count_tokens(_message_text(m)) for m in body.get("messages") or [])
+        completion = _count_tokens(plan.text) or _count_tokens(json.dumps(plan.tool_args))
+        return {
+            "prompt_tokens": prompt,
+            "completion_tokens": completion,
+            "total_tokens": prompt + completion,
+        }
+
+    def _token_delay(self) -> float:
+        return 1.0 / self.config.tokens_per_s if self.config.tokens_per_s > 0 else 0.0
+
+    def _enter(self) -> None:
+        self.inflight += 1
+        self.max_inflight = max(self.max_inflight, self.inflight)
+
+    def _exit(self) -> None:
+        self.inflight -= 1
+
+
+def _sse(chunk_id: str, body: dict[str, Any], delta: dict[str, Any], finish_reason: str | None = None) -> str:
+    return "data: " + json.dumps({
+        "id": chunk_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": body.get("model", "mock"),
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }, ensure_ascii=False) + "\n\n"
+
+
+def _message_text(message: dict[str, Any]) -> str:
+    content = message.get("content")
+    if isinstance(content, list):
+        return " ".join(p.get("text", "") for p in content if isinstance(p, dict))
+    return str(content or "")
+
+
+def _count_tokens(text: str) -> int:
+    return len(text.split()) if text else 0
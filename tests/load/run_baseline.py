@@ -8,6 +8,10 @@ Usage:
     cd insight-ai-agent
     python tests/load/run_baseline.py --host http://localhost:5000
     python tests/load/run_baseline.py --host https://api.example.com
+
+    # Self-contained: start the mock LLM/Java backends and a service wired
+    # to them on the --host port (see tests/load/mock_backends.py)
+    python tests/load/run_baseline.py --mock --host http://localhost:5000
 """
 
 from __future__ import annotations
@@ -15,9 +19,12 @@ from __future__ import annotations
 import argparse
 import asyncio
 import json
+import os
 import statistics
+import subprocess
 import sys
 import time
+from urllib.parse import urlparse
 
 
 async def test_health(client, host: str) -> dict:
@@ -276,10 +283,42 @@ def _print_result(result: dict):
             print(f"    {k}: {v}")
 
 
+def _start_mock_stack(host: str) -> subprocess.Popen:
+    """Launch mock backends + service on *host*'s port and wait for health."""
+    import httpx
+
+    root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    port = urlparse(host).port or 5000
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "tests.load.mock_backends", "--with-service", str(port)],
+        cwd=root,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise SystemExit(f"mock stack exited with code {proc.returncode}")
+        try:
+            if httpx.get(f"{host}/api/health", timeout=1).status_code == 200:
+                return proc
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.5)
+    proc.terminate()
+    raise SystemExit("mock stack did not become healthy within 60s")
+
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Baseline performance test")
     parser.add_argument("--host", default="http://localhost:5000", help="Service URL")
+    parser.add_argument("--mock", action="store_true",
+                        help="Start mock LLM/Java backends and a local service first")
     args = parser.parse_args()
 
-    exit_code = asyncio.run(main(args.host))
+    stack = _start_mock_stack(args.host) if args.mock else None
+    try:
+        exit_code = asyncio.run(main(args.host))
+    finally:
+        if stack is not None:
+            stack.terminate()
+            stack.wait(timeout=15)
     sys.exit(exit_code)
@@ -1,5 +1,7 @@
 """Tests for adapters/ — Java API response → internal model mapping."""
 
+import asyncio
+
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 
@@ -333,6 +335,202 @@ class TestGradeAdapter:
             await get_student_submissions(client, "t-001", "s-001")
 
 
+# =========================================================================
+# Pagination
+# =========================================================================
+
+class _PagedJava:
+    """Fake JavaClient serving ``PageResponseDTO`` pages from a list."""
+
+    def __init__(self, items, *, report_total=True, delay=0.0, ignore_page=False):
+        self.items = items
+        self.report_total = report_total
+        self.delay = delay
+        self.ignore_page = ignore_page
+        self.requested_pages = []
+
+    async def get(self, path, params=None):
+        import asyncio
+
+        page, limit = params["page"], params["limit"]
+        self.requested_pages.append(page)
+        await asyncio.sleep(self.delay)
+        start = 0 if self.ignore_page else (page - 1) * limit
+        chunk = self.items[start: start + limit]
+        pagination = {"page": page, "limit": limit}
+        if self.report_total:
+            pagination["total"] = len(self.items)
+        return {"code": 200, "data": {"data": chunk, "pagination": pagination}}
+
+
+def _assignments(n):
+    return [dict(JAVA_CLASS_ASSIGNMENT, assignmentId=f"a-{i}") for i in range(n)]
+
+
+def _submissions(n):
+    return [
+        dict(JAVA_SUBMISSION, uid=f"s-{i}", score=float(i % 101))
+        for i in range(n)
+    ]
+
+
+class TestPagination:
+
+    def test_parse_page_shapes(self):
+        from adapters.pagination import parse_page
+
+        bare = parse_page([1, 2], 1, 100)
+        assert bare.items == [1, 2] and bare.has_more is False
+
+        dto = parse_page({"data": [1, 2], "pagination": {"page": 1, "limit": 2, "total": 5}}, 1, 100)
+        assert dto.limit == 2 and dto.total == 5 and dto.has_more is True
+
+        last = parse_page({"data": [5], "pagination": {"page": 3, "limit": 2, "total": 5}}, 3, 2)
+        assert last.has_more is False
+
+        no_total = parse_page({"data": [1, 2], "pagination": {"limit": 2}}, 1, 2)
+        assert no_total.has_more is True
+
+        assert parse_page("oops", 1, 100) is None
+
+    @pytest.mark.asyncio
+    async def test_list_assignments_reads_all_pages(self):
+        from adapters.class_adapter import list_assignments
+
+        client = _PagedJava(_assignments(250))
+        result = await list_assignments(client, "t-1", "c-1")
+
+        assert [a.assignment_id for a in result] == [f"a-{i}" for i in range(250)]
+        assert client.requested_pages == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_pages_without_total_stop_on_short_page(self):
+        from adapters.class_adapter import list_assignments
+
+        client = _PagedJava(_assignments(20), report_total=False)
+        result = await list_assignments(client, "t-1", "c-1", page_size=10)
+
+        assert len(result) == 20
+        assert client.requested_pages == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_limit_terminates_early(self):
+        from adapters.class_adapter import list_assignments
+
+        client = _PagedJava(_assignments(500))
+        result = await list_assignments(client, "t-1", "c-1", limit=120, page_size=50)
+
+        assert len(result) == 120
+        assert client.requested_pages == [1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_next_page_is_prefetched(self):
+        from adapters.class_adapter import iter_assignment_pages
+
+        client = _PagedJava(_assignments(30))
+        pages = iter_assignment_pages(client, "t-1", "c-1", page_size=10)
+        first = await pages.__anext__()
+
+        assert len(first.items) == 10
+        await asyncio.sleep(0)
+        assert client.requested_pages == [1, 2]  # page 2 requested before it is consumed
+        await pages.aclose()
+
+    @pytest.mark.asyncio
+    async def test_early_exit_cancels_prefetch(self):
+        from adapters.class_adapter import iter_assignment_pages
+
+        client = _PagedJava(_assignments(30), delay=0.01)
+        async for _ in iter_assignment_pages(client, "t-1", "c-1", page_size=10):
+            break
+        await asyncio.sleep(0.05)
+
+        assert client.requested_pages == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_get_submissions_paginated_with_hooks(self):
+        from adapters.submission_adapter import get_submissions
+        from tools.assessment_engine import AssessmentFrameBuilder
+        from tools.stats_tools import ScoreAccumulator, calculate_stats
+
+        client = _PagedJava(_submissions(230))
+        pages_seen = []
+        acc = ScoreAccumulator()
+        builder = AssessmentFrameBuilder()
+
+        def on_page(records):
+            pages_seen.append(len(records))
+            acc.add_records(records)
+            builder.add(records)
+
+        result = await get_submissions(client, "t-1", "a-1", on_page=on_page)
+
+        assert pages_seen == [100, 100, 30]
+        assert result.submissions == [] and result.scores == []  # not collected
+        assert result.title == "Unit 5 Test"
+        assert acc.summary.count == 230
+        expected = calculate_stats([s["score"] for s in _submissions(230)], ["mean", "max"])
+        assert acc.summary.to_stats(["mean", "max"])["mean"] == expected["mean"]
+        assert builder.build().class_weakness()[1]["totalStudents"] == 0  # no item detail
+
+    @pytest.mark.asyncio
+    async def test_page_ignoring_endpoint_is_bounded(self):
+        from adapters.pagination import iter_pages
+        from adapters.submission_adapter import _fetch_submission_page
+
+        client = _PagedJava(_submissions(10), report_total=False, ignore_page=True)
+        pages = [
+            page async for page in iter_pages(
+                lambda page, limit: _fetch_submission_page(client, "t-1", "a-1", page, limit),
+                page_size=10,
+                max_pages=5,
+            )
+        ]
+
+        assert len(pages) == 5 and pages[-1].has_more is False
+        assert client.requested_pages == [1, 2, 3, 4, 5]
+
+    @pytest.mark.asyncio
+    async def test_tools_stream_assignment_submissions(self):
+        from unittest.mock import patch
+
+        from tools.assessment_tools import analyze_student_weakness
+        from tools.stats_tools import calculate_assignment_stats, calculate_stats
+
+        items = [
+            {"questionId": "q1", "correct": False, "knowledgePointIds": ["kp-1"], "errorTags": ["grammar"]},
+            {"questionId": "q2", "correct": True, "knowledgePointIds": ["kp-2"]},
+            {"bad": "item"},
+        ]
+        subs = [dict(s, items=items) for s in _submissions(150)]
+        client = _PagedJava(subs)
+
+        with patch("tools.data_tools._should_use_mock", return_value=False), \
+                patch("tools.data_tools._get_client", return_value=client):
+            stats = await calculate_assignment_stats("t-1", "a-1", metrics=["mean", "max"])
+            weakness = await analyze_student_weakness("t-1", "c-1", assignment_id="a-1")
+
+        expected = calculate_stats([s["score"] for s in subs], ["mean", "max"])
+        assert (stats["count"], stats["mean"], stats["max"]) == (150, expected["mean"], expected["max"])
+        assert weakness["summary"]["totalStudents"] == 150
+        assert weakness["weakPoints"][0]["knowledgePointId"] == "kp-1"
+        assert client.requested_pages == [1, 2, 1, 2]
+
+    @pytest.mark.asyncio
+    async def test_iter_submission_pages_limit(self):
+        from adapters.submission_adapter import iter_submission_pages
+
+        client = _PagedJava(_submissions(230))
+        seen = [
+            r.student_id
+            async for page in iter_submission_pages(client, "t-1", "a-1", max_items=5)
+            for r in page.items
+        ]
+
+        assert seen == [f"s-{i}" for i in range(5)]
+        assert client.requested_pages == [1]
+
+
 # =========================================================================
 # Internal model tests
 # =========================================================================
@@ -0,0 +1,247 @@
+"""Equivalence tests for tools/assessment_engine.py.
+
+The columnar engine must reproduce the previous dict-loop implementations
+exactly — values *and* ordering.  The reference implementations below are
+the pre-vectorization code, kept verbatim (minus the tool envelopes).
+"""
+
+from __future__ import annotations
+
+import random
+from collections import defaultdict
+from typing import Any
+
+import pytest
+from pydantic import ValidationError
+
+from models.data import SubmissionRecord
+from tools.assessment_engine import AssessmentFrame, AssessmentFrameBuilder
+from tools.assessment_tools import (
+    analyze_student_weakness,
+    calculate_class_mastery,
+    get_student_error_patterns,
+)
+
+KP_IDS = [f"DSE-ENG-U5-{t}-0{i}" for t in ("RC", "GR", "VC", "WR") for i in range(1, 4)]
+ERROR_TAGS = ["grammar", "tense", "inference", "vocabulary", "detail", "tone", "structure"]
+
+
+def make_cohort(n_students: int, n_assignments: int = 3, n_questions: int = 10, seed: int = 7):
+    """Synthetic submissions: one per student per assignment, ~5% guests."""
+    rng = random.Random(seed)
+    submissions = []
+    for a in range(n_assignments):
+        for s in range(n_students):
+            items = []
+            for q in range(n_questions):
+                correct = rng.random() < 0.65
+                items.append({
+                    "question_id": f"a{a}-q{q}",
+                    "score": 1 if correct else 0,
+                    "max_score": 1,
+                    "correct": correct,
+                    "error_tags": [] if correct else rng.sample(ERROR_TAGS, rng.randint(0, 3)),
+                    "knowledge_point_ids": rng.sample(KP_IDS, rng.randint(0, 2)),
+                })
+            guest = rng.random() < 0.05
+            submissions.append({
+                "student_id": f"g-{a}-{s}" if guest else f"s-{s:04d}",
+                "name": f"Student {s}",
+                "score": sum(i["score"] for i in items),
+                "submission_type": "guest" if guest else "student",
+                "items": items if rng.random() > 0.02 else [],
+            })
+    return submissions
+
+
+# ── Reference (pre-vectorization) implementations ───────────
+
+
+def reference_weakness(submissions):
+    kp_stats: dict[str, dict[str, Any]] = defaultdict(
+        lambda: {"errorCount": 0, "totalAttempts": 0, "affectedStudents": set(),
+                 "errorTags": defaultdict(int)}
+    )
+    total_students = 0
+    total_items = 0
+    for sub_data in submissions:
+        sub = SubmissionRecord(**sub_data)
+        if sub.submission_type == "guest" or not sub.items:
+            continue
+        total_students += 1
+        for item in sub.items:
+            total_items += 1
+            for kp_id in item.knowledge_point_ids:
+                kp_stats[kp_id]["totalAttempts"] += 1
+                if not item.correct:
+                    kp_stats[kp_id]["errorCount"] += 1
+                    kp_stats[kp_id]["affectedStudents"].add(sub.student_id)
+                    for tag in item.error_tags:
+                        kp_stats[kp_id]["errorTags"][tag] += 1
+    weak_points = []
+    for kp_id, stats in kp_stats.items():
+        if stats["totalAttempts"] > 0:
+            weak_points.append({
+                "knowledgePointId": kp_id,
+                "errorRate": round(stats["errorCount"] / stats["totalAttempts"], 3),
+                "errorCount": stats["errorCount"],
+                "totalAttempts": stats["totalAttempts"],
+                "affectedStudents": len(stats["affectedStudents"]),
+                "commonErrorTags": sorted(
+                    stats["errorTags"].keys(), key=lambda t: stats["errorTags"][t], reverse=True,
+                )[:5],
+            })
+    weak_points.sort(key=lambda x: x["errorRate"], reverse=True)
+    return weak_points, {
+        "totalStudents": total_students,
+        "totalQuestions": total_items,
+        "analyzedItems": total_items,
+        "knowledgePointsCovered": len(kp_stats),
+    }
+
+
+def reference_patterns(submissions, student_id):
+    kp_stats: dict[str, dict[str, Any]] = defaultdict(
+        lambda: {"correct": 0, "total": 0, "errorTags": defaultdict(int)}
+    )
+    for sub_data in submissions:
+        sub = SubmissionRecord(**sub_data)
+        if sub.student_id != student_id or not sub.items:
+            continue
+        for item in sub.items:
+            for kp_id in item.knowledge_point_ids:
+                kp_stats[kp_id]["total"] += 1
+                if item.correct:
+                    kp_stats[kp_id]["correct"] += 1
+                else:
+                    for tag in item.error_tags:
+                        kp_stats[kp_id]["errorTags"][tag] += 1
+    error_patterns = []
+    total_mastery = 0.0
+    for kp_id, stats in kp_stats.items():
+        mastery = stats["correct"] / stats["total"]
+        total_mastery += mastery
+        if stats["total"] - stats["correct"] > 0:
+            error_patterns.append({
+                "knowledgePointId": kp_id,
+                "errorCount": stats["total"] - stats["correct"],
+                "totalAttempts": stats["total"],
+                "masteryRate": round(mastery, 3),
+                "errorTags": sorted(
+                    stats["errorTags"].keys(), key=lambda t: stats["errorTags"][t], reverse=True,
+                )[:5],
+            })
+    error_patterns.sort(key=lambda x: x["masteryRate"])
+    overall = total_mastery / len(kp_stats) if kp_stats else 0.0
+    return error_patterns, overall, len(kp_stats)
+
+
+def reference_mastery(submissions, knowledge_point_ids=None):
+    kp_stats: dict[str, dict[str, int]] = defaultdict(lambda: {"correct": 0, "total": 0})
+    for sub_data in submissions:
+        sub = SubmissionRecord(**sub_data)
+        if sub.submission_type == "guest" or not sub.items:
+            continue
+        for item in sub.items:
+            for kp_id in item.knowledge_point_ids:
+                if knowledge_point_ids and kp_id not in knowledge_point_ids:
+                    continue
+                kp_stats[kp_id]["total"] += 1
+                if item.correct:
+                    kp_stats[kp_id]["correct"] += 1
+    mastery_data = [
+        {
+            "knowledgePointId": kp_id,
+            "masteryRate": round(stats["correct"] / stats["total"], 3),
+            "correctCount": stats["correct"],
+            "totalAttempts": stats["total"],
+        }
+        for kp_id, stats in kp_stats.items()
+    ]
+    mastery_data.sort(key=lambda x: x["masteryRate"])
+    return mastery_data
+
+
+# ── Equivalence ─────────────────────────────────────────────
+
+
+@pytest.mark.parametrize("n_students,seed", [(1, 1), (5, 2), (40, 3), (120, 4)])
+class TestEquivalence:
+    def test_class_weakness(self, n_students, seed):
+        subs = make_cohort(n_students, seed=seed)
+        assert AssessmentFrame.from_submissions(subs).class_weakness() == reference_weakness(subs)
+
+    def test_student_patterns(self, n_students, seed):
+        subs = make_cohort(n_students, seed=seed)
+        frame = AssessmentFrame.from_submissions(subs)
+        for sid in {s["student_id"] for s in subs} | {"missing"}:
+            assert frame.student_error_patterns(sid) == reference_patterns(subs, sid)
+
+    def test_class_mastery(self, n_students, seed):
+        subs = make_cohort(n_students, seed=seed)
+        frame = AssessmentFrame.from_submissions(subs)
+        assert frame.class_mastery() == reference_mastery(subs)
+        wanted = KP_IDS[:4] + ["unknown"]
+        assert frame.class_mastery(wanted) == reference_mastery(subs, wanted)
+
+
+class TestToolEnvelopes:
+    @pytest.mark.asyncio
+    async def test_tools_match_reference(self):
+        subs = make_cohort(30)
+        weak = await analyze_student_weakness("t-1", "c-1", submissions=subs)
+        ref_points, ref_summary = reference_weakness(subs)
+        assert weak["weakPoints"] == ref_points
+        assert weak["summary"] == ref_summary
+
+        patterns = await get_student_error_patterns("t-1", "s-0003", submissions=subs)
+        ref_patterns, ref_overall, ref_count = reference_patterns(subs, "s-0003")
+        assert patterns["errorPatterns"] == ref_patterns
+        assert patterns["overallMastery"] == round(ref_overall, 3)
+        assert patterns["knowledgePointsAssessed"] == ref_count
+
+        assert calculate_class_mastery(subs)["knowledgePointMastery"] == reference_mastery(subs)
+
+
+class TestInputHandling:
+    def test_accepts_submission_records(self):
+        subs = make_cohort(10)
+        records = [SubmissionRecord(**s) for s in subs]
+        assert (
+            AssessmentFrame.from_submissions(records).class_weakness()
+            == AssessmentFrame.from_submissions(subs).class_weakness()
+        )
+
+    def test_lax_values_validated_like_pydantic(self):
+        subs = [{
+            "student_id": "s1",
+            "name": "A",
+            "items": [{"question_id": "q1", "correct": "false", "knowledge_point_ids": ["K"]}],
+        }]
+        mastery = AssessmentFrame.from_submissions(subs).class_mastery()
+        assert mastery[0]["correctCount"] == 0
+
+    def test_missing_required_field_raises(self):
+        with pytest.raises(ValidationError):
+            AssessmentFrame.from_submissions([{"student_id": "s1", "items": []}])
+
+    def test_empty(self):
+        frame = AssessmentFrame.from_submissions([])
+        assert frame.class_mastery() == []
+        assert frame.student_error_patterns("s1") == ([], 0.0, 0)
+        points, summary = frame.class_weakness()
+        assert points == [] and summary["totalStudents"] == 0
+
+
+class TestFrameBuilder:
+    def test_batched_equals_single_pass(self):
+        subs = make_cohort(60, seed=11)
+        builder = AssessmentFrameBuilder()
+        for start in range(0, len(subs), 25):
+            builder.add(subs[start:start + 25])
+        frame = builder.build()
+        reference = AssessmentFrame.from_submissions(subs)
+
+        assert frame.class_weakness() == reference.class_weakness()
+        assert frame.class_mastery() == reference.class_mastery()
+        assert frame.student_error_patterns("s-0003") == reference.student_error_patterns("s-0003")
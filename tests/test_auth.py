@@ -0,0 +1,158 @@
+"""Tests for insight_backend/auth.py — cached, coalesced JWT verification."""
+
+import asyncio
+
+import httpx
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from config.settings import get_settings
+from insight_backend import auth
+from services.metrics import get_metrics_collector
+
+
+class _Upstream:
+    """Stand-in for Java /auth/me served through httpx.MockTransport."""
+
+    def __init__(self, status: int = 200, teacher_id: str = "t-42", delay: float = 0.05):
+        self.status = status
+        self.teacher_id = teacher_id
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        assert request.url.path.endswith("/auth/me")
+        await asyncio.sleep(self.delay)
+        if self.status != 200:
+            return httpx.Response(self.status, json={"code": self.status})
+        return httpx.Response(200, json={"code": 0, "data": {"id": self.teacher_id}})
+
+
+class _FakeRedis:
+    def __init__(self):
+        self.data: dict[str, str] = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, ex=None):
+        self.data[key] = value
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    server = _Upstream()
+    monkeypatch.setattr(auth, "_verified_cache", None)
+    monkeypatch.setattr(auth, "_inflight", {})
+    monkeypatch.setattr(
+        auth, "_http_client", httpx.AsyncClient(transport=httpx.MockTransport(server))
+    )
+    monkeypatch.setattr(auth, "_get_redis", lambda: None)
+    get_metrics_collector().reset()
+    return server
+
+
+def _request(token: str | None) -> Request:
+    headers = [(b"authorization", f"Bearer {token}".encode())] if token else []
+    return Request({"type": "http", "headers": headers})
+
+
+class TestVerifyToken:
+    async def test_missing_header(self, upstream):
+        with pytest.raises(HTTPException) as exc:
+            await auth.get_verified_teacher_id(_request(None))
+        assert exc.value.status_code == 401
+        assert upstream.calls == 0
+
+    async def test_caches_verified_token(self, upstream):
+        assert await auth.get_verified_teacher_id(_request("jwt-1")) == "t-42"
+        assert await auth.get_verified_teacher_id(_request("jwt-1")) == "t-42"
+
+        assert upstream.calls == 1
+        counter = get_metrics_collector().get_counter("auth_verify")
+        assert counter == {"upstream": 1, "cache_hit": 1}
+
+    async def test_burst_costs_one_upstream_call(self, upstream):
+        results = await asyncio.gather(*(auth.verify_token("jwt-burst") for _ in range(20)))
+
+        assert results == ["t-42"] * 20
+        assert upstream.calls == 1
+        assert get_metrics_collector().get_counter("auth_verify")["coalesced"] == 19
+        assert auth._inflight == {}
+
+    async def test_distinct_tokens_verified_separately(self, upstream):
+        await asyncio.gather(auth.verify_token("a"), auth.verify_token("b"))
+        assert upstream.calls == 2
+
+    async def test_invalid_token_shared_and_not_cached(self, upstream):
+        upstream.status = 401
+        results = await asyncio.gather(
+            *(auth.verify_token("bad") for _ in range(5)), return_exceptions=True
+        )
+
+        assert all(isinstance(r, HTTPException) and r.status_code == 401 for r in results)
+        assert upstream.calls == 1
+
+        with pytest.raises(HTTPException):
+            await auth.verify_token("bad")
+        assert upstream.calls == 2
+
+    async def test_cancelled_waiter_does_not_abort_verification(self, upstream):
+        first = asyncio.create_task(auth.verify_token("jwt-c"))
+        second = asyncio.create_task(auth.verify_token("jwt-c"))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "t-42"
+        assert upstream.calls == 1
+
+    async def test_transport_error_is_502(self, upstream, monkeypatch):
+        def refuse(request):
+            raise httpx.ConnectError("refused")
+
+        monkeypatch.setattr(
+            auth, "_http_client", httpx.AsyncClient(transport=httpx.MockTransport(refuse))
+        )
+        with pytest.raises(HTTPException) as exc:
+            await auth.verify_token("jwt-down")
+        assert exc.value.status_code == 502
+
+    async def test_cache_is_bounded(self, upstream, monkeypatch):
+        monkeypatch.setattr(get_settings(), "auth_cache_size", 2)
+        upstream.delay = 0
+        for token in ("a", "b", "c"):
+            await auth.verify_token(token)
+
+        assert len(auth._get_verified_cache()) == 2
+        await auth.verify_token("a")  # evicted → verified again
+        assert upstream.calls == 4
+
+
+class TestRedisTier:
+    async def test_shared_tier_skips_upstream(self, upstream, monkeypatch):
+        redis = _FakeRedis()
+        monkeypatch.setattr(auth, "_get_redis", lambda: redis)
+
+        await auth.verify_token("jwt-r")
+        assert upstream.calls == 1
+        assert list(redis.data.values()) == ["t-42"]
+
+        # Another worker: empty local cache, warm Redis
+        monkeypatch.setattr(auth, "_verified_cache", None)
+        assert await auth.verify_token("jwt-r") == "t-42"
+        assert upstream.calls == 1
+        assert get_metrics_collector().get_counter("auth_verify")["redis_hit"] == 1
+
+    async def test_redis_failure_falls_back_to_upstream(self, upstream, monkeypatch):
+        class _Broken:
+            async def get(self, key):
+                raise ConnectionError("down")
+
+            async def set(self, key, value, ex=None):
+                raise ConnectionError("down")
+
+        monkeypatch.setattr(auth, "_get_redis", lambda: _Broken())
+        assert await auth.verify_token("jwt-x") == "t-42"
+        assert upstream.calls == 1
@@ -0,0 +1,103 @@
+"""Tests for the micro-benchmark harness (tests/bench/)."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from tests.bench.harness import (
+    Baseline,
+    BenchResult,
+    compare,
+    load_baseline,
+    measure,
+    registered_cases,
+    render_report,
+    run_case,
+    save_baseline,
+)
+
+
+def _result(name: str, min_us: float, calibration_us: float = 100.0) -> BenchResult:
+    return BenchResult(
+        name=name, group="g", median_us=min_us, min_us=min_us, mean_us=min_us,
+        stddev_us=0.0, rounds=3, iterations=10, calibration_us=calibration_us,
+    )
+
+
+def _baseline(**cases: float) -> Baseline:
+    return Baseline(cases={
+        name: {"min_us": us, "median_us": us, "calibration_us": 100.0}
+        for name, us in cases.items()
+    })
+
+
+class TestCompare:
+    def test_statuses(self):
+        results = [_result("same", 10.5), _result("slow", 13.0), _result("fast", 7.0), _result("new", 1.0)]
+        statuses = {
+            c.name: c.status
+            for c in compare(results, _baseline(same=10, slow=10, fast=10), threshold=0.25)
+        }
+        assert statuses == {"same": "ok", "slow": "regressed", "fast": "improved", "new": "new"}
+
+    def test_scaled_by_calibration(self):
+        # Twice the time on a machine that runs the calibration loop twice as slow.
+        [c] = compare([_result("a", 20.0, calibration_us=200.0)], _baseline(a=10))
+        assert c.status == "ok"
+        assert c.baseline_us == pytest.approx(20.0)
+        assert c.ratio == pytest.approx(1.0)
+
+    def test_per_case_threshold(self):
+        results = [_result("noisy", 13.0), _result("tight", 13.0)]
+        statuses = {
+            c.name: c.status
+            for c in compare(results, _baseline(noisy=10, tight=10), threshold=0.25, thresholds={"noisy": 0.4})
+        }
+        assert statuses == {"noisy": "ok", "tight": "regressed"}
+
+    def test_report_lists_regressions_first(self):
+        results = [_result("a", 10.0), _result("b", 20.0)]
+        report = render_report(results, compare(results, _baseline(a=10, b=10)))
+        rows = [line for line in report.splitlines() if line.startswith("| a") or line.startswith("| b")]
+        assert rows[0].startswith("| b") and "REGRESSED" in rows[0]
+        assert "**1 regression(s)**: b" in report
+
+
+class TestBaselineFile:
+    def test_round_trip_and_merge(self, tmp_path):
+        path = str(tmp_path / "baselines.json")
+        assert load_baseline(path) is None
+
+        save_baseline([_result("a", 10.0), _result("b", 5.0)], path)
+        save_baseline([_result("a", 12.0)], path, merge=load_baseline(path))
+
+        stored = load_baseline(path)
+        assert stored.cases["a"]["min_us"] == 12.0
+        assert stored.cases["b"]["min_us"] == 5.0
+        assert stored.python
+
+
+class TestMeasure:
+    def test_sync_and_async_bodies(self):
+        calls = []
+
+        async def tick():
+            calls.append(1)
+            await asyncio.sleep(0)
+
+        samples, n = measure(tick, rounds=2, min_time=0.001)
+        assert len(samples) == 2
+        assert len(calls) >= 1 + 2 * n  # warm-up + rounds
+
+        samples, _ = measure(lambda: sum(range(100)), rounds=3, min_time=0.001)
+        assert len(samples) == 3 and all(s > 0 for s in samples)
+
+
+class TestCases:
+    @pytest.mark.parametrize("case", registered_cases(), ids=lambda c: c.name)
+    def test_case_runs_and_has_baseline(self, case):
+        result = run_case(case, rounds=1, min_time=0.0, max_iterations=1)
+        assert result.min_us > 0
+        assert case.name in load_baseline().cases
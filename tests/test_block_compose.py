@@ -4,7 +4,7 @@ import pytest
 
 from config.prompts.block_compose import (
     build_block_prompt,
-    _build_data_summary,
+    build_data_summary,
     _build_markdown_prompt,
     _build_suggestion_prompt,
     _build_question_prompt,
@@ -30,11 +30,11 @@ def _make_slot(
 
 
 def test_build_data_summary_with_data():
-    """_build_data_summary includes both data and compute sections."""
+    """build_data_summary includes both data and compute sections."""
     data_context = {"submissions": {"count": 30, "scores": [85, 72]}}
     compute_results = {"stats": {"mean": 78.5}}
 
-    summary = _build_data_summary(data_context, compute_results)
+    summary = build_data_summary(data_context, compute_results)
 
     assert "## Fetched Data" in summary
     assert "submissions" in summary
@@ -44,24 +44,24 @@ def test_build_data_summary_with_data():
 
 
 def test_build_data_summary_empty():
-    """_build_data_summary returns fallback when no data."""
-    summary = _build_data_summary({}, {})
+    """build_data_summary returns fallback when no data."""
+    summary = build_data_summary({}, {})
     assert summary == "No data available."
 
 
 def test_build_data_summary_only_data():
-    """_build_data_summary with only data_context."""
+    """build_data_summary with only data_context."""
     data_context = {"scores": [85, 72]}
-    summary = _build_data_summary(data_context, {})
+    summary = build_data_summary(data_context, {})
 
     assert "## Fetched Data" in summary
     assert "## Computed Statistics" not in summary
 
 
 def test_build_data_summary_only_compute():
-    """_build_data_summary with only compute_results."""
+    """build_data_summary with only compute_results."""
     compute_results = {"mean": 82.7}
-    summary = _build_data_summary({}, compute_results)
+    summary = build_data_summary({}, compute_results)
 
     assert "## Fetched Data" not in summary
     assert "## Computed Statistics" in summary
@@ -209,3 +209,28 @@ def test_build_block_prompt_includes_block_id():
     prompt, _ = build_block_prompt(slot, None, {}, {})
 
     assert "my-insight-block" in prompt
+
+
+def test_build_data_summary_is_compact_for_large_class():
+    """Prompt data section stays bounded regardless of class size."""
+    students = [
+        {"student_id": f"s-{i}", "name": f"Student {i}", "score": i % 100}
+        for i in range(400)
+    ]
+    summary = build_data_summary({"submissions": {"submissions": students}}, {})
+
+    assert "top_5_by_score" in summary
+    assert len(summary) < 2000
+
+
+def test_build_block_prompt_uses_precomputed_summary():
+    """A shared data summary is used verbatim instead of being rebuilt."""
+    from config.prompts.block_compose import build_block_prompt_layout
+
+    slot = _make_slot("markdown")
+    layout, _ = build_block_prompt_layout(
+        slot, None, {"ignored": 1}, {}, data_summary="## Shared summary"
+    )
+
+    assert "## Shared summary" in layout.render()
+    assert "ignored" not in layout.render()
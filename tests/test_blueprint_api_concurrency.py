@@ -184,3 +184,23 @@ async def test_distill_concurrency_different_teachers():
 
             assert resp1.status_code == 200
             assert resp2.status_code == 200
+
+
+@pytest.mark.asyncio
+async def test_distill_limiter_keeps_no_idle_teachers():
+    """Finished distillations leave nothing behind in the per-teacher limiter."""
+    from services.concurrency import get_keyed_limiter
+
+    mock_blueprint = SoftBlueprint(name="Test", entity_slots=[], execution_prompt="Test")
+
+    with patch("api.blueprint.distill_conversation", new=AsyncMock(return_value=mock_blueprint)):
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            for i in range(20):
+                response = await client.post(
+                    "/api/blueprint/distill",
+                    json={"teacherId": f"teacher-{i}", "conversationId": "conv-1"},
+                )
+                assert response.status_code == 200
+
+    assert len(get_keyed_limiter("distill", 1)) == 0
@@ -12,22 +12,35 @@ from models.soft_blueprint import (
 )
 from services.blueprint_distiller import (
     _build_distill_prompt,
+    _format_trace,
     _validate_blueprint,
+    build_interaction_trace,
     distill_conversation,
 )
 from services.conversation_store import ConversationSession, ConversationTurn
+from services.prompt_budget import estimate_tokens
+
+
+def _session(*turns: tuple[str, str, str | None]) -> ConversationSession:
+    return ConversationSession(
+        conversation_id="conv-abc",
+        turns=[
+            ConversationTurn(role=role, content=content, tool_calls_summary=tools)
+            for role, content, tools in turns
+        ],
+    )
 
 
 def test_build_distill_prompt():
-    """Test prompt building from conversation history."""
-    conversation_history = [
-        {"role": "user", "content": "分析A班的作业1"},
-        {"role": "assistant", "content": "好的，我来分析", "tool_calls_summary": "get_class_detail → ok"},
-        {"role": "user", "content": "再看看学生表现"},
-        {"role": "assistant", "content": "x" * 600},  # Long content should be truncated
-    ]
+    """Test prompt building from a compacted interaction trace."""
+    session = _session(
+        ("user", "分析A班的作业1", None),
+        ("assistant", "好的，我来分析", "get_class_detail → ok"),
+        ("user", "再看看学生表现", None),
+        ("assistant", "x" * 600, None),  # Long content should be truncated
+    )
 
-    prompt = _build_distill_prompt(conversation_history)
+    prompt = _build_distill_prompt(build_interaction_trace(session, "teacher-123"))
 
     assert "Teacher: 分析A班的作业1" in prompt
     assert "AI: [Tools used: get_class_detail → ok]" in prompt
@@ -38,6 +51,68 @@ def test_build_distill_prompt():
     assert "output_hints" in prompt
 
 
+def test_interaction_trace_compaction():
+    """Repeats collapse, tool summaries parse, the artifact type is kept."""
+    session = _session(
+        ("user", "出 5 道  英语语法题", None),
+        ("assistant", "", "generate_quiz_questions(topic=英语语法, count=5) → error"),
+        ("user", "再试一次", None),
+        ("user", "再试一次", None),
+        ("assistant", "已生成 5 道题", "generate_quiz_questions(topic=英语语法, count=5) → ok"),
+    )
+    trace = build_interaction_trace(session, "teacher-123", artifact_types=["quiz"])
+
+    assert trace.initial_message == "出 5 道 英语语法题"
+    assert trace.all_messages == ["再试一次"]
+    [call] = trace.skill_calls
+    assert call.skill_name == "generate_quiz_questions"
+    assert call.input_params == {"topic": "英语语法", "count": "5"}
+    assert call.was_successful
+    assert trace.output_type == "quiz"
+    assert trace.output_data["final_reply"] == "已生成 5 道题"
+
+
+def test_interaction_trace_lists_every_artifact_type():
+    """A multi-artifact conversation reports all artifact types in order."""
+    from services.artifact_store import InMemoryArtifactStore
+
+    store = InMemoryArtifactStore()
+    quiz = store.save_artifact(
+        conversation_id="conv-abc", artifact_type="quiz", content_format="json", content={},
+    )
+    store.save_artifact(
+        conversation_id="conv-abc", artifact_type="interactive", content_format="html", content="<p/>",
+    )
+    store.save_artifact(
+        conversation_id="conv-abc", artifact_type="quiz", content_format="json", content={},
+        artifact_id=quiz.artifact_id,
+    )
+    session = _session(("user", "出题并做成互动网页", None), ("assistant", "完成", None))
+
+    trace = build_interaction_trace(
+        session, "teacher-123", artifact_types=store.get_types_for_conversation("conv-abc"),
+    )
+
+    assert trace.output_types == ["quiz", "interactive"]
+    assert "Output: quiz → interactive" in _format_trace(trace)
+
+
+def test_interaction_trace_bounded_for_long_conversations():
+    """Prompt size stays flat however many turns the conversation has."""
+    turns = []
+    for i in range(200):
+        turns.append(("user", f"第{i}轮：请把第{i}题改得更难一些，并补充解析" * 3, None))
+        turns.append(("assistant", "已修改" * 50, f"patch_artifact(op=replace, index={i}) → ok"))
+
+    trace = build_interaction_trace(_session(*turns), "teacher-123", token_budget=800)
+
+    assert estimate_tokens(_format_trace(trace)) <= 800
+    assert trace.initial_message.startswith("第0轮")
+    assert trace.all_messages[-1].startswith("第199轮")
+    assert trace.omitted_messages + len(trace.all_messages) == 199
+    assert trace.omitted_skill_calls + len(trace.skill_calls) == 200
+
+
 def test_validate_blueprint_success():
     """Test successful blueprint validation."""
     blueprint = SoftBlueprint(
@@ -0,0 +1,70 @@
+"""Tests for services/bm25_index.py."""
+
+import pytest
+
+from services.bm25_index import BM25Index, tokenize
+
+
+class TestTokenize:
+    def test_latin_words_lowercased(self):
+        assert tokenize("Essay-2, Reading_Skills!") == ["essay", "2", "reading", "skills"]
+
+    def test_cjk_bigrams(self):
+        assert tokenize("閱讀理解") == ["閱讀", "讀理", "理解"]
+
+    def test_single_cjk_char_is_unigram(self):
+        assert tokenize("中 文") == ["中", "文"]
+
+    def test_mixed_script(self):
+        assert tokenize("DSE中文寫作") == ["dse", "中文", "文寫", "寫作"]
+
+
+class TestBM25Index:
+    def setup_method(self):
+        self.index = BM25Index()
+        self.index.add("essay", "argumentative essay writing rubric")
+        self.index.add("reading", "reading comprehension skills")
+        self.index.add("chinese", "中文閱讀理解 評分準則")
+
+    def test_ranks_matching_documents(self):
+        hits = self.index.search("essay rubric")
+        assert [doc_id for doc_id, _ in hits] == ["essay"]
+        assert hits[0][1] > 0
+
+    def test_rarer_terms_score_higher(self):
+        self.index.add("both", "reading essay")
+        hits = dict(self.index.search("comprehension reading"))
+        assert hits["reading"] > hits["both"]
+
+    def test_cjk_query(self):
+        assert self.index.search("閱讀理解")[0][0] == "chinese"
+
+    def test_no_match(self):
+        assert self.index.search("xyz") == []
+        assert BM25Index().search("anything") == []
+
+    def test_limit_and_accept(self):
+        self.index.add("essay2", "essay essay")
+        assert len(self.index.search("essay", limit=1)) == 1
+        hits = self.index.search("essay", accept=lambda doc_id: doc_id != "essay2")
+        assert [doc_id for doc_id, _ in hits] == ["essay"]
+
+    def test_replace_and_remove(self):
+        self.index.add("essay", "poetry analysis")
+        assert self.index.search("essay") == []
+        assert self.index.search("poetry")[0][0] == "essay"
+
+        assert self.index.remove("essay") is True
+        assert self.index.remove("essay") is False
+        assert "essay" not in self.index
+        assert self.index.search("poetry") == []
+        assert len(self.index) == 2
+
+    def test_round_trip(self):
+        restored = BM25Index.from_dict(self.index.to_dict())
+        assert restored.search("閱讀 essay") == self.index.search("閱讀 essay")
+
+    def test_rejects_unknown_version(self):
+        payload = self.index.to_dict() | {"version": 99}
+        with pytest.raises(ValueError, match="version"):
+            BM25Index.from_dict(payload)
@@ -333,8 +333,8 @@ def _make_agent_with_model(function_model):
     agent = NativeAgent()
     original_create = agent._create_agent
 
-    def patched_create(toolsets, deps, tracker=None):
-        pydantic_agent = original_create(toolsets, deps, tracker=tracker)
+    def patched_create(toolsets, deps, tracker=None, **kwargs):
+        pydantic_agent = original_create(toolsets, deps, tracker=tracker, **kwargs)
         pydantic_agent._model = function_model
         return pydantic_agent
 
@@ -0,0 +1,82 @@
+"""Tests for services/data_summary.py — compact prompt data summaries."""
+
+from __future__ import annotations
+
+import json
+
+from services.data_summary import summarize_data
+from services.mock_data import SUBMISSIONS
+from services.prompt_budget import estimate_tokens
+
+
+def _class_submissions(n: int) -> dict:
+    return {
+        "assignment_id": "a-001",
+        "title": "Unit 5 Test",
+        "max_score": 100,
+        "submissions": [
+            {
+                "student_id": f"s-{i:04d}",
+                "name": f"Student {i}",
+                "score": (i * 37) % 101,
+                "submitted": i % 7 != 0,
+                "feedback": "Good effort on the reading section. " * 10,
+                "answers": [{"q": j, "a": "B"} for j in range(20)],
+            }
+            for i in range(n)
+        ],
+        "scores": [(i * 37) % 101 for i in range(n)],
+    }
+
+
+class TestSmallInputs:
+    def test_empty(self):
+        assert summarize_data({}, {}) == ""
+
+    def test_compute_numbers_preserved(self):
+        text = summarize_data({}, {"stats": {"mean": 78.5, "median": 80}})
+        assert "## Computed Statistics" in text
+        assert '"mean":78.5' in text
+
+    def test_small_record_list_keeps_rows_and_selects_columns(self):
+        text = summarize_data({"submissions": SUBMISSIONS["a-001"]}, {})
+        assert "Wong Ka Ho" in text
+        assert '"score":58' in text
+        # Low-information columns are kept as categories, not dropped silently
+        assert "submission_type" in text
+
+
+class TestLargeInputs:
+    def test_records_rolled_up_with_top_and_bottom(self):
+        text = summarize_data({"submissions": _class_submissions(40)}, {}, top_n=3)
+        payload = json.loads(text.split("### submissions\n", 1)[1])
+        subs = payload["submissions"]
+        assert subs["count"] == 40
+        assert subs["stats"]["score"]["max"] == 100
+        assert len(subs["top_3_by_score"]) == 3
+        assert subs["top_3_by_score"][0]["score"] >= subs["bottom_3_by_score"][0]["score"]
+        assert subs["categories"]["submitted"] == {"False": 6, "True": 34}
+        # Long text and nested answers are dropped
+        assert "feedback" not in text and "answers" not in text
+
+    def test_numeric_array_rolled_up(self):
+        text = summarize_data({"scores": list(range(100))}, {})
+        assert '"count":100' in text
+        assert '"mean":49.5' in text
+
+    def test_size_independent_of_class_size(self):
+        small = summarize_data({"submissions": _class_submissions(40)}, {})
+        large = summarize_data({"submissions": _class_submissions(4000)}, {})
+        assert abs(estimate_tokens(large) - estimate_tokens(small)) < 50
+
+    def test_hard_token_cap(self):
+        data = {f"assignment_{i}": _class_submissions(40) for i in range(30)}
+        text = summarize_data(data, {}, max_tokens=400)
+        assert estimate_tokens(text) <= 400
+        assert text.endswith("(data truncated to fit prompt budget)")
+
+    def test_cap_disabled(self):
+        data = {f"assignment_{i}": _class_submissions(40) for i in range(30)}
+        text = summarize_data(data, {}, max_tokens=0)
+        assert "truncated" not in text
+        assert estimate_tokens(text) > 400
@@ -1224,3 +1224,24 @@ def test_fill_single_block_question_generator_with_error():
 # ── Import for A1.2 tests ─────────────────────────────────────
 
 from models.quiz_output import QuizOutputV1
+
+
+# ── Shared data summary ─────────────────────────────────────
+
+
+def test_data_summary_computed_once_per_build():
+    """All AI blocks of a build share one data summary."""
+    executor = ExecutorAgent()
+    data_context = {"submissions": {"scores": [58, 85]}}
+    compute_results = {"stats": {"mean": 71.5}}
+
+    with patch(
+        "agents.executor.build_data_summary",
+        return_value="summary",
+    ) as build:
+        first = executor._get_data_summary(data_context, compute_results)
+        second = executor._get_data_summary(data_context, compute_results)
+        executor._get_data_summary({"other": 1}, compute_results)
+
+    assert first == second == "summary"
+    assert build.call_count == 2
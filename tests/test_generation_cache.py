@@ -0,0 +1,242 @@
+"""Tests for services/generation_cache.py and its use by the generation endpoints."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from services.generation_cache import (
+    GenerationCache,
+    GenerationFailed,
+    generation_fingerprint,
+)
+from services.media_cache import DiskMediaCache
+from services.metrics import get_metrics_collector
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    get_metrics_collector().reset()
+
+
+class _Producer:
+    """Counts runs; each run yields ``n`` events, optionally gated."""
+
+    def __init__(self, n: int = 3, gate: asyncio.Event | None = None, fail: bool = False):
+        self.n = n
+        self.gate = gate
+        self.fail = fail
+        self.runs = 0
+
+    async def __call__(self):
+        self.runs += 1
+        for i in range(self.n):
+            if i == 1 and self.gate is not None:
+                await self.gate.wait()
+            yield {"i": i}
+        if self.fail:
+            raise RuntimeError("llm down")
+
+
+async def _collect(stream) -> list:
+    return [event async for event in stream]
+
+
+class TestFingerprint:
+    def test_normalized_inputs_collide(self):
+        a = generation_fingerprint("page", {"blueprint": {"id": "bp-1", "name": "Form  1A　report "}})
+        b = generation_fingerprint("page", {"blueprint": {"id": "bp-2", "name": "Form 1A report"}})
+        assert a == b and a.startswith("gen:page:")
+
+    def test_teacher_model_and_version_separate(self):
+        base = generation_fingerprint("quiz", {"topic": "x"}, teacher_id="t1", model="m", version="w:1")
+        assert base != generation_fingerprint("quiz", {"topic": "x"}, teacher_id="t2", model="m", version="w:1")
+        assert base != generation_fingerprint("quiz", {"topic": "x"}, teacher_id="t1", model="m2", version="w:1")
+        assert base != generation_fingerprint("quiz", {"topic": "x"}, teacher_id="t1", model="m", version="w:2")
+
+
+class TestGenerationCache:
+    async def test_duplicates_attach_to_running_job(self):
+        cache = GenerationCache()
+        gate = asyncio.Event()
+        produce = _Producer(gate=gate)
+
+        first = asyncio.create_task(_collect(cache.stream("page", "k", produce, cacheable=bool)))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(_collect(cache.stream("page", "k", produce, cacheable=bool)))
+        await asyncio.sleep(0.01)
+        gate.set()
+
+        assert await first == await second == [{"i": 0}, {"i": 1}, {"i": 2}]
+        assert produce.runs == 1
+        assert get_metrics_collector().get_counter("generation_cache_page") == {"miss": 1, "coalesced": 1}
+
+    async def test_completed_run_replayed(self):
+        cache = GenerationCache()
+        produce = _Producer()
+        await _collect(cache.stream("page", "k", produce, cacheable=bool))
+        job = cache.start("page", "k", produce, cacheable=bool)
+        assert job.replayed and job.done
+        assert await _collect(job.follow()) == [{"i": 0}, {"i": 1}, {"i": 2}]
+        assert produce.runs == 1
+
+    async def test_not_cacheable_runs_again(self):
+        cache = GenerationCache()
+        produce = _Producer()
+        for _ in range(2):
+            await _collect(cache.stream("page", "k", produce, cacheable=lambda events: False))
+        assert produce.runs == 2
+
+    async def test_job_survives_first_client_disconnect(self):
+        cache = GenerationCache()
+        gate = asyncio.Event()
+        produce = _Producer(gate=gate)
+
+        first = cache.stream("page", "k", produce, cacheable=bool)
+        assert await first.__anext__() == {"i": 0}
+        await first.aclose()  # client went away
+
+        gate.set()
+        retry = await _collect(cache.stream("page", "k", produce, cacheable=bool))
+        assert retry == [{"i": 0}, {"i": 1}, {"i": 2}]
+        assert produce.runs == 1
+
+    async def test_bypass_regenerates_and_replaces(self):
+        cache = GenerationCache()
+        produce = _Producer()
+        await _collect(cache.stream("page", "k", produce, cacheable=bool))
+        produce.n = 1
+        assert await _collect(cache.stream("page", "k", produce, cacheable=bool, bypass=True)) == [{"i": 0}]
+        assert await _collect(cache.stream("page", "k", produce, cacheable=bool)) == [{"i": 0}]
+        assert produce.runs == 2
+
+    async def test_failure_shared_then_retried(self):
+        cache = GenerationCache()
+        produce = _Producer(fail=True)
+        with pytest.raises(GenerationFailed, match="llm down"):
+            await _collect(cache.stream("quiz", "k", produce, cacheable=bool))
+        produce.fail = False
+        assert len(await _collect(cache.stream("quiz", "k", produce, cacheable=bool))) == 3
+        assert produce.runs == 2
+
+    async def test_shared_disk_tier(self, tmp_path):
+        produce = _Producer()
+        first = GenerationCache(backend=DiskMediaCache(str(tmp_path)))
+        await _collect(first.stream("page", "gen:page:abc", produce, cacheable=bool))
+
+        other_worker = GenerationCache(backend=DiskMediaCache(str(tmp_path)))
+        events = await _collect(other_worker.stream("page", "gen:page:abc", produce, cacheable=bool))
+        assert events == [{"i": 0}, {"i": 1}, {"i": 2}]
+        assert produce.runs == 1
+
+
+# ── Endpoints ───────────────────────────────────────────────
+
+
+@pytest.fixture
+async def client():
+    from main import app
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+def _complete_stream(calls: list):
+    async def stream(blueprint, context):
+        calls.append(context.get("teacherId"))
+        yield {"type": "PHASE", "phase": "data", "message": "Fetching data..."}
+        yield {"type": "COMPLETE", "message": "completed", "progress": 100, "result": {"page": {}}}
+
+    return stream
+
+
+class TestEndpoints:
+    async def test_page_generate_duplicate_replayed(self, client):
+        from tests.test_planner import _sample_blueprint_args
+
+        calls: list = []
+        body = {"blueprint": _sample_blueprint_args(), "teacherId": "t-001"}
+        with patch("api.page._executor") as executor:
+            executor.execute_blueprint_stream = _complete_stream(calls)
+            first = await client.post("/api/page/generate", json=body)
+            second = await client.post("/api/page/generate", json=body)
+            forced = await client.post(
+                "/api/page/generate", json=body, headers={"Cache-Control": "no-cache"},
+            )
+
+        assert first.text.count("COMPLETE") == second.text.count("COMPLETE") == 1
+        assert calls == ["t-001", "t-001"]  # second request replayed
+        assert "COMPLETE" in forced.text
+        counter = get_metrics_collector().get_counter("generation_cache_page")
+        assert counter == {"miss": 1, "hit": 1, "bypass": 1}
+
+    async def test_workflow_generate_duplicate_replayed(self, client):
+        from models.blueprint import Blueprint
+        from tests.test_planner import _sample_blueprint_args
+
+        planner = AsyncMock(return_value=(Blueprint(**_sample_blueprint_args()), "dashscope/qwen-max"))
+        with patch("api.workflow.generate_blueprint", planner):
+            responses = [
+                await client.post("/api/workflow/generate", json={"userPrompt": " Analyze  class "}),
+                await client.post("/api/workflow/generate", json={"userPrompt": "Analyze class"}),
+            ]
+        assert planner.await_count == 1
+        assert responses[0].json() == responses[1].json()
+        assert responses[1].json()["blueprint"]["id"] == "bp-test-planner"
+
+    async def test_workflow_fallback_blueprint_not_replayed(self, client):
+        from agents.planner import _build_fallback_blueprint
+
+        planner = AsyncMock(return_value=(_build_fallback_blueprint("Analyze class", "en"), "m"))
+        with patch("api.workflow.generate_blueprint", planner):
+            for _ in range(2):
+                resp = await client.post("/api/workflow/generate", json={"userPrompt": "Analyze class"})
+                assert resp.json()["blueprint"]["id"].startswith("bp-fallback-")
+        assert planner.await_count == 2
+
+
+class TestQuizTool:
+    async def test_only_inflight_duplicates_coalesced(self):
+        from models.quiz_output import QuizQuestionV1
+        from services.tool_tracker import ToolTracker, current_tracker
+        from tools.quiz_tools import generate_quiz_questions
+
+        runs = []
+        gate = asyncio.Event()
+
+        async def fake_generate_quiz(**kwargs):
+            runs.append(kwargs["topic"])
+            for i in range(2):
+                if i == 1:
+                    await gate.wait()
+                yield QuizQuestionV1(
+                    id=f"q-{i}", order=i + 1, questionType="SINGLE_CHOICE",
+                    question=f"Q{i}", options=["A", "B"], correctAnswer="A", difficulty="easy",
+                )
+
+        def call():
+            return generate_quiz_questions("fractions", count=2, teacher_id="t", conversation_id="c")
+
+        tracker = ToolTracker()
+        token = current_tracker.set(tracker)
+        try:
+            with patch("skills.quiz_skill.generate_quiz", fake_generate_quiz):
+                first = asyncio.create_task(call())
+                await asyncio.sleep(0.01)
+                duplicate = asyncio.create_task(call())
+                await asyncio.sleep(0.01)
+                gate.set()
+                first, duplicate = await first, await duplicate
+                later = await call()  # a new request once the first has finished
+        finally:
+            current_tracker.reset(token)
+
+        assert runs == ["fractions", "fractions"]  # the in-flight duplicate did not re-run
+        assert first["questions"] == duplicate["questions"] == later["questions"]
+        items = []
+        while not tracker.queue.empty():
+            items.append(tracker.queue.get_nowait())
+        assert [e.status for e in items] == ["stream-item"] * 6
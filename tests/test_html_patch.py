@@ -0,0 +1,158 @@
+"""Tests for services/html_patch.py and diff-based interactive HTML editing."""
+
+from __future__ import annotations
+
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from services.html_patch import (
+    HtmlEdit,
+    HtmlPatchError,
+    apply_html_edits,
+    parse_html_edits,
+    patch_html,
+    validate_patched_html,
+)
+from services.metrics import MetricsCollector
+
+DOC = """<!DOCTYPE html>
+<html>
+<head>
+  <style>
+    .btn { background: #999; }
+  </style>
+</head>
+<body>
+  <button class="btn">Start</button>
+  <script>
+    document.querySelector('.btn').onclick = () => alert('hi');
+  </script>
+</body>
+</html>"""
+
+BLUE_EDIT = """<<<<<<< SEARCH
+    .btn { background: #999; }
+=======
+    .btn { background: #2563eb; }
+>>>>>>> REPLACE"""
+
+
+class TestParseEdits:
+    def test_single_block(self):
+        edits = parse_html_edits(BLUE_EDIT)
+        assert edits == [HtmlEdit("    .btn { background: #999; }", "    .btn { background: #2563eb; }")]
+
+    def test_ignores_fences_and_prose(self):
+        text = f"Here you go:\n```\n{BLUE_EDIT}\n```\n{BLUE_EDIT}"
+        assert len(parse_html_edits(text)) == 2
+
+    def test_empty_replace_deletes(self):
+        edits = parse_html_edits("<<<<<<< SEARCH\nx\n=======\n>>>>>>> REPLACE")
+        assert edits[0].replace == ""
+
+    def test_no_blocks_raises(self):
+        with pytest.raises(HtmlPatchError, match="no SEARCH"):
+            parse_html_edits(DOC)
+
+    def test_unterminated_raises(self):
+        with pytest.raises(HtmlPatchError, match="unterminated"):
+            parse_html_edits("<<<<<<< SEARCH\nx\n=======\ny")
+
+
+class TestApplyEdits:
+    def test_exact_match(self):
+        result = apply_html_edits(DOC, parse_html_edits(BLUE_EDIT))
+        assert "#2563eb" in result and "#999" not in result
+
+    def test_indentation_tolerant_match(self):
+        edit = HtmlEdit(".btn { background: #999; }", "    .btn { background: red; }")
+        assert "background: red" in apply_html_edits(DOC, [edit])
+
+    def test_missing_search_raises(self):
+        with pytest.raises(HtmlPatchError, match="not found"):
+            apply_html_edits(DOC, [HtmlEdit("<canvas>", "")])
+
+    def test_ambiguous_search_raises(self):
+        with pytest.raises(HtmlPatchError, match="ambiguous"):
+            apply_html_edits(DOC, [HtmlEdit("btn", "x")])
+
+    def test_edits_apply_in_order(self):
+        edits = [HtmlEdit("Start", "Go"), HtmlEdit(">Go<", ">Run<")]
+        assert ">Run<" in apply_html_edits(DOC, edits)
+
+
+class TestValidate:
+    def test_unbalanced_script_rejected(self):
+        broken = DOC.replace("</script>", "")
+        with pytest.raises(HtmlPatchError, match="unbalanced"):
+            validate_patched_html(DOC, broken)
+
+    def test_removed_body_rejected(self):
+        with pytest.raises(HtmlPatchError, match="body"):
+            validate_patched_html(DOC, "<html><head></head></html>")
+
+    def test_patch_html_returns_edit_count(self):
+        patched, count = patch_html(DOC, BLUE_EDIT)
+        assert count == 1
+        assert patched == DOC.replace("#999", "#2563eb")
+
+
+class TestModifyInteractiveHtml:
+    """_modify_interactive_html patches first, regenerates on failure."""
+
+    @pytest.mark.asyncio
+    async def test_patch_path_uses_small_budget(self):
+        from tools import native_tools
+
+        collector = MetricsCollector()
+        run = AsyncMock(return_value=BLUE_EDIT)
+        with (
+            patch.object(native_tools, "_run_code_model", run),
+            patch("services.metrics.get_metrics_collector", return_value=collector),
+        ):
+            result = await native_tools._modify_interactive_html(DOC, "make the button blue")
+
+        assert result == DOC.replace("#999", "#2563eb")
+        assert run.await_count == 1
+        system_prompt, _, max_tokens = run.await_args.args
+        assert "SEARCH/REPLACE" in system_prompt
+        assert max_tokens < 16384
+        assert collector.get_counter("interactive_html_edit") == {"patched": 1}
+
+    @pytest.mark.asyncio
+    async def test_bad_patch_falls_back_to_regeneration(self):
+        from tools import native_tools
+
+        collector = MetricsCollector()
+        regenerated = DOC.replace("Start", "Begin")
+        run = AsyncMock(side_effect=[
+            "<<<<<<< SEARCH\n<canvas>\n=======\n<div>\n>>>>>>> REPLACE",
+            f"```html\n{regenerated}\n```",
+        ])
+        with (
+            patch.object(native_tools, "_run_code_model", run),
+            patch("services.metrics.get_metrics_collector", return_value=collector),
+        ):
+            result = await native_tools._modify_interactive_html(DOC, "rename the button")
+
+        assert result == regenerated
+        assert run.await_count == 2
+        assert "COMPLETE modified HTML" in run.await_args_list[1].args[0]
+        assert collector.get_counter("interactive_html_edit") == {
+            "fallback": 1,
+            "regenerated": 1,
+        }
+
+    @pytest.mark.asyncio
+    async def test_patching_disabled_regenerates_directly(self, monkeypatch):
+        from config.settings import get_settings
+        from tools import native_tools
+
+        monkeypatch.setattr(get_settings(), "interactive_html_patch_enabled", False)
+        run = AsyncMock(return_value=DOC)
+        with patch.object(native_tools, "_run_code_model", run):
+            await native_tools._modify_interactive_html(DOC, "anything")
+
+        assert run.await_count == 1
+        assert run.await_args.args[2] == get_settings().interactive_html_regen_max_tokens
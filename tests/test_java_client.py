@@ -18,6 +18,15 @@ from services.java_client import (
 # Fixtures
 # ---------------------------------------------------------------------------
 
+def _set_client_defaults(s):
+    s.spring_boot_http2 = False
+    s.spring_boot_cache_size = 512
+    s.spring_boot_cache_fresh_s = 5.0
+    s.spring_boot_fanout_concurrency = 8
+    s.spring_boot_dify_account = ""
+    s.spring_boot_dify_password = ""
+
+
 @pytest.fixture
 def client():
     """Create a fresh JavaClient for each test (not the global singleton)."""
@@ -29,6 +38,7 @@ def client():
         s.spring_boot_access_token = "test-token"
         s.spring_boot_refresh_token = "test-refresh"
         s.internal_api_secret = "test-internal-secret"
+        _set_client_defaults(s)
         mock_settings.return_value = s
         yield JavaClient()
 
@@ -72,6 +82,7 @@ def test_auth_headers_empty_token():
         s.spring_boot_access_token = ""
         s.spring_boot_refresh_token = ""
         s.internal_api_secret = ""
+        _set_client_defaults(s)
         mock_settings.return_value = s
         c = JavaClient()
     assert c._auth_headers() == {}
@@ -284,3 +295,243 @@ def test_get_java_client_singleton():
     c2 = get_java_client()
     assert c1 is c2
     mod._client = None  # cleanup
+
+
+# ---------------------------------------------------------------------------
+# Stand-in Java server: caching, revalidation, dedup, fan-out
+# ---------------------------------------------------------------------------
+
+import asyncio  # noqa: E402
+
+from starlette.applications import Starlette  # noqa: E402
+from starlette.requests import Request  # noqa: E402
+from starlette.responses import JSONResponse, Response  # noqa: E402
+from starlette.routing import Route  # noqa: E402
+
+from services.java_client import fan_out  # noqa: E402
+from services.metrics import get_metrics_collector  # noqa: E402
+
+
+class StandInJava:
+    """Minimal Spring Boot stand-in served in-process over ASGI."""
+
+    def __init__(self):
+        self.hits: dict[str, int] = {}
+        self.version = 1
+        self.cache_control: str | None = None
+        self.delay = 0.0
+        self.active = 0
+        self.max_active = 0
+        self.app = Starlette(routes=[
+            Route("/api/dify/teacher/{tid}/classes/me", self.classes),
+            Route("/api/dify/teacher/{tid}/classes/{cid}", self.detail),
+            Route("/api/plain", self.plain),
+            Route(
+                "/api/dify/teacher/{tid}/classes/{cid}/students", self.add_student, methods=["POST"],
+            ),
+        ])
+
+    def _hit(self, request: Request) -> None:
+        self.hits[request.url.path] = self.hits.get(request.url.path, 0) + 1
+
+    async def classes(self, request: Request):
+        self._hit(request)
+        etag = f'"v{self.version}"'
+        if request.headers.get("if-none-match") == etag:
+            return Response(status_code=304, headers={"ETag": etag})
+        headers = {"ETag": etag}
+        if self.cache_control:
+            headers["Cache-Control"] = self.cache_control
+        return JSONResponse(
+            {"code": 200, "data": [{"id": "c1", "version": self.version}]},
+            headers=headers,
+        )
+
+    async def detail(self, request: Request):
+        self._hit(request)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.active -= 1
+        return JSONResponse({"code": 200, "data": {"id": request.path_params["cid"]}})
+
+    async def plain(self, request: Request):
+        self._hit(request)
+        return JSONResponse({"code": 200, "data": self.version})
+
+    async def add_student(self, request: Request):
+        self.version += 1
+        return JSONResponse({"code": 200, "data": None})
+
+
+@pytest.fixture
+def java_server():
+    return StandInJava()
+
+
+@pytest.fixture
+def served_client(java_server):
+    with patch("services.java_client.get_settings") as mock_settings:
+        s = MagicMock()
+        s.spring_boot_base_url = "http://java.test"
+        s.spring_boot_api_prefix = "/api"
+        s.spring_boot_timeout = 10
+        s.spring_boot_access_token = "test-token"
+        s.spring_boot_refresh_token = ""
+        s.internal_api_secret = ""
+        _set_client_defaults(s)
+        s.spring_boot_cache_fresh_s = 0.0
+        mock_settings.return_value = s
+        client = JavaClient(transport=httpx.ASGITransport(app=java_server.app))
+    get_metrics_collector().reset()
+    return client
+
+
+CLASSES = "/dify/teacher/t1/classes/me"
+
+
+@pytest.mark.asyncio
+async def test_etag_revalidation_serves_cached_body(served_client, java_server):
+    await served_client.start()
+    first = await served_client.get(CLASSES)
+    second = await served_client.get(CLASSES)
+
+    assert first == second == {"code": 200, "data": [{"id": "c1", "version": 1}]}
+    assert java_server.hits["/api" + CLASSES] == 2  # second was a 304
+    assert get_metrics_collector().get_counter("java_client_get") == {"miss": 1, "revalidated": 1}
+
+    java_server.version = 2
+    third = await served_client.get(CLASSES)
+    assert third["data"][0]["version"] == 2
+    await served_client.close()
+
+
+@pytest.mark.asyncio
+async def test_cached_body_is_not_shared(served_client):
+    await served_client.start()
+    first = await served_client.get(CLASSES)
+    first["data"].clear()
+    assert (await served_client.get(CLASSES))["data"] != []
+    await served_client.close()
+
+
+@pytest.mark.asyncio
+async def test_max_age_skips_upstream(served_client, java_server):
+    java_server.cache_control = "private, max-age=60"
+    await served_client.start()
+    for _ in range(5):
+        await served_client.get(CLASSES)
+
+    assert java_server.hits["/api" + CLASSES] == 1
+    assert get_metrics_collector().get_counter("java_client_get")["fresh_hit"] == 4
+    await served_client.close()
+
+
+@pytest.mark.asyncio
+async def test_no_store_is_not_cached(served_client, java_server):
+    java_server.cache_control = "no-store"
+    await served_client.start()
+    await served_client.get(CLASSES)
+    await served_client.get(CLASSES)
+
+    assert java_server.hits["/api" + CLASSES] == 2
+    assert "revalidated" not in get_metrics_collector().get_counter("java_client_get")
+    await served_client.close()
+
+
+@pytest.mark.asyncio
+async def test_default_freshness_window(served_client, java_server):
+    served_client._cache_fresh_s = 60
+    await served_client.start()
+    await served_client.get("/plain")
+    java_server.version = 2
+    assert (await served_client.get("/plain"))["data"] == 1
+
+    served_client.clear_cache()
+    assert (await served_client.get("/plain"))["data"] == 2
+    assert java_server.hits["/api/plain"] == 2
+    await served_client.close()
+
+
+@pytest.mark.asyncio
+async def test_write_evicts_cached_gets_of_the_collection(served_client, java_server):
+    served_client._cache_fresh_s = 60
+    await served_client.start()
+    await served_client.get(CLASSES)
+    await served_client.get("/plain")
+
+    await served_client.post("/dify/teacher/t1/classes/c1/students", {"name": "Chan"})
+
+    assert (await served_client.get(CLASSES))["data"][0]["version"] == 2
+    assert (await served_client.get("/plain"))["data"] == 1  # other resources stay cached
+    assert java_server.hits["/api" + CLASSES] == 2
+    await served_client.close()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_identical_gets_are_coalesced(served_client, java_server):
+    java_server.delay = 0.05
+    await served_client.start()
+    results = await asyncio.gather(
+        *(served_client.get("/dify/teacher/t1/classes/c9") for _ in range(10))
+    )
+
+    assert all(r["data"]["id"] == "c9" for r in results)
+    assert java_server.hits["/api/dify/teacher/t1/classes/c9"] == 1
+    assert get_metrics_collector().get_counter("java_client_get")["coalesced"] == 9
+    assert served_client._inflight == {}
+    await served_client.close()
+
+
+@pytest.mark.asyncio
+async def test_params_are_part_of_the_key(served_client, java_server):
+    await served_client.start()
+    await asyncio.gather(
+        served_client.get("/plain", params={"page": 1}),
+        served_client.get("/plain", params={"page": 2}),
+    )
+    assert java_server.hits["/api/plain"] == 2
+    await served_client.close()
+
+
+@pytest.mark.asyncio
+async def test_client_fan_out_bounds_concurrency(served_client, java_server):
+    java_server.delay = 0.02
+    await served_client.start()
+    class_ids = [f"c{i}" for i in range(12)]
+
+    results = await served_client.fan_out(
+        class_ids,
+        lambda cid: served_client.get(f"/dify/teacher/t1/classes/{cid}"),
+        limit=3,
+    )
+
+    assert [r["data"]["id"] for r in results] == class_ids
+    assert java_server.max_active == 3
+    await served_client.close()
+
+
+@pytest.mark.asyncio
+async def test_fan_out_return_exceptions():
+    async def work(n):
+        if n == 2:
+            raise ValueError("boom")
+        return n * 10
+
+    results = await fan_out(range(4), work, limit=2, return_exceptions=True)
+
+    assert results[:2] == [0, 10] and results[3] == 30
+    assert isinstance(results[2], ValueError)
+    with pytest.raises(ValueError):
+        await fan_out(range(4), work, limit=2)
+
+
+def test_http2_falls_back_without_h2(monkeypatch):
+    import sys
+
+    import services.java_client as mod
+
+    monkeypatch.setitem(sys.modules, "h2", None)
+    assert mod._http2_available() is False
@@ -0,0 +1,124 @@
+"""Tests for KeyedLimiter in services/concurrency.py."""
+
+from __future__ import annotations
+
+import pytest
+
+from services import concurrency
+from services.concurrency import KeyedLimiter, LimitExceeded, get_keyed_limiter
+
+
+class _FakeRedis:
+    """The INCR/DECR/EXPIRE/DELETE subset used by the limiter."""
+
+    def __init__(self, fail: bool = False):
+        self.values: dict[str, int] = {}
+        self.ttls: dict[str, int] = {}
+        self.fail = fail
+
+    async def incr(self, key):
+        if self.fail:
+            raise ConnectionError("redis down")
+        self.values[key] = self.values.get(key, 0) + 1
+        return self.values[key]
+
+    async def decr(self, key):
+        self.values[key] = self.values.get(key, 0) - 1
+        return self.values[key]
+
+    async def expire(self, key, seconds):
+        self.ttls[key] = seconds
+
+    async def delete(self, key):
+        self.values.pop(key, None)
+        self.ttls.pop(key, None)
+
+
+class TestLocal:
+    async def test_rejects_over_limit_per_key(self):
+        limiter = KeyedLimiter("distill", 1)
+        async with limiter.hold("t-1"):
+            with pytest.raises(LimitExceeded) as exc:
+                async with limiter.hold("t-1"):
+                    pass
+            assert exc.value.key == "t-1" and exc.value.limit == 1
+            async with limiter.hold("t-2"):  # other keys are independent
+                assert len(limiter) == 2
+
+    async def test_keys_dropped_when_released(self):
+        limiter = KeyedLimiter("distill", 2)
+        for i in range(1000):
+            async with limiter.hold(f"t-{i}"):
+                async with limiter.hold(f"t-{i}"):
+                    assert limiter.active(f"t-{i}") == 2
+        assert len(limiter) == 0
+
+    async def test_released_on_error(self):
+        limiter = KeyedLimiter("distill", 1)
+        with pytest.raises(ValueError):
+            async with limiter.hold("t-1"):
+                raise ValueError("bad conversation")
+        assert limiter.active("t-1") == 0
+
+    def test_invalid_limit(self):
+        with pytest.raises(ValueError):
+            KeyedLimiter("distill", 0)
+
+
+class TestRegistry:
+    async def test_limit_change_keeps_held_slots(self, monkeypatch):
+        from config.settings import get_settings
+
+        monkeypatch.setattr(concurrency, "_keyed_limiters", {})
+        settings = get_settings()
+        monkeypatch.setattr(settings, "distill_max_concurrent_per_teacher", 1)
+        held = get_keyed_limiter("distill", settings.distill_max_concurrent_per_teacher)
+
+        async with held.hold("t-1"):
+            monkeypatch.setattr(settings, "distill_max_concurrent_per_teacher", 2)
+            limiter = get_keyed_limiter("distill", settings.distill_max_concurrent_per_teacher)
+            assert limiter is held and limiter.active("t-1") == 1
+            async with limiter.hold("t-1"):
+                with pytest.raises(LimitExceeded):
+                    async with limiter.hold("t-1"):
+                        pass
+
+            monkeypatch.setattr(settings, "distill_max_concurrent_per_teacher", 1)
+            limiter = get_keyed_limiter("distill", settings.distill_max_concurrent_per_teacher)
+            with pytest.raises(LimitExceeded):
+                async with limiter.hold("t-1"):
+                    pass
+
+    def test_invalid_limit_change(self, monkeypatch):
+        monkeypatch.setattr(concurrency, "_keyed_limiters", {})
+        get_keyed_limiter("distill", 1)
+        with pytest.raises(ValueError):
+            get_keyed_limiter("distill", 0)
+        assert get_keyed_limiter("distill", 1).limit == 1
+
+
+class TestCluster:
+    async def test_limit_shared_across_workers(self):
+        redis = _FakeRedis()
+        worker_a = KeyedLimiter("distill", 1, redis=redis, lease_s=120)
+        worker_b = KeyedLimiter("distill", 1, redis=redis, lease_s=120)
+
+        async with worker_a.hold("t-1"):
+            assert redis.ttls == {"insight:limit:distill:t-1": 120}
+            with pytest.raises(LimitExceeded):
+                async with worker_b.hold("t-1"):
+                    pass
+            assert redis.values["insight:limit:distill:t-1"] == 1
+            assert len(worker_b) == 0
+
+        assert redis.values == {}
+        async with worker_b.hold("t-1"):
+            pass
+
+    async def test_redis_failure_falls_back_to_local(self):
+        limiter = KeyedLimiter("distill", 1, redis=_FakeRedis(fail=True))
+        async with limiter.hold("t-1"):
+            with pytest.raises(LimitExceeded):
+                async with limiter.hold("t-1"):
+                    pass
+        assert len(limiter) == 0
@@ -9,6 +9,9 @@ from services.knowledge_service import (
     get_prerequisite_chain,
     get_knowledge_points_for_weakness,
     get_related_knowledge_points,
+    compile_knowledge_graph,
+    get_knowledge_graph,
+    get_unlocked_knowledge_points,
 )
 
 
@@ -211,3 +214,92 @@ class TestGetRelatedKnowledgePoints:
         """Should return empty for non-existent KP."""
         related = get_related_knowledge_points("DSE-ENG-U5-XX-99")
         assert related == []
+
+
+def _registry(edges: dict[str, list[str]]) -> dict:
+    return {
+        "subject": "Test",
+        "level": "DSE",
+        "units": [{
+            "id": "U1",
+            "name": "Unit One",
+            "knowledgePoints": [
+                {"id": kp_id, "name": kp_id, "prerequisites": prereqs}
+                for kp_id, prereqs in edges.items()
+            ],
+        }],
+    }
+
+
+class TestKnowledgeGraph:
+    """Tests for the compiled knowledge graph."""
+
+    def test_graph_is_shared(self):
+        """Should compile each registry once."""
+        assert get_knowledge_graph("English") is get_knowledge_graph("English")
+        assert get_knowledge_point("DSE-ENG-U5-RC-01") is get_knowledge_point("DSE-ENG-U5-RC-01")
+
+    def test_closure_orders_prerequisites_first(self):
+        """Should list transitive prerequisites before dependents."""
+        graph = compile_knowledge_graph(_registry({
+            "A": [], "B": ["A"], "C": ["B"], "D": ["C", "A"],
+        }))
+
+        assert graph.closures["D"] == ("A", "B", "C", "D")
+        assert graph.unlocks["A"] == ("B", "D")
+
+    def test_cycle_detected_and_skipped(self):
+        """Should terminate and record cyclic prerequisite edges."""
+        graph = compile_knowledge_graph(_registry({
+            "A": ["C"], "B": ["A"], "C": ["B"],
+        }))
+
+        assert graph.cycles == (("B", "A"),)
+        assert graph.closures["A"] == ("B", "C", "A")
+        assert graph.closures["C"] == ("B", "C")
+        assert graph.closures["B"] == ("B",)
+
+    def test_unit_lookup_by_name(self):
+        """Should resolve units by id or name."""
+        graph = compile_knowledge_graph(_registry({"A": [], "B": []}))
+        assert graph.unit_ids("Unit One") == graph.unit_ids("U1") == ("A", "B")
+
+    def test_chain_matches_recursive_walk(self):
+        """Should match a naive recursive walk for every registry entry."""
+
+        def naive(kp_id, graph, visited, out):
+            if kp_id in visited or kp_id not in graph:
+                return
+            visited.add(kp_id)
+            for p in graph.nodes[kp_id].prerequisites:
+                naive(p, graph, visited, out)
+            out.append(kp_id)
+
+        for subject in ("English", "Math", "Chinese", "ICT"):
+            graph = get_knowledge_graph(subject)
+            for kp_id in graph.nodes:
+                expected: list[str] = []
+                naive(kp_id, graph, set(), expected)
+                assert [kp.id for kp in get_prerequisite_chain(kp_id)] == expected
+
+
+class TestUnlockedKnowledgePoints:
+    """Tests for reverse prerequisite lookups."""
+
+    def test_direct_unlocks(self):
+        """RC-01 is a prerequisite of RC-02."""
+        ids = [kp.id for kp in get_unlocked_knowledge_points("DSE-ENG-U5-RC-01")]
+        assert "DSE-ENG-U5-RC-02" in ids
+        assert "DSE-ENG-U5-RC-01" not in ids
+
+    def test_transitive_is_superset(self):
+        """Transitive unlocks include direct ones."""
+        direct = {kp.id for kp in get_unlocked_knowledge_points("DSE-ENG-U5-RC-01")}
+        transitive = {
+            kp.id for kp in get_unlocked_knowledge_points("DSE-ENG-U5-RC-01", transitive=True)
+        }
+        assert direct <= transitive
+
+    def test_unknown_id(self):
+        """Should return empty for unknown ids."""
+        assert get_unlocked_knowledge_points("DSE-ENG-U5-XX-99") == []
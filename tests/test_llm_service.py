@@ -0,0 +1,230 @@
+"""Tests for services/llm_service.py against a local mock completion server."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import socket
+import threading
+import time
+
+import litellm
+import pytest
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from services import concurrency, llm_service
+from services.llm_service import LLMService
+from services.metrics import get_metrics_collector
+
+DELAY = 0.3
+MODEL = "openai/mock-model"
+
+
+class _MockOpenAI:
+    """OpenAI-compatible /v1/chat/completions that sleeps before answering."""
+
+    def __init__(self):
+        self.inflight = 0
+        self.max_inflight = 0
+        self.requests: list[dict] = []
+
+    def app(self) -> Starlette:
+        return Starlette(routes=[Route("/v1/chat/completions", self.completions, methods=["POST"])])
+
+    async def completions(self, request: Request):
+        body = await request.json()
+        self.requests.append(body)
+        self.inflight += 1
+        self.max_inflight = max(self.max_inflight, self.inflight)
+        try:
+            await asyncio.sleep(DELAY)
+        finally:
+            self.inflight -= 1
+        reply = f"echo: {body['messages'][-1]['content']}"
+        if body.get("stream"):
+            return StreamingResponse(self._sse(reply), media_type="text/event-stream")
+        return JSONResponse({
+            "id": "chatcmpl-1",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": "mock-model",
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": reply},
+                "finish_reason": "stop",
+            }],
+            "usage": {
+                "prompt_tokens": 12,
+                "completion_tokens": 3,
+                "total_tokens": 15,
+                "prompt_tokens_details": {"cached_tokens": 8},
+            },
+        })
+
+    async def _sse(self, reply: str):
+        for word in reply.split(" "):
+            chunk = {
+                "id": "chatcmpl-1",
+                "object": "chat.completion.chunk",
+                "created": int(time.time()),
+                "model": "mock-model",
+                "choices": [{"index": 0, "delta": {"content": word + " "}, "finish_reason": None}],
+            }
+            yield f"data: {json.dumps(chunk)}\n\n"
+            await asyncio.sleep(0.01)
+        final = {
+            "id": "chatcmpl-1",
+            "object": "chat.completion.chunk",
+            "created": int(time.time()),
+            "model": "mock-model",
+            "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+        }
+        yield f"data: {json.dumps(final)}\n\n"
+        yield "data: [DONE]\n\n"
+
+
+@pytest.fixture(scope="module")
+def mock_server():
+    server_state = _MockOpenAI()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(("127.0.0.1", 0))
+    port = sock.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(server_state.app(), log_level="warning"))
+    thread = threading.Thread(target=server.run, kwargs={"sockets": [sock]}, daemon=True)
+    thread.start()
+    deadline = time.time() + 10
+    while not server.started and time.time() < deadline:
+        time.sleep(0.02)
+    server_state.api_base = f"http://127.0.0.1:{port}/v1"
+    yield server_state
+    server.should_exit = True
+    thread.join(timeout=5)
+
+
+@pytest.fixture
+async def server(mock_server, monkeypatch):
+    mock_server.max_inflight = 0
+    mock_server.requests.clear()
+    get_metrics_collector().reset()
+    # Fresh semaphore / pool bound to this test's event loop
+    monkeypatch.setattr(concurrency, "_llm_semaphore", None)
+    monkeypatch.setattr(litellm, "aclient_session", None)
+    yield mock_server
+    await llm_service.close_llm_http_session()
+
+
+def _service() -> LLMService:
+    return LLMService(model=MODEL)
+
+
+def _call_kwargs(server) -> dict:
+    return {"api_base": server.api_base, "api_key": "sk-test"}
+
+
+class TestChat:
+    async def test_returns_parsed_response_and_records_metrics(self, server):
+        result = await _service().chat([{"role": "user", "content": "hi"}], **_call_kwargs(server))
+
+        assert result["content"] == "echo: hi"
+        assert result["finish_reason"] == "stop"
+        assert result["usage"] == {"input_tokens": 12, "output_tokens": 3}
+
+        snapshot = get_metrics_collector().snapshot()
+        assert snapshot["llm_calls"][MODEL]["status_breakdown"] == {"ok": 1}
+        assert snapshot["prompt_cache"]["llm_service"]["cached_tokens"] == 8
+
+    async def test_system_prompt_prepended(self, server):
+        await _service().chat(
+            [{"role": "user", "content": "hi"}], system="be brief", **_call_kwargs(server),
+        )
+        assert server.requests[0]["messages"][0] == {"role": "system", "content": "be brief"}
+
+    async def test_concurrent_calls_overlap(self, server):
+        svc = _service()
+        results = await asyncio.gather(*(
+            svc.chat([{"role": "user", "content": f"q{i}"}], **_call_kwargs(server))
+            for i in range(5)
+        ))
+
+        assert [r["content"] for r in results] == [f"echo: q{i}" for i in range(5)]
+        # All five were in flight at once — serialized calls would peak at 1.
+        assert server.max_inflight == 5
+
+    async def test_event_loop_stays_responsive(self, server):
+        ticks = 0
+        stop = asyncio.Event()
+
+        async def ticker():
+            nonlocal ticks
+            while not stop.is_set():
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        tick_task = asyncio.create_task(ticker())
+        await _service().chat([{"role": "user", "content": "hi"}], **_call_kwargs(server))
+        stop.set()
+        await tick_task
+        # A blocking call would freeze the ticker for the whole DELAY.
+        assert ticks >= int(DELAY / 0.01) // 2
+
+    async def test_llm_semaphore_caps_concurrency(self, server, monkeypatch):
+        monkeypatch.setattr(concurrency, "_llm_semaphore", asyncio.Semaphore(2))
+        svc = _service()
+        await asyncio.gather(*(
+            svc.chat([{"role": "user", "content": f"q{i}"}], **_call_kwargs(server))
+            for i in range(4)
+        ))
+        assert server.max_inflight == 2
+
+    async def test_uses_shared_pooled_session(self, server):
+        await _service().chat([{"role": "user", "content": "hi"}], **_call_kwargs(server))
+        session = litellm.aclient_session
+        assert session is llm_service._http_session
+        await _service().chat([{"role": "user", "content": "again"}], **_call_kwargs(server))
+        assert litellm.aclient_session is session
+        await llm_service.close_llm_http_session()
+        assert litellm.aclient_session is None
+
+    async def test_error_recorded(self, server):
+        with pytest.raises(Exception):
+            await _service().chat(
+                [{"role": "user", "content": "hi"}],
+                api_base="http://127.0.0.1:9/v1", api_key="sk-test", num_retries=0, timeout=2,
+            )
+        snapshot = get_metrics_collector().snapshot()
+        assert snapshot["llm_calls"][MODEL]["status_breakdown"] == {"error": 1}
+
+
+class TestStream:
+    async def test_yields_deltas_then_done(self, server):
+        events = [
+            event async for event in _service().stream(
+                [{"role": "user", "content": "hello world"}], **_call_kwargs(server),
+            )
+        ]
+        deltas = [e["content"] for e in events if e["type"] == "delta"]
+        done = events[-1]
+
+        assert len(deltas) == 3
+        assert done["type"] == "done"
+        assert done["content"].strip() == "echo: hello world"
+        assert done["finish_reason"] == "stop"
+        assert server.requests[0]["stream"] is True
+
+    async def test_concurrent_streams_overlap(self, server):
+        svc = _service()
+
+        async def consume(i: int) -> str:
+            async for event in svc.stream([{"role": "user", "content": f"s{i}"}], **_call_kwargs(server)):
+                if event["type"] == "done":
+                    return event["content"]
+            return ""
+
+        contents = await asyncio.gather(*(consume(i) for i in range(4)))
+        assert [c.strip() for c in contents] == [f"echo: s{i}" for i in range(4)]
+        assert server.max_inflight == 4
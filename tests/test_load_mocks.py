@@ -0,0 +1,185 @@
+"""Tests for the load-test stand-ins (tests/load/mock_llm.py, mock_java.py)."""
+
+from __future__ import annotations
+
+import json
+import time
+
+import httpx
+import pytest
+from pydantic import BaseModel, Field
+from pydantic_ai import Agent
+
+from adapters.class_adapter import get_detail, list_assignments, list_classes
+from adapters.grade_adapter import get_course_grades, get_student_submissions
+from adapters.submission_adapter import get_submissions
+from agents.provider import create_model
+from config.llm_config import LLMConfig
+from config.settings import get_settings
+from services.java_client import JavaClient
+from services.llm_service import LLMService
+from tests.load.mock_backends import serve_in_thread
+from tests.load.mock_java import MockJavaConfig, MockJavaServer
+from tests.load.mock_llm import (
+    LatencyProfile,
+    MockLLMConfig,
+    MockLLMServer,
+    ToolCallRule,
+    example_from_schema,
+)
+
+_QUIZ_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "generate_quiz_questions",
+        "parameters": {
+            "type": "object",
+            "properties": {"topic": {"type": "string"}, "count": {"type": "integer", "minimum": 1}},
+            "required": ["topic", "count"],
+        },
+    },
+}
+
+
+def _llm(**config) -> MockLLMServer:
+    config.setdefault("first_token", LatencyProfile(ms=0))
+    config.setdefault("tokens_per_s", 0)
+    return MockLLMServer(MockLLMConfig(**config))
+
+
+async def _post(server: MockLLMServer, body: dict) -> httpx.Response:
+    transport = httpx.ASGITransport(app=server.app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://mock") as client:
+        return await client.post("/v1/chat/completions", json=body)
+
+
+def _chunks(resp: httpx.Response) -> list[dict]:
+    lines = [line[6:] for line in resp.text.splitlines() if line.startswith("data: ")]
+    assert lines[-1] == "[DONE]"
+    return [json.loads(line) for line in lines[:-1]]
+
+
+class TestMockLLM:
+    async def test_same_messages_same_reply(self):
+        server = _llm(seed=3, reply_tokens=12)
+        body = {"model": "m", "messages": [{"role": "user", "content": "hi"}]}
+        a, b = await _post(server, body), await _post(server, body)
+        other = await _post(server, {**body, "messages": [{"role": "user", "content": "yo"}]})
+
+        text = a.json()["choices"][0]["message"]["content"]
+        assert len(text.split()) == 12
+        assert b.json()["choices"][0]["message"]["content"] == text
+        assert other.json()["choices"][0]["message"]["content"] != text
+        assert server.requests == 3
+
+    async def test_stream_paced_by_tokens_per_s(self):
+        server = _llm(reply_tokens=10, tokens_per_s=100)
+        body = {
+            "model": "m",
+            "stream": True,
+            "stream_options": {"include_usage": True},
+            "messages": [{"role": "user", "content": "hi"}],
+        }
+        t0 = time.perf_counter()
+        resp = await _post(server, body)
+        elapsed = time.perf_counter() - t0
+
+        chunks = _chunks(resp)
+        words = [c["choices"][0]["delta"].get("content") for c in chunks if c["choices"]]
+        assert len([w for w in words if w]) == 10
+        assert chunks[0]["choices"][0]["delta"]["role"] == "assistant"
+        assert chunks[-1]["usage"]["completion_tokens"] == 10
+        assert elapsed >= 0.09
+        assert server.max_inflight == 1 and server.inflight == 0
+
+    async def test_tool_script_then_text_after_result(self):
+        server = _llm(tool_scripts=[ToolCallRule(pattern="quiz", tool="generate_quiz_questions")])
+        messages = [{"role": "user", "content": "make a quiz"}]
+        resp = await _post(server, {"model": "m", "stream": True, "tools": [_QUIZ_TOOL], "messages": messages})
+
+        chunks = _chunks(resp)
+        call = chunks[0]["choices"][0]["delta"]["tool_calls"][0]
+        assert call["function"]["name"] == "generate_quiz_questions"
+        assert json.loads(call["function"]["arguments"]) == {"topic": "mock", "count": 1}
+        assert chunks[-1]["choices"][0]["finish_reason"] == "tool_calls"
+
+        messages += [
+            {"role": "assistant", "tool_calls": [call]},
+            {"role": "tool", "tool_call_id": call["id"], "content": "{}"},
+        ]
+        resp = await _post(server, {"model": "m", "tools": [_QUIZ_TOOL], "messages": messages})
+        assert resp.json()["choices"][0]["finish_reason"] == "stop"
+
+    def test_example_from_schema(self):
+        class Item(BaseModel):
+            name: str = Field(min_length=6)
+            kind: str = Field(json_schema_extra={"enum": ["a", "b"]})
+
+        class Plan(BaseModel):
+            title: str
+            items: list[Item] = Field(min_length=2)
+            note: str | None = None
+
+        value = example_from_schema(Plan.model_json_schema())
+        assert Plan.model_validate(value).items[0].name == "mockxx"
+        assert value["items"][1]["kind"] == "a"
+
+
+class TestMockJava:
+    @pytest.fixture
+    async def client(self):
+        server = MockJavaServer(MockJavaConfig(latency_ms=0, students_per_class=40))
+        client = JavaClient(transport=httpx.ASGITransport(app=server.app()))
+        await client.start()
+        yield client
+        await client.close()
+
+    async def test_adapters_parse_fixtures(self, client):
+        classes = await list_classes(client, "test-teacher-002")
+        assert classes and classes[0].class_id == "class-hk-f1a"
+
+        detail = await get_detail(client, "test-teacher-002", "class-hk-f1a")
+        assert len(detail.students) == 40
+
+        assignments = await list_assignments(client, "test-teacher-002", "class-hk-f1a")
+        assignment = assignments[0]
+        assert assignment.max_score == 100
+
+        submissions = await get_submissions(client, "test-teacher-002", assignment.assignment_id)
+        assert len(submissions.scores) == 40
+        assert all(40 <= s <= 100 for s in submissions.scores)
+
+    async def test_scores_deterministic_across_endpoints(self, client):
+        submissions = await get_submissions(client, "t", "a-001")
+        first = submissions.submissions[0]
+        grades = await get_student_submissions(client, "t", first.student_id)
+        history = await get_course_grades(client, first.student_id, "class-hk-f1a")
+        a001 = [g.score for g in grades.grades if g.assignment_id == "a-001"]
+        assert a001 == [first.score]
+        assert first.score in [g.score for g in history.grades]
+
+
+class TestMockRouting:
+    @pytest.fixture
+    def mock_url(self, monkeypatch):
+        server = MockLLMServer(MockLLMConfig(first_token=LatencyProfile(ms=0), tokens_per_s=0, reply_tokens=5))
+        uvicorn_server, port = serve_in_thread(server.app())
+        monkeypatch.setattr(get_settings(), "llm_mock_base_url", f"http://127.0.0.1:{port}/v1")
+        yield server
+        uvicorn_server.should_exit = True
+
+    async def test_agent_structured_output_via_final_result(self, mock_url):
+        class Plan(BaseModel):
+            title: str
+            steps: list[str]
+
+        agent = Agent(create_model("dashscope/qwen3-max"), output_type=Plan)
+        result = await agent.run("plan something")
+        assert result.output == Plan(title="mock", steps=["mock"])
+        assert mock_url.requests == 1
+
+    async def test_llm_service_streams_from_mock(self, mock_url):
+        service = LLMService(LLMConfig(model="dashscope/qwen-flash"))
+        events = [e async for e in service.stream([{"role": "user", "content": "hi"}])]
+        assert events[-1]["type"] == "done"
+        assert len(events[-1]["content"].split()) == 5
@@ -0,0 +1,193 @@
+"""Tests for services/media_cache.py (TTS + image result caching)."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from services import media_cache
+from services.media_cache import (
+    DiskMediaCache,
+    MediaResultCache,
+    media_cache_key,
+    normalize_text,
+)
+from services.metrics import get_metrics_collector
+from tools import tts_tools, volcengine_media
+
+
+class _FakeJava:
+    def __init__(self):
+        self.calls: list[dict] = []
+
+    async def post(self, path, json_body=None):
+        self.calls.append(json_body)
+        n = len(self.calls)
+        return {"data": {
+            "taskId": f"tts-{n}",
+            "audioUrl": f"https://oss.test/tts-{n}.mp3",
+            "duration": 3,
+            "title": json_body["title"],
+        }}
+
+
+class _FakeArkImages:
+    def __init__(self, delay: float = 0.0):
+        self.calls: list[dict] = []
+        self.delay = delay
+        self.images = SimpleNamespace(generate=self._generate)
+
+    async def _generate(self, **kwargs):
+        self.calls.append(kwargs)
+        await asyncio.sleep(self.delay)
+        return SimpleNamespace(data=[SimpleNamespace(url=f"https://ark.test/{len(self.calls)}.png")])
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    fresh = MediaResultCache(max_size=64)
+    monkeypatch.setattr(media_cache, "_media_cache", fresh)
+    get_metrics_collector().reset()
+    return fresh
+
+
+@pytest.fixture
+def java(monkeypatch):
+    fake = _FakeJava()
+    monkeypatch.setattr(tts_tools, "_get_client", lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def ark(monkeypatch):
+    fake = _FakeArkImages(delay=0.02)
+    monkeypatch.setattr(volcengine_media, "_get_ark_client", lambda: fake)
+    return fake
+
+
+class TestKeys:
+    def test_normalization_ignores_blank_noise(self):
+        assert normalize_text("  Hello   world\t\n\n  next  ") == "Hello world\nnext"
+        # NFC: "é" precomposed vs e + combining accent
+        assert normalize_text("caf\u00e9") == normalize_text("cafe\u0301")
+
+    def test_key_is_order_independent_and_input_sensitive(self):
+        a = media_cache_key("tts", {"text": "hi", "voice": "v1"})
+        assert a == media_cache_key("tts", {"voice": "v1", "text": "hi"})
+        assert a != media_cache_key("tts", {"text": "hi", "voice": "v2"})
+        assert a != media_cache_key("image", {"text": "hi", "voice": "v1"})
+        assert a.startswith("tts:")
+
+
+class TestTTSCache:
+    async def test_repeat_request_served_from_cache(self, cache, java):
+        first = await tts_tools.synthesize_speech(text="Good  morning, class.", title="Lesson 1")
+        second = await tts_tools.synthesize_speech(text="Good morning, class. ", title="Lesson 2")
+
+        assert len(java.calls) == 1
+        assert second["audio_url"] == first["audio_url"]
+        assert second["cached"] is True and "cached" not in first
+        assert second["title"] == "Lesson 2"
+
+        rates = get_metrics_collector().get_counter_rates("media_cache_tts")
+        assert rates == {"miss": 0.5, "hit": 0.5}
+
+    async def test_different_voice_or_speed_misses(self, cache, java):
+        await tts_tools.synthesize_speech(text="hello")
+        await tts_tools.synthesize_speech(text="hello", voice="longwan")
+        await tts_tools.synthesize_speech(text="hello", speed=1.2)
+        await tts_tools.synthesize_speech(text="hello", language="ZH-cn")
+        assert len(java.calls) == 3
+
+    async def test_errors_are_not_cached(self, cache, monkeypatch):
+        calls = []
+
+        class _Down:
+            async def post(self, path, json_body=None):
+                calls.append(path)
+                raise RuntimeError("java down")
+
+        monkeypatch.setattr(tts_tools, "_get_client", lambda: _Down())
+        for _ in range(2):
+            result = await tts_tools.synthesize_speech(text="hello")
+            assert result["status"] == "error"
+        assert len(calls) == 2
+
+    async def test_use_cache_false_bypasses(self, cache, java):
+        await tts_tools.synthesize_speech(text="hello")
+        await tts_tools.synthesize_speech(text="hello", use_cache=False)
+        assert len(java.calls) == 2
+
+    async def test_disabled_by_setting(self, cache, java, monkeypatch):
+        from config.settings import get_settings
+
+        monkeypatch.setattr(get_settings(), "media_cache_enabled", False)
+        await tts_tools.synthesize_speech(text="hello")
+        await tts_tools.synthesize_speech(text="hello")
+        assert len(java.calls) == 2
+
+
+class TestImageCache:
+    async def test_concurrent_identical_prompts_coalesce(self, cache, ark):
+        results = await asyncio.gather(*(
+            volcengine_media.generate_image(prompt="A red  apple", size="1024X1024", seed=7)
+            for _ in range(5)
+        ))
+        assert len(ark.calls) == 1
+        assert {r["image_url"] for r in results} == {"https://ark.test/1.png"}
+        counter = get_metrics_collector().get_counter("media_cache_image")
+        assert counter == {"miss": 1, "coalesced": 4}
+
+        again = await volcengine_media.generate_image(prompt="A red apple", seed=7)
+        assert again["cached"] is True and len(ark.calls) == 1
+
+    async def test_seed_is_part_of_key(self, cache, ark):
+        await volcengine_media.generate_image(prompt="apple", seed=1)
+        await volcengine_media.generate_image(prompt="apple", seed=2)
+        await volcengine_media.generate_image(prompt="apple", seed=1)
+        await volcengine_media.generate_image(prompt="apple", seed=0)
+        await volcengine_media.generate_image(prompt="apple", seed=0)
+        assert len(ark.calls) == 3
+        assert ark.calls[-1]["seed"] == 0
+
+    async def test_random_seed_not_replayed(self, cache, ark):
+        results = await asyncio.gather(*(
+            volcengine_media.generate_image(prompt="apple") for _ in range(3)
+        ))
+        assert len(ark.calls) == 1 and len({r["image_url"] for r in results}) == 1
+
+        again = await volcengine_media.generate_image(prompt="apple")
+        assert "cached" not in again and len(ark.calls) == 2
+
+
+class TestDiskBackend:
+    async def test_shared_across_workers_until_expiry(self, tmp_path):
+        now = [1000.0]
+        disk = DiskMediaCache(str(tmp_path), clock=lambda: now[0])
+        calls = []
+
+        async def produce():
+            calls.append(1)
+            return {"status": "ok", "audio_url": "https://oss.test/a.mp3"}
+
+        def ok(result):
+            return bool(result.get("audio_url"))
+
+        worker_a = MediaResultCache(backend=disk)
+        worker_b = MediaResultCache(backend=disk)
+        await worker_a.get_or_create("tts", {"text": "x"}, produce, ttl_s=60, cacheable=ok)
+        hit = await worker_b.get_or_create("tts", {"text": "x"}, produce, ttl_s=60, cacheable=ok)
+        assert hit["cached"] is True and len(calls) == 1
+
+        now[0] += 61
+        worker_c = MediaResultCache(backend=disk)
+        await worker_c.get_or_create("tts", {"text": "x"}, produce, ttl_s=60, cacheable=ok)
+        assert len(calls) == 2
+
+    async def test_corrupt_file_is_a_miss(self, tmp_path):
+        disk = DiskMediaCache(str(tmp_path))
+        key = media_cache_key("tts", {"text": "x"})
+        (tmp_path / (key.replace(":", "_") + ".json")).write_text("{not json")
+        assert await disk.get(key) is None
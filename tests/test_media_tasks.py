@@ -0,0 +1,241 @@
+"""Tests for services/media_tasks.py and async video generation."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from api.media import router as media_router
+from services import media_tasks
+from services.datastream import DataStreamEncoder
+from services.media_tasks import MediaTaskService
+from services.stream_adapter import _emit_semantic_events
+from tools import volcengine_media
+
+
+class _FakeArk:
+    """Stand-in AsyncArk: tasks succeed (or fail) after a number of polls."""
+
+    def __init__(self, polls_needed: int = 2, *, fail: bool = False, flaky: int = 0):
+        self.polls_needed = polls_needed
+        self.fail = fail
+        self.flaky = flaky  # leading get() calls that raise
+        self.created: list[dict] = []
+        self.gets: list[str] = []
+        self.content_generation = SimpleNamespace(
+            tasks=SimpleNamespace(create=self._create, get=self._get),
+        )
+
+    async def _create(self, **kwargs):
+        self.created.append(kwargs)
+        return SimpleNamespace(id=f"cgt-{len(self.created)}")
+
+    async def _get(self, *, task_id):
+        self.gets.append(task_id)
+        if self.flaky:
+            self.flaky -= 1
+            raise ConnectionError("ark unavailable")
+        polls = self.gets.count(task_id)
+        if polls < self.polls_needed:
+            return SimpleNamespace(status="running", content=None, error=None)
+        if self.fail:
+            return SimpleNamespace(
+                status="failed", content=None,
+                error=SimpleNamespace(message="content policy", code="E1"),
+            )
+        return SimpleNamespace(
+            status="succeeded",
+            content=SimpleNamespace(video_url=f"https://cdn.test/{task_id}.mp4"),
+            error=None,
+        )
+
+
+@pytest.fixture
+def service(monkeypatch):
+    svc = MediaTaskService(
+        volcengine_media.get_video_task,
+        poll_interval=0.01,
+        max_poll_interval=0.02,
+        max_wait=1.0,
+    )
+    monkeypatch.setattr(media_tasks, "_service", svc)
+    yield svc
+    # Loop task is bound to this test's event loop
+    if svc._loop_task is not None:
+        svc._loop_task.cancel()
+
+
+@pytest.fixture
+def ark(monkeypatch):
+    def install(fake: _FakeArk) -> _FakeArk:
+        monkeypatch.setattr(volcengine_media, "_get_ark_client", lambda: fake)
+        return fake
+
+    return install
+
+
+class TestMediaTaskService:
+    async def test_start_returns_before_completion(self, service, ark):
+        fake = ark(_FakeArk(polls_needed=3))
+        result = await volcengine_media.start_video_generation(prompt="a cat", duration=5)
+
+        assert result["status"] == "ok"
+        task = service.get(result["task_id"])
+        assert task.status == "running" and fake.gets == []
+        assert fake.created[0]["duration"] == 5
+
+        task = await service.wait(result["task_id"], timeout=2)
+        assert task.status == "succeeded"
+        assert task.result["video_url"] == "https://cdn.test/cgt-1.mp4"
+        assert task.polls == 3
+
+    async def test_one_loop_polls_all_pending_tasks(self, service, ark):
+        fake = ark(_FakeArk(polls_needed=2))
+        ids = [
+            (await volcengine_media.start_video_generation(prompt=f"clip {i}"))["task_id"]
+            for i in range(3)
+        ]
+        loop_task = service._loop_task
+        done = await asyncio.gather(*(service.wait(i, timeout=2) for i in ids))
+
+        assert [t.status for t in done] == ["succeeded"] * 3
+        assert service._loop_task is loop_task
+        assert sorted(set(fake.gets)) == sorted(ids)
+        assert service.pending_count == 0
+
+    async def test_poll_interval_backs_off_to_max(self, service, ark):
+        ark(_FakeArk(polls_needed=6))
+        result = await volcengine_media.start_video_generation(prompt="slow")
+        task = await service.wait(result["task_id"], timeout=2)
+        assert task.poll_interval == pytest.approx(0.02)
+
+    async def test_failed_task_reports_reason(self, service, ark):
+        ark(_FakeArk(polls_needed=1, fail=True))
+        result = await volcengine_media.start_video_generation(prompt="blocked")
+        task = await service.wait(result["task_id"], timeout=2)
+        assert task.status == "failed"
+        assert "content policy" in task.error
+
+    async def test_transient_status_errors_are_retried(self, service, ark):
+        ark(_FakeArk(polls_needed=1, flaky=2))
+        result = await volcengine_media.start_video_generation(prompt="retry")
+        task = await service.wait(result["task_id"], timeout=2)
+        assert task.status == "succeeded"
+        assert task.polls == 3
+
+    async def test_times_out_after_max_wait(self, service, ark, monkeypatch):
+        ark(_FakeArk(polls_needed=10_000))
+        monkeypatch.setattr(service, "_max_wait", 0.05)
+        result = await volcengine_media.start_video_generation(prompt="never")
+        task = await service.wait(result["task_id"], timeout=2)
+        assert task.status == "failed"
+        assert "timed out" in task.error
+
+    async def test_completion_callback_runs_once(self, service, ark):
+        ark(_FakeArk(polls_needed=1))
+        seen = []
+        result = await volcengine_media.start_video_generation(
+            prompt="cb", on_complete=lambda t: seen.append((t.task_id, t.status)),
+        )
+        await service.wait(result["task_id"], timeout=2)
+        assert seen == [(result["task_id"], "succeeded")]
+
+    async def test_blocking_generate_video_uses_service(self, service, ark):
+        ark(_FakeArk(polls_needed=2))
+        result = await volcengine_media.generate_video(prompt="wrapper")
+        assert result["status"] == "ok"
+        assert result["video_url"] == "https://cdn.test/cgt-1.mp4"
+
+    async def test_create_error_is_not_registered(self, service, ark):
+        class _Broken(_FakeArk):
+            async def _create(self, **kwargs):
+                raise ValueError("quota exceeded")
+
+        ark(_Broken())
+        result = await volcengine_media.start_video_generation(prompt="x")
+        assert result["status"] == "error"
+        assert service.pending_count == 0
+
+
+class TestVideoTool:
+    async def test_tool_returns_handle_and_saves_artifact_on_completion(
+        self, service, ark, monkeypatch,
+    ):
+        from tools import native_tools
+
+        ark(_FakeArk(polls_needed=1))
+        saved = []
+        monkeypatch.setattr(
+            native_tools, "_save_artifact",
+            lambda **kw: saved.append(kw) or {"artifact_id": "art-1", "version": 1},
+        )
+        deps = SimpleNamespace(conversation_id="conv-v", _called_gen_tools=set())
+        out = await native_tools.generate_video(SimpleNamespace(deps=deps), prompt="waves")
+
+        assert out["status"] == "ok" and out["task_status"] == "running"
+        assert out["events_url"] == f"/api/media/tasks/{out['media_task_id']}/events"
+        assert saved == []
+
+        task = await service.wait(out["media_task_id"], timeout=2)
+        assert saved[0]["conversation_id"] == "conv-v"
+        assert task.result["artifact_id"] == "art-1"
+
+    def test_semantic_event_for_task_handle(self):
+        lines = _emit_semantic_events(DataStreamEncoder(), {
+            "status": "ok",
+            "media_task_id": "cgt-9",
+            "task_status": "running",
+            "events_url": "/api/media/tasks/cgt-9/events",
+        })
+        payload = json.loads(lines[0].removeprefix("data: "))
+        assert payload["type"] == "data-media-task"
+        assert payload["data"]["taskId"] == "cgt-9"
+
+
+class TestMediaTaskEndpoints:
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.include_router(media_router)
+        return httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test")
+
+    async def test_status_endpoint(self, service, ark, client):
+        ark(_FakeArk(polls_needed=2))
+        resp = await client.post("/api/media/generate-video", json={"prompt": "sunrise"})
+        assert resp.status_code == 202
+        task_id = resp.json()["taskId"]
+        assert resp.json()["status"] == "running"
+
+        await service.wait(task_id, timeout=2)
+        resp = await client.get(f"/api/media/tasks/{task_id}")
+        assert resp.json()["status"] == "succeeded"
+        assert resp.json()["result"]["video_url"].endswith(".mp4")
+
+    async def test_unknown_task_404(self, service, client):
+        resp = await client.get("/api/media/tasks/nope")
+        assert resp.status_code == 404
+        resp = await client.get("/api/media/tasks/nope/events")
+        assert resp.status_code == 404
+
+    async def test_events_stream_until_file_ready(self, service, ark, client):
+        ark(_FakeArk(polls_needed=2))
+        result = await volcengine_media.start_video_generation(prompt="stream")
+
+        resp = await client.get(f"/api/media/tasks/{result['task_id']}/events")
+        events = [
+            json.loads(line.removeprefix("data: "))
+            for line in resp.text.split("\n\n")
+            if line.startswith("data: {")
+        ]
+        types = [e["type"] for e in events]
+        assert types[0] == "start" and types[-1] == "finish"
+        assert types[-2] == "data-file-ready"
+        task_events = [e for e in events if e["type"] == "data-media-task"]
+        assert task_events[0]["data"]["status"] == "running"
+        assert task_events[-1]["data"]["status"] == "succeeded"
+        assert resp.text.endswith("data: [DONE]\n\n")
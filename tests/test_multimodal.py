@@ -0,0 +1,278 @@
+"""Tests for services/multimodal.py and services/file_download.py."""
+
+import asyncio
+import os
+import time
+
+import httpx
+import pytest
+from pydantic_ai.messages import ImageUrl
+
+from config.settings import get_settings
+from models.conversation import Attachment
+from services import file_download, multimodal
+from services.file_download import (
+    DownloadIntegrityError,
+    DownloadTooLargeError,
+    download_to_file,
+    download_to_tempfile,
+)
+from services.metrics import get_metrics_collector
+
+
+class _FileServer:
+    """Stand-in OSS bucket: serves text files with an artificial delay."""
+
+    def __init__(self, files: dict[str, bytes], delay: float = 0.0):
+        self.files = files
+        self.delay = delay
+        self.downloads: list[str] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        name = request.url.path.lstrip("/")
+        self.downloads.append(name)
+        await asyncio.sleep(self.delay)
+        if name not in self.files:
+            return httpx.Response(404)
+        return httpx.Response(200, content=self.files[name])
+
+
+@pytest.fixture
+def oss(monkeypatch):
+    server = _FileServer({
+        "a.txt": b"alpha notes",
+        "b.txt": b"beta notes",
+        "copy.txt": b"alpha notes",
+        "big.txt": b"x" * 5000,
+    })
+    monkeypatch.setattr(
+        file_download, "_client", httpx.AsyncClient(transport=httpx.MockTransport(server))
+    )
+    multimodal.clear_attachment_caches()
+    get_metrics_collector().reset()
+    yield server
+    multimodal.clear_attachment_caches()
+
+
+@pytest.fixture
+def url_calls(monkeypatch):
+    """Record Java URL refreshes; signed URL = stand-in bucket path."""
+    calls: list[str] = []
+
+    async def get_file_url(file_id):
+        calls.append(file_id)
+        await asyncio.sleep(0.02)
+        return f"https://oss.test/{file_id}"
+
+    import services.java_file_client as jfc
+
+    monkeypatch.setattr(jfc, "get_file_url", get_file_url)
+    return calls
+
+
+class _FlakyStream(httpx.AsyncByteStream):
+    """Body that drops the connection after *cut* bytes."""
+
+    def __init__(self, data: bytes, cut: int):
+        self.data = data
+        self.cut = cut
+
+    async def __aiter__(self):
+        yield self.data[:self.cut]
+        raise httpx.ReadError("connection reset")
+
+
+class _RangeServer:
+    """Serves one blob; the first response is cut off mid-body."""
+
+    def __init__(self, data: bytes, *, cut: int, ranges: bool = True, headers=None):
+        self.data = data
+        self.cut = cut
+        self.ranges = ranges
+        self.headers = headers or {}
+        self.range_headers: list[str | None] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        range_header = request.headers.get("Range")
+        self.range_headers.append(range_header)
+        if range_header and self.ranges:
+            start = int(range_header.removeprefix("bytes=").rstrip("-"))
+            body = self.data[start:]
+            headers = {
+                **self.headers,
+                "Content-Range": f"bytes {start}-{len(self.data) - 1}/{len(self.data)}",
+            }
+            return httpx.Response(206, headers=headers, content=body)
+        headers = {**self.headers, "Content-Length": str(len(self.data))}
+        if len(self.range_headers) == 1:
+            return httpx.Response(200, headers=headers, stream=_FlakyStream(self.data, self.cut))
+        return httpx.Response(200, headers=headers, content=self.data)
+
+
+@pytest.fixture
+def range_server(monkeypatch):
+    def install(server: _RangeServer) -> _RangeServer:
+        monkeypatch.setattr(
+            file_download, "_client", httpx.AsyncClient(transport=httpx.MockTransport(server))
+        )
+        return server
+
+    monkeypatch.setattr(file_download, "RETRY_BASE_DELAY", 0.0)
+    return install
+
+
+def _doc(file_id: str, filename: str | None = None) -> Attachment:
+    return Attachment(
+        file_id=file_id,
+        url=f"https://stale.test/{file_id}",
+        mime_type="text/plain",
+        filename=filename or file_id,
+    )
+
+
+class TestDownload:
+    async def test_streams_to_disk_with_checksum(self, oss):
+        import hashlib
+
+        result = await download_to_tempfile("https://oss.test/a.txt", suffix=".txt")
+        try:
+            assert result.size == len(b"alpha notes")
+            assert result.sha256 == hashlib.sha256(b"alpha notes").hexdigest()
+            with open(result.path, "rb") as f:
+                assert f.read() == b"alpha notes"
+        finally:
+            os.unlink(result.path)
+
+    async def test_size_limit_removes_partial_file(self, oss, tmp_path, monkeypatch):
+        monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+        with pytest.raises(DownloadTooLargeError):
+            await download_to_tempfile("https://oss.test/big.txt", max_bytes=1000)
+        assert list(tmp_path.iterdir()) == []
+
+    async def test_http_error_raises(self, oss):
+        with pytest.raises(httpx.HTTPStatusError):
+            await download_to_tempfile("https://oss.test/missing.txt")
+
+
+class TestResumableDownload:
+    DATA = bytes(range(256)) * 1000
+
+    async def test_resumes_with_range_after_reset(self, range_server, tmp_path):
+        import hashlib
+
+        server = range_server(_RangeServer(self.DATA, cut=70_000))
+        dest = tmp_path / "doc.pdf"
+        result = await download_to_file(
+            "https://oss.test/doc.pdf",
+            str(dest),
+            expected_sha256=hashlib.sha256(self.DATA).hexdigest(),
+        )
+        assert server.range_headers == [None, "bytes=70000-"]
+        assert dest.read_bytes() == self.DATA
+        assert result.size == len(self.DATA)
+
+    async def test_restarts_when_range_ignored(self, range_server, tmp_path):
+        server = range_server(_RangeServer(self.DATA, cut=70_000, ranges=False))
+        dest = tmp_path / "doc.pdf"
+        await download_to_file("https://oss.test/doc.pdf", str(dest))
+        assert server.range_headers == [None, "bytes=70000-"]
+        assert dest.read_bytes() == self.DATA
+
+    async def test_gives_up_after_max_retries(self, range_server, tmp_path):
+        server = range_server(_RangeServer(self.DATA, cut=70_000))
+        dest = tmp_path / "doc.pdf"
+        with pytest.raises(httpx.ReadError):
+            await download_to_file("https://oss.test/doc.pdf", str(dest), max_retries=0)
+        assert len(server.range_headers) == 1
+        assert not dest.exists()
+
+    async def test_sha256_mismatch_removes_file(self, range_server, tmp_path):
+        range_server(_RangeServer(self.DATA, cut=70_000))
+        dest = tmp_path / "doc.pdf"
+        with pytest.raises(DownloadIntegrityError, match="SHA-256"):
+            await download_to_file("https://oss.test/doc.pdf", str(dest), expected_sha256="0" * 64)
+        assert not dest.exists()
+
+    async def test_content_md5_verified(self, range_server, tmp_path):
+        import base64
+        import hashlib
+
+        bad_md5 = base64.b64encode(hashlib.md5(b"other").digest()).decode()
+        range_server(_RangeServer(self.DATA, cut=70_000, headers={"Content-MD5": bad_md5}))
+        with pytest.raises(DownloadIntegrityError, match="Content-MD5"):
+            await download_to_file("https://oss.test/doc.pdf", str(tmp_path / "doc.pdf"))
+
+        good_md5 = base64.b64encode(hashlib.md5(self.DATA).digest()).decode()
+        range_server(_RangeServer(self.DATA, cut=70_000, headers={"Content-MD5": good_md5}))
+        result = await download_to_file("https://oss.test/doc.pdf", str(tmp_path / "doc.pdf"))
+        assert result.size == len(self.DATA)
+
+    async def test_declared_size_over_limit_rejected_before_body(self, range_server, tmp_path):
+        server = range_server(_RangeServer(self.DATA, cut=70_000))
+        with pytest.raises(DownloadTooLargeError):
+            await download_to_file("https://oss.test/doc.pdf", str(tmp_path / "d"), max_bytes=1000)
+        assert len(server.range_headers) == 1
+
+
+class TestBuildUserContent:
+    async def test_no_attachments_returns_prompt(self):
+        assert await multimodal.build_user_content("hi", []) == "hi"
+
+    async def test_documents_download_concurrently(self, oss, url_calls):
+        oss.delay = 0.2
+        t0 = time.perf_counter()
+        prompt = await multimodal.build_user_content(
+            "question", [_doc("a.txt"), _doc("b.txt")],
+        )
+        elapsed = time.perf_counter() - t0
+
+        assert prompt == (
+            "[Attached file: a.txt]\nalpha notes\n\n"
+            "[Attached file: b.txt]\nbeta notes\n\nquestion"
+        )
+        assert sorted(url_calls) == ["a.txt", "b.txt"]
+        assert elapsed < 0.35  # ~one download, not the sum
+
+    async def test_resent_file_uses_cache(self, oss, url_calls):
+        await multimodal.build_user_content("q1", [_doc("a.txt")])
+        prompt = await multimodal.build_user_content("q2", [_doc("a.txt")])
+
+        assert "alpha notes" in prompt
+        assert oss.downloads == ["a.txt"]
+        assert url_calls == ["a.txt"]
+        assert get_metrics_collector().get_counter("attachment_cache") == {"miss": 1, "hit": 1}
+
+    async def test_same_content_different_id_skips_extraction(self, oss, url_calls):
+        await multimodal.build_user_content("q", [_doc("a.txt")])
+        await multimodal.build_user_content("q", [_doc("copy.txt")])
+
+        assert get_metrics_collector().get_counter("attachment_cache")["content_hit"] == 1
+
+    async def test_oversized_document_reported(self, oss, url_calls, monkeypatch):
+        monkeypatch.setattr(get_settings(), "attachment_max_bytes", 1000)
+        prompt = await multimodal.build_user_content("q", [_doc("big.txt"), _doc("a.txt")])
+
+        assert "[Attached file: big.txt — file too large]" in prompt
+        assert "alpha notes" in prompt
+
+    async def test_images_resolved_in_one_batch(self, oss, url_calls):
+        img = Attachment(file_id="img-1", url="https://stale.test/img-1", mime_type="image/png")
+        parts = await multimodal.build_user_content("look", [img, img, _doc("a.txt")])
+
+        assert url_calls.count("img-1") == 1
+        assert [p.url for p in parts if isinstance(p, ImageUrl)] == [
+            "https://oss.test/img-1", "https://oss.test/img-1",
+        ]
+        assert parts[-1].endswith("look")
+
+    async def test_refresh_failure_falls_back_to_attachment_url(self, oss, monkeypatch):
+        import services.java_file_client as jfc
+
+        async def failing(file_id):
+            return None
+
+        monkeypatch.setattr(jfc, "get_file_url", failing)
+        img = Attachment(file_id="img-2", url="https://stale.test/img-2", mime_type="image/png")
+        parts = await multimodal.build_user_content("look", [img])
+
+        assert parts[0].url == "https://stale.test/img-2"
@@ -60,8 +60,8 @@ def _make_test_agent(call_tools: list[str] | str = "all", custom_text: str | Non
     # Patch _create_agent to use TestModel
     original_create = agent._create_agent
 
-    def patched_create(toolsets, deps):
-        pydantic_agent = original_create(toolsets, deps)
+    def patched_create(toolsets, deps, **kwargs):
+        pydantic_agent = original_create(toolsets, deps, **kwargs)
         pydantic_agent._model = TestModel(
             call_tools=call_tools,
             custom_output_text=custom_text or "测试回复",
@@ -208,8 +208,8 @@ class TestBudgetEnforcement:
 
         original_create = agent._create_agent
 
-        def patched_create(toolsets, deps_arg):
-            pydantic_agent = original_create(toolsets, deps_arg)
+        def patched_create(toolsets, deps_arg, **kwargs):
+            pydantic_agent = original_create(toolsets, deps_arg, **kwargs)
             pydantic_agent._model = TestModel(call_tools=[], custom_output_text="ok")
 
             original_run = pydantic_agent.run
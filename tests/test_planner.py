@@ -5,7 +5,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 import pytest
 from pydantic_ai.models.test import TestModel
 
-from agents.planner import _planner_agent, generate_blueprint
+from agents.planner import _get_planner_agent, generate_blueprint
 from models.blueprint import (
     Blueprint,
     CapabilityLevel,
@@ -87,7 +87,7 @@ async def test_generate_blueprint_structure():
     """Test that generate_blueprint returns a valid Blueprint via TestModel."""
     test_model = TestModel(custom_output_args=_sample_blueprint_args())
 
-    result = await _planner_agent.run(
+    result = await _get_planner_agent().run(
         "Analyze class performance",
         model=test_model,
     )
@@ -102,7 +102,7 @@ async def test_generate_blueprint_three_layers():
     """Verify all three Blueprint layers are present and valid."""
     test_model = TestModel(custom_output_args=_sample_blueprint_args())
 
-    result = await _planner_agent.run(
+    result = await _get_planner_agent().run(
         "Analyze class performance",
         model=test_model,
     )
@@ -137,7 +137,7 @@ async def test_generate_blueprint_metadata():
     """Verify top-level metadata fields."""
     test_model = TestModel(custom_output_args=_sample_blueprint_args())
 
-    result = await _planner_agent.run(
+    result = await _get_planner_agent().run(
         "Analyze class performance",
         model=test_model,
     )
@@ -153,7 +153,7 @@ async def test_generate_blueprint_camel_case_output():
     """Verify the Blueprint serializes to camelCase for API output."""
     test_model = TestModel(custom_output_args=_sample_blueprint_args())
 
-    result = await _planner_agent.run(
+    result = await _get_planner_agent().run(
         "Analyze class performance",
         model=test_model,
     )
@@ -173,7 +173,7 @@ async def test_generate_blueprint_with_language():
     """Test Blueprint generation with language parameter via TestModel."""
     test_model = TestModel(custom_output_args=_sample_blueprint_args())
 
-    result = await _planner_agent.run(
+    result = await _get_planner_agent().run(
         "[Language: zh-CN]\n\nUser request: 分析 Form 1A 的考试成绩",
         model=test_model,
     )
@@ -191,7 +191,7 @@ async def test_generate_blueprint_with_language():
 
 
 def _mock_agent_run(bp_args: dict):
-    """Create a mock for _planner_agent.run that returns a Blueprint."""
+    """Create a mock for the planner agent's run that returns a Blueprint."""
     mock_bp = Blueprint(**bp_args)
     mock_result = MagicMock()
     mock_result.output = mock_bp
@@ -203,7 +203,7 @@ async def test_source_prompt_always_equals_user_prompt():
     """sourcePrompt is force-overwritten to user_prompt regardless of LLM output."""
     user_prompt = "Show me the math scores for 1B班"
 
-    with patch.object(_planner_agent, "run", _mock_agent_run(_sample_blueprint_args())):
+    with patch.object(_get_planner_agent(), "run", _mock_agent_run(_sample_blueprint_args())):
         bp, _ = await generate_blueprint(user_prompt)
 
     assert bp.source_prompt == user_prompt
@@ -217,7 +217,7 @@ async def test_source_prompt_overwrite_when_llm_rewrites():
 
     user_prompt = "分析 1A 班英语成绩"
 
-    with patch.object(_planner_agent, "run", _mock_agent_run(args)):
+    with patch.object(_get_planner_agent(), "run", _mock_agent_run(args)):
         bp, _ = await generate_blueprint(user_prompt)
 
     assert bp.source_prompt == user_prompt
@@ -232,7 +232,7 @@ async def test_source_prompt_set_when_llm_omits():
 
     user_prompt = "Generate a report for Form 2A"
 
-    with patch.object(_planner_agent, "run", _mock_agent_run(args)):
+    with patch.object(_get_planner_agent(), "run", _mock_agent_run(args)):
         bp, _ = await generate_blueprint(user_prompt)
 
     assert bp.source_prompt == user_prompt
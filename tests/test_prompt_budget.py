@@ -0,0 +1,132 @@
+"""Tests for services/prompt_budget.py — tool schema token budgeting."""
+
+from __future__ import annotations
+
+# Ensure native tools are registered
+import tools.native_tools  # noqa: F401
+
+from agents.native_agent import AgentDeps, NativeAgent
+from config.prompts.native_agent import SYSTEM_PROMPT
+from services.prompt_budget import (
+    estimate_tokens,
+    get_tool_cost,
+    plan_prompt_budget,
+)
+from tools.registry import ALL_TOOLSETS, ALWAYS_TOOLSETS, _registry, get_tools_raw
+
+
+class TestEstimateTokens:
+    def test_empty(self):
+        assert estimate_tokens("") == 0
+
+    def test_cjk_counts_per_character(self):
+        assert estimate_tokens("你好世界") == 4
+
+    def test_latin_roughly_four_chars_per_token(self):
+        assert estimate_tokens("a" * 40) == 10
+
+    def test_mixed_text(self):
+        assert estimate_tokens("生成 quiz") == 2 + 2
+
+
+class TestToolDescriptions:
+    def test_extended_is_full_docstring(self):
+        rt = _registry["generate_interactive_html"]
+        assert "InsightAI.chat" in rt.extended_description
+        assert rt.description == rt.extended_description.split("\n")[0]
+
+    def test_compact_override_is_much_shorter(self):
+        rt = _registry["generate_interactive_html"]
+        assert len(rt.compact_description) < len(rt.extended_description) / 4
+        # Essential API surface survives compaction
+        assert "InsightAI.chat" in rt.compact_description
+        assert "InsightAI.synthesize" in rt.compact_description
+
+    def test_args_section_excluded(self):
+        rt = _registry["generate_tts_audio"]
+        assert "Args:" not in rt.extended_description
+
+    def test_default_compact_is_first_paragraph(self):
+        rt = _registry["get_teacher_classes"]
+        assert rt.compact_description == "List all classes for the current teacher (SUMMARY ONLY)."
+
+
+class TestToolCost:
+    def test_cost_is_cached(self):
+        rt = _registry["generate_quiz_questions"]
+        assert get_tool_cost(rt) is get_tool_cost(rt)
+
+    def test_schema_tokens_included(self):
+        cost = get_tool_cost(_registry["generate_quiz_questions"])
+        assert cost.schema_tokens > 0
+        assert cost.extended_tokens >= cost.compact_tokens >= cost.schema_tokens
+
+
+class TestPlanPromptBudget:
+    def test_under_budget_keeps_extended(self):
+        tools = get_tools_raw(ALWAYS_TOOLSETS)
+        plan = plan_prompt_budget(tools, SYSTEM_PROMPT, 100_000)
+        assert plan.compacted == []
+        for rt in tools:
+            assert plan.descriptions[rt.name] == rt.extended_description
+
+    def test_budget_compacts_largest_savings_first(self):
+        tools = get_tools_raw(ALL_TOOLSETS)
+        unlimited = plan_prompt_budget(tools, SYSTEM_PROMPT, 0)
+        budget = unlimited.total_tokens - 100
+        plan = plan_prompt_budget(tools, SYSTEM_PROMPT, budget)
+        assert plan.compacted == ["generate_interactive_html"]
+        assert plan.total_tokens <= budget
+        assert not plan.over_budget
+
+    def test_never_drops_tools(self):
+        tools = get_tools_raw(ALL_TOOLSETS)
+        plan = plan_prompt_budget(tools, SYSTEM_PROMPT, 10)
+        assert set(plan.descriptions) == {rt.name for rt in tools}
+        assert plan.over_budget
+
+    def test_zero_budget_disables_compaction(self):
+        plan = plan_prompt_budget(get_tools_raw(ALL_TOOLSETS), SYSTEM_PROMPT, 0)
+        assert plan.compacted == []
+        assert not plan.over_budget
+
+    def test_forced_modes(self):
+        tools = get_tools_raw(ALL_TOOLSETS)
+        compact = plan_prompt_budget(tools, SYSTEM_PROMPT, 0, mode="compact")
+        extended = plan_prompt_budget(tools, SYSTEM_PROMPT, 10, mode="extended")
+        assert "generate_interactive_html" in compact.compacted
+        assert extended.compacted == []
+
+    def test_report_has_tokens_per_toolset(self):
+        plan = plan_prompt_budget(get_tools_raw(ALL_TOOLSETS), SYSTEM_PROMPT, 0)
+        report = plan.report()
+        assert set(report["toolset_tokens"]) == set(ALL_TOOLSETS)
+        assert report["total_tokens"] == report["system_tokens"] + report["tool_tokens"]
+
+
+class TestNativeAgentUsesBudget:
+    def test_agent_tools_use_compact_description(self, monkeypatch):
+        from config.settings import get_settings
+
+        monkeypatch.setattr(get_settings(), "prompt_tool_description_mode", "compact")
+        agent = NativeAgent()._create_agent(
+            list(ALL_TOOLSETS),
+            AgentDeps(teacher_id="t-1", conversation_id="c-1"),
+        )
+        toolset = agent.toolsets[-1]
+        tool = toolset.tools["generate_interactive_html"]
+        assert tool.description == _registry["generate_interactive_html"].compact_description
+
+    def test_speculative_promoted_tools_are_budgeted(self, monkeypatch):
+        from agents.native_agent import ToolsetSelection
+        from config.settings import get_settings
+
+        monkeypatch.setattr(get_settings(), "prompt_tool_description_mode", "compact")
+        agent = NativeAgent()._create_agent(
+            list(ALWAYS_TOOLSETS),
+            AgentDeps(teacher_id="t-1", conversation_id="c-1"),
+            selection=ToolsetSelection(toolsets=list(ALWAYS_TOOLSETS)),
+        )
+        # Not exposed yet, but a promotion must not ship the full docstring.
+        tool = agent.toolsets[-1].wrapped.tools["generate_interactive_html"]
+        assert tool.description == _registry["generate_interactive_html"].compact_description
@@ -0,0 +1,131 @@
+"""Tests for services/prompt_layout.py — prefix-stable prompt assembly."""
+
+from __future__ import annotations
+
+from types import SimpleNamespace
+
+from agents.native_agent import NativeAgent
+from config.prompts.block_compose import build_block_prompt_layout
+from config.prompts.native_agent import SYSTEM_PROMPT
+from models.blueprint import ComponentSlot, ComponentType
+from services.metrics import MetricsCollector
+from services.prompt_layout import (
+    PromptLayout,
+    cached_tokens_from_usage,
+    record_cache_usage,
+)
+
+
+class TestPromptLayout:
+    def test_static_segments_render_first(self):
+        layout = (
+            PromptLayout()
+            .dynamic("ctx", "dynamic-1")
+            .static("base", "static-1")
+            .dynamic("more", "dynamic-2")
+            .static("rules", "static-2")
+        )
+        assert layout.render() == "static-1\n\nstatic-2\n\ndynamic-1\n\ndynamic-2"
+        assert layout.static_prefix() == "static-1\n\nstatic-2"
+
+    def test_empty_segments_skipped(self):
+        layout = PromptLayout().static("base", "a").dynamic("empty", "")
+        assert [s.name for s in layout.segments] == ["base"]
+
+    def test_fingerprint_ignores_dynamic_content(self):
+        a = PromptLayout().static("base", "rules").dynamic("ctx", "teacher A")
+        b = PromptLayout().static("base", "rules").dynamic("ctx", "teacher B")
+        c = PromptLayout().static("base", "other rules")
+        assert a.fingerprint() == b.fingerprint()
+        assert a.fingerprint() != c.fingerprint()
+        assert len(a.fingerprint()) == 16
+
+    def test_fingerprint_empty_without_static(self):
+        assert PromptLayout().dynamic("ctx", "x").fingerprint() == ""
+
+
+class TestNativeAgentLayout:
+    def test_system_prompt_is_stable_prefix(self):
+        agent = NativeAgent()
+        context = {
+            "resolved_entities": {"class_id": {"id": "cls-001", "displayName": "A班"}},
+        }
+        prompt = agent._build_system_prompt(context)
+        assert prompt.startswith(SYSTEM_PROMPT.strip("\n"))
+        assert "class_id = cls-001 (A班)" in prompt
+
+    def test_report_schemas_precede_per_turn_context(self):
+        agent = NativeAgent()
+        context = {
+            "resolved_entities": {"class_id": {"id": "cls-001", "displayName": "A班"}},
+            "blueprint_hints": {
+                "expectedArtifacts": ["report"],
+                "tabs": [{"key": "overview", "label": "Overview", "description": "KPI"}],
+            },
+        }
+        prompt = agent._build_system_prompt(context)
+        assert prompt.index("block:kpi_grid") < prompt.index("cls-001")
+        assert prompt.index("block:kpi_grid") < prompt.index("Overview (key: overview)")
+
+    def test_fingerprint_shared_across_entities(self):
+        agent = NativeAgent()
+        a = agent._build_prompt_layout(
+            {"resolved_entities": {"class_id": {"id": "c-1", "displayName": "A"}}}
+        )
+        b = agent._build_prompt_layout(
+            {"resolved_entities": {"class_id": {"id": "c-2", "displayName": "B"}}}
+        )
+        assert a.fingerprint() == b.fingerprint()
+
+
+class TestBlockPromptLayout:
+    def _slot(self, slot_id: str, **props) -> ComponentSlot:
+        return ComponentSlot(
+            id=slot_id,
+            component_type=ComponentType.SUGGESTION_LIST,
+            props=props,
+            ai_content_slot=True,
+        )
+
+    def test_instructions_precede_data(self):
+        layout, fmt = build_block_prompt_layout(
+            self._slot("s1"), None, {"submissions": {"count": 3}}, {}
+        )
+        prompt = layout.render()
+        assert fmt == "json"
+        assert prompt.index("## Output Format") < prompt.index("## Fetched Data")
+        assert prompt.index("## Fetched Data") < prompt.index("## Block: s1")
+
+    def test_same_type_blocks_share_prefix(self):
+        a, _ = build_block_prompt_layout(self._slot("s1", maxItems=3), None, {"x": 1}, {})
+        b, _ = build_block_prompt_layout(self._slot("s2", maxItems=8), None, {"y": 2}, {})
+        assert a.fingerprint() == b.fingerprint()
+
+
+class TestRecordCacheUsage:
+    def test_extracts_tokens(self):
+        usage = SimpleNamespace(input_tokens=1200, cache_read_tokens=1024)
+        assert cached_tokens_from_usage(usage) == (1200, 1024)
+        assert cached_tokens_from_usage(None) == (0, 0)
+
+    def test_records_into_metrics(self, monkeypatch):
+        collector = MetricsCollector()
+        monkeypatch.setattr("services.prompt_layout.get_metrics_collector", lambda: collector)
+
+        record_cache_usage(
+            SimpleNamespace(input_tokens=1000, cache_read_tokens=0),
+            source="native_agent",
+            fingerprint="abc",
+        )
+        record_cache_usage(
+            SimpleNamespace(input_tokens=1000, cache_read_tokens=800),
+            source="native_agent",
+            fingerprint="abc",
+        )
+
+        stats = collector.snapshot()["prompt_cache"]["native_agent"]
+        assert stats["requests"] == 2
+        assert stats["cache_hits"] == 1
+        assert stats["cached_tokens"] == 800
+        assert stats["cached_ratio"] == 0.4
+        assert stats["distinct_prefixes"] == 1
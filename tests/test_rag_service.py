@@ -80,6 +80,48 @@ class TestSimpleRAGStore:
         assert stats["doc_count"] == 2
         assert "description" in stats
 
+    def test_add_same_id_replaces(self):
+        """Re-adding an id should replace the document, not duplicate it."""
+        self.store.add_document("official_corpus", "doc1", "old essay content")
+        self.store.add_document("official_corpus", "doc1", "new poetry content")
+
+        assert self.store.get_collection_stats("official_corpus")["doc_count"] == 1
+        assert self.store.query("official_corpus", "essay") == []
+        assert self.store.query("official_corpus", "poetry")[0]["id"] == "doc1"
+
+    def test_remove_document(self):
+        """Removed documents should disappear from results."""
+        self.store.add_document("official_corpus", "doc1", "essay rubric")
+
+        assert self.store.remove_document("official_corpus", "doc1") is True
+        assert self.store.remove_document("official_corpus", "doc1") is False
+        assert self.store.query("official_corpus", "essay") == []
+
+    def test_query_cjk(self):
+        """Chinese queries should match via character bigrams."""
+        self.store.add_document("official_corpus", "chi", "中文閱讀理解評分準則")
+        self.store.add_document("official_corpus", "eng", "English reading rubric")
+
+        results = self.store.query("official_corpus", "閱讀理解")
+
+        assert [r["id"] for r in results] == ["chi"]
+        assert 0 < results[0]["distance"] < 1
+
+    def test_save_and_load(self, tmp_path):
+        """A saved store should reload with identical results."""
+        self.store.add_document(
+            "school_assets", "doc1", "math rubric", metadata={"type": "rubric"}
+        )
+        path = tmp_path / "index.json"
+        self.store.save(path, fingerprint="abc")
+
+        loaded = SimpleRAGStore.load(path, fingerprint="abc")
+
+        assert loaded is not None
+        assert loaded.query("school_assets", "math") == self.store.query("school_assets", "math")
+        assert SimpleRAGStore.load(path, fingerprint="other") is None
+        assert SimpleRAGStore.load(tmp_path / "missing.json") is None
+
 
 class TestCurriculumRAG:
     """Tests for CurriculumRAG service."""
@@ -158,6 +200,18 @@ class TestCurriculumRAG:
 
         assert len(results) >= 1
 
+    def test_persist_dir_round_trip(self, tmp_path):
+        """Should write the index on first start and reuse it afterwards."""
+        rag = CurriculumRAG(persist_dir=str(tmp_path))
+        assert (tmp_path / "rag_index.json").exists()
+
+        rag.add_document("school_assets", "custom-1", "school essay checklist")
+        rag.save()
+
+        reloaded = CurriculumRAG(persist_dir=str(tmp_path))
+        assert reloaded.get_stats() == rag.get_stats()
+        assert reloaded.query("school_assets", "checklist")[0]["id"] == "custom-1"
+
 
 class TestGetRagService:
     """Tests for singleton access."""
@@ -0,0 +1,292 @@
+"""Tests for services/resumable_stream.py and Last-Event-ID resumption."""
+
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import patch
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from services.conversation_store import get_conversation_store
+from services.metrics import get_metrics_collector
+from services.resumable_stream import StreamRegistry, parse_event_id
+
+
+@pytest.fixture(autouse=True)
+def fresh_metrics():
+    get_metrics_collector().reset()
+
+
+def _producer(n: int = 4, gate: asyncio.Event | None = None):
+    async def produce():
+        for i in range(n):
+            if i == 1 and gate is not None:
+                await gate.wait()
+            yield f"e{i}"
+
+    return produce
+
+
+class TestEventIds:
+    @pytest.mark.parametrize("raw, expected", [
+        ("s-abc:3", ("s-abc", 3)),
+        (" s-abc:0 ", ("s-abc", 0)),
+        ("s-abc", None),
+        ("s-abc:x", None),
+        (":3", None),
+        ("", None),
+        (None, None),
+    ])
+    def test_parse(self, raw, expected):
+        assert parse_event_id(raw) == expected
+
+
+class TestStreamRegistry:
+    async def test_resume_replays_after_last_seen(self):
+        registry = StreamRegistry()
+        stream_id, job = registry.launch("page", _producer())
+        await job.task
+
+        sid, resumed, start = registry.resume(f"{stream_id}:2", "page")
+        assert (sid, resumed) == (stream_id, job)
+        assert [e async for e in resumed.follow(start)] == ["e2", "e3"]
+        assert get_metrics_collector().get_counter("sse_resume") == {"page": 1}
+
+    async def test_run_continues_without_follower(self):
+        registry = StreamRegistry()
+        gate = asyncio.Event()
+        stream_id, job = registry.launch("conversation", _producer(gate=gate))
+
+        follower = job.follow()
+        assert await follower.__anext__() == "e0"
+        await follower.aclose()  # client disconnected
+
+        gate.set()
+        await asyncio.wait_for(job.task, 1)
+        assert job.status == "done" and job.events == ["e0", "e1", "e2", "e3"]
+
+    async def test_unknown_or_mismatched_stream(self):
+        registry = StreamRegistry()
+        stream_id, job = registry.launch("page", _producer())
+        await job.task
+
+        assert registry.resume("s-missing:1", "page") is None
+        assert registry.resume(f"{stream_id}:1", "conversation") is None
+        assert registry.resume(f"{stream_id}:99", "page") is None
+        assert registry.resume("garbage", "page") is None
+        assert get_metrics_collector().get_counter("sse_resume") == {"miss": 3}
+
+    async def test_resume_refused_for_other_owner(self):
+        registry = StreamRegistry()
+        stream_id, job = registry.launch("conversation", _producer(), owner=("t-1", "conv-1"))
+        await job.task
+
+        assert registry.resume(f"{stream_id}:1", "conversation", owner=("t-2", "conv-1")) is None
+        assert registry.resume(f"{stream_id}:1", "conversation", owner=("t-1", "conv-2")) is None
+        assert registry.resume(f"{stream_id}:1", "conversation") is None
+        assert registry.resume(f"{stream_id}:1", "conversation", owner=("t-1", "conv-1")) is not None
+        assert get_metrics_collector().get_counter("sse_resume") == {"miss": 3, "conversation": 1}
+
+    async def test_detached_run_holds_slot(self, monkeypatch):
+        from services import concurrency
+
+        sem = asyncio.Semaphore(1)
+        monkeypatch.setattr(concurrency, "_detached_semaphore", sem)
+        registry = StreamRegistry()
+        gates = [asyncio.Event(), asyncio.Event()]
+        _, first = registry.launch("page", _producer(gate=gates[0]))
+        _, second = registry.launch("page", _producer(gate=gates[1]))
+        await asyncio.sleep(0.01)
+
+        assert sem.locked()
+        assert len(first.events) == 1 and second.events == []  # waits for the slot
+        gates[0].set()
+        gates[1].set()
+        await asyncio.wait_for(asyncio.gather(first.task, second.task), 1)
+        assert second.events == ["e0", "e1", "e2", "e3"] and not sem.locked()
+
+    async def test_nested_run_shares_parent_slot(self, monkeypatch):
+        from services import concurrency
+        from services.generation_cache import GenerationCache
+
+        monkeypatch.setattr(concurrency, "_detached_semaphore", asyncio.Semaphore(1))
+        cache = GenerationCache()
+
+        async def produce():
+            async for event in cache.stream("quiz", "k", _producer(2), cacheable=bool):
+                yield event
+
+        _, job = StreamRegistry().launch("conversation", produce)
+        await asyncio.wait_for(job.task, 1)
+        assert job.events == ["e0", "e1"]
+
+    async def test_finished_stream_expires(self):
+        now = [0.0]
+        registry = StreamRegistry(ttl_s=10, clock=lambda: now[0])
+        stream_id, job = registry.launch("page", _producer())
+        await job.task
+
+        now[0] = 9.0
+        assert registry.resume(f"{stream_id}:0", "page") is not None
+        now[0] = 20.0
+        assert registry.resume(f"{stream_id}:0", "page") is None
+
+    async def test_failed_run_marks_log(self):
+        async def produce():
+            yield "e0"
+            raise RuntimeError("boom")
+
+        registry = StreamRegistry()
+        _, job = registry.launch("page", produce)
+        await job.task
+        assert (job.status, job.error, job.events) == ("failed", "boom", ["e0"])
+
+
+# ── Endpoints ───────────────────────────────────────────────
+
+
+@pytest.fixture
+async def client():
+    from main import app
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as ac:
+        yield ac
+
+
+def _ids(text: str) -> list[str]:
+    return [line[len("id: "):] for line in text.splitlines() if line.startswith("id: ")]
+
+
+class _FakeAgent:
+    def __init__(self, gate: asyncio.Event | None = None):
+        self.gate = gate
+        self.runs = 0
+
+    async def run_stream(self, **kwargs):
+        self.runs += 1
+        yield object()
+
+
+def _fake_adapt(gate: asyncio.Event | None = None):
+    async def adapt_stream(stream, enc, *, message_id, context):
+        yield enc.start(message_id)
+        yield enc.text_start("t-0")
+        if gate is not None:
+            await gate.wait()
+        yield enc.text_delta("t-0", "平均分 68")
+        yield enc.text_end("t-0")
+        yield enc.finish()
+
+    return adapt_stream
+
+
+class TestConversationStream:
+    async def test_events_numbered_and_resumable(self, client):
+        agent = _FakeAgent()
+        with patch("api.conversation._agent", agent), \
+                patch("api.conversation.adapt_stream", _fake_adapt()), \
+                patch("api.conversation.extract_tool_calls_summary", return_value=None):
+            body = {"message": "分析成绩", "conversationId": "conv-resume-1"}
+            first = await client.post("/api/conversation/stream", json=body)
+            stream_id = first.headers["X-Stream-Id"]
+            ids = _ids(first.text)
+            assert ids == [f"{stream_id}:{n}" for n in range(1, len(ids) + 1)]
+
+            retry = await client.post(
+                "/api/conversation/stream", json=body, headers={"Last-Event-ID": ids[2]},
+            )
+
+        assert agent.runs == 1
+        assert _ids(retry.text) == ids[3:]
+        assert "平均分 68" in retry.text and "[DONE]" in retry.text
+        session = await get_conversation_store().get("conv-resume-1")
+        assert [t.role for t in session.turns] == ["user", "assistant"]
+
+    async def test_unknown_last_event_id_starts_new_run(self, client):
+        agent = _FakeAgent()
+        with patch("api.conversation._agent", agent), \
+                patch("api.conversation.adapt_stream", _fake_adapt()), \
+                patch("api.conversation.extract_tool_calls_summary", return_value=None):
+            resp = await client.post(
+                "/api/conversation/stream",
+                json={"message": "hi"},
+                headers={"Last-Event-ID": "s-gone:4"},
+            )
+        assert agent.runs == 1
+        assert _ids(resp.text)[0].endswith(":1")
+
+    async def test_other_teacher_cannot_resume(self, client):
+        agent = _FakeAgent()
+        with patch("api.conversation._agent", agent), \
+                patch("api.conversation.adapt_stream", _fake_adapt()), \
+                patch("api.conversation.extract_tool_calls_summary", return_value=None):
+            body = {"message": "分析成绩", "conversationId": "conv-owned", "teacherId": "t-1"}
+            first = await client.post("/api/conversation/stream", json=body)
+            retry = await client.post(
+                "/api/conversation/stream",
+                json=dict(body, teacherId="t-2"),
+                headers={"Last-Event-ID": _ids(first.text)[2]},
+            )
+
+        assert agent.runs == 2
+        assert retry.headers["X-Stream-Id"] != first.headers["X-Stream-Id"]
+
+    async def test_busy_while_detached_runs_at_capacity(self, client, monkeypatch):
+        from services import concurrency
+
+        monkeypatch.setattr(concurrency, "_detached_semaphore", asyncio.Semaphore(0))
+        resp = await client.post("/api/conversation/stream", json={"message": "hi"})
+        assert resp.status_code == 503
+
+    async def test_turn_completes_after_disconnect(self):
+        from api.conversation import conversation_stream
+        from models.conversation import ConversationRequest
+
+        gate = asyncio.Event()
+        with patch("api.conversation._agent", _FakeAgent()), \
+                patch("api.conversation.adapt_stream", _fake_adapt(gate)), \
+                patch("api.conversation.extract_tool_calls_summary", return_value=None):
+            response = await conversation_stream(
+                ConversationRequest(message="hi", conversation_id="conv-detached"),
+                last_event_id=None,
+            )
+            body = response.body_iterator
+            assert "conversation" in await body.__anext__()
+            await body.aclose()  # client went away mid-turn
+
+            gate.set()
+            for _ in range(100):
+                session = await get_conversation_store().get("conv-detached")
+                if session is not None and len(session.turns) == 2:
+                    break
+                await asyncio.sleep(0.01)
+
+        assert session.turns[-1].content == "平均分 68"
+
+
+class TestPageGenerate:
+    async def test_resume_page_run(self, client):
+        from tests.test_planner import _sample_blueprint_args
+
+        runs = []
+
+        async def stream(blueprint, context):
+            runs.append(1)
+            for phase in ("data", "compute", "compose"):
+                yield {"type": "PHASE", "phase": phase}
+            yield {"type": "COMPLETE", "message": "completed", "progress": 100, "result": {}}
+
+        body = {"blueprint": _sample_blueprint_args(), "teacherId": "t-001"}
+        with patch("api.page._executor") as executor:
+            executor.execute_blueprint_stream = stream
+            first = await client.post("/api/page/generate", json=body)
+            ids = _ids(first.text)
+            retry = await client.post(
+                "/api/page/generate", json=body, headers={"Last-Event-ID": ids[1]},
+            )
+
+        assert len(ids) == 4 and first.headers["X-Stream-Id"] == ids[0].split(":")[0]
+        assert _ids(retry.text) == ids[2:]
+        assert '"phase": "data"' not in retry.text and "COMPLETE" in retry.text
+        assert runs == [1]
@@ -1,11 +1,19 @@
 """Tests for rubric service and tools."""
 
+import json
+import os
+
 import pytest
+
+from config.settings import get_settings
+from services import rubric_service
 from services.rubric_service import (
+    build_rubric_catalog,
     load_rubric,
     list_rubrics,
     get_rubric_for_task,
     get_rubric_context,
+    reload_rubric_catalog,
 )
 from tools.rubric_tools import get_rubric, list_available_rubrics
 
@@ -79,6 +87,88 @@ class TestRubricService:
         assert len(context["commonErrors"]) > 0
 
 
+def _write_rubric(directory, stem, **overrides):
+    data = {
+        "id": stem.upper(),
+        "name": f"Rubric {stem}",
+        "subject": "English",
+        "taskType": "essay",
+        "level": "DSE",
+        "totalMarks": 10,
+        "criteria": [],
+    } | overrides
+    path = directory / f"{stem}.json"
+    path.write_text(json.dumps(data), encoding="utf-8")
+    return path
+
+
+class TestRubricCatalog:
+    """Tests for the indexed, optionally hot-reloaded rubric catalog."""
+
+    @pytest.fixture
+    def rubric_dir(self, tmp_path, monkeypatch):
+        monkeypatch.setattr(rubric_service, "RUBRIC_DIR", tmp_path)
+        yield tmp_path
+        monkeypatch.undo()
+        reload_rubric_catalog()
+
+    def test_index_filters_combine(self, rubric_dir):
+        _write_rubric(rubric_dir, "a", subject="English", taskType="essay")
+        _write_rubric(rubric_dir, "b", subject="English", taskType="reading")
+        _write_rubric(rubric_dir, "c", subject="Math", taskType="essay", level="IB")
+
+        catalog = build_rubric_catalog(rubric_dir)
+
+        assert [r["id"] for r in catalog.find()] == ["A", "B", "C"]
+        assert [r["id"] for r in catalog.find(subject="english")] == ["A", "B"]
+        assert [r["id"] for r in catalog.find(task_type="ESSAY", level="ib")] == ["C"]
+        assert catalog.find(subject="Math", task_type="reading") == []
+
+    def test_invalid_files_are_skipped(self, rubric_dir):
+        _write_rubric(rubric_dir, "good")
+        (rubric_dir / "broken.json").write_text("{not json", encoding="utf-8")
+        _write_rubric(rubric_dir, "invalid", criteria="nope")
+
+        catalog = build_rubric_catalog(rubric_dir)
+
+        # Listed from raw JSON, but only valid rubrics can be loaded
+        assert [r["id"] for r in catalog.find()] == ["GOOD", "INVALID"]
+        assert catalog.get("good") is not None
+        assert catalog.get("invalid") is None
+
+    def test_returned_summaries_are_copies(self, rubric_dir):
+        _write_rubric(rubric_dir, "a")
+        reload_rubric_catalog()
+
+        list_rubrics()[0]["name"] = "mutated"
+
+        assert list_rubrics()[0]["name"] == "Rubric a"
+
+    def test_loaded_once_without_reload_interval(self, rubric_dir, monkeypatch):
+        monkeypatch.setattr(get_settings(), "rubric_reload_interval", 0.0)
+        path = _write_rubric(rubric_dir, "a", name="Before")
+        reload_rubric_catalog()
+
+        _write_rubric(rubric_dir, "a", name="After")
+        os.utime(path, ns=(1, 1))
+
+        assert list_rubrics()[0]["name"] == "Before"
+        assert load_rubric("a").name == "Before"
+
+    def test_hot_reload_on_mtime_change(self, rubric_dir, monkeypatch):
+        monkeypatch.setattr(get_settings(), "rubric_reload_interval", 1e-9)
+        path = _write_rubric(rubric_dir, "a", name="Before")
+        reload_rubric_catalog()
+        assert load_rubric("a").name == "Before"
+
+        _write_rubric(rubric_dir, "a", name="After")
+        os.utime(path, ns=(1, 1))
+        _write_rubric(rubric_dir, "b", subject="Math")
+
+        assert load_rubric("a").name == "After"
+        assert [r["id"] for r in list_rubrics(subject="Math")] == ["B"]
+
+
 class TestRubricTools:
     """Tests for rubric_tools.py async functions."""
 
@@ -0,0 +1,128 @@
+"""Tests for services/startup.py (warm-up tracking, readiness, boot budget)."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import subprocess
+import sys
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+
+from services import startup
+from services.metrics import get_metrics_collector
+from services.startup import (
+    check_startup_budget,
+    mark_phase,
+    readiness,
+    start_warmup,
+    wait_for_warmup,
+)
+
+
+@pytest.fixture(autouse=True)
+def fresh_state():
+    startup.reset_startup_state()
+    get_metrics_collector().reset()
+    yield
+    startup.reset_startup_state()
+
+
+class TestWarmup:
+    async def test_ready_and_failed_states(self):
+        async def ok():
+            await asyncio.sleep(0.01)
+
+        async def boom():
+            raise RuntimeError("db down")
+
+        start_warmup("a", ok)
+        start_warmup("b", boom, required=False)
+        assert await wait_for_warmup("a", timeout=1) is True
+        assert await wait_for_warmup("b", timeout=1) is False
+
+        _, report = readiness()
+        assert report["components"]["a"]["status"] == "ready"
+        assert report["components"]["b"] == {
+            "status": "failed",
+            "required": False,
+            "durationMs": report["components"]["b"]["durationMs"],
+            "error": "db down",
+        }
+        assert get_metrics_collector().get_counter("startup_warmup") == {
+            "a_ready": 1, "b_failed": 1,
+        }
+
+    async def test_stop_cancels_pending(self):
+        gate = asyncio.Event()
+        component = start_warmup("slow", gate.wait)
+        await startup.stop_warmups()
+        assert component.task.cancelled()
+
+
+class TestReadiness:
+    async def test_waits_for_serving_and_required_components(self):
+        gate = asyncio.Event()
+        start_warmup("tools", gate.wait)
+        start_warmup("rag", lambda: asyncio.sleep(3600), required=False)
+
+        assert readiness()[0] is False  # lifespan not serving yet
+        mark_phase("serving")
+        assert readiness()[0] is False  # required warm-up pending
+
+        gate.set()
+        await wait_for_warmup("tools", timeout=1)
+        ready, report = readiness()
+        assert ready is True
+        assert report["components"]["rag"]["status"] == "pending"
+        await startup.stop_warmups()
+
+    async def test_endpoint_returns_503_until_ready(self):
+        from main import app
+
+        transport = ASGITransport(app=app)
+        async with AsyncClient(transport=transport, base_url="http://test") as client:
+            gate = asyncio.Event()
+            start_warmup("tools", gate.wait)
+            mark_phase("serving")
+            resp = await client.get("/api/health/ready")
+            assert resp.status_code == 503
+            assert resp.json()["status"] == "starting"
+
+            gate.set()
+            await wait_for_warmup("tools", timeout=1)
+            resp = await client.get("/api/health/ready")
+            assert resp.status_code == 200
+            assert resp.json()["components"]["tools"]["status"] == "ready"
+
+
+class TestBudget:
+    def test_over_budget_warns_and_counts(self, caplog):
+        startup.begin_boot(startup.time.monotonic() - 2.0)
+        mark_phase("imports")
+        with caplog.at_level("WARNING", logger="services.startup"):
+            assert check_startup_budget(1.0) is False
+        assert "budget 1000ms" in caplog.text and "imports=" in caplog.text
+        assert get_metrics_collector().get_counter("startup") == {"over_budget": 1}
+
+    def test_within_budget(self):
+        startup.begin_boot()
+        assert check_startup_budget(60.0) is True
+        assert "serving" in readiness()[1]["startupMs"]
+
+
+class TestLazyImports:
+    def test_importing_main_defers_tools_and_planner(self):
+        code = (
+            "import sys, main, agents.planner as p\n"
+            "assert 'tools.native_tools' not in sys.modules\n"
+            "assert p._planner_agent is None\n"
+            "from tools.registry import get_registered_count\n"
+            "assert get_registered_count() > 0\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        proc = subprocess.run(
+            [sys.executable, "-c", code], cwd=root, capture_output=True, text=True, timeout=120,
+        )
+        assert proc.returncode == 0, proc.stderr[-2000:]
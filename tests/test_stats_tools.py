@@ -107,3 +107,217 @@ class TestComparePerformance:
 
         # Group A should have higher mean
         assert result["difference"]["mean"] > 0
+
+
+class TestNormalization:
+    """Tests for max_score normalization and binning."""
+
+    def test_max_score_normalizes_distribution(self):
+        """Scores out of 20 land in percentage grade bands."""
+        result = calculate_stats([8, 10, 14, 18, 20], max_score=20)
+
+        assert result["mean"] == 14.0  # raw metrics unchanged
+        assert result["normalized"]["mean_pct"] == 70.0
+        assert result["distribution"]["unit"] == "percent"
+        assert result["distribution"]["counts"] == [0, 1, 1, 0, 1, 0, 2]
+
+    def test_max_score_100_matches_legacy(self):
+        """Normalizing by 100 keeps the legacy distribution."""
+        data = [35, 45, 55, 65, 75, 85, 95]
+        assert (
+            calculate_stats(data, max_score=100)["distribution"]["counts"]
+            == calculate_stats(data)["distribution"]["counts"]
+        )
+
+    def test_invalid_max_score(self):
+        assert "error" in calculate_stats([1, 2], max_score=0)
+
+    def test_adaptive_bins_for_out_of_range_scores(self):
+        """Scores above 100 without max_score get bins fitted to the data."""
+        data = [95, 110, 120, 131, 140, 150]
+        dist = calculate_stats(data)["distribution"]
+
+        assert sum(dist["counts"]) == len(data)
+        assert dist["labels"][-1] != "90-100"
+        assert len(dist["labels"]) <= 10
+
+    def test_forced_grade_binning(self):
+        dist = calculate_stats([10, 120], binning="grade")["distribution"]
+        assert dist["labels"][0] == "0-39"
+
+
+class TestScoreSummary:
+    """Tests for the mergeable ScoreSummary accumulator."""
+
+    def test_matches_calculate_stats(self):
+        from tools.stats_tools import ScoreSummary
+
+        data = [58, 85, 72, 91, 65, 78, 62]
+        stats = ScoreSummary.from_scores(data).to_stats()
+        direct = calculate_stats(data)
+        for key in ("count", "mean", "median", "stddev", "min", "max", "percentiles"):
+            assert stats[key] == direct[key]
+
+    def test_merge_equals_pooled(self):
+        """Merging class summaries equals summarizing pooled scores."""
+        import random
+
+        from tools.stats_tools import ScoreSummary
+
+        rng = random.Random(3)
+        classes = [[rng.randint(20, 100) for _ in range(35)] for _ in range(6)]
+        merged = ScoreSummary.combine(ScoreSummary.from_scores(c) for c in classes)
+        pooled = [s for c in classes for s in c]
+
+        assert merged.to_stats() == ScoreSummary.from_scores(pooled).to_stats()
+        assert merged.to_stats()["stddev"] == calculate_stats(pooled)["stddev"]
+
+    def test_merge_different_max_scores_in_percent(self):
+        from tools.stats_tools import ScoreSummary
+
+        out_of_20 = ScoreSummary.from_scores([10, 20], max_score=20)
+        out_of_150 = ScoreSummary.from_scores([75, 150], max_score=150)
+        merged = out_of_20.merge(out_of_150)
+
+        assert merged.unit == "percent"
+        assert merged.mean == 75.0
+        assert merged.band_counts == [0, 0, 2, 0, 0, 0, 2]
+
+    def test_merge_rejects_mixed_units(self):
+        from tools.stats_tools import ScoreSummary
+
+        with pytest.raises(ValueError):
+            ScoreSummary.from_scores([1, 2]).merge(ScoreSummary.from_scores([1], max_score=5))
+
+    def test_sketch_compresses_with_bounded_error(self):
+        import numpy as np
+
+        from tools.stats_tools import ScoreSummary
+
+        rng = np.random.default_rng(0)
+        chunks = [rng.normal(70, 12, 500) for _ in range(20)]
+        merged = ScoreSummary.combine(
+            ScoreSummary.from_scores(c, sketch_capacity=128) for c in chunks
+        )
+        pooled = np.concatenate(chunks)
+
+        assert merged.sketch.means.size <= 128
+        assert not merged.sketch.exact
+        for q in (0.25, 0.5, 0.9):
+            assert merged.sketch.quantile(q) == pytest.approx(np.quantile(pooled, q), abs=1.0)
+        assert merged.to_stats()["approximate_quantiles"] is True
+
+    def test_round_trip_dict(self):
+        from tools.stats_tools import ScoreSummary
+
+        summary = ScoreSummary.from_scores([3, 7, 9], max_score=10)
+        restored = ScoreSummary.from_dict(summary.to_dict())
+        assert restored.to_stats() == summary.to_stats()
+
+
+class TestCompareNormalized:
+    """compare_performance with different full marks."""
+
+    def test_compare_in_percent(self):
+        result = compare_performance([10, 16], [75, 120], max_score_a=20, max_score_b=150)
+
+        assert result["group_a"]["mean"] == 65.0
+        assert result["group_b"]["mean"] == 65.0
+        assert result["difference"]["mean"] == 0.0
+
+    def test_percent_kpis_labelled_as_percent(self):
+        result = compare_performance([10, 20, 15], [100, 150, 120], max_score_a=20, max_score_b=150)
+
+        mean_kpi = result["group_a"]["summary"][0]
+        assert mean_kpi == {"label": "平均得分率", "value": 75.0, "unit": "%"}
+        assert all(item["unit"] != "分" for item in result["group_b"]["summary"])
+
+        raw = compare_performance([10, 20, 15], [12, 18, 14])
+        assert raw["group_a"]["summary"][0]["unit"] == "分"
+
+    def test_compare_requires_both_max_scores(self):
+        assert "error" in compare_performance([1], [2], max_score_b=10)
+
+    def test_compare_rejects_non_positive_max_score(self):
+        expected = {"error": "max_score must be positive"}
+        assert compare_performance([1], [2], max_score_a=-5) == expected
+        assert compare_performance([1], [2], max_score_a=0, max_score_b=20) == expected
+        assert compare_performance([1], [2], max_score_a=20, max_score_b=-1) == expected
+
+    def test_compare_summaries_without_raw_scores(self):
+        from tools.stats_tools import ScoreSummary, compare_summaries
+
+        result = compare_summaries(
+            ScoreSummary.from_scores([80, 85, 90]),
+            ScoreSummary.from_scores([70, 75, 80]),
+        )
+        assert result == compare_performance([80, 85, 90], [70, 75, 80])
+
+
+class TestScoreAccumulator:
+    """Tests for the incremental (per-page) ScoreAccumulator hook."""
+
+    def test_batches_equal_single_pass(self):
+        from tools.stats_tools import ScoreAccumulator
+
+        data = [58, 85, 72, 91, 65, 78, 62, 49, 100, 88]
+        acc = ScoreAccumulator()
+        for start in range(0, len(data), 3):
+            acc.add(data[start:start + 3])
+        acc.add([])
+
+        stats = acc.summary.to_stats()
+        direct = calculate_stats(data)
+        for key in ("count", "mean", "median", "stddev", "min", "max"):
+            assert stats[key] == direct[key]
+
+    def test_add_records_skips_missing_scores(self):
+        from models.data import SubmissionRecord
+        from tools.stats_tools import ScoreAccumulator
+
+        acc = ScoreAccumulator(max_score=50)
+        acc.add_records([
+            SubmissionRecord(student_id="a", name="A", score=25),
+            SubmissionRecord(student_id="b", name="B", score=None),
+            SubmissionRecord(student_id="c", name="C", score=50),
+        ])
+
+        assert acc.summary.unit == "percent"
+        assert acc.summary.count == 2
+        assert acc.summary.mean == 75.0
+
+
+class TestAssignmentStats:
+    """calculate_assignment_stats streams pages but matches calculate_stats."""
+
+    @pytest.mark.parametrize("max_score", [None, 100, 200])
+    async def test_matches_calculate_stats_on_mock_assignment(self, max_score):
+        from unittest.mock import patch
+
+        from services.mock_data import SUBMISSIONS
+        from tools.stats_tools import calculate_assignment_stats
+
+        scores = [s["score"] for s in SUBMISSIONS["a-001"]["submissions"]]
+        with patch("tools.data_tools._should_use_mock", return_value=True):
+            streamed = await calculate_assignment_stats("t-001", "a-001", max_score=max_score)
+
+        assert streamed.pop("assignment_id") == "a-001"
+        assert streamed == calculate_stats(scores, max_score=max_score)
+
+    async def test_adaptive_bins_for_large_scale(self):
+        from unittest.mock import patch
+
+        from models.data import SubmissionRecord
+        from tools.stats_tools import calculate_assignment_stats
+
+        scores = [35, 80, 95, 120, 150, 88, 101]
+
+        async def fake_stream(teacher_id, assignment_id, on_page):
+            on_page([SubmissionRecord(student_id=str(i), name="", score=s) for i, s in enumerate(scores)])
+            return {"assignment_id": assignment_id}
+
+        with patch("tools.data_tools.stream_assignment_submissions", fake_stream):
+            streamed = await calculate_assignment_stats("t-001", "a-x")
+
+        assert streamed["distribution"] == calculate_stats(scores)["distribution"]
+        assert streamed["distribution"]["unit"] == "score"
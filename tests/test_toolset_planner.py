@@ -306,3 +306,128 @@ class TestKeywordFallbackDirect:
         assert TOOLSET_PLATFORM in result
         assert "generation" not in result
         assert "analysis" not in result
+
+
+# ── Planner Cache ──────────────────────────────────────────
+
+
+class TestPlannerCache:
+    """plan_toolsets caches results by normalized message + state."""
+
+    @pytest.fixture(autouse=True)
+    def _fresh_cache(self):
+        from agents.toolset_planner import clear_plan_cache
+
+        clear_plan_cache()
+        yield
+        clear_plan_cache()
+
+    def test_normalize_message(self):
+        from agents.toolset_planner import normalize_planner_message
+
+        assert normalize_planner_message("  帮我出  5 道题！ ") == "帮我出 5 道题"
+        assert normalize_planner_message("Make A Quiz.") == "make a quiz"
+        assert normalize_planner_message("ＰＰＴ") == "ppt"
+
+    @pytest.mark.asyncio
+    async def test_second_call_hits_cache(self):
+        from unittest.mock import MagicMock
+
+        from agents import toolset_planner
+        from services.metrics import MetricsCollector
+
+        collector = MetricsCollector()
+        agent = MagicMock()
+        agent.run = AsyncMock(return_value=MagicMock(
+            output=ToolsetPlannerResult(toolsets=["generation"], confidence=0.9),
+        ))
+        with (
+            patch.object(toolset_planner, "_get_planner_agent", return_value=agent),
+            patch.object(toolset_planner, "get_metrics_collector", return_value=collector),
+        ):
+            first = await toolset_planner.plan_toolsets("帮我出 5 道题")
+            second = await toolset_planner.plan_toolsets(" 帮我出 5 道题。")
+            other_state = await toolset_planner.plan_toolsets("帮我出 5 道题", has_artifacts=True)
+
+        assert first == second == other_state
+        assert agent.run.await_count == 2  # state change is a separate key
+        assert collector.get_counter("toolset_planner") == {"cache_miss": 2, "cache_hit": 1}
+
+
+# ── Speculative Selection ──────────────────────────────────
+
+
+class TestSpeculativeSelection:
+    """start_speculative_selection returns keywords now, promotes later."""
+
+    @pytest.mark.asyncio
+    async def test_promotes_missing_toolset(self):
+        from agents.native_agent import start_speculative_selection
+        from services.metrics import MetricsCollector
+
+        collector = MetricsCollector()
+        deps = _make_deps()
+        with (
+            patch("agents.native_agent.get_metrics_collector", return_value=collector),
+            patch(
+                "agents.toolset_planner.plan_toolsets",
+                new_callable=AsyncMock,
+                return_value=ToolsetPlannerResult(toolsets=["generation"], confidence=0.9),
+            ),
+        ):
+            selection, task = start_speculative_selection("hello there", deps)
+            assert "generation" not in selection.toolsets
+            await task
+
+        assert "generation" in selection.toolsets
+        assert selection.source == "planner_promoted"
+        assert collector.get_counter("toolset_planner") == {"override": 1}
+
+    @pytest.mark.asyncio
+    async def test_agreeing_planner_keeps_selection(self):
+        from agents.native_agent import start_speculative_selection
+        from services.metrics import MetricsCollector
+
+        collector = MetricsCollector()
+        deps = _make_deps()
+        with (
+            patch("agents.native_agent.get_metrics_collector", return_value=collector),
+            patch(
+                "agents.toolset_planner.plan_toolsets",
+                new_callable=AsyncMock,
+                # Planner drops nothing material — removals are ignored
+                return_value=ToolsetPlannerResult(toolsets=[], confidence=0.9),
+            ),
+        ):
+            selection, task = start_speculative_selection("帮我出 5 道选择题", deps)
+            before = list(selection.toolsets)
+            await task
+
+        assert selection.toolsets == before
+        assert selection.source == "speculative_keyword"
+        assert collector.get_counter("toolset_planner") == {"agree": 1}
+
+    @pytest.mark.asyncio
+    async def test_filtered_agent_sees_promoted_tools(self):
+        from pydantic_ai.messages import ModelResponse, TextPart
+        from pydantic_ai.models.function import AgentInfo, FunctionModel
+
+        from agents.native_agent import NativeAgent, ToolsetSelection
+
+        seen: list[set[str]] = []
+
+        def model_fn(messages, info: AgentInfo) -> ModelResponse:
+            seen.append({t.name for t in info.function_tools})
+            return ModelResponse(parts=[TextPart("ok")])
+
+        deps = _make_deps()
+        selection = ToolsetSelection(toolsets=list(ALWAYS_TOOLSETS))
+        agent = NativeAgent()._create_agent(list(ALWAYS_TOOLSETS), deps, selection=selection)
+
+        await agent.run("hi", deps=deps, model=FunctionModel(model_fn))
+        selection.promote(["generation"])
+        await agent.run("hi", deps=deps, model=FunctionModel(model_fn))
+
+        assert "generate_quiz_questions" not in seen[0]
+        assert "get_teacher_classes" in seen[0]
+        assert "generate_quiz_questions" in seen[1]
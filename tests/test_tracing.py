@@ -0,0 +1,174 @@
+"""Tests for services/tracing.py and the spans around the hot path."""
+
+from __future__ import annotations
+
+import json
+from types import SimpleNamespace
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from opentelemetry import trace
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from pydantic_ai.models.test import TestModel
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from agents.native_agent import AgentDeps, NativeAgent
+from services import tracing
+from services.middleware import RequestIdMiddleware
+from services.tracing import (
+    JsonLinesSpanExporter,
+    detached_span,
+    request_id_var,
+    setup_tracing,
+    shutdown_tracing,
+    span,
+)
+from tools.registry import _wrap_with_metrics
+
+
+@pytest.fixture
+def exporter():
+    memory = InMemorySpanExporter()
+    provider = setup_tracing(exporter=memory)
+
+    def finished():
+        provider.force_flush()
+        return {s.name: s for s in memory.get_finished_spans()}
+
+    memory.finished = finished
+    yield memory
+    shutdown_tracing()
+
+
+def _app() -> Starlette:
+    async def work(request):
+        with span("inner"):
+            pass
+        return JSONResponse({"ok": True})
+
+    async def stream(request):
+        async def body():
+            for i in range(3):
+                yield f"data: {i}\n\n"
+        return StreamingResponse(body(), media_type="text/event-stream")
+
+    app = Starlette(routes=[Route("/work", work), Route("/stream", stream)])
+    return RequestIdMiddleware(app)
+
+
+async def _get(path: str, headers: dict[str, str] | None = None):
+    transport = ASGITransport(app=_app())
+    async with AsyncClient(transport=transport, base_url="http://test") as client:
+        return await client.get(path, headers=headers)
+
+
+class TestRequestSpans:
+    async def test_root_span_carries_request_id(self, exporter):
+        resp = await _get("/work", {"X-Request-ID": "req-42"})
+        assert resp.headers["x-request-id"] == "req-42"
+
+        spans = exporter.finished()
+        root, inner = spans["HTTP GET /work"], spans["inner"]
+        assert root.kind == trace.SpanKind.SERVER
+        assert root.attributes["http.response.status_code"] == 200
+        assert inner.parent.span_id == root.context.span_id
+        assert inner.attributes["request.id"] == root.attributes["request.id"] == "req-42"
+
+    async def test_continues_incoming_traceparent(self, exporter):
+        trace_id = "4bf92f3577b34da6a3ce929d0e0e4736"
+        await _get("/work", {"traceparent": f"00-{trace_id}-00f067aa0ba902b7-01"})
+        root = exporter.finished()["HTTP GET /work"]
+        assert format(root.context.trace_id, "032x") == trace_id
+
+    async def test_stream_flush_recorded(self, exporter):
+        await _get("/stream")
+        root = exporter.finished()["HTTP GET /stream"]
+        assert [e.name for e in root.events] == ["http.first_byte"]
+        assert root.attributes["http.response.body_chunks"] >= 3
+        assert "http.response.send_ms" in root.attributes
+
+
+class TestComponentSpans:
+    async def test_tool_span_records_status_and_turn(self, exporter):
+        async def lookup(ctx, name: str) -> dict:
+            return {"status": "error", "message": "not found"}
+
+        wrapped = _wrap_with_metrics(lookup, "lookup")
+        ctx = SimpleNamespace(deps=SimpleNamespace(turn_id="turn-1", conversation_id="conv-1"))
+        token = request_id_var.set("req-7")
+        try:
+            await wrapped(ctx, "x")
+        finally:
+            request_id_var.reset(token)
+
+        tool = exporter.finished()["tool lookup"]
+        assert tool.attributes["tool.status"] == "error"
+        assert tool.attributes["turn.id"] == "turn-1"
+        assert tool.attributes["request.id"] == "req-7"
+
+    async def test_agent_turn_nests_selection_and_model_run(self, exporter):
+        agent = NativeAgent()
+        original_create = agent._create_agent
+
+        def patched_create(toolsets, deps, **kwargs):
+            pydantic_agent = original_create(toolsets, deps, **kwargs)
+            pydantic_agent._model = TestModel(call_tools=[], custom_output_text="ok")
+            return pydantic_agent
+
+        agent._create_agent = patched_create
+        await agent.run("你好", deps=AgentDeps(teacher_id="t-1", conversation_id="c-1"))
+
+        spans = exporter.finished()
+        turn = spans["agent.turn"]
+        selection = spans["agent.select_toolsets"]
+        assert selection.parent.span_id == turn.context.span_id
+        assert selection.attributes["toolsets.source"]
+        children = {
+            s.name for s in exporter.get_finished_spans()
+            if s.parent is not None and s.parent.span_id == turn.context.span_id
+        }
+        assert "agent run" in children  # PydanticAI instrumentation
+        assert turn.attributes["llm.requests"] >= 1
+
+    async def test_detached_span_links_explicit_parent(self, exporter):
+        async def gen():
+            with detached_span("outer") as outer:
+                with detached_span("phase", parent=outer):
+                    yield 1
+                yield 2
+
+        stream = gen()
+        assert await stream.__anext__() == 1
+        await stream.aclose()
+
+        spans = exporter.finished()
+        assert spans["phase"].parent.span_id == spans["outer"].context.span_id
+        assert spans["outer"].attributes["cancelled"] is True
+        # Never made current, so nothing leaked into this context.
+        assert not trace.get_current_span().is_recording()
+
+
+class TestExport:
+    def test_disabled_hands_out_non_recording_spans(self):
+        assert setup_tracing() is None
+        with span("noop") as current:
+            assert not current.is_recording()
+
+    def test_json_lines_file(self, tmp_path):
+        path = tmp_path / "traces" / "spans.jsonl"
+        provider = setup_tracing(exporter=JsonLinesSpanExporter(str(path)))
+        token = request_id_var.set("req-9")
+        try:
+            with span("a"), span("b"):
+                pass
+        finally:
+            request_id_var.reset(token)
+        provider.force_flush()
+        shutdown_tracing()
+
+        rows = [json.loads(line) for line in path.read_text().splitlines()]
+        assert [r["name"] for r in rows] == ["b", "a"]
+        assert {r["attributes"]["request.id"] for r in rows} == {"req-9"}
+        assert tracing._provider is None
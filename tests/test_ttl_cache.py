@@ -0,0 +1,34 @@
+"""Tests for services/ttl_cache.py."""
+
+from __future__ import annotations
+
+from services.ttl_cache import TTLCache
+
+
+class TestTTLCache:
+    def test_entries_expire(self):
+        now = [0.0]
+        cache: TTLCache[str, int] = TTLCache(max_size=4, ttl_seconds=10, clock=lambda: now[0])
+        cache.set("a", 1)
+        now[0] = 9.9
+        assert cache.get("a") == 1
+        now[0] = 10.0
+        assert cache.get("a") is None
+
+    def test_per_entry_ttl_without_default_ttl(self):
+        now = [0.0]
+        cache: TTLCache[str, int] = TTLCache(max_size=4, ttl_seconds=0, clock=lambda: now[0])
+        cache.set("forever", 1)
+        cache.set("short", 2, ttl_seconds=5)
+        now[0] = 6.0
+        assert "short" not in cache
+        assert cache.get("short") is None
+        assert cache.get("forever") == 1
+
+    def test_lru_eviction(self):
+        cache: TTLCache[str, int] = TTLCache(max_size=2, ttl_seconds=0)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert "b" not in cache and "a" in cache and "c" in cache
@@ -12,6 +12,7 @@ from typing import Any, Callable
 from tools.registry import (  # noqa: F401
     _registry as _native_registry,
     get_tool_descriptions,
+    load_builtin_tools,
 )
 
 
@@ -25,6 +26,7 @@ class _ToolRegistryProxy(dict):
     """
 
     def _snapshot(self) -> dict[str, Callable[..., Any]]:
+        load_builtin_tools()
         return {rt.name: rt.func for rt in _native_registry.values()}
 
     def __getitem__(self, key: str) -> Callable[..., Any]:
@@ -46,6 +48,7 @@ class _ToolRegistryProxy(dict):
         return key in self._snapshot()
 
     def __len__(self) -> int:
+        load_builtin_tools()
         return len(_native_registry)
 
     def __iter__(self):
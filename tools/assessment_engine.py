@@ -0,0 +1,344 @@
+"""Columnar analytics core for question-level assessment data.
+
+``tools/assessment_tools.py`` used to build a ``SubmissionRecord`` per row
+and aggregate in nested dict loops.  ``AssessmentFrame`` instead loads the
+submissions once into flat numpy arrays — one row per (item, knowledge
+point) pair plus an exploded error-tag table — and computes mastery,
+error-tag distributions and per-knowledge-point rates in vectorized
+passes (``np.bincount`` / ``np.unique``).
+
+Outputs are identical to the previous loop implementation, including
+ordering: knowledge points appear in first-seen order before the final
+stable sort, and error tags tie-break by first occurrence.
+
+Paged submissions can be accumulated with ``AssessmentFrameBuilder``
+(an ``on_page`` hook for ``adapters.submission_adapter``).
+
+A frame can be reused for several analyses over the same cohort::
+
+    frame = AssessmentFrame.from_submissions(submissions)
+    class_view = frame.class_weakness()
+    for sid in student_ids:
+        frame.student_error_patterns(sid)
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+import numpy as np
+
+from models.data import QuestionItem, SubmissionRecord
+
+_TOP_ERROR_TAGS = 5
+
+
+def _as_record_fields(sub: Any) -> tuple[str, str, list]:
+    """Return ``(student_id, submission_type, items)`` for one submission.
+
+    Plain dicts take a fast path; anything unusual goes through pydantic
+    so validation errors match ``SubmissionRecord(**sub)``.
+    """
+    if isinstance(sub, dict):
+        sid = sub.get("student_id")
+        stype = sub.get("submission_type", "student")
+        items = sub.get("items", [])
+        if (
+            isinstance(sid, str)
+            and isinstance(sub.get("name"), str)
+            and isinstance(stype, str)
+            and isinstance(items, list)
+        ):
+            return sid, stype, items
+        sub = SubmissionRecord(**sub)
+    return sub.student_id, sub.submission_type, sub.items
+
+
+def _as_item_fields(item: Any) -> tuple[bool, list[str], list[str]]:
+    """Return ``(correct, knowledge_point_ids, error_tags)`` for one item."""
+    if isinstance(item, dict):
+        correct = item.get("correct", False)
+        kps = item.get("knowledge_point_ids", [])
+        tags = item.get("error_tags", [])
+        if (
+            isinstance(correct, bool)
+            and isinstance(kps, list)
+            and isinstance(tags, list)
+            and isinstance(item.get("question_id"), str)
+        ):
+            return correct, kps, tags
+        item = QuestionItem(**item)
+    return item.correct, item.knowledge_point_ids, item.error_tags
+
+
+class _Vocab:
+    """String → dense int code, in first-seen order."""
+
+    __slots__ = ("codes", "values")
+
+    def __init__(self) -> None:
+        self.codes: dict[str, int] = {}
+        self.values: list[str] = []
+
+    def code(self, value: str) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+
+def _first_seen_order(codes: np.ndarray) -> np.ndarray:
+    """Unique codes ordered by their first occurrence in *codes*."""
+    if codes.size == 0:
+        return codes
+    uniq, first = np.unique(codes, return_index=True)
+    return uniq[np.argsort(first, kind="stable")]
+
+
+class AssessmentFrame:
+    """Question-level submission data in columnar form.
+
+    Submission-level arrays (length = submissions):
+        sub_student: student code; sub_guest: guest flag;
+        sub_items: number of question items.
+    Row-level arrays (length = item × knowledge-point pairs):
+        row_sub, row_kp, row_correct.
+    Tag-level arrays (length = error tags on incorrect rows):
+        tag_row (index into row arrays), tag_code.
+    """
+
+    def __init__(
+        self,
+        *,
+        students: list[str],
+        kps: list[str],
+        tags: list[str],
+        sub_student: np.ndarray,
+        sub_guest: np.ndarray,
+        sub_items: np.ndarray,
+        row_sub: np.ndarray,
+        row_kp: np.ndarray,
+        row_correct: np.ndarray,
+        tag_row: np.ndarray,
+        tag_code: np.ndarray,
+    ) -> None:
+        self.students = students
+        self.kps = kps
+        self.tags = tags
+        self.sub_student = sub_student
+        self.sub_guest = sub_guest
+        self.sub_items = sub_items
+        self.row_sub = row_sub
+        self.row_kp = row_kp
+        self.row_correct = row_correct
+        self.tag_row = tag_row
+        self.tag_code = tag_code
+        self._student_codes = {sid: i for i, sid in enumerate(students)}
+        self._kp_codes = {kp: i for i, kp in enumerate(kps)}
+
+    @classmethod
+    def from_submissions(cls, submissions: Iterable[Any]) -> AssessmentFrame:
+        """Load submissions (dicts or ``SubmissionRecord``) in one pass."""
+        builder = AssessmentFrameBuilder()
+        builder.add(submissions)
+        return builder.build()
+
+    # ── Vectorized building blocks ──────────────────────────
+
+    def _kp_counts(self, row_mask: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """``(kp_order, attempts, correct)`` for rows in *row_mask*."""
+        n_kp = len(self.kps)
+        kp = self.row_kp[row_mask]
+        attempts = np.bincount(kp, minlength=n_kp)
+        correct = np.bincount(kp[self.row_correct[row_mask]], minlength=n_kp)
+        return _first_seen_order(kp), attempts, correct
+
+    def _top_tags(self, row_mask: np.ndarray) -> dict[int, list[str]]:
+        """Most frequent error tags per kp code (ties by first occurrence)."""
+        keep = row_mask[self.tag_row]
+        if not keep.any():
+            return {}
+        n_tags = len(self.tags)
+        pair = self.row_kp[self.tag_row[keep]] * n_tags + self.tag_code[keep]
+        uniq, first, counts = np.unique(pair, return_index=True, return_counts=True)
+        kp_of = uniq // n_tags
+        # Group by kp, then count desc, then first occurrence asc.
+        order = np.lexsort((first, -counts, kp_of))
+        result: dict[int, list[str]] = {}
+        for idx in order:
+            kp_code = int(kp_of[idx])
+            top = result.setdefault(kp_code, [])
+            if len(top) < _TOP_ERROR_TAGS:
+                top.append(self.tags[int(uniq[idx] % n_tags)])
+        return result
+
+    def _registered_with_items(self) -> np.ndarray:
+        return ~self.sub_guest & (self.sub_items > 0)
+
+    # ── Analyses ────────────────────────────────────────────
+
+    def class_weakness(self) -> tuple[list[dict[str, Any]], dict[str, int]]:
+        """Weak points (sorted by error rate desc) and summary counts."""
+        sub_mask = self._registered_with_items()
+        row_mask = sub_mask[self.row_sub]
+        order, attempts, correct = self._kp_counts(row_mask)
+
+        # Distinct (kp, student) pairs among incorrect rows
+        err_mask = row_mask & ~self.row_correct
+        n_students = max(len(self.students), 1)
+        pairs = np.unique(
+            self.row_kp[err_mask] * n_students + self.sub_student[self.row_sub[err_mask]]
+        )
+        affected = np.bincount(pairs // n_students, minlength=len(self.kps))
+        top_tags = self._top_tags(err_mask)
+
+        weak_points = []
+        for code in order.tolist():
+            total = int(attempts[code])
+            errors = total - int(correct[code])
+            weak_points.append({
+                "knowledgePointId": self.kps[code],
+                "errorRate": round(errors / total, 3),
+                "errorCount": errors,
+                "totalAttempts": total,
+                "affectedStudents": int(affected[code]),
+                "commonErrorTags": top_tags.get(code, []),
+            })
+        weak_points.sort(key=lambda x: x["errorRate"], reverse=True)
+
+        total_items = int(self.sub_items[sub_mask].sum())
+        summary = {
+            "totalStudents": int(sub_mask.sum()),
+            "totalQuestions": total_items,
+            "analyzedItems": total_items,
+            "knowledgePointsCovered": int(order.size),
+        }
+        return weak_points, summary
+
+    def student_error_patterns(self, student_id: str) -> tuple[list[dict[str, Any]], float, int]:
+        """``(error_patterns, overall_mastery, kp_count)`` for one student."""
+        code = self._student_codes.get(student_id)
+        if code is None:
+            return [], 0.0, 0
+        row_mask = self.sub_student[self.row_sub] == code
+        order, attempts, correct = self._kp_counts(row_mask)
+        top_tags = self._top_tags(row_mask & ~self.row_correct)
+
+        patterns = []
+        total_mastery = 0.0
+        for kp_code in order.tolist():
+            total = int(attempts[kp_code])
+            right = int(correct[kp_code])
+            mastery = right / total
+            total_mastery += mastery
+            if total > right:
+                patterns.append({
+                    "knowledgePointId": self.kps[kp_code],
+                    "errorCount": total - right,
+                    "totalAttempts": total,
+                    "masteryRate": round(mastery, 3),
+                    "errorTags": top_tags.get(kp_code, []),
+                })
+        patterns.sort(key=lambda x: x["masteryRate"])
+        overall = total_mastery / order.size if order.size else 0.0
+        return patterns, overall, int(order.size)
+
+    def class_mastery(self, knowledge_point_ids: list[str] | None = None) -> list[dict[str, Any]]:
+        """Per-kp mastery for registered students, sorted by rate asc."""
+        sub_mask = self._registered_with_items()
+        row_mask = sub_mask[self.row_sub]
+        if knowledge_point_ids:
+            wanted = [self._kp_codes[k] for k in knowledge_point_ids if k in self._kp_codes]
+            row_mask &= np.isin(self.row_kp, np.asarray(wanted, dtype=np.int64))
+        order, attempts, correct = self._kp_counts(row_mask)
+
+        mastery = []
+        for code in order.tolist():
+            total = int(attempts[code])
+            right = int(correct[code])
+            mastery.append({
+                "knowledgePointId": self.kps[code],
+                "masteryRate": round(right / total, 3),
+                "correctCount": right,
+                "totalAttempts": total,
+            })
+        mastery.sort(key=lambda x: x["masteryRate"])
+        return mastery
+
+
+class AssessmentFrameBuilder:
+    """Accumulates submissions batch by batch into an ``AssessmentFrame``.
+
+    Only the integer column buffers are retained, so it can be fed pages of
+    submissions (an ``on_page`` hook) without keeping the records alive.
+    """
+
+    def __init__(self) -> None:
+        self._students, self._kps, self._tags = _Vocab(), _Vocab(), _Vocab()
+        self._sub_student: list[int] = []
+        self._sub_guest: list[bool] = []
+        self._sub_items: list[int] = []
+        self._row_sub: list[int] = []
+        self._row_kp: list[int] = []
+        self._row_correct: list[bool] = []
+        self._tag_row: list[int] = []
+        self._tag_code: list[int] = []
+
+    def add(self, submissions: Iterable[Any]) -> None:
+        """Append a batch of submissions (dicts or ``SubmissionRecord``)."""
+        sub_student, sub_guest, sub_items = self._sub_student, self._sub_guest, self._sub_items
+        row_sub, row_kp, row_correct = self._row_sub, self._row_kp, self._row_correct
+        tag_row, tag_code = self._tag_row, self._tag_code
+        student_code = self._students.code
+        kp_code = self._kps.code
+        tag_codes = self._tags.code
+        for sub in submissions:
+            sub_idx = len(sub_student)
+            sid, stype, items = _as_record_fields(sub)
+            sub_student.append(student_code(sid))
+            sub_guest.append(stype == "guest")
+            sub_items.append(len(items))
+            for item in items:
+                # Inlined fast path of _as_item_fields for plain dict items.
+                if type(item) is dict and type(item.get("question_id")) is str:
+                    correct = item.get("correct", False)
+                    kp_ids = item.get("knowledge_point_ids", ())
+                    error_tags = item.get("error_tags", ())
+                    if (
+                        type(correct) is not bool
+                        or type(kp_ids) is not list
+                        or type(error_tags) is not list
+                    ):
+                        correct, kp_ids, error_tags = _as_item_fields(item)
+                else:
+                    correct, kp_ids, error_tags = _as_item_fields(item)
+                for kp_id in kp_ids:
+                    if not correct:
+                        row = len(row_sub)
+                        for tag in error_tags:
+                            tag_row.append(row)
+                            tag_code.append(tag_codes(tag))
+                    row_sub.append(sub_idx)
+                    row_kp.append(kp_code(kp_id))
+                    row_correct.append(correct)
+
+    def add_records(self, records: Iterable[Any]) -> None:
+        """Alias of ``add`` matching ``ScoreAccumulator.add_records``."""
+        self.add(records)
+
+    def build(self) -> AssessmentFrame:
+        return AssessmentFrame(
+            students=list(self._students.values),
+            kps=list(self._kps.values),
+            tags=list(self._tags.values),
+            sub_student=np.asarray(self._sub_student, dtype=np.int64),
+            sub_guest=np.asarray(self._sub_guest, dtype=bool),
+            sub_items=np.asarray(self._sub_items, dtype=np.int64),
+            row_sub=np.asarray(self._row_sub, dtype=np.int64),
+            row_kp=np.asarray(self._row_kp, dtype=np.int64),
+            row_correct=np.asarray(self._row_correct, dtype=bool),
+            tag_row=np.asarray(self._tag_row, dtype=np.int64),
+            tag_code=np.asarray(self._tag_code, dtype=np.int64),
+        )
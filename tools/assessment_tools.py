@@ -2,21 +2,30 @@
 
 Phase 7: These tools analyze student performance at the question level,
 identifying weak knowledge points and error patterns to support targeted
-question generation.
+question generation.  Aggregation runs on the columnar ``AssessmentFrame``
+(see ``tools/assessment_engine.py``).  Given an ``assignment_id`` instead of
+pre-fetched submissions, the frame is built page by page from the data
+layer with ``AssessmentFrameBuilder``.
 """
 
 from __future__ import annotations
 
-from collections import defaultdict
 from typing import Any
 
-from models.data import (
-    ErrorPattern,
-    KnowledgePoint,
-    QuestionItem,
-    StudentMastery,
-    SubmissionRecord,
-)
+from tools.assessment_engine import AssessmentFrame, AssessmentFrameBuilder
+
+
+async def _load_assignment_frame(
+    teacher_id: str, assignment_id: str,
+) -> tuple[AssessmentFrame | None, dict[str, Any]]:
+    """Stream an assignment's submissions into a frame; ``(None, error)`` on failure."""
+    from tools.data_tools import stream_assignment_submissions
+
+    builder = AssessmentFrameBuilder()
+    meta = await stream_assignment_submissions(teacher_id, assignment_id, builder.add_records)
+    if meta.get("status") == "error" or meta.get("error"):
+        return None, meta
+    return builder.build(), meta
 
 
 async def analyze_student_weakness(
@@ -24,6 +33,7 @@ async def analyze_student_weakness(
     class_id: str,
     subject: str = "",
     submissions: list[dict[str, Any]] | None = None,
+    assignment_id: str = "",
 ) -> dict[str, Any]:
     """Analyze weak knowledge points for a class based on submission data.
 
@@ -32,6 +42,8 @@ async def analyze_student_weakness(
         class_id: Class ID to analyze.
         subject: Optional subject filter.
         submissions: Optional pre-fetched submission data with items.
+        assignment_id: Fetch (streamed) submissions of this assignment
+            when *submissions* is not given.
 
     Returns:
         Dictionary containing:
@@ -40,9 +52,13 @@ async def analyze_student_weakness(
         - recommendedFocus: Top knowledge points to focus on
         - summary: Overall analysis summary
     """
+    frame: AssessmentFrame | None = None
+    if not submissions and assignment_id:
+        frame, meta = await _load_assignment_frame(teacher_id, assignment_id)
+        if frame is None:
+            return meta
     # If no submissions provided, return empty analysis
-    # In production, this would fetch from the data layer
-    if not submissions:
+    if frame is None and not submissions:
         return {
             "classId": class_id,
             "weakPoints": [],
@@ -54,59 +70,9 @@ async def analyze_student_weakness(
             },
         }
 
-    # Aggregate error data by knowledge point
-    kp_stats: dict[str, dict[str, Any]] = defaultdict(
-        lambda: {
-            "errorCount": 0,
-            "totalAttempts": 0,
-            "affectedStudents": set(),
-            "errorTags": defaultdict(int),
-        }
-    )
-
-    total_students = 0
-    total_items = 0
-
-    for sub_data in submissions:
-        sub = SubmissionRecord(**sub_data) if isinstance(sub_data, dict) else sub_data
-        # Skip guest submissions — class weakness analysis is for registered students only
-        if sub.submission_type == "guest":
-            continue
-        if not sub.items:
-            continue
-
-        total_students += 1
-
-        for item in sub.items:
-            total_items += 1
-            for kp_id in item.knowledge_point_ids:
-                kp_stats[kp_id]["totalAttempts"] += 1
-                if not item.correct:
-                    kp_stats[kp_id]["errorCount"] += 1
-                    kp_stats[kp_id]["affectedStudents"].add(sub.student_id)
-                    for tag in item.error_tags:
-                        kp_stats[kp_id]["errorTags"][tag] += 1
-
-    # Build weak points list sorted by error rate
-    weak_points = []
-    for kp_id, stats in kp_stats.items():
-        if stats["totalAttempts"] > 0:
-            error_rate = stats["errorCount"] / stats["totalAttempts"]
-            weak_points.append({
-                "knowledgePointId": kp_id,
-                "errorRate": round(error_rate, 3),
-                "errorCount": stats["errorCount"],
-                "totalAttempts": stats["totalAttempts"],
-                "affectedStudents": len(stats["affectedStudents"]),
-                "commonErrorTags": sorted(
-                    stats["errorTags"].keys(),
-                    key=lambda t: stats["errorTags"][t],
-                    reverse=True,
-                )[:5],
-            })
-
-    # Sort by error rate descending
-    weak_points.sort(key=lambda x: x["errorRate"], reverse=True)
+    if frame is None:
+        frame = AssessmentFrame.from_submissions(submissions)
+    weak_points, summary = frame.class_weakness()
 
     # Recommend top 3 focus areas
     recommended_focus = [wp["knowledgePointId"] for wp in weak_points[:3]]
@@ -115,12 +81,7 @@ async def analyze_student_weakness(
         "classId": class_id,
         "weakPoints": weak_points,
         "recommendedFocus": recommended_focus,
-        "summary": {
-            "totalStudents": total_students,
-            "totalQuestions": total_items,
-            "analyzedItems": total_items,
-            "knowledgePointsCovered": len(kp_stats),
-        },
+        "summary": summary,
     }
 
 
@@ -129,6 +90,7 @@ async def get_student_error_patterns(
     student_id: str,
     class_id: str = "",
     submissions: list[dict[str, Any]] | None = None,
+    assignment_id: str = "",
 ) -> dict[str, Any]:
     """Get error patterns for a single student.
 
@@ -137,6 +99,8 @@ async def get_student_error_patterns(
         student_id: Student ID to analyze.
         class_id: Optional class ID filter.
         submissions: Optional pre-fetched submission data.
+        assignment_id: Fetch (streamed) submissions of this assignment
+            when *submissions* is not given.
 
     Returns:
         Dictionary containing:
@@ -144,71 +108,27 @@ async def get_student_error_patterns(
         - errorPatterns: List of error patterns by knowledge point
         - overallMastery: Average mastery rate across all knowledge points
     """
-    if not submissions:
+    frame: AssessmentFrame | None = None
+    if not submissions and assignment_id:
+        frame, meta = await _load_assignment_frame(teacher_id, assignment_id)
+        if frame is None:
+            return meta
+    if frame is None and not submissions:
         return {
             "studentId": student_id,
             "errorPatterns": [],
             "overallMastery": 0.0,
         }
 
-    # Aggregate by knowledge point
-    kp_stats: dict[str, dict[str, Any]] = defaultdict(
-        lambda: {
-            "correct": 0,
-            "total": 0,
-            "errorTags": defaultdict(int),
-        }
-    )
-
-    for sub_data in submissions:
-        sub = SubmissionRecord(**sub_data) if isinstance(sub_data, dict) else sub_data
-        if sub.student_id != student_id:
-            continue
-        if not sub.items:
-            continue
-
-        for item in sub.items:
-            for kp_id in item.knowledge_point_ids:
-                kp_stats[kp_id]["total"] += 1
-                if item.correct:
-                    kp_stats[kp_id]["correct"] += 1
-                else:
-                    for tag in item.error_tags:
-                        kp_stats[kp_id]["errorTags"][tag] += 1
-
-    # Build error patterns
-    error_patterns = []
-    total_mastery = 0.0
-
-    for kp_id, stats in kp_stats.items():
-        if stats["total"] > 0:
-            mastery = stats["correct"] / stats["total"]
-            error_count = stats["total"] - stats["correct"]
-            total_mastery += mastery
-
-            if error_count > 0:
-                error_patterns.append({
-                    "knowledgePointId": kp_id,
-                    "errorCount": error_count,
-                    "totalAttempts": stats["total"],
-                    "masteryRate": round(mastery, 3),
-                    "errorTags": sorted(
-                        stats["errorTags"].keys(),
-                        key=lambda t: stats["errorTags"][t],
-                        reverse=True,
-                    )[:5],
-                })
-
-    # Sort by mastery rate ascending (worst first)
-    error_patterns.sort(key=lambda x: x["masteryRate"])
-
-    overall_mastery = total_mastery / len(kp_stats) if kp_stats else 0.0
+    if frame is None:
+        frame = AssessmentFrame.from_submissions(submissions)
+    error_patterns, overall_mastery, kp_count = frame.student_error_patterns(student_id)
 
     return {
         "studentId": student_id,
         "errorPatterns": error_patterns,
         "overallMastery": round(overall_mastery, 3),
-        "knowledgePointsAssessed": len(kp_stats),
+        "knowledgePointsAssessed": kp_count,
     }
 
 
@@ -225,39 +145,10 @@ def calculate_class_mastery(
     Returns:
         Dictionary with mastery statistics per knowledge point.
     """
-    kp_stats: dict[str, dict[str, int]] = defaultdict(
-        lambda: {"correct": 0, "total": 0}
+    mastery_data = AssessmentFrame.from_submissions(submissions).class_mastery(
+        knowledge_point_ids
     )
 
-    for sub_data in submissions:
-        sub = SubmissionRecord(**sub_data) if isinstance(sub_data, dict) else sub_data
-        # Skip guest submissions — mastery analysis is for registered students only
-        if sub.submission_type == "guest":
-            continue
-        if not sub.items:
-            continue
-
-        for item in sub.items:
-            for kp_id in item.knowledge_point_ids:
-                if knowledge_point_ids and kp_id not in knowledge_point_ids:
-                    continue
-                kp_stats[kp_id]["total"] += 1
-                if item.correct:
-                    kp_stats[kp_id]["correct"] += 1
-
-    mastery_data = []
-    for kp_id, stats in kp_stats.items():
-        if stats["total"] > 0:
-            mastery_data.append({
-                "knowledgePointId": kp_id,
-                "masteryRate": round(stats["correct"] / stats["total"], 3),
-                "correctCount": stats["correct"],
-                "totalAttempts": stats["total"],
-            })
-
-    # Sort by mastery rate
-    mastery_data.sort(key=lambda x: x["masteryRate"])
-
     return {
         "knowledgePointMastery": mastery_data,
         "averageMastery": round(
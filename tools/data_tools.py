@@ -11,8 +11,9 @@ does not need changes.
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any
+from typing import Any, Callable
 
 from config.settings import get_settings
 from services.mock_data import CLASSES, CLASS_DETAILS, SUBMISSIONS, STUDENT_GRADES
@@ -133,13 +134,20 @@ async def get_class_detail(teacher_id: str, class_id: str) -> dict:
     if _should_use_mock():
         return _mock_class_detail(teacher_id, class_id)
 
+    assignments_task: asyncio.Future | None = None
     try:
         from adapters.class_adapter import get_detail, list_assignments
         client = _get_client()
+        # Detail and assignment list are independent — fetch them concurrently.
+        assignments_task = asyncio.ensure_future(list_assignments(client, teacher_id, class_id))
         detail = await get_detail(client, teacher_id, class_id)
     except ValueError:
+        if assignments_task is not None:
+            assignments_task.cancel()
         raise  # Null-data transient error — let PydanticAI retry
     except Exception as exc:
+        if assignments_task is not None:
+            assignments_task.cancel()
         logger.exception("get_class_detail failed")
         if _should_use_mock():
             return _mock_class_detail(teacher_id, class_id)
@@ -148,7 +156,7 @@ async def get_class_detail(teacher_id: str, class_id: str) -> dict:
     assignments = []
     assignment_warning = None
     try:
-        assignments = await list_assignments(client, teacher_id, class_id)
+        assignments = await assignments_task
     except Exception:
         # Keep class detail available even when assignment listing is temporarily down.
         logger.warning(
@@ -213,6 +221,65 @@ async def get_assignment_submissions(teacher_id: str, assignment_id: str) -> dic
         }
 
 
+async def stream_assignment_submissions(
+    teacher_id: str,
+    assignment_id: str,
+    on_page: Callable[[list[Any]], Any],
+) -> dict:
+    """Feed an assignment's submissions to *on_page* one page at a time.
+
+    Aggregating tools (``calculate_stats`` / ``analyze_student_weakness``
+    given an ``assignment_id``) use this with ``ScoreAccumulator`` or
+    ``AssessmentFrameBuilder`` instead of ``get_assignment_submissions``,
+    so the submission list is never materialized.
+
+    Returns:
+        Assignment metadata (no ``submissions`` / ``scores``), or an error
+        payload shaped like ``get_assignment_submissions``.
+    """
+    teacher_id = _normalize_teacher_id(teacher_id)
+    if not teacher_id:
+        logger.warning("stream_assignment_submissions called without teacher_id")
+        return {
+            "status": "error",
+            "reason": "teacher_id is required",
+            "teacher_id": teacher_id,
+            "assignment_id": assignment_id,
+        }
+    if _should_use_mock():
+        return _stream_mock_submissions(teacher_id, assignment_id, on_page)
+
+    try:
+        from adapters.submission_adapter import get_submissions
+        client = _get_client()
+        data = await get_submissions(client, teacher_id, assignment_id, on_page=on_page)
+        result = data.model_dump(exclude={"submissions", "scores"})
+        result["teacher_id"] = teacher_id
+        return result
+    except ValueError:
+        raise  # Null-data transient error — let PydanticAI retry
+    except Exception as exc:
+        logger.exception("stream_assignment_submissions failed")
+        return {
+            "status": "error",
+            "reason": str(exc),
+            "teacher_id": teacher_id,
+            "assignment_id": assignment_id,
+        }
+
+
+def _stream_mock_submissions(
+    teacher_id: str, assignment_id: str, on_page: Callable[[list[Any]], Any],
+) -> dict:
+    from models.data import SubmissionRecord
+
+    data = _mock_assignment_submissions(teacher_id, assignment_id)
+    if "error" in data:
+        return data
+    on_page([SubmissionRecord(**s) for s in data.get("submissions", [])])
+    return {k: v for k, v in data.items() if k not in ("submissions", "scores")}
+
+
 async def get_student_grades(teacher_id: str, student_id: str) -> dict:
     """Get all grades for a specific student.
 
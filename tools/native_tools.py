@@ -89,13 +89,38 @@ def _save_artifact(
     }
 
 
-async def _modify_interactive_html(original_html: str, instruction: str) -> str:
-    """Use the code model to modify interactive HTML based on a user instruction.
-
-    Called by ``regenerate_from_previous`` when the artifact is interactive.
-    The code model receives the original HTML and the modification request,
-    then returns the complete modified HTML.
-    """
+_HTML_PATCH_SYSTEM_PROMPT = (
+    "You are an expert HTML/CSS/JavaScript developer.\n"
+    "You will receive an existing HTML document and a modification instruction.\n"
+    "Apply the change as one or more SEARCH/REPLACE edits in exactly this format:\n"
+    "<<<<<<< SEARCH\n"
+    "(lines copied verbatim from the document)\n"
+    "=======\n"
+    "(replacement lines)\n"
+    ">>>>>>> REPLACE\n"
+    "Rules:\n"
+    "- Return ONLY edit blocks, no full document, no explanation.\n"
+    "- Each SEARCH must match exactly one place in the document; include just\n"
+    "  enough surrounding lines to make it unique.\n"
+    "- Keep the document self-contained (inline CSS/JS, CDN libs OK).\n"
+    "- Preserve all existing functionality unless the instruction says otherwise.\n"
+    "- If the instruction is ambiguous, make a reasonable choice."
+)
+
+_HTML_REGEN_SYSTEM_PROMPT = (
+    "You are an expert HTML/CSS/JavaScript developer.\n"
+    "You will receive an existing HTML document and a modification instruction.\n"
+    "Apply the requested change and return the COMPLETE modified HTML document.\n"
+    "Rules:\n"
+    "- Return ONLY the HTML code, no markdown fences, no explanation.\n"
+    "- Keep the document self-contained (inline CSS/JS, CDN libs OK).\n"
+    "- Preserve all existing functionality unless the instruction says otherwise.\n"
+    "- If the instruction is ambiguous, make a reasonable choice."
+)
+
+
+async def _run_code_model(system_prompt: str, user_prompt: str, max_tokens: int) -> str:
+    """Run the code-tier model once and return its text output."""
     from pydantic_ai import Agent
     from pydantic_ai.settings import ModelSettings
     from agents.provider import create_model, get_model_for_tier
@@ -104,41 +129,77 @@ async def _modify_interactive_html(original_html: str, instruction: str) -> str:
     model = create_model(code_model_name)
     agent: Agent[None, str] = Agent(
         model=model,
-        system_prompt=(
-            "You are an expert HTML/CSS/JavaScript developer.\n"
-            "You will receive an existing HTML document and a modification instruction.\n"
-            "Apply the requested change and return the COMPLETE modified HTML document.\n"
-            "Rules:\n"
-            "- Return ONLY the HTML code, no markdown fences, no explanation.\n"
-            "- Keep the document self-contained (inline CSS/JS, CDN libs OK).\n"
-            "- Preserve all existing functionality unless the instruction says otherwise.\n"
-            "- If the instruction is ambiguous, make a reasonable choice."
-        ),
+        system_prompt=system_prompt,
         output_type=str,
     )
     # Only send enable_thinking for Qwen (dashscope) models
-    settings_kwargs: dict = {"max_tokens": 16384}
+    settings_kwargs: dict = {"max_tokens": max_tokens}
     if code_model_name.startswith("dashscope/") or code_model_name.startswith("qwen"):
         settings_kwargs["extra_body"] = {"enable_thinking": False}
 
-    result = await agent.run(
-        f"## Original HTML\n```html\n{original_html}\n```\n\n"
-        f"## Modification Request\n{instruction}",
-        model_settings=ModelSettings(**settings_kwargs),
-    )
-    modified = result.output
+    result = await agent.run(user_prompt, model_settings=ModelSettings(**settings_kwargs))
+    return result.output
 
-    # Strip markdown code fences if the model wrapped the output
-    if modified.startswith("```"):
-        lines = modified.split("\n")
+
+def _strip_code_fences(text: str) -> str:
+    """Strip markdown code fences if the model wrapped the output."""
+    if text.startswith("```"):
+        lines = text.split("\n")
         # Remove first line (```html) and last line (```)
         if lines[-1].strip() == "```":
             lines = lines[1:-1]
         elif lines[0].startswith("```"):
             lines = lines[1:]
-        modified = "\n".join(lines)
+        text = "\n".join(lines)
+    return text
+
+
+async def _modify_interactive_html(original_html: str, instruction: str) -> str:
+    """Use the code model to modify interactive HTML based on a user instruction.
+
+    Called by ``regenerate_from_previous`` when the artifact is interactive.
+    The code model first returns targeted SEARCH/REPLACE edits which are
+    applied and validated locally (see ``services.html_patch``).  When the
+    edits cannot be parsed, applied or validated, the model regenerates the
+    complete document instead.
+    """
+    from config.settings import get_settings
+    from services.html_patch import HtmlPatchError, patch_html
+    from services.metrics import get_metrics_collector
 
-    return modified
+    settings = get_settings()
+    user_prompt = (
+        f"## Original HTML\n```html\n{original_html}\n```\n\n"
+        f"## Modification Request\n{instruction}"
+    )
+
+    if settings.interactive_html_patch_enabled:
+        try:
+            output = await _run_code_model(
+                _HTML_PATCH_SYSTEM_PROMPT,
+                user_prompt,
+                settings.interactive_html_patch_max_tokens,
+            )
+            patched, edit_count = patch_html(original_html, output)
+            get_metrics_collector().increment("interactive_html_edit", "patched")
+            logger.info(
+                "Interactive HTML patched: %d edit(s), %d output chars",
+                edit_count, len(output),
+            )
+            return patched
+        except HtmlPatchError as exc:
+            logger.info("Interactive HTML patch rejected, regenerating: %s", exc)
+        except Exception as exc:
+            logger.warning("Interactive HTML patch failed, regenerating: %s", exc)
+        get_metrics_collector().increment("interactive_html_edit", "fallback")
+
+    get_metrics_collector().increment("interactive_html_edit", "regenerated")
+    modified = await _run_code_model(
+        _HTML_REGEN_SYSTEM_PROMPT,
+        user_prompt,
+        settings.interactive_html_regen_max_tokens,
+    )
+    return _strip_code_fences(modified)
 
 
 # ---------------------------------------------------------------------------
@@ -261,13 +322,30 @@ async def resolve_entity(
 @register_tool(toolset="analysis")
 async def calculate_stats(
     ctx: RunContext[AgentDeps],
-    data: list[float],
+    data: list[float] | None = None,
     metrics: StrList = None,
+    max_score: float | None = None,
+    assignment_id: str = "",
 ) -> dict:
-    """Compute descriptive statistics (mean, median, stdev, etc.) on a numeric dataset."""
+    """Compute descriptive statistics (mean, median, stdev, etc.) on a numeric dataset.
+
+    Pass the assignment's max_score (full marks) so the distribution uses
+    percentage grade bands, e.g. for tests out of 20 or 150.
+    To analyze a whole assignment, pass assignment_id instead of data: scores
+    are then aggregated directly from the backend without listing submissions.
+    """
+    from tools.stats_tools import calculate_assignment_stats
     from tools.stats_tools import calculate_stats as _calc
 
-    result = _calc(data=data, metrics=metrics)
+    if assignment_id and not data:
+        teacher_id = ctx.deps.teacher_id
+        if not teacher_id:
+            return _error("teacher_id is required")
+        result = await calculate_assignment_stats(
+            teacher_id, assignment_id, metrics=metrics, max_score=max_score,
+        )
+    else:
+        result = _calc(data=data or [], metrics=metrics, max_score=max_score)
     if _is_error(result):
         return _forward_error(result)
     return _ok(result)
@@ -279,11 +357,23 @@ async def compare_performance(
     group_a: list[float],
     group_b: list[float],
     metrics: StrList = None,
+    max_score_a: float | None = None,
+    max_score_b: float | None = None,
 ) -> dict:
-    """Compare two groups of scores and return comparative statistics."""
+    """Compare two groups of scores and return comparative statistics.
+
+    When the groups come from assessments with different full marks, pass
+    both max scores to compare in percent.
+    """
     from tools.stats_tools import compare_performance as _compare
 
-    result = _compare(group_a=group_a, group_b=group_b, metrics=metrics)
+    result = _compare(
+        group_a=group_a,
+        group_b=group_b,
+        metrics=metrics,
+        max_score_a=max_score_a,
+        max_score_b=max_score_b,
+    )
     if _is_error(result):
         return _forward_error(result)
     return _ok(result)
@@ -295,8 +385,13 @@ async def analyze_student_weakness(
     class_id: str,
     subject: str = "",
     submissions: list[dict[str, Any]] | None = None,
+    assignment_id: str = "",
 ) -> dict:
-    """Identify common weakness areas across students in a class."""
+    """Identify common weakness areas across students in a class.
+
+    Pass assignment_id (instead of submissions) to analyze an assignment's
+    submissions fetched directly from the backend.
+    """
     from tools.assessment_tools import analyze_student_weakness as _analyze
 
     teacher_id = ctx.deps.teacher_id
@@ -307,7 +402,10 @@ async def analyze_student_weakness(
         class_id=class_id,
         subject=subject,
         submissions=submissions,
+        assignment_id=assignment_id,
     )
+    if _is_error(result):
+        return _forward_error(result)
     return _ok(result)
 
 
@@ -317,8 +415,13 @@ async def get_student_error_patterns(
     student_id: str,
     class_id: str = "",
     submissions: list[dict[str, Any]] | None = None,
+    assignment_id: str = "",
 ) -> dict:
-    """Detect recurring error patterns for a specific student."""
+    """Detect recurring error patterns for a specific student.
+
+    Pass assignment_id (instead of submissions) to analyze an assignment's
+    submissions fetched directly from the backend.
+    """
     from tools.assessment_tools import get_student_error_patterns as _patterns
 
     teacher_id = ctx.deps.teacher_id
@@ -329,7 +432,10 @@ async def get_student_error_patterns(
         student_id=student_id,
         class_id=class_id,
         submissions=submissions,
+        assignment_id=assignment_id,
     )
+    if _is_error(result):
+        return _forward_error(result)
     return _ok(result)
 
 
@@ -382,6 +488,8 @@ async def generate_quiz_questions(
         subject=subject,
         grade=grade,
         context=context,
+        teacher_id=ctx.deps.teacher_id,
+        conversation_id=ctx.deps.conversation_id,
     )
     artifact_meta = _save_artifact(
         conversation_id=ctx.deps.conversation_id,
@@ -500,7 +608,30 @@ async def render_pdf(
     return _ok({**result, **artifact_meta, "artifact_type": "document", "content_format": "html"})
 
 
-@register_tool(toolset="generation")
+_INTERACTIVE_HTML_COMPACT = """\
+Generate an interactive HTML web page rendered live in the browser
+(simulations, animations, drag-and-drop exercises, visual demos).
+
+Rules: fully self-contained — CSS in <style>, JS in <script>; HTTPS CDN libs OK
+(Chart.js, p5.js, D3.js, Three.js, Matter.js, marked.js are pre-loaded).
+Sandboxed iframe: no relative paths, guessed URLs or icon fonts — use Emoji,
+inline SVG, CSS shapes or data URIs for images.
+
+Platform APIs (optional):
+- `await InsightAI.chat(text, {role, scenario, instructions})` → reply text
+  (may be Markdown; render via `InsightAI.renderMarkdown`). Ask for 2-4
+  sentence plain-text replies in instructions.
+- `InsightAI.synthesize(text, {voice, lang, speed, onPlaying})` for natural
+  speech (voices: Tongtong, Chuichui, Xiaochen, Jam, Kazi, Douji, Luodo,
+  Kelly, Rocky); `InsightAI.stopSpeaking()`; `InsightAI.speak(text, {lang})`
+  only for single words. Speech must be user-triggered (🔊 button with
+  idle/loading/playing states) — never autoplay; speak the displayed text.
+- `await InsightAI.generateImage(prompt, {size})` → `{imageUrl}` for
+  backgrounds (1024x1024, 1792x1024, 1024x1792); show a loading state and
+  never invent image URLs."""
+
+
+@register_tool(toolset="generation", compact_description=_INTERACTIVE_HTML_COMPACT)
 async def generate_interactive_html(
     ctx: RunContext[AgentDeps],
     html: str,
@@ -860,7 +991,9 @@ async def generate_video(
     Create educational videos, animations, visual demonstrations.
     Duration: 5 or 10 seconds. Aspect ratios: 16:9, 9:16, 4:3, 1:1.
     Optionally provide image_url to animate an existing image into video.
-    Note: video generation takes 1-5 minutes — inform the user about the wait.
+    Note: video generation takes 1-5 minutes and runs in the background —
+    this returns a task handle immediately; tell the user the video will
+    appear when ready.
 
     Args:
         prompt: Detailed description of the video content and motion.
@@ -873,23 +1006,39 @@ async def generate_video(
         return _ok({"message": "Video already generated this turn.", "duplicate": True})
     ctx.deps._called_gen_tools.add(_tool_key)
 
-    from tools.volcengine_media import generate_video as _gen
+    from tools.volcengine_media import start_video_generation
 
-    result = await _gen(
+    conversation_id = ctx.deps.conversation_id
+
+    def _on_complete(task: Any) -> None:
+        if task.status != "succeeded":
+            return
+        task.result.update(_save_artifact(
+            conversation_id=conversation_id,
+            artifact_type="video",
+            content_format="url",
+            content={"video_url": task.result.get("video_url", ""), "prompt": prompt},
+        ))
+
+    result = await start_video_generation(
         prompt=prompt,
         duration=duration,
         aspect_ratio=aspect_ratio,
         image_url=image_url,
+        conversation_id=conversation_id,
+        on_complete=_on_complete,
     )
     if _is_error(result):
         return _forward_error(result)
-    artifact_meta = _save_artifact(
-        conversation_id=ctx.deps.conversation_id,
-        artifact_type="video",
-        content_format="url",
-        content={"video_url": result["video_url"], "prompt": prompt},
-    )
-    return _ok({**result, **artifact_meta, "artifact_type": "video", "content_format": "url"})
+    task_id = result["task_id"]
+    return _ok({
+        **result,
+        "media_task_id": task_id,
+        "task_status": "running",
+        "status_url": f"/api/media/tasks/{task_id}",
+        "events_url": f"/api/media/tasks/{task_id}/events",
+        "message": "Video generation started; it will appear when ready (1-5 minutes).",
+    })
 
 
 # ---------------------------------------------------------------------------
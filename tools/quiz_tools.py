@@ -3,6 +3,10 @@
 from __future__ import annotations
 
 
+def _never(events: list) -> bool:
+    return False
+
+
 async def generate_quiz_questions(
     topic: str,
     count: int = 10,
@@ -13,6 +17,8 @@ async def generate_quiz_questions(
     context: str = "",
     weakness_focus: list[str] | None = None,
     model_name: str = "",
+    teacher_id: str = "",
+    conversation_id: str = "",
 ) -> dict:
     """Generate quiz questions as a tool-call result for Unified Agent mode.
 
@@ -20,7 +26,17 @@ async def generate_quiz_questions(
     is pushed as a ``stream-item`` event so the SSE layer can emit
     ``data-quiz-question`` events incrementally instead of waiting for
     the entire batch to complete.
+
+    Identical requests within one teacher's conversation that arrive while
+    the first is still running share its LLM run.  Completed quizzes are
+    never replayed: asking again later is a request for new questions.
     """
+    from config.settings import get_settings
+    from services.generation_cache import (
+        data_version,
+        generation_fingerprint,
+        get_generation_cache,
+    )
     from services.tool_tracker import ToolEvent, current_tracker
     from skills.quiz_skill import generate_quiz
 
@@ -29,21 +45,41 @@ async def generate_quiz_questions(
     if weakness_focus is None:
         weakness_focus = []
 
+    async def produce():
+        async for question in generate_quiz(
+            topic=topic,
+            count=count,
+            difficulty=difficulty,
+            types=types,
+            subject=subject,
+            grade=grade,
+            context=context,
+            weakness_focus=weakness_focus,
+            model_name=model_name,
+        ):
+            yield question.model_dump(by_alias=True)
+
+    cache = get_generation_cache()
+    if cache is None:
+        source = produce()
+    else:
+        inputs = {
+            "topic": topic, "count": count, "difficulty": difficulty, "types": types,
+            "subject": subject, "grade": grade, "context": context,
+            "weakness_focus": weakness_focus, "conversation": conversation_id,
+        }
+        key = generation_fingerprint(
+            "quiz", inputs,
+            teacher_id=teacher_id,
+            model=model_name or get_settings().executor_model,
+            version=data_version(teacher_id),
+        )
+        source = cache.stream("quiz", key, produce, cacheable=_never)
+
     tracker = current_tracker.get()
 
     questions: list[dict] = []
-    async for question in generate_quiz(
-        topic=topic,
-        count=count,
-        difficulty=difficulty,
-        types=types,
-        subject=subject,
-        grade=grade,
-        context=context,
-        weakness_focus=weakness_focus,
-        model_name=model_name,
-    ):
-        q_dict = question.model_dump(by_alias=True)
+    async for q_dict in source:
         questions.append(q_dict)
 
         # Push incremental quiz-question event for real-time SSE streaming
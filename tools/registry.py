@@ -25,6 +25,7 @@ from pydantic_ai import Tool
 from pydantic_ai.toolsets import FunctionToolset
 
 from services.metrics import get_metrics_collector
+from services.tracing import span
 
 logger = logging.getLogger(__name__)
 
@@ -59,19 +60,46 @@ class RegisteredTool:
     func: Callable[..., Any]
     toolset: str
     description: str = ""
+    # Full docstring — the default schema description sent to the LLM.
+    extended_description: str = ""
+    # Short variant used when the prompt budget is tight.
+    compact_description: str = ""
 
 
 # Module-level registry
 _registry: dict[str, RegisteredTool] = {}
 
+# Whether ``tools.native_tools`` (the built-in tool chain) has been imported.
+_builtin_loaded = False
+
+
+def load_builtin_tools() -> None:
+    """Import ``tools.native_tools`` so its ``@register_tool`` calls run.
+
+    Idempotent.  The public getters call this on first use, so the import
+    (and the generation / RAG modules it pulls in) no longer has to happen
+    at worker boot; ``main`` warms it up in the background instead.
+    """
+    global _builtin_loaded
+    if _builtin_loaded:
+        return
+    import tools.native_tools  # noqa: F401
+
+    _builtin_loaded = True
+
 
 def register_tool(
     toolset: str,
     *,
     name: str | None = None,
+    compact_description: str | None = None,
 ):
     """Decorator to register a tool function with a toolset.
 
+    *compact_description* is the short schema description used when the
+    prompt budget forces compaction (see ``services/prompt_budget.py``).
+    Defaults to the first paragraph of the docstring.
+
     Usage::
 
         @register_tool(toolset="generation")
@@ -85,13 +113,20 @@ def register_tool(
 
     def decorator(func: Callable[..., Any]) -> Callable[..., Any]:
         tool_name = name or func.__name__
-        doc = (func.__doc__ or "").strip().split("\n")[0]
+        full_doc = _description_from_docstring(func.__doc__)
+        doc = full_doc.split("\n")[0]
         wrapped = _wrap_with_metrics(func, tool_name)
         _registry[tool_name] = RegisteredTool(
             name=tool_name,
             func=wrapped,
             toolset=toolset,
             description=doc,
+            extended_description=full_doc,
+            compact_description=(
+                compact_description.strip()
+                if compact_description
+                else full_doc.split("\n\n")[0]
+            ),
         )
         return wrapped
 
@@ -101,17 +136,30 @@ def register_tool(
 # ── Public API ──────────────────────────────────────────────
 
 
-def get_tools(toolsets: Sequence[str]) -> FunctionToolset:
+def get_tools(
+    toolsets: Sequence[str],
+    descriptions: dict[str, str] | None = None,
+) -> FunctionToolset:
     """Return a PydanticAI FunctionToolset containing tools from the given toolsets.
 
     Args:
         toolsets: List of toolset names to include.
+        descriptions: Optional per-tool description overrides (tool name →
+            description), e.g. the compact variants chosen by the prompt
+            budget.  Tools not listed keep their docstring.
 
     Returns:
         A ``FunctionToolset`` ready to pass to ``Agent(toolsets=[...])``.
     """
+    load_builtin_tools()
+    descriptions = descriptions or {}
     selected = [
-        Tool(rt.func, name=rt.name, max_retries=2)
+        Tool(
+            rt.func,
+            name=rt.name,
+            description=descriptions.get(rt.name),
+            max_retries=2,
+        )
         for rt in _registry.values()
         if rt.toolset in toolsets
     ]
@@ -124,6 +172,7 @@ def get_tools_raw(toolsets: Sequence[str]) -> list[RegisteredTool]:
     Used by NativeAgent to wrap tools with ToolTracker before building
     a FunctionToolset.
     """
+    load_builtin_tools()
     return [
         rt for rt in _registry.values()
         if rt.toolset in toolsets
@@ -132,6 +181,7 @@ def get_tools_raw(toolsets: Sequence[str]) -> list[RegisteredTool]:
 
 def get_all_tools() -> FunctionToolset:
     """Return a FunctionToolset containing ALL registered tools."""
+    load_builtin_tools()
     all_tools = [
         Tool(rt.func, name=rt.name, max_retries=2)
         for rt in _registry.values()
@@ -141,6 +191,7 @@ def get_all_tools() -> FunctionToolset:
 
 def get_tool_names(toolsets: Sequence[str] | None = None) -> list[str]:
     """Return tool names, optionally filtered by toolset."""
+    load_builtin_tools()
     if toolsets is None:
         return list(_registry.keys())
     return [
@@ -151,6 +202,7 @@ def get_tool_names(toolsets: Sequence[str] | None = None) -> list[str]:
 
 def get_tool_descriptions() -> list[dict[str, str]]:
     """Return name + description for every registered tool."""
+    load_builtin_tools()
     return [
         {"name": rt.name, "description": rt.description, "toolset": rt.toolset}
         for rt in _registry.values()
@@ -159,17 +211,33 @@ def get_tool_descriptions() -> list[dict[str, str]]:
 
 def get_registered_count() -> int:
     """Return the number of registered tools."""
+    load_builtin_tools()
     return len(_registry)
 
 
 def get_toolset_counts() -> dict[str, int]:
     """Return tool count per toolset."""
+    load_builtin_tools()
     counts: dict[str, int] = {}
     for rt in _registry.values():
         counts[rt.toolset] = counts.get(rt.toolset, 0) + 1
     return counts
 
 
+def _description_from_docstring(doc: str | None) -> str:
+    """Return the description part of a docstring (``Args:`` section excluded).
+
+    Mirrors what PydanticAI sends as the tool description — parameter docs
+    travel separately inside the JSON schema.
+    """
+    text = inspect.cleandoc(doc or "")
+    for marker in ("\nArgs:\n", "\nReturns:\n"):
+        idx = text.find(marker)
+        if idx != -1:
+            text = text[:idx]
+    return text.strip()
+
+
 def _wrap_with_metrics(func: Callable[..., Any], tool_name: str) -> Callable[..., Any]:
     if not inspect.iscoroutinefunction(func):
         return func
@@ -189,23 +257,29 @@ def _wrap_with_metrics(func: Callable[..., Any], tool_name: str) -> Callable[...
             turn_id = str(getattr(deps, "turn_id", "") or "")
             conversation_id = str(getattr(deps, "conversation_id", "") or "")
 
-        try:
-            result = await func(*args, **kwargs)
-            if isinstance(result, dict):
-                status = str(result.get("status", "ok"))
-            return result
-        except Exception:
-            status = "error"
-            logger.exception("tool %s raised an unhandled exception", tool_name)
-            raise
-        finally:
-            latency_ms = (time.monotonic() - start) * 1000
-            get_metrics_collector().record_tool_call(
-                tool_name=tool_name,
-                status=status,
-                latency_ms=latency_ms,
-                turn_id=turn_id,
-                conversation_id=conversation_id,
-            )
+        with span(f"tool {tool_name}", {
+            "tool.name": tool_name,
+            "turn.id": turn_id,
+            "conversation.id": conversation_id,
+        }) as tool_span:
+            try:
+                result = await func(*args, **kwargs)
+                if isinstance(result, dict):
+                    status = str(result.get("status", "ok"))
+                return result
+            except Exception:
+                status = "error"
+                logger.exception("tool %s raised an unhandled exception", tool_name)
+                raise
+            finally:
+                tool_span.set_attribute("tool.status", status)
+                latency_ms = (time.monotonic() - start) * 1000
+                get_metrics_collector().record_tool_call(
+                    tool_name=tool_name,
+                    status=status,
+                    latency_ms=latency_ms,
+                    turn_id=turn_id,
+                    conversation_id=conversation_id,
+                )
 
     return wrapped
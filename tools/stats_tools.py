@@ -2,29 +2,147 @@
 
 These produce the numeric KPIs and distributions that AI narrative
 is built on. Numbers from these tools are authoritative.
+
+Scores can be normalized by ``max_score`` so assignments out of 20 or 150
+land in the same percentage grade bands.  ``ScoreSummary`` is a mergeable
+accumulator (count / mean / M2 / min / max / quantile sketch / band
+counts) that lets class- and assignment-level summaries be combined into
+grade-level views without reprocessing raw scores.
 """
 
-from typing import Any
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Iterable
 
 import numpy as np
 
+# Percentage grade bands used for distributions of normalized scores.
+GRADE_BAND_EDGES = [0, 40, 50, 60, 70, 80, 90, 100]
+GRADE_BAND_LABELS = ["0-39", "40-49", "50-59", "60-69", "70-79", "80-89", "90-100"]
+
+# Upper bound on adaptive histogram bins.
+MAX_ADAPTIVE_BINS = 10
+
+# Centroids kept by a QuantileSketch; below this size it is exact.
+DEFAULT_SKETCH_CAPACITY = 1024
+
+DEFAULT_METRICS = ["mean", "median", "stddev", "min", "max", "percentiles", "distribution"]
+_PERCENTILES = {"p25": 25, "p50": 50, "p75": 75, "p90": 90}
+
+
+def normalize_scores(data: Iterable[float | int], max_score: float) -> np.ndarray:
+    """Convert raw scores to percentages of *max_score*."""
+    if max_score <= 0:
+        raise ValueError("max_score must be positive")
+    return np.asarray(list(data), dtype=float) * (100.0 / max_score)
+
+
+def _nice_step(span: float, bins: int) -> float:
+    """Round ``span / bins`` up to 1, 2, 2.5 or 5 × 10^k."""
+    raw = span / bins
+    magnitude = 10 ** np.floor(np.log10(raw))
+    for factor in (1, 2, 2.5, 5, 10):
+        if raw <= factor * magnitude:
+            return float(factor * magnitude)
+    return float(10 * magnitude)
+
+
+def _format_edge(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else f"{value:g}"
+
+
+def adaptive_bins(arr: np.ndarray) -> tuple[list[float], list[str]]:
+    """Histogram edges and labels fitted to the data range.
+
+    Uses numpy's ``auto`` estimator for the bin count (capped at
+    ``MAX_ADAPTIVE_BINS``) and snaps edges to round numbers.
+    """
+    lo, hi = float(np.min(arr)), float(np.max(arr))
+    if hi == lo:
+        return [lo, lo + 1], [_format_edge(lo)]
+    estimated = len(np.histogram_bin_edges(arr, bins="auto")) - 1
+    bins = max(1, min(MAX_ADAPTIVE_BINS, estimated))
+    step = _nice_step(hi - lo, bins)
+    start = float(np.floor(lo / step) * step)
+    edges = [start]
+    while edges[-1] <= hi:
+        edges.append(round(edges[-1] + step, 10))
+    labels = [f"{_format_edge(a)}-{_format_edge(b)}" for a, b in zip(edges, edges[1:])]
+    return edges, labels
 
-def calculate_stats(data: list[float | int], metrics: list[str] | None = None) -> dict:
+
+def _distribution(
+    arr: np.ndarray,
+    binning: str,
+    normalized: bool,
+    weights: np.ndarray | None = None,
+) -> dict[str, Any]:
+    """Histogram of *arr*; *weights* count each value (sketch centroids)."""
+    use_grade = binning == "grade" or (
+        binning == "auto"
+        and (normalized or (float(np.min(arr)) >= 0 and float(np.max(arr)) <= 100))
+    )
+    if use_grade:
+        counts, _ = np.histogram(arr, bins=GRADE_BAND_EDGES, weights=weights)
+        return {
+            "labels": list(GRADE_BAND_LABELS),
+            "counts": [int(round(c)) for c in counts],
+            "unit": "percent" if normalized else "score",
+        }
+    edges, labels = adaptive_bins(arr)
+    counts, _ = np.histogram(arr, bins=edges, weights=weights)
+    return {"labels": labels, "counts": [int(round(c)) for c in counts], "unit": "score"}
+
+
+def _kpi_summary(result: dict[str, Any], unit: str = "score") -> list[dict[str, Any]]:
+    # Phase 7: Add summary field for kpi_grid component compatibility
+    if unit == "percent":
+        return [
+            {"label": "平均得分率", "value": result.get("mean", 0), "unit": "%"},
+            {"label": "最高得分率", "value": result.get("max", 0), "unit": "%"},
+            {"label": "最低得分率", "value": result.get("min", 0), "unit": "%"},
+            {"label": "标准差", "value": result.get("stddev", 0), "unit": "%"},
+            {"label": "样本数", "value": result.get("count", 0), "unit": "人"},
+        ]
+    return [
+        {"label": "平均分", "value": result.get("mean", 0), "unit": "分"},
+        {"label": "最高分", "value": result.get("max", 0), "unit": "分"},
+        {"label": "最低分", "value": result.get("min", 0), "unit": "分"},
+        {"label": "标准差", "value": result.get("stddev", 0), "unit": ""},
+        {"label": "样本数", "value": result.get("count", 0), "unit": "人"},
+    ]
+
+
+def calculate_stats(
+    data: list[float | int],
+    metrics: list[str] | None = None,
+    max_score: float | None = None,
+    binning: str = "auto",
+) -> dict:
     """Calculate descriptive statistics for a numeric dataset.
 
     Args:
         data: List of numeric values (e.g. student scores).
         metrics: Which metrics to compute. Defaults to all.
             Supported: mean, median, stddev, min, max, percentiles, distribution.
+        max_score: Full marks of the assessment.  When given, a
+            ``normalized`` block (percent of max_score) is added and the
+            distribution uses percentage grade bands.
+        binning: Distribution bins — ``"grade"`` (fixed 0-39 … 90-100
+            bands), ``"adaptive"`` (fitted to the data range) or ``"auto"``
+            (grade bands for normalized or 0-100 data, adaptive otherwise).
 
     Returns:
         Dictionary of computed metric results.
     """
     if not data:
         return {"error": "Empty data list"}
+    if max_score is not None and max_score <= 0:
+        return {"error": "max_score must be positive"}
 
     arr = np.array(data, dtype=float)
-    all_metrics = metrics or ["mean", "median", "stddev", "min", "max", "percentiles", "distribution"]
+    all_metrics = metrics or DEFAULT_METRICS
 
     result: dict[str, Any] = {"count": len(data)}
 
@@ -40,55 +158,379 @@ def calculate_stats(data: list[float | int], metrics: list[str] | None = None) -
         result["max"] = round(float(np.max(arr)), 2)
     if "percentiles" in all_metrics:
         result["percentiles"] = {
-            "p25": round(float(np.percentile(arr, 25)), 2),
-            "p50": round(float(np.percentile(arr, 50)), 2),
-            "p75": round(float(np.percentile(arr, 75)), 2),
-            "p90": round(float(np.percentile(arr, 90)), 2),
+            key: round(float(np.percentile(arr, q)), 2) for key, q in _PERCENTILES.items()
         }
-    if "distribution" in all_metrics:
-        bins = [0, 40, 50, 60, 70, 80, 90, 100]
-        labels = ["0-39", "40-49", "50-59", "60-69", "70-79", "80-89", "90-100"]
-        counts, _ = np.histogram(arr, bins=bins)
-        result["distribution"] = {
-            "labels": labels,
-            "counts": [int(c) for c in counts],
+
+    pct = arr * (100.0 / max_score) if max_score else None
+    if pct is not None:
+        result["max_score"] = max_score
+        result["normalized"] = {
+            "mean_pct": round(float(np.mean(pct)), 2),
+            "median_pct": round(float(np.median(pct)), 2),
+            "min_pct": round(float(np.min(pct)), 2),
+            "max_pct": round(float(np.max(pct)), 2),
         }
+    if "distribution" in all_metrics:
+        result["distribution"] = _distribution(
+            pct if pct is not None else arr, binning, normalized=pct is not None
+        )
 
-    # Phase 7: Add summary field for kpi_grid component compatibility
     if "summary" in all_metrics or "mean" in all_metrics:
-        result["summary"] = [
-            {"label": "平均分", "value": result.get("mean", 0), "unit": "分"},
-            {"label": "最高分", "value": result.get("max", 0), "unit": "分"},
-            {"label": "最低分", "value": result.get("min", 0), "unit": "分"},
-            {"label": "标准差", "value": result.get("stddev", 0), "unit": ""},
-            {"label": "样本数", "value": result.get("count", 0), "unit": "人"},
-        ]
+        result["summary"] = _kpi_summary(result)
 
     return result
 
 
-def compare_performance(
-    group_a: list[float | int],
-    group_b: list[float | int],
+# ── Mergeable accumulators ──────────────────────────────────
+
+
+@dataclass(eq=False)
+class QuantileSketch:
+    """Mergeable quantile sketch of weighted centroids.
+
+    Keeps every value (exact quantiles) until more than *capacity*
+    distinct centroids accumulate, then compresses to *capacity*
+    equal-weight centroids.  Quantiles interpolate linearly between
+    centroid positions, matching ``np.percentile`` while exact.
+    """
+
+    capacity: int = DEFAULT_SKETCH_CAPACITY
+    means: np.ndarray = field(default_factory=lambda: np.empty(0))
+    weights: np.ndarray = field(default_factory=lambda: np.empty(0))
+
+    @property
+    def exact(self) -> bool:
+        return bool(np.all(self.weights == 1))
+
+    @property
+    def count(self) -> float:
+        return float(self.weights.sum())
+
+    def add_many(self, values: np.ndarray) -> None:
+        values = np.asarray(values, dtype=float)
+        self._absorb(values, np.ones(values.size))
+
+    def merge(self, other: QuantileSketch) -> None:
+        self._absorb(other.means, other.weights)
+
+    def _absorb(self, means: np.ndarray, weights: np.ndarray) -> None:
+        all_means = np.concatenate([self.means, means])
+        all_weights = np.concatenate([self.weights, weights])
+        order = np.argsort(all_means, kind="stable")
+        self.means, self.weights = all_means[order], all_weights[order]
+        if self.means.size > self.capacity:
+            self._compress()
+
+    def _compress(self) -> None:
+        cum = np.cumsum(self.weights)
+        total = cum[-1]
+        # Group centroids into `capacity` buckets of ~equal weight.
+        bucket = np.minimum(
+            ((cum - self.weights / 2) / total * self.capacity).astype(int),
+            self.capacity - 1,
+        )
+        weights = np.bincount(bucket, weights=self.weights, minlength=self.capacity)
+        sums = np.bincount(bucket, weights=self.means * self.weights, minlength=self.capacity)
+        keep = weights > 0
+        self.weights = weights[keep]
+        self.means = sums[keep] / self.weights
+
+    def quantile(self, q: float) -> float:
+        """Estimate the *q*-th quantile (0 ≤ q ≤ 1)."""
+        if self.means.size == 0:
+            return float("nan")
+        if self.exact:
+            return float(np.percentile(self.means, q * 100))
+        # Centroid positions on the 0..n-1 rank scale.
+        positions = np.cumsum(self.weights) - (self.weights + 1) / 2
+        rank = q * (self.count - 1)
+        return float(np.interp(rank, positions, self.means))
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "capacity": self.capacity,
+            "means": self.means.tolist(),
+            "weights": self.weights.tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> QuantileSketch:
+        return cls(
+            capacity=int(data.get("capacity", DEFAULT_SKETCH_CAPACITY)),
+            means=np.asarray(data.get("means", []), dtype=float),
+            weights=np.asarray(data.get("weights", []), dtype=float),
+        )
+
+
+@dataclass(eq=False)
+class ScoreSummary:
+    """Mergeable summary of a score set.
+
+    ``count``/``mean``/``m2`` follow Welford/Chan so merged variance is
+    exact; ``band_counts`` are exact grade-band histogram counts when the
+    summary is normalized (``unit == "percent"``).  Summaries in different
+    units cannot be merged — normalize by ``max_score`` when combining
+    assessments with different full marks.
+    """
+
+    unit: str = "score"  # "score" (raw) | "percent" (normalized by max_score)
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: float = float("inf")
+    max: float = float("-inf")
+    sketch: QuantileSketch = field(default_factory=QuantileSketch)
+    band_counts: list[int] = field(default_factory=lambda: [0] * len(GRADE_BAND_LABELS))
+
+    @classmethod
+    def from_scores(
+        cls,
+        data: Iterable[float | int],
+        max_score: float | None = None,
+        *,
+        sketch_capacity: int = DEFAULT_SKETCH_CAPACITY,
+    ) -> ScoreSummary:
+        """Summarize raw scores in one vectorized pass.
+
+        With *max_score* the summary is kept in percent so it can be merged
+        with summaries of assessments that have different full marks.
+        """
+        arr = (
+            normalize_scores(data, max_score)
+            if max_score
+            else np.asarray(list(data), dtype=float)
+        )
+        summary = cls(
+            unit="percent" if max_score else "score",
+            sketch=QuantileSketch(capacity=sketch_capacity),
+        )
+        if arr.size == 0:
+            return summary
+        summary.count = int(arr.size)
+        summary.mean = float(np.mean(arr))
+        summary.m2 = float(np.sum((arr - summary.mean) ** 2))
+        summary.min = float(np.min(arr))
+        summary.max = float(np.max(arr))
+        summary.sketch.add_many(arr)
+        if max_score:
+            counts, _ = np.histogram(arr, bins=GRADE_BAND_EDGES)
+            summary.band_counts = [int(c) for c in counts]
+        return summary
+
+    def merge(self, other: ScoreSummary) -> ScoreSummary:
+        """Return a new summary combining *self* and *other*."""
+        if other.count and self.count and other.unit != self.unit:
+            raise ValueError(f"cannot merge {self.unit!r} summary with {other.unit!r}")
+        if not other.count:
+            return self._copy()
+        if not self.count:
+            return other._copy()
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        sketch = QuantileSketch(capacity=max(self.sketch.capacity, other.sketch.capacity))
+        sketch.merge(self.sketch)
+        sketch.merge(other.sketch)
+        return ScoreSummary(
+            unit=self.unit,
+            count=n,
+            mean=self.mean + delta * other.count / n,
+            m2=self.m2 + other.m2 + delta * delta * self.count * other.count / n,
+            min=min(self.min, other.min),
+            max=max(self.max, other.max),
+            sketch=sketch,
+            band_counts=[a + b for a, b in zip(self.band_counts, other.band_counts)],
+        )
+
+    def _copy(self) -> ScoreSummary:
+        return ScoreSummary.from_dict(self.to_dict())
+
+    @classmethod
+    def combine(cls, summaries: Iterable[ScoreSummary]) -> ScoreSummary:
+        """Merge many summaries (e.g. every class in a grade)."""
+        result = cls()
+        for summary in summaries:
+            if not result.count:
+                result = summary._copy()
+            else:
+                result = result.merge(summary)
+        return result
+
+    @property
+    def stddev(self) -> float:
+        """Sample standard deviation (ddof=1), as ``calculate_stats``."""
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else 0.0
+
+    def to_stats(self, metrics: list[str] | None = None) -> dict[str, Any]:
+        """Render in the ``calculate_stats`` result format."""
+        if not self.count:
+            return {"error": "Empty data list"}
+        all_metrics = metrics or DEFAULT_METRICS
+        result: dict[str, Any] = {"count": self.count}
+        if "mean" in all_metrics:
+            result["mean"] = round(self.mean, 2)
+        if "median" in all_metrics:
+            result["median"] = round(self.sketch.quantile(0.5), 2)
+        if "stddev" in all_metrics:
+            result["stddev"] = round(self.stddev, 2)
+        if "min" in all_metrics:
+            result["min"] = round(self.min, 2)
+        if "max" in all_metrics:
+            result["max"] = round(self.max, 2)
+        if "percentiles" in all_metrics:
+            result["percentiles"] = {
+                key: round(self.sketch.quantile(q / 100), 2) for key, q in _PERCENTILES.items()
+            }
+        if "distribution" in all_metrics and self.unit == "percent":
+            result["distribution"] = {
+                "labels": list(GRADE_BAND_LABELS),
+                "counts": list(self.band_counts),
+                "unit": "percent",
+            }
+        if "summary" in all_metrics or "mean" in all_metrics:
+            result["summary"] = _kpi_summary(result, self.unit)
+        if self.unit == "percent":
+            result["unit"] = "percent"
+        if not self.sketch.exact:
+            result["approximate_quantiles"] = True
+        return result
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-serializable form (for caching per class/assignment)."""
+        return {
+            "unit": self.unit,
+            "count": self.count,
+            "mean": self.mean,
+            "m2": self.m2,
+            "min": self.min,
+            "max": self.max,
+            "sketch": self.sketch.to_dict(),
+            "band_counts": list(self.band_counts),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ScoreSummary:
+        return cls(
+            unit=data.get("unit", "score"),
+            count=int(data.get("count", 0)),
+            mean=float(data.get("mean", 0.0)),
+            m2=float(data.get("m2", 0.0)),
+            min=float(data.get("min", float("inf"))),
+            max=float(data.get("max", float("-inf"))),
+            sketch=QuantileSketch.from_dict(data.get("sketch", {})),
+            band_counts=list(data.get("band_counts", [0] * len(GRADE_BAND_LABELS))),
+        )
+
+
+class ScoreAccumulator:
+    """Incrementally build a ``ScoreSummary`` from batches of scores.
+
+    Used as an ``on_page`` hook when iterating paginated submissions, so
+    class-wide statistics never need the full score list in memory::
+
+        acc = ScoreAccumulator(max_score=100)
+        await get_submissions(client, tid, aid, on_page=acc.add_records)
+        stats = acc.summary.to_stats()
+    """
+
+    def __init__(
+        self,
+        max_score: float | None = None,
+        *,
+        sketch_capacity: int = DEFAULT_SKETCH_CAPACITY,
+    ) -> None:
+        self.max_score = max_score
+        self.sketch_capacity = sketch_capacity
+        self.summary = ScoreSummary(
+            unit="percent" if max_score else "score",
+            sketch=QuantileSketch(capacity=sketch_capacity),
+        )
+
+    def add(self, scores: Iterable[float | int]) -> None:
+        batch = ScoreSummary.from_scores(
+            scores, self.max_score, sketch_capacity=self.sketch_capacity,
+        )
+        if batch.count:
+            self.summary = self.summary.merge(batch)
+
+    def add_records(self, records: Iterable[Any]) -> None:
+        """Add the non-null ``score`` of each submission record."""
+        self.add(r.score for r in records if r.score is not None)
+
+
+async def calculate_assignment_stats(
+    teacher_id: str,
+    assignment_id: str,
     metrics: list[str] | None = None,
+    max_score: float | None = None,
+    binning: str = "auto",
 ) -> dict:
-    """Compare performance between two groups of scores.
-
-    Args:
-        group_a: First group of numeric scores.
-        group_b: Second group of numeric scores.
-        metrics: Which metrics to compare. Defaults to ["mean", "median", "stddev"].
+    """``calculate_stats`` over an assignment's scores, streamed page by page.
 
-    Returns:
-        Dictionary with stats for each group, differences, and a summary.
+    Scores are fed into a ``ScoreAccumulator`` as each page of submissions
+    arrives, so the cohort is never held in memory.  The result has the
+    same shape and scale as ``calculate_stats`` on the full score list;
+    quantiles and the distribution become approximate (flagged with
+    ``approximate_quantiles``) past the sketch capacity.
     """
-    if not group_a or not group_b:
+    from tools.data_tools import stream_assignment_submissions
+
+    if max_score is not None and max_score <= 0:
+        return {"error": "max_score must be positive"}
+    acc = ScoreAccumulator()
+    meta = await stream_assignment_submissions(teacher_id, assignment_id, acc.add_records)
+    if meta.get("status") == "error" or meta.get("error"):
+        return meta
+    result = _summary_stats(acc.summary, metrics, max_score, binning)
+    if "error" not in result:
+        result["assignment_id"] = assignment_id
+    return result
+
+
+def _summary_stats(
+    summary: ScoreSummary,
+    metrics: list[str] | None,
+    max_score: float | None,
+    binning: str,
+) -> dict[str, Any]:
+    """``calculate_stats`` output from a raw-scale (``unit == "score"``) summary."""
+    result = summary.to_stats(metrics)
+    if "error" in result:
+        return result
+    all_metrics = metrics or DEFAULT_METRICS
+    sketch = summary.sketch
+    values = sketch.means
+    if max_score:
+        scale = 100.0 / max_score
+        values = values * scale
+        result["max_score"] = max_score
+        result["normalized"] = {
+            "mean_pct": round(summary.mean * scale, 2),
+            "median_pct": round(sketch.quantile(0.5) * scale, 2),
+            "min_pct": round(summary.min * scale, 2),
+            "max_pct": round(summary.max * scale, 2),
+        }
+    if "distribution" in all_metrics:
+        result["distribution"] = _distribution(
+            values, binning, normalized=bool(max_score),
+            weights=None if sketch.exact else sketch.weights,
+        )
+    return result
+
+
+def compare_summaries(
+    summary_a: ScoreSummary,
+    summary_b: ScoreSummary,
+    metrics: list[str] | None = None,
+) -> dict:
+    """Compare two precomputed summaries (see ``compare_performance``)."""
+    if not summary_a.count or not summary_b.count:
         return {"error": "Both groups must be non-empty"}
+    if summary_a.unit != summary_b.unit:
+        return {"error": "Both groups must use the same unit (normalize by max_score)"}
 
     compare_metrics = metrics or ["mean", "median", "stddev"]
-
-    stats_a = calculate_stats(group_a, compare_metrics)
-    stats_b = calculate_stats(group_b, compare_metrics)
+    stats_a = summary_a.to_stats(compare_metrics)
+    stats_b = summary_b.to_stats(compare_metrics)
 
     diff: dict[str, float] = {}
     for key in compare_metrics:
@@ -104,3 +546,39 @@ def compare_performance(
             "group_b_count": stats_b.get("count", 0),
         },
     }
+
+
+def compare_performance(
+    group_a: list[float | int],
+    group_b: list[float | int],
+    metrics: list[str] | None = None,
+    max_score_a: float | None = None,
+    max_score_b: float | None = None,
+) -> dict:
+    """Compare performance between two groups of scores.
+
+    Args:
+        group_a: First group of numeric scores.
+        group_b: Second group of numeric scores.
+        metrics: Which metrics to compare. Defaults to ["mean", "median", "stddev"].
+        max_score_a: Full marks for group A.  Give both max scores to compare
+            in percent (e.g. a test out of 20 against one out of 150).
+        max_score_b: Full marks for group B (defaults to max_score_a).
+
+    Returns:
+        Dictionary with stats for each group, differences, and a summary.
+    """
+    if not group_a or not group_b:
+        return {"error": "Both groups must be non-empty"}
+    if any(m is not None and m <= 0 for m in (max_score_a, max_score_b)):
+        return {"error": "max_score must be positive"}
+    max_score_b = max_score_b or max_score_a
+    if bool(max_score_a) != bool(max_score_b):
+        return {"error": "Give max_score for both groups or neither"}
+
+    # One vectorized pass per group; metrics are derived from the summaries.
+    return compare_summaries(
+        ScoreSummary.from_scores(group_a, max_score_a),
+        ScoreSummary.from_scores(group_b, max_score_b),
+        metrics,
+    )
@@ -2,6 +2,9 @@
 
 The Java backend handles: DashScope API call → file storage → database record.
 AI Agent passes raw CosyVoice voice IDs — no mapping needed.
+
+Identical text / voice / language / speed combinations are served from the
+media result cache (``services.media_cache``) instead of re-synthesizing.
 """
 
 from __future__ import annotations
@@ -9,6 +12,8 @@ from __future__ import annotations
 import logging
 from typing import Any
 
+from services.media_cache import get_media_cache, normalize_text
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,9 +29,14 @@ async def synthesize_speech(
     language: str = "zh-CN",
     speed: float = 1.0,
     title: str = "",
+    use_cache: bool = True,
 ) -> dict[str, Any]:
     """Call Java backend TTS endpoint to synthesize audio.
 
+    Results are cached by normalized text + voice + language + speed (the
+    title only labels the Java record and is not part of the key).  Pass
+    ``use_cache=False`` to force a fresh synthesis.
+
     Returns:
         {"status": "ok", "task_id": str, "audio_url": str, "duration": int, ...}
         or {"status": "error", "reason": str}
@@ -36,6 +46,43 @@ async def synthesize_speech(
     if len(text) > 3000:
         return {"status": "error", "reason": "text exceeds 3000 characters"}
 
+    async def _synthesize() -> dict[str, Any]:
+        return await _synthesize_uncached(
+            text=text, voice=voice, language=language, speed=speed, title=title,
+        )
+
+    cache = get_media_cache() if use_cache else None
+    if cache is None:
+        return await _synthesize()
+
+    from config.settings import get_settings
+
+    inputs = {
+        "text": normalize_text(text),
+        "voice": voice.strip(),
+        "language": language.strip().lower(),
+        "speed": round(float(speed), 2),
+    }
+    result = await cache.get_or_create(
+        "tts",
+        inputs,
+        _synthesize,
+        ttl_s=get_settings().media_cache_tts_ttl_s,
+        cacheable=lambda r: r.get("status") == "ok" and bool(r.get("audio_url")),
+    )
+    if result.get("cached") and title:
+        result["title"] = title
+    return result
+
+
+async def _synthesize_uncached(
+    *,
+    text: str,
+    voice: str,
+    language: str,
+    speed: float,
+    title: str,
+) -> dict[str, Any]:
     try:
         client = _get_client()
         response = await client.post("/text-to-speech", json_body={
@@ -9,6 +9,8 @@ Image generation (Seedream):
 Video generation (Seedance):
   ``client.content_generation.tasks.create(model, content, duration, ratio)``
   → async task → poll ``tasks.get(task_id)`` until succeeded/failed.
+  Polling is done centrally by ``services.media_tasks`` so callers get a
+  task handle back immediately (``start_video_generation``).
 
 Response type reference (from SDK):
   ContentGenerationTask.content.video_url  — generated video URL
@@ -18,10 +20,12 @@ Response type reference (from SDK):
 
 from __future__ import annotations
 
-import asyncio
 import logging
 from functools import lru_cache
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable
+
+if TYPE_CHECKING:
+    from services.media_tasks import MediaTask
 
 logger = logging.getLogger(__name__)
 
@@ -50,9 +54,15 @@ async def generate_image(
     size: str = "1024x1024",
     model: str = "",
     seed: int = -1,
+    use_cache: bool = True,
 ) -> dict[str, Any]:
     """Generate an image from a text prompt using Seedream.
 
+    Results are cached by normalized prompt + size + model + seed (see
+    ``services.media_cache``); pass ``use_cache=False`` for a fresh image.
+    With a random seed (``seed < 0``) concurrent duplicates still share one
+    call, but the image is not kept for later requests.
+
     Returns:
         {"status": "ok", "image_url": str, "model": str, "prompt": str, "size": str}
         or {"status": "error", "reason": str}
@@ -61,9 +71,40 @@ async def generate_image(
         return {"status": "error", "reason": "prompt is required"}
 
     from config.settings import get_settings
+    from services.media_cache import get_media_cache, normalize_text
+
     settings = get_settings()
     model = model or settings.ark_image_model
 
+    async def _generate() -> dict[str, Any]:
+        return await _generate_image_uncached(prompt=prompt, size=size, model=model, seed=seed)
+
+    cache = get_media_cache() if use_cache else None
+    if cache is None:
+        return await _generate()
+
+    inputs = {
+        "prompt": normalize_text(prompt),
+        "size": size.strip().lower(),
+        "model": model,
+        "seed": seed if seed >= 0 else -1,
+    }
+    return await cache.get_or_create(
+        "image",
+        inputs,
+        _generate,
+        ttl_s=settings.media_cache_image_ttl_s,
+        cacheable=lambda r: seed >= 0 and r.get("status") == "ok" and bool(r.get("image_url")),
+    )
+
+
+async def _generate_image_uncached(
+    *,
+    prompt: str,
+    size: str,
+    model: str,
+    seed: int,
+) -> dict[str, Any]:
     try:
         client = _get_ark_client()
 
@@ -74,7 +115,7 @@ async def generate_image(
         }
         if size:
             kwargs["size"] = size
-        if seed and seed >= 0:
+        if seed >= 0:
             kwargs["seed"] = seed
 
         response = await client.images.generate(**kwargs)
@@ -120,7 +161,7 @@ def _build_video_content(
     return content
 
 
-async def generate_video(
+async def submit_video_task(
     *,
     prompt: str,
     duration: int = 5,
@@ -128,15 +169,14 @@ async def generate_video(
     model: str = "",
     image_url: str = "",
 ) -> dict[str, Any]:
-    """Generate a video from text (+ optional image) using Seedance.
+    """Create a Seedance task via ``content_generation.tasks.create()``.
 
-    This is an async task:
-      1. Create task via ``content_generation.tasks.create()``
-      2. Poll ``content_generation.tasks.get(task_id)`` until done
+    Returns immediately — use :func:`get_video_task` (or the media task
+    service) to follow it.
 
     Returns:
-        {"status": "ok", "video_url": str, "task_id": str, ...}
-        or {"status": "error", "reason": str, ...}
+        {"status": "ok", "task_id": str, "model": str, ...}
+        or {"status": "error", "reason": str}
     """
     if not prompt or not prompt.strip():
         return {"status": "error", "reason": "prompt is required"}
@@ -149,7 +189,6 @@ async def generate_video(
         client = _get_ark_client()
         content = _build_video_content(prompt=prompt, image_url=image_url)
 
-        # Step 1: Create the video generation task
         # SDK supports duration, ratio as first-class params
         create_result = await client.content_generation.tasks.create(
             model=model,
@@ -159,57 +198,126 @@ async def generate_video(
         )
         task_id = create_result.id
         logger.info("Video generation task created: %s (model=%s)", task_id, model)
-
-        # Step 2: Poll for completion
-        elapsed = 0
-        poll_interval = settings.ark_video_poll_interval
-        max_wait = settings.ark_video_max_wait
-
-        while elapsed < max_wait:
-            await asyncio.sleep(poll_interval)
-            elapsed += poll_interval
-
-            result = await client.content_generation.tasks.get(task_id=task_id)
-            status = result.status
-
-            if status == "succeeded":
-                video_url = ""
-                if result.content:
-                    video_url = result.content.video_url or ""
-                logger.info("Video generation succeeded: %s → %s", task_id, video_url)
-                return {
-                    "status": "ok",
-                    "video_url": video_url,
-                    "task_id": task_id,
-                    "model": model,
-                    "prompt": prompt.strip(),
-                    "duration": duration,
-                    "aspect_ratio": aspect_ratio,
-                }
-
-            if status == "failed":
-                error_msg = "unknown error"
-                if result.error:
-                    error_msg = result.error.message or result.error.code or error_msg
-                logger.error("Video generation failed: %s — %s", task_id, error_msg)
-                return {
-                    "status": "error",
-                    "reason": f"Video generation failed: {error_msg}",
-                    "task_id": task_id,
-                }
-
-            # Still running — continue polling
-            logger.debug("Video task %s status: %s (%ds elapsed)", task_id, status, elapsed)
-
-        # Timed out
         return {
-            "status": "error",
-            "reason": f"Video generation timed out after {max_wait}s",
+            "status": "ok",
             "task_id": task_id,
+            "model": model,
+            "prompt": prompt.strip(),
+            "duration": duration,
+            "aspect_ratio": aspect_ratio,
         }
-
     except RuntimeError as exc:
         return {"status": "error", "reason": str(exc)}
     except Exception as exc:
-        logger.exception("Seedance video generation failed: %s", exc)
+        logger.exception("Seedance video task creation failed: %s", exc)
         return {"status": "error", "reason": f"Video generation failed: {exc}"}
+
+
+async def get_video_task(task_id: str) -> dict[str, Any]:
+    """Fetch a Seedance task's state via ``content_generation.tasks.get()``.
+
+    Returns:
+        {"status": "succeeded", "video_url": str}
+        | {"status": "failed", "reason": str}
+        | {"status": <upstream status, e.g. "queued" / "running">}
+
+    Raises:
+        Exception: Transport / API errors are left to the caller (the
+        media task service retries them on its next poll).
+    """
+    result = await _get_ark_client().content_generation.tasks.get(task_id=task_id)
+    status = result.status
+
+    if status == "succeeded":
+        video_url = ""
+        if result.content:
+            video_url = result.content.video_url or ""
+        logger.info("Video generation succeeded: %s → %s", task_id, video_url)
+        return {"status": "succeeded", "video_url": video_url}
+
+    if status == "failed":
+        error_msg = "unknown error"
+        if result.error:
+            error_msg = result.error.message or result.error.code or error_msg
+        logger.error("Video generation failed: %s — %s", task_id, error_msg)
+        return {"status": "failed", "reason": f"Video generation failed: {error_msg}"}
+
+    logger.debug("Video task %s status: %s", task_id, status)
+    return {"status": status or "running"}
+
+
+async def start_video_generation(
+    *,
+    prompt: str,
+    duration: int = 5,
+    aspect_ratio: str = "16:9",
+    model: str = "",
+    image_url: str = "",
+    conversation_id: str = "",
+    on_complete: Callable[[MediaTask], None] | None = None,
+) -> dict[str, Any]:
+    """Submit a video task and hand it to the background media task service.
+
+    Returns:
+        The :func:`submit_video_task` result (``task_id`` etc.) once the task
+        is registered, or its error.
+    """
+    from services.media_tasks import get_media_task_service
+
+    submitted = await submit_video_task(
+        prompt=prompt,
+        duration=duration,
+        aspect_ratio=aspect_ratio,
+        model=model,
+        image_url=image_url,
+    )
+    if submitted.get("status") == "error":
+        return submitted
+
+    get_media_task_service().register(
+        submitted["task_id"],
+        "video",
+        params={k: v for k, v in submitted.items() if k not in ("status", "task_id")},
+        conversation_id=conversation_id,
+        on_complete=on_complete,
+    )
+    return submitted
+
+
+async def generate_video(
+    *,
+    prompt: str,
+    duration: int = 5,
+    aspect_ratio: str = "16:9",
+    model: str = "",
+    image_url: str = "",
+) -> dict[str, Any]:
+    """Generate a video and wait for the result (blocking convenience wrapper).
+
+    Polling happens in the shared media task service; this only awaits the
+    task's completion.  Agent tools should prefer
+    :func:`start_video_generation` and return the task handle instead.
+
+    Returns:
+        {"status": "ok", "video_url": str, "task_id": str, ...}
+        or {"status": "error", "reason": str, ...}
+    """
+    from services.media_tasks import get_media_task_service
+
+    submitted = await start_video_generation(
+        prompt=prompt,
+        duration=duration,
+        aspect_ratio=aspect_ratio,
+        model=model,
+        image_url=image_url,
+    )
+    if submitted.get("status") == "error":
+        return submitted
+
+    task = await get_media_task_service().wait(submitted["task_id"])
+    if task.status == "failed":
+        return {"status": "error", "reason": task.error, "task_id": task.task_id}
+    return {
+        **submitted,
+        "video_url": task.result.get("video_url", ""),
+    }